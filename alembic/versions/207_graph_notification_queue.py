@@ -0,0 +1,57 @@
+"""Durable Graph webhook ingestion queue.
+
+What:
+  - NEW graph_notification_queue — one row per validated Graph mail notification.
+    The webhook endpoint inserts and returns 202; a scheduler drain claims pending
+    rows in batches (claimed_at lease), logs the messages and coalesces one inbox
+    poll per user. dedup_key (sha256 of subscription_id:resource) is UNIQUE so a
+    notification replayed to a different worker is rejected cross-process.
+
+Additive/reversible (downgrade drops the table). Indexes declared in the model's
+__table_args__ with identical names so the fresh-DB drift gate stays green.
+
+Called by: alembic (upgrade/downgrade).
+Depends on: users.
+
+Revision ID: 207_graph_notification_queue
+Revises: 206_part_equivalences
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "207_graph_notification_queue"
+down_revision = "206_part_equivalences"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "graph_notification_queue",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("subscription_id", sa.String(255), nullable=False),
+        sa.Column("resource", sa.Text(), nullable=False),
+        sa.Column("change_type", sa.String(100), nullable=False),
+        sa.Column("dedup_key", sa.String(64), nullable=False),
+        sa.Column("received_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("fail_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.String(500), nullable=True),
+    )
+    op.create_index("ix_gnq_dedup", "graph_notification_queue", ["dedup_key"], unique=True)
+    op.create_index("ix_gnq_pending", "graph_notification_queue", ["processed_at", "id"])
+    op.create_index("ix_gnq_user", "graph_notification_queue", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_gnq_user", table_name="graph_notification_queue")
+    op.drop_index("ix_gnq_pending", table_name="graph_notification_queue")
+    op.drop_index("ix_gnq_dedup", table_name="graph_notification_queue")
+    op.drop_table("graph_notification_queue")
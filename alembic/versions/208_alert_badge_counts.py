@@ -0,0 +1,43 @@
+"""Add alert_badge_counts table — materialized per-(user, kind) nav badge counters.
+
+What: creates alert_badge_counts (user_id, alert_kind, count, stale, computed_at) with a
+      unique constraint on (user_id, alert_kind) and an index on (stale, computed_at) for
+      the reconcile job's stale/aged scan. The badge endpoint reads these rows instead of
+      running every AlertSource count query per render; rows are filled lazily, so no
+      backfill is needed.
+Downgrade: drops the table.
+
+Revision ID: 208_alert_badge_counts
+Revises: 207_graph_notification_queue
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "208_alert_badge_counts"
+down_revision = "207_graph_notification_queue"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "alert_badge_counts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("alert_kind", sa.String(length=40), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("stale", sa.Boolean(), nullable=False, server_default="false"),
+        sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "alert_kind", name="uq_alert_badge_counts_user_kind"),
+    )
+    op.create_index("ix_alert_badge_counts_stale", "alert_badge_counts", ["stale", "computed_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_alert_badge_counts_stale", table_name="alert_badge_counts")
+    op.drop_table("alert_badge_counts")
@@ -0,0 +1,58 @@
+"""Add quote_offer_links — relational projection of quotes.line_items offer ids.
+
+What: creates quote_offer_links (quote_id, offer_id, status) with a unique constraint on
+      (quote_id, offer_id) and indexes on (status, offer_id) and offer_id, then backfills
+      one row per distinct offer id found in each quote's line_items JSON. Scoring reads
+      this table instead of decoding every quote's JSON; the Quote after_insert /
+      after_update listeners keep it current from here on.
+Downgrade: drops the indexes and the table.
+
+Revision ID: 209_quote_offer_links
+Revises: 208_alert_badge_counts
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from alembic import op
+
+revision = "209_quote_offer_links"
+down_revision = "208_alert_badge_counts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "quote_offer_links",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("quote_id", sa.Integer(), nullable=False),
+        sa.Column("offer_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.ForeignKeyConstraint(["quote_id"], ["quotes.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("quote_id", "offer_id", name="uq_quote_offer_link"),
+    )
+    op.create_index("ix_quote_offer_links_status_offer", "quote_offer_links", ["status", "offer_id"], unique=False)
+    op.create_index("ix_quote_offer_links_offer", "quote_offer_links", ["offer_id"], unique=False)
+
+    # Backfill from the JSON. Only object items whose offer_id is a positive integer
+    # are projected — the same rule as models.quotes.offer_ids_from_line_items.
+    op.get_bind().execute(
+        text(
+            "INSERT INTO quote_offer_links (quote_id, offer_id, status) "
+            "SELECT DISTINCT q.id, (li->>'offer_id')::int, q.status "
+            "FROM quotes q CROSS JOIN LATERAL json_array_elements("
+            "  CASE WHEN json_typeof(q.line_items) = 'array' THEN q.line_items ELSE '[]'::json END"
+            ") AS li "
+            "WHERE json_typeof(li) = 'object' AND (li->>'offer_id') ~ '^[0-9]{1,9}$' "
+            "AND (li->>'offer_id')::int > 0"
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_quote_offer_links_offer", table_name="quote_offer_links")
+    op.drop_index("ix_quote_offer_links_status_offer", table_name="quote_offer_links")
+    op.drop_table("quote_offer_links")
@@ -0,0 +1,49 @@
+"""Add vendor_affinity_cells — precomputed vendor x manufacturer / category matrix.
+
+What: creates vendor_affinity_cells (dimension, dim_key, vendor_name_normalized,
+      vendor_name, vendor_card_id, mpn_count, computed_at) with a lookup index on
+      (dimension, dim_key, mpn_count) for top-k reads. Vendor affinity L1/L3 read these
+      cells once the first build exists; the hourly refresh job performs that first full
+      build, so no backfill is needed here.
+Downgrade: drops the index and the table.
+
+Revision ID: 210_vendor_affinity_cells
+Revises: 209_quote_offer_links
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "210_vendor_affinity_cells"
+down_revision = "209_quote_offer_links"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vendor_affinity_cells",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("dimension", sa.String(length=20), nullable=False),
+        sa.Column("dim_key", sa.String(length=255), nullable=False),
+        sa.Column("vendor_name_normalized", sa.String(length=255), nullable=True),
+        sa.Column("vendor_name", sa.String(length=255), nullable=False),
+        sa.Column("vendor_card_id", sa.Integer(), nullable=True),
+        sa.Column("mpn_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["vendor_card_id"], ["vendor_cards.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_vendor_affinity_cells_lookup",
+        "vendor_affinity_cells",
+        ["dimension", "dim_key", "mpn_count"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vendor_affinity_cells_lookup", table_name="vendor_affinity_cells")
+    op.drop_table("vendor_affinity_cells")
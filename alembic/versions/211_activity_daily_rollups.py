@@ -0,0 +1,84 @@
+"""Add activity_daily_rollups — per-day activity counts per entity, contact and kind.
+
+What: creates activity_daily_rollups (day, user_id, company_id, vendor_card_id,
+      vendor_contact_id, site_contact_id, channel, direction, activity_type,
+      activity_count, last_at) with a unique bucket constraint over the nine key
+      columns and (company_id, day), (vendor_contact_id, day), (user_id, day) indexes,
+      then backfills it from activity_log. Absent dimensions are 0 / '' so the bucket
+      key is a plain unique constraint; no FKs, since the nightly rebuild repairs
+      SET NULL cascades. The day is the UTC date of coalesce(occurred_at, created_at).
+Downgrade: drops the indexes and the table.
+
+Revision ID: 211_activity_daily_rollups
+Revises: 210_vendor_affinity_cells
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from alembic import op
+
+revision = "211_activity_daily_rollups"
+down_revision = "210_vendor_affinity_cells"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "activity_daily_rollups",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("company_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("vendor_card_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("vendor_contact_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("site_contact_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("channel", sa.String(length=20), nullable=False, server_default=""),
+        sa.Column("direction", sa.String(length=20), nullable=False, server_default=""),
+        sa.Column("activity_type", sa.String(length=20), nullable=False, server_default=""),
+        sa.Column("activity_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "day",
+            "user_id",
+            "company_id",
+            "vendor_card_id",
+            "vendor_contact_id",
+            "site_contact_id",
+            "channel",
+            "direction",
+            "activity_type",
+            name="uq_activity_daily_rollup_bucket",
+        ),
+    )
+    op.create_index("ix_activity_rollup_company_day", "activity_daily_rollups", ["company_id", "day"], unique=False)
+    op.create_index(
+        "ix_activity_rollup_vendor_contact_day", "activity_daily_rollups", ["vendor_contact_id", "day"], unique=False
+    )
+    op.create_index("ix_activity_rollup_user_day", "activity_daily_rollups", ["user_id", "day"], unique=False)
+
+    # Backfill — the same grouping as services/activity_rollup.rebuild_activity_rollups.
+    op.get_bind().execute(
+        text(
+            "INSERT INTO activity_daily_rollups (day, user_id, company_id, vendor_card_id, "
+            "vendor_contact_id, site_contact_id, channel, direction, activity_type, "
+            "activity_count, last_at) "
+            "SELECT (COALESCE(occurred_at, created_at) AT TIME ZONE 'UTC')::date, "
+            "COALESCE(user_id, 0), COALESCE(company_id, 0), COALESCE(vendor_card_id, 0), "
+            "COALESCE(vendor_contact_id, 0), COALESCE(site_contact_id, 0), "
+            "COALESCE(channel, ''), COALESCE(direction, ''), COALESCE(activity_type, ''), "
+            "COUNT(*), MAX(COALESCE(occurred_at, created_at)) "
+            "FROM activity_log WHERE COALESCE(occurred_at, created_at) IS NOT NULL "
+            "GROUP BY 1, 2, 3, 4, 5, 6, 7, 8, 9"
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_activity_rollup_user_day", table_name="activity_daily_rollups")
+    op.drop_index("ix_activity_rollup_vendor_contact_day", table_name="activity_daily_rollups")
+    op.drop_index("ix_activity_rollup_company_day", table_name="activity_daily_rollups")
+    op.drop_table("activity_daily_rollups")
@@ -0,0 +1,41 @@
+"""Add data_migrations — ledger of versioned startup backfills.
+
+What: creates data_migrations (name PK, version, status, checkpoint JSON, rows_done,
+      started_at, completed_at, last_error). app/data_migrations.run_pending reads it on
+      every boot and skips backfills already completed at their registered version;
+      ``checkpoint`` holds keyset cursors so an interrupted backfill resumes.
+      No backfill: an empty ledger runs every registered backfill once, as before.
+Downgrade: drops the table.
+
+Revision ID: 212_data_migrations
+Revises: 211_activity_daily_rollups
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "212_data_migrations"
+down_revision = "211_activity_daily_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "data_migrations",
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("checkpoint", sa.JSON(), nullable=True),
+        sa.Column("rows_done", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("data_migrations")
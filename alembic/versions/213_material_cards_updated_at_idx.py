@@ -0,0 +1,27 @@
+"""Index material_cards.updated_at for the faceted-search index refresh.
+
+What: creates ix_material_cards_updated_at on material_cards (updated_at). The
+      in-process facet bitset index (app/services/facet_index.py) refreshes by reading
+      cards whose updated_at moved past its watermark every few seconds; without the
+      index that read is a sequential scan of material_cards.
+Downgrade: drops the index.
+
+Revision ID: 213_material_cards_updated_at_idx
+Revises: 212_data_migrations
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "213_material_cards_updated_at_idx"
+down_revision = "212_data_migrations"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_material_cards_updated_at", "material_cards", ["updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_material_cards_updated_at", table_name="material_cards")
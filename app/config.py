@@ -59,6 +59,12 @@ class Settings(BaseSettings):
     # exist => 404. Flip True only in a trusted/dev environment. Env: EXPOSE_API_DOCS.
     expose_api_docs: bool = False
 
+    # --- SQL profiler ---
+    # Server-Timing response header with per-request DB time + statement count (see
+    # app/sql_profiler.py). None = auto: on unless app_url is https (production).
+    # Env: SQL_SERVER_TIMING.
+    sql_server_timing: bool | None = None
+
     # --- Rate limiting ---
     # Global per-IP default applied by SlowAPIMiddleware to every route that lacks its
     # own @limiter.limit. 600/minute (10 req/s sustained) is sized for an htmx-heavy
@@ -395,6 +401,12 @@ class Settings(BaseSettings):
     # Set MVP_MODE=true in .env only to suppress the Teams integration.
     mvp_mode: bool = False
 
+    # --- PDF documents (services/pdf_renderer.py) ---
+    # WeasyPrint render processes; 0 renders inline in the calling thread.
+    pdf_render_workers: int = Field(default=2, ge=0)
+    pdf_render_timeout_s: float = 30.0
+    pdf_cache_max_mb: int = Field(default=64, ge=0)  # process-local rendered-PDF LRU
+
     # --- Metrics ---
     metrics_token: str = ""  # Required token for /metrics endpoint (X-Metrics-Token header)
 
@@ -15,6 +15,7 @@ class EbayConnector(BaseConnector):
     """EBay Browse API — OAuth client credentials flow."""
 
     source_name: str = "ebay"
+    idempotent_get = True
 
     TOKEN_URL = "https://api.ebay.com/identity/v1/oauth2/token"
     SEARCH_URL = "https://api.ebay.com/buy/browse/v1/item_summary/search"
@@ -64,6 +64,7 @@ class Element14Connector(BaseConnector):
     """Element14 Product Search — API key auth, Newark US store."""
 
     source_name: str = "element14"
+    idempotent_get = True
 
     SEARCH_URL = "https://api.element14.com/catalog/products"
 
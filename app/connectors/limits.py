@@ -0,0 +1,249 @@
+"""Adaptive per-connector concurrency and latency-derived deadlines.
+
+Each connector class gets one ``AdaptiveLimiter`` per process. It replaces the fixed
+per-connector ``asyncio.Semaphore``:
+
+  - AIMD concurrency: the limit starts at the connector's configured concurrency,
+    grows by one slot per ``limit`` fast successes (additive increase, up to
+    ``MAX_SCALE`` x the configured value) and is cut multiplicatively on a 429 (halved)
+    or on a failure / latency spike (x0.75), at most once per ``DECREASE_COOLDOWN_S``
+    so one burst of errors is one decrease. Never below one slot.
+  - Rolling latency: the last ``WINDOW`` successful call latencies give p50/p95. A
+    "spike" is a success slower than ``SPIKE_FACTOR`` x p50.
+  - Deadline: ``deadline_s(budget)`` is ``DEADLINE_FACTOR`` x p95 (floored at
+    ``MIN_DEADLINE_S``), capped by the overall search budget. Until ``MIN_SAMPLES``
+    latencies exist the connector gets the whole budget.
+  - Hedge delay: ``hedge_after_s()`` — after p95 without an answer, an idempotent GET
+    connector may send one duplicate request if a slot is free.
+
+Limits are per process; ``sources._shared_connector_slot`` caps all processes together
+at the configured concurrency when Redis is up.
+
+Called by: connectors/sources.py (BaseConnector slot + outcome recording),
+           search_service._fetch_fresh (limited_search: deadlines, hedging),
+           services/connector_health.py (live limits on the sources health page).
+Depends on: asyncio only.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any, TypedDict
+
+# Default max concurrent requests per connector type (the AIMD starting point).
+CONNECTOR_CONCURRENCY = {
+    "DigiKeyConnector": 2,
+    "MouserConnector": 2,
+    "OEMSecretsConnector": 3,
+    "NexarConnector": 3,
+    "BrokerBinConnector": 5,
+}
+DEFAULT_CONCURRENCY = 3
+
+MAX_SCALE = 2  # AIMD ceiling = MAX_SCALE x configured concurrency
+WINDOW = 200  # successful latencies kept for the percentiles
+MIN_SAMPLES = 20  # below this, deadlines fall back to the overall budget
+SPIKE_FACTOR = 3.0  # success slower than this x p50 counts as congestion
+DEADLINE_FACTOR = 1.5
+MIN_DEADLINE_S = 2.0
+DECREASE_COOLDOWN_S = 2.0
+
+
+class LimiterSnapshot(TypedDict):
+    """Live state of one connector's limiter (sources health page)."""
+
+    limit: int
+    in_flight: int
+    configured: int
+    samples: int
+    p50_ms: int | None
+    p95_ms: int | None
+    throttled: int
+    hedges: int
+    deadline_misses: int
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    idx = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit plus rolling latency percentiles for one connector."""
+
+    def __init__(self, name: str, initial: int, max_limit: int | None = None):
+        self.name = name
+        self.configured = initial
+        self.max_limit = max_limit if max_limit is not None else initial * MAX_SCALE
+        self._limit = float(initial)
+        self.in_flight = 0
+        self.throttled = 0
+        self.hedges = 0
+        self.deadline_misses = 0
+        self._latencies: deque[float] = deque(maxlen=WINDOW)
+        self._last_decrease = 0.0
+        self._cond: asyncio.Condition | None = None
+
+    @property
+    def limit(self) -> int:
+        return max(1, int(self._limit))
+
+    def _condition(self) -> asyncio.Condition:
+        # Created lazily on the running loop (the conftest reset drops limiters per test).
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    def has_capacity(self) -> bool:
+        return self.in_flight < self.limit
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one concurrency slot; waits while ``in_flight`` is at the live limit."""
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(self.has_capacity)
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with cond:
+                self.in_flight -= 1
+                cond.notify_all()
+
+    def _percentiles(self) -> tuple[float, float] | None:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return _percentile(ordered, 0.50), _percentile(ordered, 0.95)
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < DECREASE_COOLDOWN_S:
+            return
+        self._last_decrease = now
+        self._limit = max(1.0, self._limit * factor)
+
+    def record_success(self, latency_s: float) -> None:
+        """A completed call: additive increase unless it was a latency spike."""
+        pct = self._percentiles()
+        self._latencies.append(latency_s)
+        if pct is not None and len(self._latencies) >= MIN_SAMPLES and latency_s > SPIKE_FACTOR * pct[0]:
+            self._decrease(0.75)
+            return
+        self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+    def record_throttled(self) -> None:
+        """The upstream answered 429 — halve the limit."""
+        self.throttled += 1
+        self._decrease(0.5)
+
+    def record_failure(self) -> None:
+        """Timeout / 5xx / connection failure — gentle multiplicative decrease."""
+        self._decrease(0.75)
+
+    def deadline_s(self, budget_s: float) -> float:
+        """Per-call deadline from the rolling p95, never above the overall budget."""
+        pct = self._percentiles()
+        if pct is None or len(self._latencies) < MIN_SAMPLES:
+            return budget_s
+        return min(budget_s, max(MIN_DEADLINE_S, DEADLINE_FACTOR * pct[1]))
+
+    def hedge_after_s(self) -> float | None:
+        """Delay before a hedged duplicate request, or None until enough samples exist."""
+        pct = self._percentiles()
+        if pct is None or len(self._latencies) < MIN_SAMPLES:
+            return None
+        return pct[1]
+
+    def snapshot(self) -> LimiterSnapshot:
+        pct = self._percentiles()
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "configured": self.configured,
+            "samples": len(self._latencies),
+            "p50_ms": int(pct[0] * 1000) if pct else None,
+            "p95_ms": int(pct[1] * 1000) if pct else None,
+            "throttled": self.throttled,
+            "hedges": self.hedges,
+            "deadline_misses": self.deadline_misses,
+        }
+
+
+_limiters: dict[str, AdaptiveLimiter] = {}
+
+
+def get_limiter(name: str) -> AdaptiveLimiter:
+    """Get or create the limiter for the named connector class."""
+    limiter = _limiters.get(name)
+    if limiter is None:
+        limiter = _limiters[name] = AdaptiveLimiter(name, CONNECTOR_CONCURRENCY.get(name, DEFAULT_CONCURRENCY))
+    return limiter
+
+
+def limiter_snapshots() -> dict[str, LimiterSnapshot]:
+    """Live state of every limiter created in this process, keyed by connector class."""
+    return {name: limiter.snapshot() for name, limiter in _limiters.items()}
+
+
+async def hedged_call[T](
+    call: Callable[[], Awaitable[T]],
+    hedge_after_s: float | None,
+    can_hedge: Callable[[], bool],
+) -> T:
+    """Run ``call()``; if it is still running after *hedge_after_s*, start one duplicate.
+
+    The first successful result wins and the other call is cancelled. The duplicate is
+    only sent when ``can_hedge()`` — i.e. a concurrency slot is free — so hedging never
+    queues behind (or adds load to) an already saturated connector. With
+    *hedge_after_s* None this is a plain ``await call()``.
+    """
+    tasks: set[asyncio.Future[T]] = {asyncio.ensure_future(call())}
+    try:
+        if hedge_after_s is not None:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after_s)
+            if not done and can_hedge():
+                tasks.add(asyncio.ensure_future(call()))
+        first_error: BaseException | None = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                if t.exception() is None:
+                    return t.result()
+                first_error = first_error or t.exception()
+        assert first_error is not None
+        raise first_error
+    finally:
+        for t in tasks:
+            t.cancel()
+
+
+async def limited_search(conn: Any, part_number: str, budget_s: float) -> list[dict]:
+    """``conn.search(part_number)`` bounded by the connector's latency-derived deadline.
+
+    Connectors flagged ``idempotent_get`` are hedged after their p95. Raises
+    ``TimeoutError`` when the deadline passes (recorded as a failure on the limiter).
+    """
+    limiter = get_limiter(conn.__class__.__name__)
+    hedge_after = limiter.hedge_after_s() if getattr(conn, "idempotent_get", False) else None
+
+    def _can_hedge() -> bool:
+        if not limiter.has_capacity():
+            return False
+        limiter.hedges += 1
+        return True
+
+    deadline = limiter.deadline_s(budget_s)
+    try:
+        result: list[dict] = await asyncio.wait_for(
+            hedged_call(lambda: conn.search(part_number), hedge_after, _can_hedge),
+            timeout=deadline,
+        )
+    except TimeoutError:
+        limiter.deadline_misses += 1
+        limiter.record_failure()
+        raise TimeoutError(f"connector deadline exceeded ({deadline:.1f}s)") from None
+    return result
@@ -21,6 +21,7 @@ class OEMSecretsConnector(BaseConnector):
     """OEMSecrets Part Search API — JSON endpoint."""
 
     source_name: str = "oemsecrets"
+    idempotent_get = True
 
     # Docs: https://oemsecretsapi.com/documentation/
     SEARCH_URL = "https://oemsecretsapi.com/partsearch"
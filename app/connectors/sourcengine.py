@@ -12,6 +12,7 @@ class SourcengineConnector(BaseConnector):
     """Sourcengine REST API — search by MPN across suppliers."""
 
     source_name: str = "sourcengine"
+    idempotent_get = True
 
     # Docs: https://dev.sourcengine.com/
     SEARCH_URL = "https://api.sourcengine.com/v1/search"
@@ -5,8 +5,10 @@ import random
 import re
 import threading
 import time
+import uuid
 from abc import ABC, abstractmethod
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from typing import cast
 from urllib.parse import quote_plus
 
@@ -16,6 +18,7 @@ from loguru import logger
 from ..utils import safe_float, safe_int
 from ._core_attrs import clean_str
 from .errors import ConnectorAuthError, ConnectorError, ConnectorQuotaError, ConnectorRateLimitError
+from .limits import CONNECTOR_CONCURRENCY, DEFAULT_CONCURRENCY, get_limiter
 
 # ── Secret redaction for logged exception text ───────────────────────
 # Connectors that authenticate with the API key as a URL query param (Mouser,
@@ -52,12 +55,41 @@ def _safe_connector_error(exc: BaseException) -> "ConnectorError":
     return ConnectorError(f"{type(exc).__name__}: {_redact_secrets(str(exc))}")
 
 
+# ── Cross-process shared state (optional Redis) ──────────────────────
+# Every web worker, search runner and enrichment worker builds its own connectors, so
+# purely in-process breakers / concurrency caps / bearer caches multiply by the process
+# count: N processes send N x the allowed concurrency upstream, each probe a dead API
+# fail_max times before opening, and each mint their own OAuth token. With Redis up the
+# breaker state, concurrency leases and bearers below are shared under
+# ``connectors:*`` keys; with Redis down (or under TESTING) the in-process state —
+# which is always maintained alongside — is used unchanged.
+_SHARED_PREFIX = "connectors:"
+# A lease held by a crashed process frees itself after this long.
+_SLOT_LEASE_S = 60.0
+# Poll interval while every shared slot of a connector is leased elsewhere.
+_SLOT_POLL_S = 0.05
+# How long a process waits for a peer's in-flight token mint before minting itself.
+_TOKEN_MINT_WAIT_S = 5.0
+
+
+def _shared_redis():
+    """The shared Redis client, or ``None`` (TESTING, non-Redis backend, outage)."""
+    from ..cache.intel_cache import _get_redis
+
+    return _get_redis()
+
+
 # ── Async-compatible circuit breaker ─────────────────────────────────
 # Opens after `fail_max` consecutive failures, resets after `reset_timeout` seconds.
 
 
 class CircuitBreaker:
-    """Lightweight async-friendly circuit breaker."""
+    """Lightweight async-friendly circuit breaker.
+
+    State lives in a Redis hash shared by every process when Redis is up (wall-clock
+    ``opened_at``), so one process tripping the breaker stops the others probing a dead
+    API. The in-process counters are updated regardless and answer while Redis is down.
+    """
 
     def __init__(self, name: str, fail_max: int = 5, reset_timeout: float = 60):
         self.name = name
@@ -65,9 +97,20 @@ class CircuitBreaker:
         self.reset_timeout = reset_timeout
         self._fail_count = 0
         self._opened_at: float | None = None
+        self._shared_key = f"{_SHARED_PREFIX}breaker:{name}"
 
     @property
     def current_state(self) -> str:
+        r = _shared_redis()
+        if r is not None:
+            try:
+                opened_at = r.hget(self._shared_key, "opened_at")
+            except Exception as e:  # Redis down: fall back to local state
+                logger.debug("Shared breaker read failed for {}: {}", self.name, e)
+            else:
+                if opened_at is None:
+                    return "closed"
+                return "half_open" if time.time() - float(opened_at) >= self.reset_timeout else "open"
         if self._opened_at is not None:
             if time.monotonic() - self._opened_at >= self.reset_timeout:
                 return "half_open"
@@ -77,11 +120,29 @@ class CircuitBreaker:
     def record_success(self):
         self._fail_count = 0
         self._opened_at = None
+        r = _shared_redis()
+        if r is not None:
+            try:
+                r.delete(self._shared_key)
+            except Exception as e:  # local state already reset
+                logger.debug("Shared breaker reset failed for {}: {}", self.name, e)
 
     def record_failure(self):
         self._fail_count += 1
         if self._fail_count >= self.fail_max:
             self._opened_at = time.monotonic()
+        r = _shared_redis()
+        if r is not None:
+            try:
+                pipe = r.pipeline(transaction=True)
+                pipe.hincrby(self._shared_key, "fails", 1)
+                # Idle consecutive-failure counts age out rather than trip days later.
+                pipe.expire(self._shared_key, int(max(self.reset_timeout * 10, 600)))
+                fails = int(pipe.execute()[0])
+                if fails >= self.fail_max:
+                    r.hset(self._shared_key, "opened_at", time.time())
+            except Exception as e:  # local state already recorded
+                logger.debug("Shared breaker update failed for {}: {}", self.name, e)
 
 
 _breakers: dict[str, CircuitBreaker] = {}
@@ -97,25 +158,66 @@ def get_breaker(name: str) -> CircuitBreaker:
 
 
 # ── Per-connector concurrency limits ─────────────────────────────────
-# Prevents hammering a single API with too many parallel requests.
-_connector_semaphores: dict[str, asyncio.Semaphore] = {}
+# Prevents hammering a single API with too many parallel requests. Each process runs an
+# AIMD limiter per connector (limits.AdaptiveLimiter — starts at the configured
+# concurrency, backs off on 429s / failures / latency spikes) and, with Redis up, all
+# processes together hold at most that many leases (_shared_connector_slot).
+_CONNECTOR_CONCURRENCY = CONNECTOR_CONCURRENCY
 
-# Default max concurrent requests per connector type
-_CONNECTOR_CONCURRENCY = {
-    "DigiKeyConnector": 2,
-    "MouserConnector": 2,
-    "OEMSecretsConnector": 3,
-    "NexarConnector": 3,
-    "BrokerBinConnector": 5,
-}
 
+def _try_lease_slot(r, key: str, token: str, limit: int) -> bool:
+    """Take one of *limit* leases in the sorted set *key* (score = lease expiry).
 
-def _get_connector_semaphore(name: str) -> asyncio.Semaphore:
-    """Get or create a per-connector semaphore to limit concurrency."""
-    if name not in _connector_semaphores:
-        limit = _CONNECTOR_CONCURRENCY.get(name, 3)
-        _connector_semaphores[name] = asyncio.Semaphore(limit)
-    return _connector_semaphores[name]
+    Add-then-rank in one MULTI: expired leases are dropped, ours is added, and we hold a
+    slot iff fewer than *limit* live leases expire before ours. Losers remove their entry.
+    """
+    now = time.time()
+    pipe = r.pipeline(transaction=True)
+    pipe.zremrangebyscore(key, "-inf", now)
+    pipe.zadd(key, {token: now + _SLOT_LEASE_S})
+    pipe.zrank(key, token)
+    pipe.expire(key, int(_SLOT_LEASE_S) * 2)
+    rank = pipe.execute()[2]
+    if rank is not None and int(rank) < limit:
+        return True
+    r.zrem(key, token)
+    return False
+
+
+@asynccontextmanager
+async def _shared_connector_slot(name: str, limit: int | None = None) -> AsyncIterator[None]:
+    """Hold one of *limit* slots for the connector across ALL processes.
+
+    *limit* defaults to the configured ``_CONNECTOR_CONCURRENCY``; ``BaseConnector``
+    passes its limiter's live AIMD limit, so a process that backed off also shrinks the
+    cluster-wide ceiling it leases against. Taken inside the in-process limiter slot, so
+    a process never polls for more slots than it could use. Without Redis (or when Redis
+    fails mid-acquire) this is a no-op and the in-process limiter alone caps concurrency.
+    """
+    r = _shared_redis()
+    key = f"{_SHARED_PREFIX}slots:{name}"
+    token = uuid.uuid4().hex
+    held = False
+    if r is not None:
+        if limit is None:
+            limit = _CONNECTOR_CONCURRENCY.get(name, DEFAULT_CONCURRENCY)
+        try:
+            while True:
+                held = await asyncio.to_thread(_try_lease_slot, r, key, token, limit)
+                if held:
+                    break
+                await asyncio.sleep(_SLOT_POLL_S * (1 + random.random()))
+        except Exception as e:  # Redis failed: the local limiter still caps us
+            logger.debug("Shared slot acquire failed for {}: {}", name, e)
+            held = False
+    try:
+        yield
+    finally:
+        if held:
+            try:
+                await asyncio.to_thread(r.zrem, key, token)
+            except Exception as e:  # the lease expires on its own
+                logger.debug("Shared slot release failed for {}: {}", name, e)
 
 
 # ── Cross-search OAuth token cache ───────────────────────────────────
@@ -125,7 +227,7 @@ def _get_connector_semaphore(name: str) -> asyncio.Semaphore:
 # with it — each search paid ~3 serial token POSTs on the critical path and a
 # burst of concurrent PNs could herd the auth endpoint. Hoist the cache to the
 # process (keyed by connector class name + client_id, matching `_breakers` /
-# `_connector_semaphores` above) so a token minted by one search is reused by the
+# the per-connector limiters) so a token minted by one search is reused by the
 # next until it expires. A per-key `asyncio.Lock` collapses a cold-cache mint
 # burst into a SINGLE POST (double-checked after acquire).
 #
@@ -145,18 +247,66 @@ def _get_token_lock(cache_key: tuple[str, str]) -> asyncio.Lock:
     return lock
 
 
+def _shared_token_key(cache_key: tuple[str, str]) -> str:
+    return f"{_SHARED_PREFIX}token:{cache_key[0]}:{cache_key[1]}"
+
+
+def _read_shared_token(cache_key: tuple[str, str], safety_margin: float) -> str | None:
+    """A peer process's still-valid bearer from Redis, mirrored into the local cache."""
+    r = _shared_redis()
+    if r is None:
+        return None
+    try:
+        raw = r.get(_shared_token_key(cache_key))
+    except Exception as e:  # Redis down: mint locally
+        logger.debug("Shared token read failed for {}: {}", cache_key[0], e)
+        return None
+    if not raw:
+        return None
+    bearer, _, expires_at = str(raw).rpartition("|")
+    remaining = float(expires_at) - time.time()
+    if not bearer or remaining <= safety_margin:
+        return None
+    _token_cache[cache_key] = (bearer, time.monotonic() + remaining)
+    return bearer
+
+
+def _write_shared_token(cache_key: tuple[str, str], bearer: str, expires_in: int) -> None:
+    r = _shared_redis()
+    if r is None:
+        return
+    try:
+        r.setex(_shared_token_key(cache_key), max(int(expires_in), 1), f"{bearer}|{time.time() + expires_in}")
+    except Exception as e:  # the local cache still holds it
+        logger.debug("Shared token write failed for {}: {}", cache_key[0], e)
+
+
+def _claim_shared_mint(cache_key: tuple[str, str]) -> bool:
+    """True when this process should mint (it won the NX claim, or Redis is unavailable)."""
+    r = _shared_redis()
+    if r is None:
+        return True
+    try:
+        return bool(r.set(_shared_token_key(cache_key) + ":mint", "1", nx=True, ex=int(_TOKEN_MINT_WAIT_S) * 2))
+    except Exception as e:  # mint locally
+        logger.debug("Shared token mint claim failed for {}: {}", cache_key[0], e)
+        return True
+
+
 async def _get_cached_token(
     cache_key: tuple[str, str],
     mint: Callable[[], Awaitable[tuple[str, int]]],
     *,
     safety_margin: float = 60.0,
 ) -> str:
-    """Return a process-cached OAuth bearer for *cache_key*, minting only on a cold or
+    """Return a cached OAuth bearer for *cache_key*, minting only on a cold or
     near-expiry cache.
 
     *mint* is an async callable returning ``(bearer, expires_in_seconds)``. The
     per-key lock collapses a concurrent cold-cache mint burst into one POST; the
-    re-check after acquiring the lock means only the first waiter mints.
+    re-check after acquiring the lock means only the first waiter mints. With Redis up
+    the bearer is shared across processes, and an NX claim lets one process mint while
+    its peers wait (up to ``_TOKEN_MINT_WAIT_S``) for the shared result.
     """
     cached = _token_cache.get(cache_key)
     if cached and time.monotonic() < cached[1] - safety_margin:
@@ -167,25 +317,46 @@ async def _get_cached_token(
         cached = _token_cache.get(cache_key)
         if cached and time.monotonic() < cached[1] - safety_margin:
             return cached[0]
+        shared = _read_shared_token(cache_key, safety_margin)
+        if shared:
+            return shared
+        if not _claim_shared_mint(cache_key):
+            # A peer process is minting — wait for its bearer rather than mint twice.
+            deadline = time.monotonic() + _TOKEN_MINT_WAIT_S
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.1)
+                shared = _read_shared_token(cache_key, safety_margin)
+                if shared:
+                    return shared
         bearer, expires_in = await mint()
         _token_cache[cache_key] = (bearer, time.monotonic() + expires_in)
+        _write_shared_token(cache_key, bearer, expires_in)
         return bearer
 
 
 def _invalidate_token(cache_key: tuple[str, str]) -> None:
     """Drop a cached bearer so the next `_get_cached_token` re-mints (used after a
-    401)."""
+    401) — locally and, when shared, for every process."""
     _token_cache.pop(cache_key, None)
+    r = _shared_redis()
+    if r is not None:
+        try:
+            r.delete(_shared_token_key(cache_key), _shared_token_key(cache_key) + ":mint")
+        except Exception as e:  # the shared copy expires on its own
+            logger.debug("Shared token invalidate failed for {}: {}", cache_key[0], e)
 
 
 class BaseConnector(ABC):
     source_name: str = "unknown"
+    # True when a search is a side-effect-free GET — search_service may then hedge a
+    # slow call with one duplicate request (limits.hedged_call).
+    idempotent_get: bool = False
 
     def __init__(self, timeout: float = 20.0, max_retries: int = 2):
         self.timeout = timeout
         self.max_retries = max_retries
         self._breaker = get_breaker(self.__class__.__name__)
-        self._semaphore = _get_connector_semaphore(self.__class__.__name__)
+        self._limiter = get_limiter(self.__class__.__name__)
 
     async def search(self, part_number: str) -> list[dict]:
         # Short-circuit if the breaker is open (service is known-down).
@@ -216,7 +387,11 @@ class BaseConnector(ABC):
     async def _search_with_retry(self, part_number: str) -> list[dict]:
         """Retry loop with per-connector concurrency limiting.
 
-        The semaphore is acquired ONLY around the actual HTTP call
+        Every attempt feeds the connector's AIMD limiter: a success its latency, a 429
+        a halving, a timeout / 5xx / connection failure a gentler decrease. Auth and
+        quota errors say nothing about load and are not recorded.
+
+        The limiter slot is acquired ONLY around the actual HTTP call
         (``self._do_search``), not around the whole retry loop — a 429 backoff or
         exponential-backoff sleep here can be several seconds, and holding the
         per-connector concurrency slot (and, transitively, the caller's outer
@@ -228,19 +403,24 @@ class BaseConnector(ABC):
         last_err: Exception | None = None
         for attempt in range(self.max_retries + 1):
             try:
-                async with self._semaphore:
+                async with self._limiter.slot(), _shared_connector_slot(self.__class__.__name__, self._limiter.limit):
+                    started = time.monotonic()
                     result = await self._do_search(part_number)
+                self._limiter.record_success(time.monotonic() - started)
                 self._breaker.record_success()
                 return result
-            except ConnectorError:
+            except ConnectorError as e:
                 # Hard error from the connector — auth, quota, persistent
                 # rate-limit. Do NOT retry; fast-fail so health_monitor
                 # flips status='error' and the upstream stops getting hit.
                 self._breaker.record_failure()
+                if isinstance(e, ConnectorRateLimitError):
+                    self._limiter.record_throttled()
                 raise
             except (httpx.ConnectTimeout, httpx.ConnectError) as e:
                 # Server unreachable — no point retrying
                 self._breaker.record_failure()
+                self._limiter.record_failure()
                 logger.warning(f"{self.__class__.__name__} failed for {part_number}: {type(e).__name__}")
                 raise
             except httpx.HTTPStatusError as e:
@@ -248,13 +428,14 @@ class BaseConnector(ABC):
 
                 # 429 Too Many Requests — always retry with Retry-After
                 if status == 429:
+                    self._limiter.record_throttled()
                     retry_after = _parse_retry_after(e.response)
                     logger.warning(
                         f"{self.__class__.__name__} rate limited (429) for {part_number}, "
                         f"retry after {retry_after:.1f}s (attempt {attempt + 1}/{self.max_retries + 1})"
                     )
                     if attempt < self.max_retries:
-                        # Semaphore already released above — this sleep no longer
+                        # Limiter slot already released above — this sleep no longer
                         # pins a concurrency slot.
                         await asyncio.sleep(retry_after)
                         last_err = e
@@ -274,6 +455,8 @@ class BaseConnector(ABC):
                     raise _safe_connector_error(e) from None  # e's URL holds ?apiKey=SECRET
 
                 self._breaker.record_failure()
+                if status >= 500:
+                    self._limiter.record_failure()
                 last_err = e
                 if attempt < self.max_retries:
                     await asyncio.sleep(2**attempt + random.uniform(0, 1))
@@ -281,6 +464,7 @@ class BaseConnector(ABC):
                     logger.warning(f"{self.__class__.__name__} failed for {part_number}: {_redact_secrets(str(e))}")
             except Exception as e:
                 self._breaker.record_failure()
+                self._limiter.record_failure()
                 last_err = e
                 if attempt < self.max_retries:
                     await asyncio.sleep(2**attempt + random.uniform(0, 1))
@@ -329,7 +513,7 @@ def _parse_retry_after(response: httpx.Response) -> float:
             # settings.search_total_timeout_s (12s default) — a 30s sleep here would
             # always outlive that deadline and get cancelled anyway, so honoring an
             # upstream's longer Retry-After is pointless in the search context. The
-            # retry loop no longer holds the connector's semaphore during this sleep
+            # retry loop no longer holds the connector's limiter slot during this sleep
             # (see _search_with_retry), so the cap is purely about not burning the
             # search's own wall-clock budget on a wait that can't pay off.
             return min(max(float(header), 1.0), 8.0)
@@ -786,6 +970,7 @@ class BrokerBinConnector(BaseConnector):
     """
 
     source_name: str = "brokerbin"
+    idempotent_get = True
 
     API_URL = "https://search.brokerbin.com/api/v2/part/search"
 
@@ -0,0 +1,175 @@
+"""data_migrations.py — Versioned ledger for the deferred startup backfills.
+
+Each backfill is registered as a named ``Backfill`` with an integer version. The
+``data_migrations`` table records the version each one last completed at, so a boot on
+an unchanged tree reads one small table and runs nothing; bumping a backfill's version
+makes the next boot run it once more. Long keyset backfills persist a cursor through
+``Checkpoint.advance`` after every committed batch, so a run interrupted by a crash or
+deploy resumes where it stopped instead of rescanning from id 0.
+
+Only one process runs pending backfills at a time: on PostgreSQL ``run_pending`` takes a
+session-level advisory lock and every other worker skips the phase (the leader finishes
+the work for all of them). If the ledger table is unreadable — a database not yet
+migrated to 212, or a bare test engine — every backfill runs unledgered, exactly as it
+did before the ledger existed.
+
+Called by: startup.run_deferred_startup_backfills
+Depends on: database.py (engine), models/config.py (DataMigration)
+"""
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from loguru import logger
+from sqlalchemy import Table, delete, insert, select, update
+from sqlalchemy import text as sqltext
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+
+from .models.config import DataMigration
+
+# pg_try_advisory_lock key for the backfill phase — arbitrary, but fixed across deploys.
+_LOCK_KEY = 7_411_043
+
+_table: Table = DataMigration.__table__  # type: ignore[assignment]
+
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+
+class Checkpoint:
+    """Keyset cursors for one backfill, persisted to its ledger row as it advances.
+
+    ``Checkpoint()`` with no engine is an in-memory cursor (used when the ledger is
+    unavailable and by direct calls), so backfills can take one unconditionally.
+    """
+
+    def __init__(self, name: str = "", engine: Engine | None = None, state: dict | None = None, rows_done: int = 0):
+        self.name = name
+        self._engine = engine
+        self._state: dict = dict(state or {})
+        self.rows_done = rows_done
+
+    def get(self, key: str, default: int = 0) -> int:
+        """Last id processed for *key* (0 when the backfill has not started it)."""
+        return int(self._state.get(key, default))
+
+    def advance(self, key: str, last_id: int, rows: int = 0) -> None:
+        """Record that every row of *key* up to *last_id* is done (after its commit)."""
+        self._state[key] = int(last_id)
+        self.rows_done += rows
+        if self._engine is None:
+            return
+        with self._engine.begin() as conn:
+            conn.execute(
+                update(_table)
+                .where(_table.c.name == self.name)
+                .values(checkpoint=dict(self._state), rows_done=self.rows_done)
+            )
+
+
+@dataclass(frozen=True)
+class Backfill:
+    """A named, versioned data migration. ``run`` receives the backfill's Checkpoint."""
+
+    name: str
+    version: int
+    run: Callable[[Checkpoint], None]
+
+
+def _read_ledger(conn: Connection) -> dict[str, dict]:
+    return {row.name: row._asdict() for row in conn.execute(select(_table))}
+
+
+def _is_done(ledger: dict[str, dict], backfill: Backfill) -> bool:
+    row = ledger.get(backfill.name)
+    return bool(row and row["status"] == STATUS_COMPLETED and row["version"] == backfill.version)
+
+
+def _pending(ledger: dict[str, dict], backfills: Sequence[Backfill]) -> list[Backfill]:
+    return [b for b in backfills if not _is_done(ledger, b)]
+
+
+def _start(engine: Engine, backfill: Backfill, row: dict | None) -> Checkpoint:
+    """Mark *backfill* running, keeping its checkpoint only when resuming the same version."""
+    resume = row is not None and row["version"] == backfill.version and row["status"] != STATUS_COMPLETED
+    state = (row["checkpoint"] or {}) if resume and row else {}
+    rows_done = (row["rows_done"] or 0) if resume and row else 0
+    values = {
+        "version": backfill.version,
+        "status": STATUS_RUNNING,
+        "checkpoint": state,
+        "rows_done": rows_done,
+        "started_at": datetime.now(UTC),
+        "completed_at": None,
+        "last_error": None,
+    }
+    with engine.begin() as conn:
+        conn.execute(delete(_table).where(_table.c.name == backfill.name))
+        conn.execute(insert(_table).values(name=backfill.name, **values))
+    if state:
+        logger.info("Resuming backfill {} v{} from checkpoint {}", backfill.name, backfill.version, state)
+    return Checkpoint(backfill.name, engine, state, rows_done)
+
+
+def _finish(engine: Engine, name: str, status: str, error: str | None = None) -> None:
+    values: dict = {"status": status, "last_error": error}
+    if status == STATUS_COMPLETED:
+        values["completed_at"] = datetime.now(UTC)
+    with engine.begin() as conn:
+        conn.execute(update(_table).where(_table.c.name == name).values(**values))
+
+
+def _run_unledgered(backfills: Sequence[Backfill]) -> None:
+    for backfill in backfills:
+        backfill.run(Checkpoint(backfill.name))
+
+
+def run_pending(engine: Engine, backfills: Sequence[Backfill]) -> int:
+    """Run every backfill not yet completed at its registered version, in order.
+
+    Returns the number of backfills run. A backfill that raises is recorded as
+    ``failed`` (with the error) and the exception propagates; its checkpoint is kept so
+    the next boot resumes it.
+    """
+    try:
+        with engine.connect() as conn:
+            ledger = _read_ledger(conn)
+    except (SQLAlchemyError, DBAPIError) as e:  # ledger table missing (pre-212 database)
+        logger.warning("data_migrations ledger unavailable ({}); running backfills unledgered", e)
+        _run_unledgered(backfills)
+        return len(backfills)
+
+    if not _pending(ledger, backfills):
+        logger.debug("All {} startup backfills already completed", len(backfills))
+        return 0
+
+    with engine.connect() as lock_conn:
+        is_pg = engine.dialect.name == "postgresql"
+        if is_pg:
+            got = lock_conn.execute(sqltext("SELECT pg_try_advisory_lock(:k)"), {"k": _LOCK_KEY}).scalar()
+            lock_conn.commit()
+            if not got:
+                logger.info("Startup backfills already running in another process; skipping")
+                return 0
+        try:
+            # Re-read under the lock: a previous leader may have finished meanwhile.
+            with engine.connect() as conn:
+                ledger = _read_ledger(conn)
+            pending = _pending(ledger, backfills)
+            for backfill in pending:
+                checkpoint = _start(engine, backfill, ledger.get(backfill.name))
+                try:
+                    backfill.run(checkpoint)
+                except Exception as e:
+                    _finish(engine, backfill.name, STATUS_FAILED, f"{type(e).__name__}: {e}"[:2000])
+                    raise
+                _finish(engine, backfill.name, STATUS_COMPLETED)
+                logger.info("Backfill {} v{} completed", backfill.name, backfill.version)
+            return len(pending)
+        finally:
+            if is_pg:
+                lock_conn.execute(sqltext("SELECT pg_advisory_unlock(:k)"), {"k": _LOCK_KEY})
+                lock_conn.commit()
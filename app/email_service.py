@@ -1,6 +1,7 @@
 """Email service — batch RFQ sending, inbox monitoring, AI parsing."""
 
 import asyncio
+import contextlib
 import json
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING
@@ -32,8 +33,10 @@ from .models import (
     VendorCard,
     VendorResponse,
 )
+from .services import email_threads
 from .services.activity_service import log_activity, log_email_activity
 from .services.credential_service import get_credential_cached
+from .services.entity_resolver import resolve_many
 from .shared_constants import JUNK_DOMAINS as NOISE_DOMAINS
 from .shared_constants import JUNK_EMAIL_PREFIXES as NOISE_PREFIXES
 from .shared_constants import RFQ_SUBJECT_TAG_RE
@@ -652,7 +655,7 @@ async def poll_inbox(
                 "/me/mailFolders/inbox/messages/delta",
                 delta_token=delta_token,
                 params={
-                    "$select": "id,subject,from,receivedDateTime,bodyPreview,body,conversationId",
+                    "$select": "id,subject,from,toRecipients,receivedDateTime,bodyPreview,body,conversationId",
                     "$top": "50",
                 },
                 max_items=200,
@@ -664,6 +667,8 @@ async def poll_inbox(
             )
             messages = items
             used_delta = True
+            # New replies extend any conversation a thread panel has already cached.
+            email_threads.record_delta_messages(scanned_by_user_id, items)
 
             # Persist new delta token
             if new_delta:
@@ -794,6 +799,15 @@ async def poll_inbox(
                     if domain not in NOISE_DOMAINS:
                         domain_map[domain] = c
 
+    # Resolve every new sender to its company / vendor in one batch; the per-message
+    # log_email_activity match below is then an index lookup.
+    senders: list[str] = []
+    for m in messages:
+        if m.get("id") and m["id"] not in already_processed:
+            with contextlib.suppress(AttributeError, KeyError, TypeError):
+                senders.append(m["from"]["emailAddress"]["address"])
+    resolve_many(senders, db)
+
     results = []
     pending_parse = []  # VendorResponse objects awaiting AI parsing
     for msg in messages:
@@ -0,0 +1,49 @@
+"""Alert badge counter reconcile — repairs drift and pushes changed nav badges.
+
+The materialized ``alert_badge_counts`` rows are outdated by the dirty marks that
+committed domain writes publish; this job recomputes stale, marked and aged-out rows in batches
+(bulk ``query().update()`` writes bypass the listener, and FYI counts decay as items
+age past the recency floor) and publishes ``alert-badge-<tab>`` on each affected
+user's SSE channel so the nav re-fetches that one badge instead of polling.
+
+Called by: app/jobs/__init__.py via register_alert_jobs().
+Depends on: services/alerts/counters.reconcile_counters, services/sse_broker.broker.
+"""
+
+from apscheduler.triggers.interval import IntervalTrigger
+from loguru import logger
+
+from ..scheduler import _traced_job
+
+
+def register_alert_jobs(scheduler, settings):
+    """Register the alert badge counter reconcile job."""
+    scheduler.add_job(
+        _job_reconcile_alert_badges,
+        IntervalTrigger(seconds=60),
+        id="alert_badge_reconcile",
+        name="Reconcile alert badge counters",
+    )
+
+
+@_traced_job
+async def _job_reconcile_alert_badges():
+    """Recompute stale/aged badge counters and push the badges whose count changed."""
+    from ..database import SessionLocal
+    from ..services.alerts.counters import reconcile_counters
+    from ..services.sse_broker import broker
+
+    db = SessionLocal()
+    try:
+        changed = reconcile_counters(db)
+    except Exception as e:
+        logger.exception(f"Alert badge reconcile error: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    for user_id, tab_key in sorted(changed):
+        await broker.publish(f"user:{user_id}", f"alert-badge-{tab_key}", "")
+    if changed:
+        logger.debug("Alert badge reconcile pushed {} badge update(s)", len(changed))
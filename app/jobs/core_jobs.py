@@ -46,6 +46,12 @@ def register_core_jobs(scheduler, settings, db=None):
         scheduler.add_job(
             _job_webhook_subscriptions, IntervalTrigger(minutes=5), id="webhook_subs", name="Webhook subscriptions"
         )
+        scheduler.add_job(
+            _job_drain_graph_notifications,
+            IntervalTrigger(seconds=15),
+            id="graph_notification_drain",
+            name="Graph notification queue drain",
+        )
 
 
 @_traced_job
@@ -296,3 +302,26 @@ async def _job_webhook_subscriptions():
         raise  # Re-raise so _traced_job / Sentry can capture
     finally:
         db.close()
+
+
+@_traced_job
+async def _job_drain_graph_notifications():
+    """Drain the durable Graph webhook notification queue."""
+    from ..database import SessionLocal
+    from ..services.webhook_service import drain_notification_queue
+
+    db = SessionLocal()
+    try:
+        count = await asyncio.wait_for(drain_notification_queue(db), timeout=300)
+        if count:
+            logger.info(f"Graph notification drain: {count} notification(s) processed")
+    except TimeoutError:
+        logger.error("Graph notification drain timed out (300s)")
+        db.rollback()
+        raise  # Re-raise so _traced_job / Sentry can capture
+    except Exception as e:
+        logger.exception(f"Graph notification drain error: {e}")
+        db.rollback()
+        raise  # Re-raise so _traced_job / Sentry can capture
+    finally:
+        db.close()
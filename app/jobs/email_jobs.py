@@ -7,11 +7,12 @@ Includes:
   - Contacts sync (Outlook -> VendorCards via delta query)
   - Inbox scanning (vendor replies, stock lists, outbound RFQs)
   - Sent folder scanning (track outbound emails, link to requisitions)
-  - Deep email mining, contact scoring, calendar scan
+  - Deep email mining, activity rollup repair, contact scoring, calendar scan
   - Email health, reverification, ownership sweep
 """
 
 import asyncio
+import contextlib
 from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
 
@@ -58,6 +59,14 @@ def register_email_jobs(scheduler, settings, db=None):
             name="Contact relationship scoring",
         )
 
+    # Before contact_scoring (02:00) so scores read a freshly repaired rollup.
+    scheduler.add_job(
+        _job_activity_rollup_repair,
+        CronTrigger(hour=1, minute=30),
+        id="activity_rollup_repair",
+        name="Activity daily rollup repair",
+    )
+
     scheduler.add_job(
         _job_contact_status_compute,
         CronTrigger(hour=3, minute=0),
@@ -210,6 +219,29 @@ async def _job_contact_scoring():
         db.close()
 
 
+@_traced_job
+async def _job_activity_rollup_repair():
+    """Nightly: rebuild activity_daily_rollups from activity_log."""
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        from ..services.activity_rollup import rebuild_activity_rollups
+
+        loop = asyncio.get_running_loop()
+        await asyncio.wait_for(loop.run_in_executor(None, rebuild_activity_rollups, db), timeout=600)
+    except TimeoutError:
+        logger.error("Activity rollup repair timed out after 600s")
+        db.rollback()
+        raise
+    except Exception as e:
+        logger.exception(f"Activity rollup repair error: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 @_traced_job
 async def _job_contact_status_compute():
     """Auto-compute contact_status for SiteContacts based on activity history.
@@ -787,11 +819,13 @@ async def scan_sent_folder(user, db):
     from ..config import settings
     from ..models import SyncState
     from ..models.intelligence import ActivityLog
+    from ..services import email_threads
     from ..services.activity_service import (
         _is_internal_email,
         demote_internal_activity,
         match_email_to_entity,
     )
+    from ..services.entity_resolver import resolve_many
     from ..utils.token_manager import get_valid_token
 
     token = await get_valid_token(user, db)
@@ -807,7 +841,9 @@ async def scan_sent_folder(user, db):
     delta_token = sync_state.delta_token if sync_state else None
 
     delta_params = {
-        "$select": "id,conversationId,subject,from,toRecipients,sentDateTime,hasAttachments,internetMessageHeaders",
+        "$select": (
+            "id,conversationId,subject,from,toRecipients,sentDateTime,bodyPreview,hasAttachments,internetMessageHeaders"
+        ),
         "$top": "100",
     }
     try:
@@ -855,6 +891,9 @@ async def scan_sent_folder(user, db):
             )
         db.flush()
 
+    # Our replies extend any conversation a thread panel has already cached.
+    email_threads.record_delta_messages(user.id, messages)
+
     # [ref:]/[AVAIL-] tokens can outlive their requisition (deleted reqs, stale
     # forwarded subjects). Filter every message's tokens through ONE existence
     # query up front — a stale id written to ActivityLog.requisition_id is an FK
@@ -883,6 +922,15 @@ async def scan_sent_folder(user, db):
     # within RECONCILE_WINDOW_HOURS of the message's sentDateTime.
     RECONCILE_WINDOW_HOURS = 48
 
+    # Resolve every first recipient in one batch; the per-message
+    # match_email_to_entity calls below are then index lookups. Malformed messages
+    # are skipped here and handled by the per-message SAVEPOINT below.
+    first_recipients: list[str] = []
+    for m in messages:
+        with contextlib.suppress(AttributeError, IndexError, KeyError, TypeError):
+            first_recipients.append(m["toRecipients"][0]["emailAddress"]["address"])
+    resolve_many(first_recipients, db)
+
     created_logs = []
     attachment_queue = []
     for msg in messages:
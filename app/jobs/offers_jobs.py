@@ -198,6 +198,7 @@ async def _job_performance_tracking():
         now = datetime.now(UTC)
         from ..services.avail_score_service import compute_all_avail_scores
         from ..services.buyer_leaderboard import compute_buyer_leaderboard
+        from ..services.scoring_context import MonthScoringContext
         from ..services.vendor_scorecard import compute_all_vendor_scorecards
 
         loop = asyncio.get_running_loop()
@@ -209,11 +210,13 @@ async def _job_performance_tracking():
         vs_result = await _run(compute_all_vendor_scorecards, timeout=600)
         logger.info(f"Vendor scorecards: {vs_result['updated']} updated, {vs_result['skipped_cold_start']} cold-start")
         current_month = now.date().replace(day=1)
+        # One month context shared by the leaderboard, Avail and multiplier passes
+        ctx = MonthScoringContext(db, current_month)
         # Buyer leaderboard
-        bl_result = await _run(compute_buyer_leaderboard, current_month, timeout=300)
+        bl_result = await _run(compute_buyer_leaderboard, current_month, ctx, timeout=300)
         logger.info(f"Buyer leaderboard: {bl_result['entries']} entries for {current_month}")
         # Avail Scores
-        as_result = await _run(compute_all_avail_scores, current_month, timeout=300)
+        as_result = await _run(compute_all_avail_scores, current_month, ctx, timeout=300)
         logger.info(
             f"Avail Scores: {as_result['buyers']} buyers, "
             f"{as_result['sales']} sales, {as_result['saved']} saved for {current_month}"
@@ -221,7 +224,7 @@ async def _job_performance_tracking():
         # Multiplier Scores
         from ..services.multiplier_score_service import compute_all_multiplier_scores
 
-        ms_result = await _run(compute_all_multiplier_scores, current_month, timeout=300)
+        ms_result = await _run(compute_all_multiplier_scores, current_month, ctx, timeout=300)
         logger.info(
             f"Multiplier Scores: {ms_result['buyers']} buyers, "
             f"{ms_result['sales']} sales, {ms_result['saved']} saved for {current_month}"
@@ -234,9 +237,10 @@ async def _job_performance_tracking():
         # Recompute previous month during grace period (first 7 days)
         if now.day <= 7:
             prev_month = (current_month - timedelta(days=1)).replace(day=1)
-            await _run(compute_buyer_leaderboard, prev_month, timeout=300)
-            await _run(compute_all_avail_scores, prev_month, timeout=300)
-            await _run(compute_all_multiplier_scores, prev_month, timeout=300)
+            prev_ctx = MonthScoringContext(db, prev_month)
+            await _run(compute_buyer_leaderboard, prev_month, prev_ctx, timeout=300)
+            await _run(compute_all_avail_scores, prev_month, prev_ctx, timeout=300)
+            await _run(compute_all_multiplier_scores, prev_month, prev_ctx, timeout=300)
             await _run(compute_all_unified_scores, prev_month, timeout=300)
     except TimeoutError:
         logger.error("Performance tracking timed out")
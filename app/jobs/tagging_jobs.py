@@ -3,11 +3,13 @@ sweep.
 
 Called by: app/jobs/__init__.py via register_tagging_jobs()
 Depends on: app.database, app.models, app.services.enrichment, app.services.tagging_backfill,
-            app.services.tagging_ai, app.services.spec_enrichment_service, app.utils.claude_client
+            app.services.tagging_ai, app.services.spec_enrichment_service, app.utils.claude_client,
+            app.services.vendor_affinity_service
 """
 
 import asyncio
 
+from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from loguru import logger
 
@@ -78,6 +80,21 @@ def register_tagging_jobs(scheduler, settings):
         name="Material card spec extraction (backlog sweep)",
     )
 
+    # Vendor affinity matrix: full rebuild nightly, touched keys hourly (the hourly run
+    # also performs the first full build on a fresh database).
+    scheduler.add_job(
+        _job_vendor_affinity_rebuild,
+        CronTrigger(hour=3, minute=30),
+        id="vendor_affinity_rebuild",
+        name="Rebuild vendor affinity matrix",
+    )
+    scheduler.add_job(
+        _job_vendor_affinity_refresh,
+        IntervalTrigger(hours=1),
+        id="vendor_affinity_refresh",
+        name="Refresh vendor affinity matrix for touched keys",
+    )
+
 
 @_traced_job
 async def _job_internal_boost():
@@ -112,6 +129,28 @@ async def _job_sighting_mining():
     await _run_threaded_db_job("Sighting mining", backfill_manufacturer_from_sightings)
 
 
+@_traced_job
+async def _job_vendor_affinity_rebuild():
+    """Rebuild the vendor x manufacturer / category affinity matrix.
+
+    Nightly 03:30.
+    """
+    from ..services.vendor_affinity_service import rebuild_vendor_affinity
+
+    await _run_threaded_db_job("Vendor affinity rebuild", rebuild_vendor_affinity)
+
+
+@_traced_job
+async def _job_vendor_affinity_refresh():
+    """Recompute affinity cells for manufacturers / categories touched since the last build.
+
+    Every 1h.
+    """
+    from ..services.vendor_affinity_service import refresh_vendor_affinity
+
+    await _run_threaded_db_job("Vendor affinity refresh", refresh_vendor_affinity)
+
+
 @_traced_job
 async def _job_ai_tagging():
     """Classify untagged material cards via Claude Haiku. Every 30 min, 500 cards/batch.
@@ -23,11 +23,21 @@ from starlette.middleware.sessions import SessionMiddleware
 from .audit_listeners import register_audit_listeners
 from .config import APP_VERSION, settings
 from .database import get_db
-
-# Register CRM audit-trail event listeners (before_insert / before_update).
+from .services.alerts.counters import register_counter_listeners
+from .services.entity_resolver import register_resolver_listeners
+from .services.facet_index import register_facet_index_listeners
+from .services.fragment_cache import register_fragment_listeners
+
+# Register CRM audit-trail event listeners (before_insert / before_update) and the
+# alert badge counter, fragment cache, entity resolver and facet index invalidation listeners
+# (after_flush).
 # Must run at import time, before any ORM session is used, so listeners
 # are in place for the first request.
 register_audit_listeners()
+register_counter_listeners()
+register_fragment_listeners()
+register_resolver_listeners()
+register_facet_index_listeners()
 
 # Schema managed by Alembic migrations — see alembic/ directory
 # To apply:  alembic upgrade head
@@ -222,6 +232,10 @@ async def lifespan(app):
 
         await close_clients()
 
+        from .services import pdf_renderer
+
+        pdf_renderer.shutdown()
+
         from .database import engine
 
         engine.dispose()
@@ -565,6 +579,8 @@ app.mount("/static", _FallbackStaticFiles(["app/static/dist", "app/static"]), na
 from fastapi import Response
 
 from app.prometheus_metrics import PrometheusMiddleware, render_metrics
+from app.sql_profiler import SQLProfilerMiddleware
+from app.sql_profiler import install as install_sql_profiler
 
 
 async def _metrics_auth(x_metrics_token: str = Header(default="")) -> None:
@@ -587,6 +603,10 @@ async def _metrics_auth(x_metrics_token: str = Header(default="")) -> None:
 # add_middleware() cluster, before the http handlers — to preserve that timing scope and
 # the metrics contract.
 app.add_middleware(PrometheusMiddleware)
+# SQL profiler wraps directly outside PrometheusMiddleware: one QueryProfile per request
+# (count, DB time, N+1 shapes → db_*_per_unit histograms + Server-Timing outside prod).
+app.add_middleware(SQLProfilerMiddleware)
+install_sql_profiler()
 
 
 @app.get("/metrics", include_in_schema=False, dependencies=[Depends(_metrics_auth)])
@@ -0,0 +1,18 @@
+"""Rebuild quote_offer_links from every quote's JSON line items.
+
+Called by: ops — `docker compose exec app python -m app.management.backfill_quote_offer_links`.
+Migration 209 already backfills on deploy; re-run this after any bulk write that
+bypassed the ORM (raw SQL, restores) to repair the projection.
+Depends on: services/quote_offer_links.backfill_quote_offer_links. Idempotent: each
+quote's links are deleted and re-inserted.
+"""
+
+from app.database import SessionLocal
+from app.services.quote_offer_links import backfill_quote_offer_links
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        backfill_quote_offer_links(db)
+    finally:
+        db.close()
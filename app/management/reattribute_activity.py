@@ -29,7 +29,7 @@ False is re-flagged to the same value. No deletions.
 Called by: an operator (manually, post-deploy of the ISS-030 activity-tab fix).
 Depends on: app.database.SessionLocal, app.models.ActivityLog,
     app.services.activity_service.match_email_to_entity / _is_internal_email /
-    _is_junk_email / demote_internal_activity.
+    _is_junk_email / demote_internal_activity, app.services.entity_resolver.resolve_many.
 """
 
 from __future__ import annotations
@@ -47,6 +47,7 @@ from ..services.activity_service import (
     demote_internal_activity,
     match_email_to_entity,
 )
+from ..services.entity_resolver import resolve_many
 
 _COMMIT_CHUNK = 500
 
@@ -85,6 +86,7 @@ def run_backfill(db: Session, *, apply: bool, limit: int | None = None) -> dict:
         "unresolved": 0,
     }
     rows = _candidate_rows(db, limit)
+    resolve_many((str(row.contact_email) for row in rows if row.contact_email), db)
     for row in rows:
         tally["scanned"] += 1
         email = (row.contact_email or "").strip().lower()
@@ -4,7 +4,11 @@ Import from here:  from app.models import User, Company, ...
 Or from submodules: from app.models.auth import User
 """
 
-# Alert read-state (per-user seen-state for cross-app alerts)
+# Activity: per-day rollup of activity_log (maintained by ActivityLog listeners)
+from .activity_rollup import ActivityDailyRollup  # noqa: F401
+
+# Alert read-state (per-user seen-state + materialized badge counters for cross-app alerts)
+from .alert_badge_count import AlertBadgeCount  # noqa: F401
 from .alert_seen import AlertSeen  # noqa: F401
 
 # Approvals engine (5 tables: request, step, recipient, event, outbox)
@@ -25,7 +29,14 @@ from .base import Base  # noqa: F401
 from .buy_plan import BuyPlan, BuyPlanLine, VerificationGroupMember  # noqa: F401
 
 # System Config
-from .config import ApiSource, ApiUsageLog, GraphSubscription, SystemConfig  # noqa: F401
+from .config import (
+    ApiSource,  # noqa: F401
+    ApiUsageLog,  # noqa: F401
+    DataMigration,  # noqa: F401
+    GraphNotificationQueue,  # noqa: F401
+    GraphSubscription,  # noqa: F401
+    SystemConfig,  # noqa: F401
+)
 
 # CRM: Companies & Sites
 from .crm import (
@@ -145,7 +156,7 @@ from .purchase_history import CustomerPartHistory  # noqa: F401
 from .quality_plan import Prepayment, QpFruLookup, QpSerialEntry, QualityPlan  # noqa: F401
 
 # Quotes (V1 BuyPlan model removed — use BuyPlan from buy_plan module)
-from .quotes import Quote, QuoteLine, QuoteRequisition  # noqa: F401
+from .quotes import Quote, QuoteLine, QuoteOfferLink, QuoteRequisition  # noqa: F401
 from .root_cause_group import RootCauseGroup  # noqa: F401
 
 # Core: Requisitions, Requirements & Attachments
@@ -180,6 +191,9 @@ from .trouble_ticket import TroubleTicket  # noqa: F401
 # Unified Score (cross-role leaderboard)
 from .unified_score import UnifiedScoreSnapshot  # noqa: F401
 
+# Vendor affinity matrix (precomputed vendor x manufacturer/category strengths)
+from .vendor_affinity import VendorAffinityCell  # noqa: F401
+
 # Vendor+Part Unavailability (durable "stock is gone" knowledge per vendor+MPN)
 from .vendor_part_unavailability import VendorPartUnavailability  # noqa: F401
 
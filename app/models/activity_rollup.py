@@ -0,0 +1,177 @@
+"""ActivityDailyRollup model — per-day activity counts for scoring, recency and scorecards.
+
+One row per (day, user, company, vendor card, vendor contact, site contact, channel,
+direction, activity type) with the number of ``activity_log`` rows in that bucket and
+the latest activity time among them. The day is the UTC date of the activity time —
+``occurred_at``, falling back to ``created_at`` for rows that never set it. Absent
+dimensions are stored as 0 / "" rather than NULL so the bucket key is a plain unique
+constraint that ``ON CONFLICT`` can target on every dialect.
+
+Contact scoring, the activity scorecard and the company recency helpers read window
+sums here, so their cost grows with days x entities instead of total activity rows.
+
+Written by: the ActivityLog after_insert / before_update / before_delete listeners below
+    (+1 / -1 per bucket as rows are logged, re-attributed or removed), migration 211's
+    backfill and services/activity_rollup.rebuild_activity_rollups (nightly repair —
+    catches bulk writes that skip the ORM and FK SET NULL cascades).
+Read by: services/activity_rollup.py, services/contact_intelligence.py,
+    services/activity_scorecard.py, services/activity_service.py.
+Depends on: models/base.py, models/intelligence.py (ActivityLog), database.py.
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import Column, Date, Index, Integer, String, UniqueConstraint, case, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.event import listens_for
+
+from ..database import UTCDateTime
+from .base import Base
+from .intelligence import ActivityLog
+
+
+class ActivityDailyRollup(Base):
+    __tablename__ = "activity_daily_rollups"
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)
+    user_id = Column(Integer, nullable=False, default=0, server_default="0")
+    company_id = Column(Integer, nullable=False, default=0, server_default="0")
+    vendor_card_id = Column(Integer, nullable=False, default=0, server_default="0")
+    vendor_contact_id = Column(Integer, nullable=False, default=0, server_default="0")
+    site_contact_id = Column(Integer, nullable=False, default=0, server_default="0")
+    channel = Column(String(20), nullable=False, default="", server_default="")
+    direction = Column(String(20), nullable=False, default="", server_default="")
+    activity_type = Column(String(20), nullable=False, default="", server_default="")
+    activity_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_at = Column(UTCDateTime)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "day",
+            "user_id",
+            "company_id",
+            "vendor_card_id",
+            "vendor_contact_id",
+            "site_contact_id",
+            "channel",
+            "direction",
+            "activity_type",
+            name="uq_activity_daily_rollup_bucket",
+        ),
+        Index("ix_activity_rollup_company_day", "company_id", "day"),
+        Index("ix_activity_rollup_vendor_contact_day", "vendor_contact_id", "day"),
+        Index("ix_activity_rollup_user_day", "user_id", "day"),
+    )
+
+
+# Bucket key columns, in unique-constraint order.
+ROLLUP_KEY = (
+    "day",
+    "user_id",
+    "company_id",
+    "vendor_card_id",
+    "vendor_contact_id",
+    "site_contact_id",
+    "channel",
+    "direction",
+    "activity_type",
+)
+_ID_KEYS = ("user_id", "company_id", "vendor_card_id", "vendor_contact_id", "site_contact_id")
+_TEXT_KEYS = ("channel", "direction", "activity_type")
+
+
+def activity_time(occurred_at: datetime | None, created_at: datetime | None) -> datetime | None:
+    """The time an activity is bucketed by: ``occurred_at``, else ``created_at``."""
+    at = occurred_at or created_at
+    if at is None:
+        return None
+    return at.replace(tzinfo=UTC) if at.tzinfo is None else at.astimezone(UTC)
+
+
+def _bucket(values: dict) -> tuple[dict, datetime] | None:
+    at = activity_time(values.get("occurred_at"), values.get("created_at"))
+    if at is None:
+        return None
+    key: dict = {"day": at.date()}
+    key.update({k: values.get(k) or 0 for k in _ID_KEYS})
+    key.update({k: values.get(k) or "" for k in _TEXT_KEYS})
+    return key, at
+
+
+def bump_rollup(connection: Connection, key: dict, delta: int, at: datetime | None) -> None:
+    """Add *delta* to one bucket (creating it), raising ``last_at`` to *at* if later."""
+    dialect = connection.dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(ActivityDailyRollup).values(**key, activity_count=delta, last_at=at)
+    table = ActivityDailyRollup.__table__.c
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(ROLLUP_KEY),
+        set_={
+            "activity_count": table.activity_count + stmt.excluded.activity_count,
+            "last_at": case(
+                (table.last_at.is_(None) | (stmt.excluded.last_at > table.last_at), stmt.excluded.last_at),
+                else_=table.last_at,
+            ),
+        },
+    )
+    connection.execute(stmt)
+
+
+_TRACKED = (*_ID_KEYS, *_TEXT_KEYS, "occurred_at", "created_at")
+
+
+def _stored_values(connection: Connection, activity_id: int) -> dict | None:
+    """Bucket inputs of one activity row as the flush connection currently sees it.
+
+    Read through the connection rather than the instance: tracked attributes may be
+    expired, and loading them through the Session mid-flush is not allowed.
+    """
+    cols = [getattr(ActivityLog, name) for name in _TRACKED]
+    row = connection.execute(select(*cols).where(ActivityLog.id == activity_id)).first()
+    return dict(zip(_TRACKED, row, strict=True)) if row else None
+
+
+@listens_for(ActivityLog, "after_insert")
+def _rollup_on_insert(_mapper, connection, target) -> None:
+    """Count a newly logged activity in its day bucket."""
+    bucket = _bucket({name: getattr(target, name) for name in _TRACKED})
+    if bucket:
+        bump_rollup(connection, bucket[0], 1, bucket[1])
+
+
+@listens_for(ActivityLog, "before_update")
+def _rollup_on_update(_mapper, connection, target) -> None:
+    """Move the row between buckets when attribution, channel, type or time changes.
+
+    Runs before the UPDATE so the stored row still holds the old bucket inputs (the
+    instance's history cannot supply them — committed objects are expired, so an
+    attribute set after a commit has no recorded previous value).
+    """
+    attrs = inspect(target).attrs
+    changed = {name: attrs[name].history.added for name in _TRACKED if attrs[name].history.has_changes()}
+    if not changed:
+        return
+    previous = _stored_values(connection, target.id)
+    if previous is None:
+        return
+    current = dict(previous)
+    for name, added in changed.items():
+        current[name] = added[0] if added else None
+    old, new = _bucket(previous), _bucket(current)
+    if old and new and old[0] == new[0]:
+        return
+    if old:
+        bump_rollup(connection, old[0], -1, None)
+    if new:
+        bump_rollup(connection, new[0], 1, new[1])
+
+
+@listens_for(ActivityLog, "before_delete")
+def _rollup_on_delete(_mapper, connection, target) -> None:
+    """Uncount a deleted activity (``last_at`` is left for the nightly repair)."""
+    current = _stored_values(connection, target.id)
+    bucket = _bucket(current) if current else None
+    if bucket:
+        bump_rollup(connection, bucket[0], -1, None)
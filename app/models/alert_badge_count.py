@@ -0,0 +1,36 @@
+"""AlertBadgeCount model — materialized per-(user, alert kind) nav badge counters.
+
+One row per user per AlertSource kind holding the last computed ``count_for_user``.
+The badge endpoint reads a tab's counters in one indexed query instead of running every
+source's count query per render. Committed writes to a source's ``invalidated_by``
+tables publish dirty marks (Redis + process-local, see services/alerts/counters.py) that
+outdate rows computed before them; ``stale`` stays as an explicit per-row flag. A
+stale, marked or aged-out row is recomputed on the next read or by the reconcile job,
+which also pushes changed badges over SSE.
+
+Called by: models/__init__.py (re-exported for DB schema), services/alerts/counters.py.
+Depends on: models/base.py, models/auth.py, database.py (UTCDateTime).
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, UniqueConstraint
+
+from ..database import UTCDateTime
+from .base import Base
+
+
+class AlertBadgeCount(Base):
+    __tablename__ = "alert_badge_counts"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    alert_kind = Column(String(40), nullable=False)  # AlertKind value — mirrors alert_seen
+    count = Column(Integer, nullable=False, default=0, server_default="0")
+    stale = Column(Boolean, nullable=False, default=False, server_default="false")
+    computed_at = Column(UTCDateTime, default=lambda: datetime.now(UTC), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "alert_kind", name="uq_alert_badge_counts_user_kind"),
+        Index("ix_alert_badge_counts_stale", "stale", "computed_at"),
+    )
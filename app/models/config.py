@@ -62,6 +62,28 @@ class SystemConfig(Base):
     )
 
 
+class DataMigration(Base):
+    """Ledger of named, versioned runtime data migrations (startup backfills).
+
+    One row per migration name. ``status`` is ``running`` / ``completed`` /
+    ``failed``; a row completed at the registered ``version`` is skipped on later
+    boots. ``checkpoint`` holds keyset cursors (e.g. ``{"requirements": 81234}``) so an
+    interrupted run resumes where it stopped.
+
+    Written by: app/data_migrations.py (run_pending). Read by: the same, on every boot.
+    """
+
+    __tablename__ = "data_migrations"
+    name = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False)
+    checkpoint = Column(JSON)
+    rows_done = Column(Integer, nullable=False, default=0, server_default="0")
+    started_at = Column(UTCDateTime)
+    completed_at = Column(UTCDateTime)
+    last_error = Column(Text)
+
+
 class GraphSubscription(Base):
     """Tracks active Graph API webhook subscriptions per user."""
 
@@ -87,6 +109,38 @@ class GraphSubscription(Base):
     )
 
 
+class GraphNotificationQueue(Base):
+    """Durable ingestion queue for Graph mail webhook notifications.
+
+    The webhook endpoint validates and inserts a row, then returns 202; the drain job
+    claims pending rows in batches, fetches/logs the messages and coalesces one inbox poll
+    per user. ``dedup_key`` (sha256 of ``subscription_id:resource``) is unique, so a
+    notification replayed to a different worker is rejected by PostgreSQL even when the
+    Redis replay set is unavailable.
+    """
+
+    __tablename__ = "graph_notification_queue"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    subscription_id = Column(String(255), nullable=False)
+    resource = Column(Text, nullable=False)
+    change_type = Column(String(100), nullable=False)
+    dedup_key = Column(String(64), nullable=False)
+    received_at = Column(UTCDateTime, default=lambda: datetime.now(UTC))
+    claimed_at = Column(UTCDateTime, nullable=True)  # drain lease — stale claims are re-claimable
+    processed_at = Column(UTCDateTime, nullable=True)
+    fail_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(String(500), nullable=True)
+
+    user = relationship("User", foreign_keys=[user_id])
+
+    __table_args__ = (
+        Index("ix_gnq_dedup", "dedup_key", unique=True),
+        Index("ix_gnq_pending", "processed_at", "id"),
+        Index("ix_gnq_user", "user_id"),
+    )
+
+
 class ApiUsageLog(Base):
     """Tracks individual API calls for usage monitoring and health history."""
 
@@ -200,6 +200,9 @@ class MaterialCard(Base):
             postgresql_ops={"normalized_mpn": "gin_trgm_ops"},
         ),
         Index("ix_mc_last_searched", "last_searched_at", postgresql_where=text("last_searched_at IS NOT NULL")),
+        # Change-stamp range scans for the faceted-search bitset index refresh
+        # (services/facet_index.py, migration 213).
+        Index("ix_material_cards_updated_at", "updated_at"),
     )
 
     # --- Validators ---
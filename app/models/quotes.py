@@ -15,7 +15,10 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    delete,
     event,
+    insert,
+    inspect,
 )
 from sqlalchemy.orm import relationship, validates
 
@@ -180,6 +183,79 @@ def _quote_self_link(_mapper, connection, target) -> None:
     )
 
 
+class QuoteOfferLink(Base):
+    """Relational projection of ``Quote.line_items`` offer references.
+
+    One row per distinct (quote, offer) in the quote's JSON line items, carrying a copy
+    of the quote's ``status``. Scoring answers "was this offer quoted / won" with an
+    indexed lookup here instead of decoding every quote's JSON on each run.
+
+    ``offer_id`` has no foreign key on purpose: line items can outlive the offer they
+    name, and the projection mirrors the JSON exactly. Rows go with their quote via the
+    ``quote_id`` ON DELETE CASCADE.
+
+    Written by: the Quote after_insert / after_update listeners below
+        (every create, edit, send and result path), migration 209's backfill and
+        management/backfill_quote_offer_links.py.
+    Read by: services/quote_offer_links.py.
+    """
+
+    __tablename__ = "quote_offer_links"
+    id = Column(Integer, primary_key=True)
+    quote_id = Column(Integer, ForeignKey("quotes.id", ondelete="CASCADE"), nullable=False)
+    offer_id = Column(Integer, nullable=False)
+    status = Column(String(20))
+
+    __table_args__ = (
+        UniqueConstraint("quote_id", "offer_id", name="uq_quote_offer_link"),
+        Index("ix_quote_offer_links_status_offer", "status", "offer_id"),
+        Index("ix_quote_offer_links_offer", "offer_id"),
+    )
+
+
+def offer_ids_from_line_items(line_items) -> set[int]:
+    """Distinct integer ``offer_id`` values referenced by a quote's JSON line items."""
+    ids: set[int] = set()
+    for item in line_items or []:
+        if not isinstance(item, dict):
+            continue
+        try:
+            oid = int(item.get("offer_id") or 0)
+        except (TypeError, ValueError):
+            continue
+        if oid > 0:
+            ids.add(oid)
+    return ids
+
+
+def _write_offer_links(connection, target) -> None:
+    connection.execute(delete(QuoteOfferLink).where(QuoteOfferLink.quote_id == target.id))
+    rows = [
+        {"quote_id": target.id, "offer_id": oid, "status": target.status}
+        for oid in sorted(offer_ids_from_line_items(target.line_items))
+    ]
+    if rows:
+        connection.execute(insert(QuoteOfferLink), rows)
+
+
+@event.listens_for(Quote, "after_insert")
+def _quote_offer_links_on_insert(_mapper, connection, target) -> None:
+    """Project a new quote's line items into ``quote_offer_links``."""
+    _write_offer_links(connection, target)
+
+
+@event.listens_for(Quote, "after_update")
+def _quote_offer_links_on_update(_mapper, connection, target) -> None:
+    """Re-project when line items or status changed (edit, revise, send, won/lost).
+
+    In-place JSON edits must be flagged (``flag_modified``) as they already must be
+    for the column itself to persist; other column updates skip the rewrite.
+    """
+    state = inspect(target)
+    if state.attrs.line_items.history.has_changes() or state.attrs.status.history.has_changes():
+        _write_offer_links(connection, target)
+
+
 # V1 BuyPlan model removed. All buy plan functionality now in models/buy_plan.py (BuyPlan).
 # The old `buy_plans` table still exists in the DB but is no longer mapped by SQLAlchemy.
 # Migration 076 already moved all V1 data to buy_plans + buy_plan_lines.
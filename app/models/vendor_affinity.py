@@ -0,0 +1,33 @@
+"""VendorAffinityCell model — precomputed vendor x (manufacturer | category) strengths.
+
+A sparse matrix stored one non-zero cell per row: for each manufacturer (L1) and each
+lower-cased material category (L3), how many distinct MPNs each vendor has supplied.
+``find_vendor_affinity`` reads the top-k cells for a key with one indexed query instead
+of aggregating material_vendor_history / sightings on every modal open. Built nightly in
+full and refreshed hourly for the keys touched since the last build.
+
+Called by: models/__init__.py (re-exported for DB schema), services/vendor_affinity_service.py.
+Depends on: models/base.py, models/vendors.py (vendor_cards), database.py (UTCDateTime).
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+
+from ..database import UTCDateTime
+from .base import Base
+
+
+class VendorAffinityCell(Base):
+    __tablename__ = "vendor_affinity_cells"
+
+    id = Column(Integer, primary_key=True)
+    dimension = Column(String(20), nullable=False)  # "manufacturer" (L1) | "category" (L3)
+    dim_key = Column(String(255), nullable=False)  # manufacturer as stored; category lower-cased
+    vendor_name_normalized = Column(String(255))
+    vendor_name = Column(String(255), nullable=False)
+    vendor_card_id = Column(Integer, ForeignKey("vendor_cards.id", ondelete="SET NULL"))
+    mpn_count = Column(Integer, nullable=False, default=0, server_default="0")
+    computed_at = Column(UTCDateTime, default=lambda: datetime.now(UTC), nullable=False)
+
+    __table_args__ = (Index("ix_vendor_affinity_cells_lookup", "dimension", "dim_key", "mpn_count"),)
@@ -1,7 +1,8 @@
 """Prometheus metrics middleware + /metrics endpoint exposure.
 
 Purpose: Record HTTP request count, in-flight gauge, and request duration for
-    application traffic, and expose them in Prometheus text format at /metrics.
+    application traffic (plus the per-request / per-job SQL histograms that
+    app.sql_profiler observes), and expose them in Prometheus text format at /metrics.
     Pure ASGI middleware so it composes with streaming responses (sse-starlette)
     without consuming their bodies.
 Called by: app.main (mounts middleware on app + adds the GET /metrics route).
@@ -57,6 +58,29 @@ REQUEST_INFLIGHT = Gauge(
     ["method"],
 )
 
+# SQL profiler (app/sql_profiler.py): statements and DB time per unit of work.
+# kind="request" labels by route template (same bounded set as above); kind="job" by
+# scheduler job function name. DB_N_PLUS_ONE counts units that repeated one statement
+# shape >= sql_profiler.N_PLUS_ONE_THRESHOLD times.
+DB_QUERIES = Histogram(
+    "db_queries_per_unit",
+    "SQL statements executed per HTTP request / scheduler job run.",
+    ["kind", "handler"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 250, 500, 1000),
+)
+
+DB_TIME = Histogram(
+    "db_time_seconds_per_unit",
+    "Cumulative SQL execution time per HTTP request / scheduler job run.",
+    ["kind", "handler"],
+)
+
+DB_N_PLUS_ONE = Counter(
+    "db_n_plus_one_total",
+    "Requests / job runs that repeated one SQL statement shape enough to look like an N+1.",
+    ["kind", "handler"],
+)
+
 # Redis-backed subsystems (search-result cache, intel cache) fall back to a degraded
 # path when Redis is unreachable. These make the degraded state observable so it can be
 # alerted on (previously a failed connect disabled Redis silently for the process
@@ -74,6 +98,26 @@ REDIS_DOWNGRADE_TOTAL = Counter(
     ["subsystem"],
 )
 
+# PDF rendering (app/services/pdf_renderer.py): WeasyPrint layout time per template,
+# renders waiting for or holding a pool slot, and content-hash cache hits vs misses.
+PDF_RENDER_SECONDS = Histogram(
+    "pdf_render_seconds",
+    "WeasyPrint layout time per rendered (cache-miss) PDF document.",
+    ["template"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+)
+
+PDF_RENDER_QUEUE_DEPTH = Gauge(
+    "pdf_render_queue_depth",
+    "PDF renders currently queued for or running in the render pool.",
+)
+
+PDF_RENDER_CACHE = Counter(
+    "pdf_render_cache",
+    "PDF render cache lookups by result (hit / miss).",
+    ["result"],
+)
+
 # Paths excluded from collection entirely. Each entry is either a fixed path
 # (browser/health/observability noise) or a prefix; collectively they keep the
 # counter free of high-volume, low-signal traffic.
@@ -1,6 +1,7 @@
 """routers/htmx/_shared_tabs.py — detail-tab partial renderers shared across routers.
 
-``requisition_tab`` / ``company_tab`` / ``vendor_tab`` are each registered as the
+``requisition_tab`` (via its fragment-cached front ``requisition_tab_route``) /
+``company_tab`` / ``vendor_tab`` are each registered as the
 detail-shell tab-swap route on their OWNING router (requisitions.py / companies.py /
 vendors.py respectively — each does ``router.get(...)(...)`` on the function imported
 from here so the route stays registered exactly where it always was), but a handful of
@@ -24,6 +25,7 @@ Called by: app.routers.htmx.requisitions/companies/vendors (route registration),
     app.routers.htmx.offers (post-save requisition "offers" tab refresh),
     app.routers.htmx.archive (post-restore company/vendor detail tab)
 Depends on: app.models, app.dependencies, app.database, app.services.quote_requisitions,
+    app.services.fragment_cache,
     app.services.activity_service, app.routers.htmx._shared, app.routers.htmx._lookup_helpers
 """
 
@@ -32,6 +34,7 @@ from datetime import UTC, datetime
 from fastapi import Depends, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse
 from sqlalchemy import func as sqlfunc
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload, selectinload
 
 from ...constants import ActivityType, QuoteStatus
@@ -49,6 +52,7 @@ from ...models import (
 )
 from ...models.enrichment import ProspectContact
 from ...models.vendors import VendorContact
+from ...services import fragment_cache
 from ...services.quote_requisitions import quotes_for_requisition
 from ...template_env import template_response
 from .._lookup_helpers import get_requisition_or_404, get_vendor_card_or_404
@@ -160,6 +164,34 @@ async def requisition_tab(
         return template_response("htmx/partials/requisitions/tabs/activity.html", ctx)
 
 
+async def requisition_tab_route(
+    request: Request,
+    req_id: int,
+    tab: str,
+    qual: str | None = None,
+    user: User = Depends(require_user),
+    db: Session = Depends(get_db),
+):
+    """Tab-swap route: the parts tab is served through the fragment cache.
+
+    Its ETag tracks the requisition and each of its requirements (sightings bump their
+    requirement's scope, which moves the per-part sighting counts). Other tabs — and
+    in-process callers of ``requisition_tab`` — always render fresh.
+    """
+    if tab != "parts":
+        return await requisition_tab(request=request, req_id=req_id, tab=tab, qual=qual, user=user, db=db)
+    get_requisition_or_404(db, req_id)
+    require_requisition_access(db, req_id, user)
+    requirement_ids = db.scalars(select(Requirement.id).where(Requirement.requisition_id == req_id)).all()
+    scopes = [(fragment_cache.REQUISITION, req_id), *((fragment_cache.REQUIREMENT, rid) for rid in requirement_ids)]
+    etag = fragment_cache.fragment_etag(request, scopes, user=user)
+    return await fragment_cache.cached_fragment(
+        request,
+        etag,
+        lambda: requisition_tab(request=request, req_id=req_id, tab=tab, qual=qual, user=user, db=db),
+    )
+
+
 async def company_tab(
     request: Request,
     company_id: int,
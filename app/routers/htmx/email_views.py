@@ -39,7 +39,7 @@ async def email_thread_viewer(
         token = await _rft(request, db)
         from ...services.email_threads import fetch_thread_messages
 
-        messages = await fetch_thread_messages(conversation_id, token)
+        messages = await fetch_thread_messages(conversation_id, token, user_id=user.id)
     except HTTPException:
         error = "M365 connection needs refresh — please reconnect in Settings"
     except (ConnectionError, TimeoutError, OSError, RuntimeError) as exc:
@@ -35,6 +35,7 @@ from ...models import (
     User,
 )
 from ...models.faceted_search import CommoditySpecSchema
+from ...services import fragment_cache
 from ...services.commodity_registry import COMMODITY_TREE, get_display_name
 from ...services.faceted_search_service import (
     INTERNAL_FILTER_VALUES,
@@ -44,6 +45,7 @@ from ...services.faceted_search_service import (
     get_facet_counts,
     get_global_facet_counts,
     get_subfilter_options,
+    page_materials_faceted,
     search_materials_faceted,
 )
 from ...services.part_history_service import (
@@ -462,6 +464,7 @@ async def materials_faceted_partial(
     sub_filters: str = "{}",
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: str = "",
     verified_only: bool = Query(False),
     statuses: str = Query(""),
     lifecycle: str = Query(""),
@@ -501,7 +504,7 @@ async def materials_faceted_partial(
         min_searches,
     )
 
-    materials, total = search_materials_faceted(
+    materials, list_total, next_cursor = page_materials_faceted(
         db,
         commodity=commodity or None,
         q=q or None,
@@ -509,9 +512,11 @@ async def materials_faceted_partial(
         manufacturers=manufacturers,
         verified_only=verified_only,
         **card_params,
+        cursor=cursor,
         limit=limit,
         offset=offset,
     )
+    total = list_total.value
 
     # Attach vendor stats (matching existing materials list pattern)
     card_ids = [m.id for m in materials]
@@ -634,6 +639,8 @@ async def materials_faceted_partial(
             "materials": materials,
             "q": q,
             "total": total,
+            "total_approx": list_total.approximate,
+            "next_cursor": next_cursor,
             "limit": limit,
             "offset": offset,
             "commodity": commodity,
@@ -975,6 +982,30 @@ async def fru_lookup_partial(
 
 
 @router.get("/v2/partials/materials/{card_id}", response_class=HTMLResponse)
+async def material_detail_route(
+    request: Request,
+    card_id: int,
+    user: User = Depends(require_access(AccessKey.MATERIALS)),
+    db: Session = Depends(get_db),
+):
+    """Serve material card detail through the fragment cache (ETag on the card scope).
+
+    In-process callers (enrich-status, spec/conflict edits) use ``material_detail_partial``
+    and always render fresh.
+    """
+    from ...models.intelligence import MaterialCard
+
+    card = db.get(MaterialCard, card_id)
+    if not card or card.deleted_at is not None:
+        raise HTTPException(404, "Material card not found")
+    etag = fragment_cache.fragment_etag(
+        request, [(fragment_cache.MATERIAL, card.id)], user=user, versions=[card.updated_at]
+    )
+    return await fragment_cache.cached_fragment(
+        request, etag, lambda: material_detail_partial(request, card_id, user, db)
+    )
+
+
 async def material_detail_partial(
     request: Request,
     card_id: int,
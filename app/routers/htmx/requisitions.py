@@ -49,6 +49,7 @@ from ...models import (
     User,
 )
 from ...services.freeform_parser_service import parse_freeform_rfq
+from ...services.list_paging import list_count, page_rows
 from ...services.task_service import create_requisition_task, delete_task, is_task_mutation_authorized, update_task
 from ...template_env import template_response
 from ...utils.csv_export import stream_csv
@@ -56,7 +57,7 @@ from ...utils.search_builder import SearchBuilder
 from ...utils.sql_helpers import escape_like
 from .._lookup_helpers import get_requisition_or_404
 from ._shared import _base_ctx, _parse_date_safe, _parse_task_due_date
-from ._shared_tabs import requisition_tab as _requisition_tab_impl
+from ._shared_tabs import requisition_tab_route as _requisition_tab_impl
 
 router = APIRouter(tags=["htmx-views"])
 
@@ -183,6 +184,7 @@ async def requisitions_list_partial(
     group_by: str = "",
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str = "",
     user: User = Depends(require_user),
     db: Session = Depends(get_db),
 ):
@@ -190,7 +192,8 @@ async def requisitions_list_partial(
 
     ``group_by='customer'`` renders a 2-level nested tree (Customer → Requisition →
     requirement lines) built server-side over the current page's rows; any other value
-    is the default flat list.
+    is the default flat list. ``cursor`` (the previous page's ``next_cursor``) pages by
+    keyset on the active sort; ``offset`` then only drives the "x–y of N" label.
     """
     query = build_requisition_list_query(
         db,
@@ -214,7 +217,7 @@ async def requisitions_list_partial(
     # Retained for the per-row match-reason/scope logic below.
     search_term = q.strip()
 
-    total = query.count()
+    list_total = list_count(db, query)
 
     # Sorting — whitelist of sortable columns, including subqueries for computed counts
     req_count_sub = (
@@ -273,9 +276,18 @@ async def requisitions_list_partial(
         logger.warning("Unknown sort key '{}', falling back to created_at", sort)
         sort_col = Requisition.created_at
         sort = "created_at"
-    # nullslast: NULLs always sort to the bottom regardless of direction
-    order = sort_col.desc().nullslast() if sort_dir == "desc" else sort_col.asc().nullslast()
-    reqs = query.order_by(order).offset(offset).limit(limit).all()
+    # nullslast: NULLs always sort to the bottom regardless of direction; id breaks ties
+    # so the keyset cursor is unique.
+    descending = sort_dir == "desc"
+    page = page_rows(
+        query,
+        [(sort_col, descending), (Requisition.id, descending)],
+        scope=f"requisitions:{sort}:{sort_dir}",
+        cursor=cursor,
+        offset=offset,
+        limit=limit,
+    )
+    reqs = page.rows
 
     # Quotes contributing to each requisition on THIS page, via the join table — ONE extra
     # query for the whole page (not per row) so a combined quote's status shows on every
@@ -371,7 +383,9 @@ async def requisitions_list_partial(
             "dir": sort_dir,
             "group_by": group_by,
             "customer_groups": customer_groups,
-            "total": total,
+            "total": list_total.value,
+            "total_approx": list_total.approximate,
+            "next_cursor": page.next_cursor,
             "limit": limit,
             "offset": offset,
             "users": users,
@@ -31,9 +31,11 @@ from ...dependencies import require_access, require_admin, require_prospect_site
 from ...models import Offer, Sighting, SourcingLead, User, VendorCard
 from ...models.enrichment import ProspectContact
 from ...models.vendors import VendorContact
+from ...services import fragment_cache
 from ...services.crm_service import cadence_state as _cadence_state
+from ...services.crm_service import clock_sort_keys
 from ...services.crm_service import next_best_touch as _next_best_touch
-from ...services.crm_service import order_by_clock as _order_by_clock
+from ...services.list_paging import list_count, page_rows
 from ...services.vendor_duplicates import check_vendor_duplicate
 from ...template_env import template_response
 from ...utils.column_limits import ensure_fits_column
@@ -118,12 +120,16 @@ async def vendors_list_partial(
     my_only: bool = False,
     limit: int = Query(30, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str = "",
     hx_target: str = Query("#main-content", alias="hx_target"),
     push_url_base: str = Query("/v2/vendors", alias="push_url_base"),
     user: User = Depends(require_user),
     db: Session = Depends(get_db),
 ):
-    """Return vendor list as HTML partial with blacklisted toggle and sorting."""
+    """Return vendor list as HTML partial with blacklisted toggle and sorting.
+
+    ``cursor`` (the previous page's ``next_cursor``) pages by keyset on the active sort.
+    """
     hx_target, push_url_base = _sanitize_hx_params(hx_target, push_url_base, "/v2/vendors")
 
     query = build_vendor_list_query(
@@ -135,12 +141,14 @@ async def vendors_list_partial(
         my_only=my_only,
     )
 
-    total = query.count()
+    list_total = list_count(db, query)
 
-    # Sorting — outbound_asc uses the generalized order_by_clock (VendorCard clocks)
+    # Sorting — outbound_asc is the shared cadence order (crm_service.clock_sort_keys on
+    # VendorCard clocks). Every order ends on id so the keyset cursor is unique.
     now_utc = datetime.now(UTC)
     if sort == "outbound_asc":
-        vendors = _order_by_clock(query, "outbound", model=VendorCard).offset(offset).limit(limit).all()
+        keys = [*clock_sort_keys("outbound", model=VendorCard), (VendorCard.id, False)]
+        scope = "vendors:outbound_asc"
     else:
         sort_col_map = {
             "display_name": VendorCard.display_name,
@@ -150,8 +158,10 @@ async def vendors_list_partial(
             "industry": VendorCard.industry,
         }
         sort_col = sort_col_map.get(sort, VendorCard.sighting_count)
-        order = sort_col.desc().nullslast() if dir == "desc" else sort_col.asc().nullslast()
-        vendors = query.order_by(order).offset(offset).limit(limit).all()
+        keys = [(sort_col, dir == "desc"), (VendorCard.id, dir == "desc")]
+        scope = f"vendors:{sort}:{dir}"
+    page = page_rows(query, keys, scope=scope, cursor=cursor, offset=offset, limit=limit)
+    vendors = page.rows
 
     # Attach cadence_state to each vendor (tier=None → standard/30d target)
     for v in vendors:
@@ -167,7 +177,9 @@ async def vendors_list_partial(
             "include_archived": include_archived,
             "sort": sort,
             "dir": dir,
-            "total": total,
+            "total": list_total.value,
+            "total_approx": list_total.approximate,
+            "next_cursor": page.next_cursor,
             "limit": limit,
             "offset": offset,
             "my_only": my_only,
@@ -305,10 +317,11 @@ async def vendor_contacts_partial(
     dir: str = "asc",
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: str = "",
     user: User = Depends(require_user),
     db: Session = Depends(get_db),
 ):
-    """Return the global vendor-contacts list as an HTML partial."""
+    """Return the global vendor-contacts list as an HTML partial (keyset ``cursor`` paging)."""
     from ...models import VendorCard
 
     query = (
@@ -333,10 +346,17 @@ async def vendor_contacts_partial(
         "score": VendorContact.relationship_score,
     }
     sort_col = sort_col_map.get(sort, VendorContact.full_name)
-    order = sort_col.desc().nullslast() if dir == "desc" else sort_col.asc().nullslast()
 
-    total = query.count()
-    contacts = query.order_by(order, VendorContact.id).offset(offset).limit(limit).all()
+    list_total = list_count(db, query)
+    page = page_rows(
+        query,
+        [(sort_col, dir == "desc"), (VendorContact.id, False)],
+        scope=f"vendor-contacts:{sort}:{dir}",
+        cursor=cursor,
+        offset=offset,
+        limit=limit,
+    )
+    contacts = page.rows
 
     ctx = _base_ctx(request, user, "crm")
     ctx.update(
@@ -345,7 +365,9 @@ async def vendor_contacts_partial(
             "search": search,
             "sort": sort,
             "dir": dir,
-            "total": total,
+            "total": list_total.value,
+            "total_approx": list_total.approximate,
+            "next_cursor": page.next_cursor,
             "limit": limit,
             "offset": offset,
         }
@@ -532,6 +554,39 @@ async def delete_vendor_partial(
 
 
 @router.get("/v2/partials/vendors/{vendor_id}", response_class=HTMLResponse)
+async def vendor_detail_route(
+    request: Request,
+    vendor_id: int,
+    mpn: str = "",
+    hx_target: str = "#main-content",
+    push_url_base: str = "/v2/vendors",
+    user: User = Depends(require_user),
+    db: Session = Depends(get_db),
+):
+    """Serve vendor detail through the fragment cache (ETag on the vendor card scope).
+
+    In-process callers (edit/contact handlers) use ``vendor_detail_partial`` and always
+    render fresh.
+    """
+    vendor = get_vendor_card_or_404(db, vendor_id)
+    etag = fragment_cache.fragment_etag(
+        request, [(fragment_cache.VENDOR, vendor.id)], user=user, versions=[vendor.updated_at]
+    )
+    return await fragment_cache.cached_fragment(
+        request,
+        etag,
+        lambda: vendor_detail_partial(
+            request=request,
+            vendor_id=vendor_id,
+            mpn=mpn,
+            hx_target=hx_target,
+            push_url_base=push_url_base,
+            user=user,
+            db=db,
+        ),
+    )
+
+
 async def vendor_detail_partial(
     request: Request,
     vendor_id: int,
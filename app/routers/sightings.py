@@ -61,7 +61,9 @@ from ..models.sourcing import Requirement, Requisition, Sighting
 from ..models.vendor_sighting_summary import VendorSightingSummary
 from ..models.vendors import VendorCard, VendorContact
 from ..schemas.sightings import SightingsListParams
+from ..services import fragment_cache
 from ..services.activity_service import log_rfq_activity
+from ..services.list_paging import list_count, page_rows
 from ..services.offer_qualification import prefill_from_vendor
 from ..services.part_offers import part_offers_for
 from ..services.rfq_attachments import trim_datasheet_names_to_cap
@@ -150,12 +152,13 @@ def _invalidate_cache(key: str):
     _cache.pop(key, None)
 
 
-# Sort key → (column for asc, column for desc)
+# Sort key → sort column; paged by ``list_paging.page_rows`` with Requirement.id as the
+# unique tiebreaker (NULLs last in both directions).
 _SORT_COLUMNS = {
-    "priority": (Requirement.priority_score.asc().nullslast(), Requirement.priority_score.desc().nullslast()),
-    "mpn": (Requirement.primary_mpn.asc(), Requirement.primary_mpn.desc()),
-    "created": (Requirement.created_at.asc(), Requirement.created_at.desc()),
-    "status": (Requirement.sourcing_status.asc(), Requirement.sourcing_status.desc()),
+    "priority": Requirement.priority_score,
+    "mpn": Requirement.primary_mpn,
+    "created": Requirement.created_at,
+    "status": Requirement.sourcing_status,
 }
 
 
@@ -478,14 +481,20 @@ async def _render_sightings_table(
     stale_threshold = datetime.now(UTC) - timedelta(days=settings.sighting_stale_days)
     deadline_48h = date.today() + timedelta(days=2)
 
-    total = query.count()
-
-    asc_col, desc_col = _SORT_COLUMNS.get(filters.sort, _SORT_COLUMNS["priority"])
-    order = asc_col if filters.dir == "asc" else desc_col
-    query = query.order_by(order)
-
-    offset = (filters.page - 1) * filters.limit
-    requirements = query.offset(offset).limit(filters.limit).all()
+    list_total = list_count(db, query)
+    total = list_total.value
+
+    sort_key = filters.sort if filters.sort in _SORT_COLUMNS else "priority"
+    descending = filters.dir != "asc"
+    keyset = page_rows(
+        query,
+        [(_SORT_COLUMNS[sort_key], descending), (Requirement.id, descending)],
+        scope=f"sightings:{sort_key}:{'desc' if descending else 'asc'}",
+        cursor=filters.cursor,
+        offset=(filters.page - 1) * filters.limit,
+        limit=filters.limit,
+    )
+    requirements = keyset.rows
     total_pages = max(1, (total + filters.limit - 1) // filters.limit)
 
     stat_counts = _get_cached(
@@ -671,6 +680,8 @@ async def _render_sightings_table(
         "request": request,
         "requirements": requirements,
         "total": total,
+        "total_approx": list_total.approximate,
+        "next_cursor": keyset.next_cursor,
         "page": filters.page,
         "total_pages": total_pages,
         "limit": filters.limit,
@@ -819,13 +830,29 @@ async def sightings_export(
 
 
 @router.get("/v2/partials/sightings/{requirement_id}/detail", response_class=HTMLResponse)
-async def sightings_detail(
+async def sightings_detail_route(
     request: Request,
     requirement_id: int,
     db: Session = Depends(get_db),
     user: User = Depends(require_user),
 ):
-    """Return the detail panel for a single requirement."""
+    """Serve the detail panel through the fragment cache.
+
+    The ETag tracks the requirement, its requisition and its material card, so a poll or
+    SSE refresh of an unchanged panel is a 304. In-process callers (mutation handlers
+    that re-render the panel) use ``sightings_detail`` and always render fresh.
+    """
+    requirement = _detail_requirement_or_404(db, requirement_id, user)
+    scopes = [(fragment_cache.REQUIREMENT, requirement.id), (fragment_cache.REQUISITION, requirement.requisition_id)]
+    if requirement.material_card_id:
+        scopes.append((fragment_cache.MATERIAL, requirement.material_card_id))
+    etag = fragment_cache.fragment_etag(request, scopes, user=user)
+    return await fragment_cache.cached_fragment(
+        request, etag, lambda: _render_sightings_detail(request, requirement, db, user)
+    )
+
+
+def _detail_requirement_or_404(db: Session, requirement_id: int, user: User) -> Requirement:
     requirement = db.get(Requirement, requirement_id)
     if not requirement:
         raise HTTPException(status_code=404, detail="Requirement not found")
@@ -833,7 +860,17 @@ async def sightings_detail(
     # Read-IDOR gate: this panel exposes vendor sightings, pricing, and contacts — restrict
     # to users who may access the owning requisition (matches the other sightings routes).
     require_requisition_access(db, requirement.requisition_id, user)
+    return requirement
+
+
+async def sightings_detail(request: Request, requirement_id: int, db: Session, user: User) -> Response:
+    """Return the detail panel for a single requirement."""
+    requirement = _detail_requirement_or_404(db, requirement_id, user)
+    return await _render_sightings_detail(request, requirement, db, user)
+
 
+async def _render_sightings_detail(request: Request, requirement: Requirement, db: Session, user: User) -> Response:
+    requirement_id = requirement.id
     requisition = db.get(Requisition, requirement.requisition_id)
 
     summaries = (
@@ -1079,7 +1116,8 @@ async def _run_search_and_publish(
     source: str = "user",
 ) -> None:
     """Background job: run ``search_requirement`` for each requirement (bounded
-    concurrency) then publish a ``sighting-updated`` SSE per requirement.
+    concurrency), publishing a ``sighting-updated`` SSE after each connector's
+    partial result lands and once more when the requirement's search completes.
 
     Runs AFTER the HTTP response is sent (FastAPI ``BackgroundTasks``), so the POST that
     scheduled it already returned an immediate "Searching…" state and the board never froze
@@ -1102,7 +1140,11 @@ async def _run_search_and_publish(
             try:
                 req = db.get(Requirement, rid)
                 if req is not None:
-                    await search_requirement(req, db)
+
+                    async def _partial(_source_name: str, rid: int = rid) -> None:
+                        await _publish_if_user_source(source, user_id, rid)
+
+                    await search_requirement(req, db, on_partial=_partial)
             except Exception:
                 logger.warning("Background search refresh failed for requirement {}", rid, exc_info=True)
             finally:
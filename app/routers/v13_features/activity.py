@@ -62,7 +62,7 @@ def _validation_echo_response(validation_token: str) -> PlainTextResponse:
     )
 
 
-@router.post("/api/webhooks/graph")
+@router.post("/api/webhooks/graph", status_code=202)
 @limiter.limit("60/minute")
 async def graph_webhook(
     request: Request,
@@ -70,7 +70,9 @@ async def graph_webhook(
 ):
     """Microsoft Graph webhook endpoint.
 
-    Handles validation handshake and notification payloads.
+    Handles validation handshake and notification payloads. Notifications are only
+    validated and written to the durable queue here — the 202 goes back before any
+    Graph fetch or inbox poll; ``_job_drain_graph_notifications`` does the work.
     """
     validation_token = request.query_params.get("validationToken")
     if validation_token:
@@ -83,7 +85,7 @@ async def graph_webhook(
 
     payload = GraphWebhookPayload.model_validate(raw)
 
-    from app.services.webhook_service import handle_notification, validate_notifications
+    from app.services.webhook_service import enqueue_notifications, release_replay_keys, validate_notifications
 
     payload_dict = payload.model_dump()
     validated = validate_notifications(payload_dict, db)
@@ -91,9 +93,11 @@ async def graph_webhook(
         raise HTTPException(403, "No valid notifications")
 
     try:
-        await handle_notification(payload_dict, db, validated=validated)
+        enqueue_notifications(validated, db)
     except Exception as e:
-        logger.exception("Webhook notification processing failed")
+        logger.exception("Webhook notification enqueue failed")
+        db.rollback()
+        release_replay_keys(validated)  # nothing was queued — let Graph's retry through
         raise HTTPException(500, "Processing failed") from e
     return {"status": "accepted"}
 
@@ -120,7 +124,7 @@ async def teams_webhook(
     except (ValueError, UnicodeDecodeError) as e:
         raise HTTPException(400, "Invalid JSON payload") from e
 
-    from app.services.webhook_service import handle_teams_notification, validate_notifications
+    from app.services.webhook_service import handle_teams_notification, release_replay_keys, validate_notifications
 
     validated = validate_notifications(raw, db)
     if not validated:
@@ -130,6 +134,7 @@ async def teams_webhook(
         await handle_teams_notification(raw, db, validated=validated)
     except Exception as e:
         logger.exception("Teams webhook notification processing failed")
+        release_replay_keys(validated)
         raise HTTPException(500, "Processing failed") from e
     return {"status": "accepted"}
 
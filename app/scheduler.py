@@ -15,14 +15,20 @@ from functools import wraps
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from loguru import logger
 
+from .sql_profiler import profile_block
+
 
 def _traced_job(func):
-    """Wrap scheduler jobs with a unique trace_id for log correlation."""
+    """Wrap scheduler jobs with a unique trace_id for log correlation.
+
+    Each run is also SQL-profiled (app.sql_profiler): statement count + DB time land in
+    the db_*_per_unit histograms under kind="job", handler=<function name>.
+    """
 
     @wraps(func)
     async def wrapper(*args, **kwargs):
         trace_id = str(uuid.uuid4())[:8]
-        with logger.contextualize(trace_id=trace_id, job=func.__name__):
+        with logger.contextualize(trace_id=trace_id, job=func.__name__), profile_block("job", func.__name__) as prof:
             logger.debug("Job started")
             start = time.monotonic()
             try:
@@ -32,7 +38,10 @@ def _traced_job(func):
                 raise
             finally:
                 elapsed = time.monotonic() - start
-                logger.debug(f"Job finished: {func.__name__} [{trace_id}, {elapsed:.1f}s]")
+                logger.debug(
+                    f"Job finished: {func.__name__} [{trace_id}, {elapsed:.1f}s, "
+                    f"{prof.count} queries / {prof.total_seconds:.2f}s DB]"
+                )
 
     return wrapper
 
@@ -20,6 +20,7 @@ class SightingsListParams(BaseModel):
     dir: str = "desc"
     page: int = Field(default=1, ge=1)
     limit: int = Field(default=50, ge=1, le=200)
+    cursor: str = ""  # keyset cursor for page+1 (services/list_paging); overrides page offset
     # Dashboard-strip quick filters. These mirror the counter predicates computed in
     # sightings_list so clicking "N Urgent" / "N Stale" shows exactly those N rows.
     urgent: bool = False  # priority_score >= 70 OR need_by_date within 48h
@@ -12,6 +12,7 @@ import hashlib
 import json
 import os
 import time
+from collections.abc import Awaitable, Callable
 from datetime import UTC, datetime, timedelta
 from typing import Final
 
@@ -25,6 +26,7 @@ from .connectors.ai_live_web import AIWebSearchConnector
 from .connectors.digikey import DigiKeyConnector
 from .connectors.ebay import EbayConnector
 from .connectors.element14 import Element14Connector
+from .connectors.limits import limited_search
 from .connectors.mouser import MouserConnector
 from .connectors.oemsecrets import OEMSecretsConnector
 from .connectors.sourcengine import SourcengineConnector
@@ -473,9 +475,19 @@ def _persist_search_write(
     searched_keys: set[str],
     now: datetime,
     bind,
+    persisted_ids: list[int] | None = None,
+    persisted_sources: set[str] | None = None,
 ) -> dict | None:
     """Save fresh sightings + upsert material cards on a worker thread.
 
+    ``persisted_sources`` / ``persisted_ids`` are the connectors whose batches this
+    search already saved progressively (``_persist_search_batch``) and the sightings
+    they wrote; ``fresh`` then holds only the hits those batches did not cover. This
+    final pass is the reconciliation: the
+    batch rows are protected from the stale-row delete, every row of the search is
+    re-scored against ONE median price (each batch scored against its own), and the
+    vendor summaries get a full rebuild.
+
     This is the dominant synchronous DB cost of ``search_requirement`` — bulk
     sighting insert, tag propagation, vendor-summary rebuild (all inside
     ``_save_sightings``), the per-MPN material-card upsert loop, and the inline
@@ -506,7 +518,22 @@ def _persist_search_write(
             logger.error("Requirement {} not found in write session", req_id)
             return None
 
-        sightings = _save_sightings(fresh, write_req, write_db, succeeded_sources)
+        if not persisted_sources:
+            sightings = _save_sightings(fresh, write_req, write_db, succeeded_sources)
+        else:
+            # The full succeeded set keeps the delete connector-aware (a batch source's
+            # older rows are already gone, and keep_ids shields the batch rows).
+            keep_ids = set(persisted_ids or [])
+            remaining = (
+                _save_sightings(fresh, write_req, write_db, succeeded_sources, keep_ids=keep_ids)
+                if fresh or succeeded_sources - persisted_sources
+                else []
+            )
+            earlier = (
+                list(write_db.scalars(select(Sighting).where(Sighting.id.in_(keep_ids))).all()) if keep_ids else []
+            )
+            sightings = earlier + remaining
+            _rescore_search_sightings(write_db, write_req, sightings)
         logger.info(f"Req {req_id} ({to_search[0]}): {len(sightings)} fresh sightings")
 
         # Material card upsert (errors won't break search). Only upsert cards for
@@ -592,6 +619,65 @@ def _persist_search_write(
         write_db.close()
 
 
+def _persist_search_batch(
+    req_id: int,
+    rows: list[dict],
+    source_name: str,
+    keep_ids: list[int],
+    bind,
+) -> list[int] | None:
+    """Save ONE connector's batch of a progressive ``search_requirement`` on a worker thread.
+
+    Replaces that source's previous sightings for the requirement (``keep_ids`` —
+    rows earlier batches of this search wrote — are never deleted), scores the batch,
+    and rebuilds the VendorSightingSummary rows of only the vendors it carries, so
+    the board can render the partial result. Own write session, same pattern as
+    ``_persist_search_write``. Returns the new sighting ids, or ``None`` when the
+    requirement no longer exists.
+
+    Called by: search_requirement (via asyncio.to_thread, from _fetch_fresh's on_batch)
+    Depends on: _save_sightings
+    """
+    from sqlalchemy.orm import sessionmaker
+
+    _WriteSession = sessionmaker(bind=bind, autocommit=False, autoflush=False, expire_on_commit=False)
+    write_db = _WriteSession()
+    try:
+        write_req = write_db.get(Requirement, req_id)
+        if not write_req:
+            return None
+        sightings = _save_sightings(
+            rows, write_req, write_db, {source_name}, keep_ids=set(keep_ids), scoped_summaries=True
+        )
+        write_db.commit()
+        logger.info("Req {} partial: {} sighting(s) from {}", req_id, len(sightings), source_name)
+        return [int(s.id) for s in sightings]
+    except Exception:
+        write_db.rollback()
+        raise
+    finally:
+        write_db.close()
+
+
+def _rescore_search_sightings(db: Session, req: Requirement, sightings: list[Sighting]) -> None:
+    """Reconcile a progressive search: v2-score every row against one shared median.
+
+    Each batch was scored against its own connector's median price; the final
+    scores must match a one-shot save of all the hits. Every row here is a live
+    hit (a cache HIT is never saved progressively), so freshness age is 0. Followed
+    by a full vendor-summary rebuild, which also sweeps vendors whose last row a
+    batch replaced.
+
+    Called by: _persist_search_write
+    """
+    from .services.sighting_aggregation import rebuild_vendor_summaries_from_sightings
+
+    trust = _vendor_trust_lookup(db, {str(s.vendor_name_normalized or "") for s in sightings})
+    _apply_v2_scores(sightings, [0.0] * len(sightings), req, trust)
+    db.flush()
+    rebuild_vendor_summaries_from_sightings(db, req.id, sightings)
+
+
 def _persist_interactive_sightings(
     mpn: str,
     raw_hits: list[dict],
@@ -642,9 +728,20 @@ def _persist_interactive_sightings(
         write_db.close()
 
 
-async def search_requirement(req: Requirement, db: Session) -> dict:
+async def search_requirement(
+    req: Requirement,
+    db: Session,
+    on_partial: Callable[[str], Awaitable[None]] | None = None,
+) -> dict:
     """Search APIs for stale MPNs only; surface cached sightings for fresh ones.
 
+    Progressive: each connector's batch is saved, scored and summarized as soon as
+    that connector finishes (``_persist_search_batch``), and ``on_partial(source)``
+    (optional — the board's background refresh publishes a ``sighting-updated`` SSE
+    with it) is awaited after each, so the board row fills in source by source
+    instead of waiting for the slowest one. The final pass reconciles scoring
+    across all hits.
+
     The per-MPN 48h cooldown (``MaterialCard.last_searched_at``) gates which
     MPNs hit the connector layer. Cached MPNs are still surfaced via
     ``material_card_id`` linkage in the caller's detail panel.
@@ -706,9 +803,30 @@ async def search_requirement(req: Requirement, db: Session) -> dict:
             "mpn_results": mpn_results,
         }
 
-    # 1. Fetch + dedupe (parallel across stale-MPN connectors). Affinity was
-    # already computed above so it's available to the merge step below.
-    fresh, source_stats = await _fetch_fresh(to_search, db)
+    req_id = req.id
+    write_bind = db.get_bind()
+
+    # 1. Fetch + dedupe (parallel across stale-MPN connectors), saving each
+    # connector's batch as it lands. Affinity was already computed above so it's
+    # available to the merge step below.
+    persisted_ids: list[int] = []
+    persisted_rows: set[int] = set()  # id() of the hit dicts a batch already saved
+    persisted_sources: set[str] = set()
+
+    async def _save_batch(source_name: str, rows: list[dict]) -> None:
+        ids = await asyncio.to_thread(_persist_search_batch, req_id, rows, source_name, list(persisted_ids), write_bind)
+        if ids is None:
+            return
+        persisted_ids.extend(ids)
+        persisted_rows.update(id(r) for r in rows)
+        persisted_sources.add(source_name)
+        if on_partial is not None:
+            try:
+                await on_partial(source_name)
+            except Exception:
+                logger.warning("Partial-result publish failed for requirement {}", req_id, exc_info=True)
+
+    fresh, source_stats = await _fetch_fresh(to_search, db, on_batch=_save_batch)
 
     # 2. Score + save — only replace sightings from connectors that succeeded.
     # The whole save+upsert+deterministic-pass chain is synchronous DB work with
@@ -719,13 +837,20 @@ async def search_requirement(req: Requirement, db: Session) -> dict:
     # write_db is created and used ENTIRELY inside the thread (mirrors the
     # vendor-affinity fix at _find_affinity_in_thread, PERF-1). Only plain
     # dicts/ids cross back — no ORM object survives the thread boundary.
-    req_id = req.id
     succeeded_sources = {
         stat["source"] for stat in source_stats if stat["status"] == SourceRunStatus.OK.value and not stat.get("error")
     }
-    write_bind = db.get_bind()
     persisted = await asyncio.to_thread(
-        _persist_search_write, req_id, fresh, to_search, succeeded_sources, searched_keys, now, write_bind
+        _persist_search_write,
+        req_id,
+        [r for r in fresh if id(r) not in persisted_rows],
+        to_search,
+        succeeded_sources,
+        searched_keys,
+        now,
+        write_bind,
+        persisted_ids,
+        persisted_sources,
     )
     if persisted is None:
         return {"sightings": [], "source_stats": source_stats, "mpn_results": mpn_results}
@@ -1733,6 +1858,15 @@ def _any_pn_obsolete(db: Session, pns: list[str]) -> bool:
     )
 
 
+def _hit_key(r: dict) -> tuple[str, str, str]:
+    """Dedup key of a raw connector hit: (vendor, normalized mpn, vendor sku)."""
+    return (
+        r.get("vendor_name", "").lower(),
+        normalize_mpn_key(r.get("mpn_matched", "")),
+        str(r.get("vendor_sku") or "").lower(),
+    )
+
+
 def _flatten_dedupe_filter_junk(raw: list[dict]) -> list[dict]:
     """Flatten already-collected raw connector hits, dedupe by (vendor, mpn_key, sku),
     and drop junk vendors (no-seller placeholders etc).
@@ -1748,11 +1882,7 @@ def _flatten_dedupe_filter_junk(raw: list[dict]) -> list[dict]:
     seen: set[tuple] = set()
     out = []
     for r in raw:
-        key = (
-            r.get("vendor_name", "").lower(),
-            normalize_mpn_key(r.get("mpn_matched", "")),
-            str(r.get("vendor_sku") or "").lower(),
-        )
+        key = _hit_key(r)
         if key not in seen:
             seen.add(key)
             out.append(r)
@@ -1790,9 +1920,20 @@ def _aggregate_source_stats(stats_updates: list[tuple[str, int, int, str | None]
     return agg
 
 
-async def _fetch_fresh(pns: list[str], db: Session) -> tuple[list[dict], list[dict]]:
+async def _fetch_fresh(
+    pns: list[str],
+    db: Session,
+    on_batch: Callable[[str, list[dict]], Awaitable[None]] | None = None,
+) -> tuple[list[dict], list[dict]]:
     """Run all enabled connectors against pns and return (results, source_stats).
 
+    ``on_batch(source_name, rows)`` (optional) is awaited once per connector as soon
+    as all of its PN calls succeed — ``rows`` are that connector's deduped, junk-
+    filtered hits, minus any (vendor, mpn, sku) an earlier connector already
+    delivered, so the batches partition the first-seen rows of the returned results.
+    A connector with any failed/timed-out PN call is never handed to ``on_batch``;
+    its hits only appear in the returned results. Not called on a cache HIT.
+
     source_stats[i] follows SourceRunStatus: 'ok' (ran successfully), 'error' (this run
     failed), 'error_skipped' (excluded because health_monitor previously flipped
     api_sources.status to 'error' — auto-recovers on next ping success), 'skipped' (no
@@ -1845,6 +1986,9 @@ async def _fetch_fresh(pns: list[str], db: Session) -> tuple[list[dict], list[di
     # IMPORTANT: Stats are collected in a plain list (not written to DB) during
     # gather, because the SQLAlchemy session is not safe for concurrent access.
     stats_updates = []  # (source_name, hit_count, elapsed_ms, error_str|None)
+    failed_conns: set = set()  # connectors with at least one failed/timed-out PN call
+
+    from .config import settings
 
     async def _run_one(conn, pn):
         """Run a single connector for a single PN.
@@ -1854,13 +1998,22 @@ async def _fetch_fresh(pns: list[str], db: Session) -> tuple[list[dict], list[di
         source_name = _CONNECTOR_SOURCE_MAP.get(conn.__class__.__name__)
         start = time.time()
         try:
-            hits = await conn.search(pn)
+            hits = await limited_search(conn, pn, settings.search_total_timeout_s)
             elapsed_ms = int((time.time() - start) * 1000)
             for r in hits:
                 r["mpn_matched"] = pn
             if source_name:
                 stats_updates.append((source_name, len(hits), elapsed_ms, None))
             return hits
+        except TimeoutError as e:
+            # The connector's own p95-derived deadline (limits.limited_search) — one
+            # slow source no longer holds the whole fan-out to the global budget.
+            elapsed_ms = int((time.time() - start) * 1000)
+            logger.warning("Search {} via {} hit its deadline ({}ms)", pn, conn.__class__.__name__, elapsed_ms)
+            if source_name:
+                stats_updates.append((source_name, 0, elapsed_ms, str(e)))
+            failed_conns.add(conn)
+            return []
         except Exception as e:
             elapsed_ms = int((time.time() - start) * 1000)
             logger.opt(exception=True).error(
@@ -1868,11 +2021,10 @@ async def _fetch_fresh(pns: list[str], db: Session) -> tuple[list[dict], list[di
             )
             if source_name:
                 stats_updates.append((source_name, 0, elapsed_ms, _redact_secrets(str(e))[:500]))
+            failed_conns.add(conn)
             return []
 
     # Fire all connector×PN combos in parallel (with concurrency limit)
-    from .config import settings
-
     sem = asyncio.Semaphore(settings.search_concurrency_limit)
 
     async def _throttled(conn, pn):
@@ -1881,43 +2033,66 @@ async def _fetch_fresh(pns: list[str], db: Session) -> tuple[list[dict], list[di
 
     pairs = [(conn, pn) for pn in pns for conn in connectors]
     task_objs = [asyncio.create_task(_throttled(conn, pn)) for conn, pn in pairs]
+    task_conn = {t: conn for (conn, _pn), t in zip(pairs, task_objs)}
 
+    # Consume completions as they land. A connector's hits are released (into `raw`,
+    # and to on_batch for a progressive caller) once ALL of its PN calls are done, in
+    # connector-completion order — so the final first-seen dedup over `raw` keeps the
+    # very rows each batch delivered.
+    #
     # Bounded deadline: one slow/hung connector must not block the orchestrator.
     # Tasks still pending when the budget expires are cancelled and recorded as
     # errored in stats_updates. CancelledError is a BaseException in 3.8+, so
     # _run_one's except-Exception doesn't swallow it — pending tasks finish
-    # cancelled rather than returning [] and are skipped in results_lists below.
-    if task_objs:
-        _done, pending = await asyncio.wait(task_objs, timeout=settings.search_total_timeout_s)
-    else:
-        pending = set()
-    if pending:
+    # cancelled rather than returning [] and their connectors' completed hits are
+    # appended after the loop.
+    calls_left = {conn: 0 for conn in connectors}
+    for conn, _pn in pairs:
+        calls_left[conn] += 1
+    hits_by_conn: dict = {conn: [] for conn in connectors}
+    raw: list[dict] = []
+    delivered: set[tuple] = set()
+    fanout_start = time.time()
+    pending = set(task_objs)
+    timed_out: set = set()
+    while pending:
+        remaining = settings.search_total_timeout_s - (time.time() - fanout_start)
+        done, pending, timed_out = await _await_next_within_budget(pending, remaining)
+        for t in done:
+            conn = task_conn[t]
+            if t.exception() is None:
+                hits_by_conn[conn].extend(t.result())
+            calls_left[conn] -= 1
+            if calls_left[conn]:
+                continue
+            batch = hits_by_conn.pop(conn)
+            raw.extend(batch)
+            rows = [r for r in _flatten_dedupe_filter_junk(batch) if _hit_key(r) not in delivered]
+            delivered.update(_hit_key(r) for r in rows)
+            source_name = _CONNECTOR_SOURCE_MAP.get(conn.__class__.__name__)
+            if on_batch is None or source_name is None or conn in failed_conns:
+                continue
+            for r in rows:
+                r["_source_age_hours"] = 0.0
+            try:
+                await on_batch(source_name, rows)
+            except Exception:
+                logger.warning("Progressive batch handler failed for {}", source_name, exc_info=True)
+    if timed_out:
         logger.warning(
             "Search budget {:.1f}s exceeded; cancelling {}/{} pending connector tasks",
             settings.search_total_timeout_s,
-            len(pending),
+            len(timed_out),
             len(task_objs),
         )
-        for t in pending:
-            t.cancel()
-        await asyncio.gather(*pending, return_exceptions=True)
         budget_ms = int(settings.search_total_timeout_s * 1000)
-        pending_set = set(pending)
         for (conn, _pn), t in zip(pairs, task_objs):
-            if t in pending_set:
+            if t in timed_out:
                 source_name = _CONNECTOR_SOURCE_MAP.get(conn.__class__.__name__)
                 if source_name:
                     stats_updates.append((source_name, 0, budget_ms, "search budget exceeded"))
-
-    results_lists: list = []
-    for t in task_objs:
-        if t.cancelled():
-            continue
-        exc = t.exception()
-        if exc is not None:
-            results_lists.append(exc)
-        else:
-            results_lists.append(t.result())
+    for batch in hits_by_conn.values():
+        raw.extend(batch)
 
     # Apply stats to DB in one pass — safe, sequential, after gather completes
     try:
@@ -1949,21 +2124,8 @@ async def _fetch_fresh(pns: list[str], db: Session) -> tuple[list[dict], list[di
         db.rollback()
 
     # Flatten, dedupe, and drop junk vendors
-    raw = []
-    for result in results_lists:
-        if isinstance(result, list):
-            raw.extend(result)
-        # If it's an exception from gather, skip it
-
     out = _flatten_dedupe_filter_junk(raw)
-    seen = {
-        (
-            r.get("vendor_name", "").lower(),
-            normalize_mpn_key(r.get("mpn_matched", "")),
-            str(r.get("vendor_sku") or "").lower(),
-        )
-        for r in out
-    }
+    seen = {_hit_key(r) for r in out}
 
     # ── Smart AI trigger: conditionally fire AI connector ────────────
     if ai_connector is not None:
@@ -2055,11 +2217,7 @@ async def _fetch_fresh(pns: list[str], db: Session) -> tuple[list[dict], list[di
             for result in ai_results_lists:
                 if isinstance(result, list):
                     for r in result:
-                        key = (
-                            r.get("vendor_name", "").lower(),
-                            normalize_mpn_key(r.get("mpn_matched", "")),
-                            str(r.get("vendor_sku") or "").lower(),
-                        )
+                        key = _hit_key(r)
                         if key not in seen:
                             seen.add(key)
                             out.append(r)
@@ -2094,30 +2252,21 @@ async def _fetch_fresh(pns: list[str], db: Session) -> tuple[list[dict], list[di
     return out, list(source_stats_map.values())
 
 
-def _save_sightings(
-    fresh: list[dict],
-    req: Requirement | None,
-    db: Session,
-    succeeded_sources: set[str] | None = None,
-) -> list[Sighting]:
-    """Save fresh connector hits as Sighting rows, scored + deduped.
+def _vendor_trust_lookup(db: Session, vendor_names: set[str]) -> Callable[[str], float | None]:
+    """Build normalized-vendor-name → trust score (feedback adjustment applied).
 
-    ``req`` is optional: when ``None`` the sightings are requirement-less
-    (interactive/global "quick search" discoveries persisted by
-    ``stream_search_mpn``). In that case every requirement-scoped step — lead
-    sync, requirement-level dedup/stamping, vendor-summary rebuild — is skipped
-    since those tables' FKs are non-nullable; dedup instead runs against
-    existing requirement-less rows by (vendor, mpn). Vendor-card creation,
-    material-card upsert (by the caller), scoring, evidence tiers, and tag
-    propagation all still run either way.
+    Loads the VendorCards for *vendor_names* in one query and ONE
+    get_vendor_feedback_adjustment call per DISTINCT vendor_card, never per sighting —
+    a save with 200 sightings across 5 vendors issues 5 feedback queries, not 200.
+    A do_not_contact vendor is floor-scored (trust <= 15), not dropped — the sighting
+    still surfaces, but scores low enough that it never outranks a clean vendor's
+    identical listing.
+
+    Called by: _save_sightings, _rescore_search_sightings
     """
     from .models import VendorCard
 
-    requirement_id = req.id if req is not None else None
-
-    # Build vendor-name → (vendor_score, vendor_card_id) lookup (only for
-    # vendors in results).
-    needed_names = {normalize_vendor_name((r.get("vendor_name") or "").strip()) for r in fresh if r.get("vendor_name")}
+    needed_names = set(vendor_names)
     needed_names.discard("")
     if needed_names:
         vendor_cards = (
@@ -2131,19 +2280,10 @@ def _save_sightings(
         vendor_score_map = {}
         vendor_id_map = {}
 
-    # Batch the vendor feedback adjustment: ONE get_vendor_feedback_adjustment
-    # call per DISTINCT vendor_card in this save, never per sighting — a save
-    # with 200 sightings across 5 vendors issues 5 feedback queries, not 200.
     distinct_vendor_ids = {vc_id for vc_id in vendor_id_map.values() if vc_id}
     feedback_by_vendor_id = {vc_id: get_vendor_feedback_adjustment(db, vc_id) for vc_id in distinct_vendor_ids}
 
     def _effective_trust_score(norm_name: str) -> float | None:
-        """Vendor trust score with the vendor's feedback adjustment applied.
-
-        A do_not_contact vendor is floor-scored (trust <= 15), not dropped — the
-        sighting still surfaces, but scores low enough that it never outranks a clean
-        vendor's identical listing.
-        """
         base = vendor_score_map.get(norm_name)
         if base is None:
             return None
@@ -2156,6 +2296,78 @@ def _save_sightings(
             adjusted = min(adjusted, 15.0)
         return adjusted
 
+    return _effective_trust_score
+
+
+def _apply_v2_scores(
+    sightings: list[Sighting],
+    ages_hours: list[float],
+    req: Requirement | None,
+    trust: Callable[[str], float | None],
+) -> None:
+    """Multi-factor v2 score for each sighting against the batch's median USD price.
+
+    Prices are converted to USD before the median and the per-offer comparison
+    (currency-blind price scoring bug — a search mixing e.g. JPY and USD listings
+    previously compared raw numbers across currencies). ``ages_hours`` pairs 1:1 with
+    ``sightings``: 0.0 for a genuinely live connector hit, the real elapsed age for a
+    row served from the 15-min search-result Redis cache.
+
+    Called by: _save_sightings, _rescore_search_sightings
+    """
+    # float(): rows loaded back from the DB (the reconciliation pass) carry Numeric
+    # prices as Decimal.
+    usd = [to_usd(float(s.unit_price), s.currency) if s.unit_price is not None else None for s in sightings]
+    median_price = _median([p for p in usd if p is not None and p > 0])
+    target_qty = (req.target_qty if req.target_qty else None) if req is not None else None
+    for s, age_hours, unit_price_usd in zip(sightings, ages_hours, usd):
+        norm_name = s.vendor_name_normalized or ""
+        v2_total, v2_comp = score_sighting_v2(
+            vendor_score=trust(norm_name),
+            is_authorized=s.is_authorized,
+            unit_price=unit_price_usd,
+            median_price=median_price,
+            qty_available=s.qty_available,
+            target_qty=target_qty,
+            age_hours=age_hours,
+            has_price=s.unit_price is not None,
+            has_qty=s.qty_available is not None,
+            has_lead_time=s.lead_time_days is not None,
+            has_condition=s.condition is not None,
+        )
+        s.score = v2_total
+        s.score_components = v2_comp
+
+
+def _save_sightings(
+    fresh: list[dict],
+    req: Requirement | None,
+    db: Session,
+    succeeded_sources: set[str] | None = None,
+    keep_ids: set[int] | None = None,
+    scoped_summaries: bool = False,
+) -> list[Sighting]:
+    """Save fresh connector hits as Sighting rows, scored + deduped.
+
+    ``req`` is optional: when ``None`` the sightings are requirement-less
+    (interactive/global "quick search" discoveries persisted by
+    ``stream_search_mpn``). In that case every requirement-scoped step — lead
+    sync, requirement-level dedup/stamping, vendor-summary rebuild — is skipped
+    since those tables' FKs are non-nullable; dedup instead runs against
+    existing requirement-less rows by (vendor, mpn). Vendor-card creation,
+    material-card upsert (by the caller), scoring, evidence tiers, and tag
+    propagation all still run either way.
+
+    Progressive saves (``search_requirement`` persisting one connector's batch at a
+    time) pass ``keep_ids`` — rows an earlier batch of the SAME search wrote, which
+    are never treated as stale — and ``scoped_summaries`` to rebuild only the
+    VendorSightingSummary rows of the vendors in this batch.
+    """
+    requirement_id = req.id if req is not None else None
+
+    needed_names = {normalize_vendor_name((r.get("vendor_name") or "").strip()) for r in fresh if r.get("vendor_name")}
+    _effective_trust_score = _vendor_trust_lookup(db, needed_names)
+
     # Connector-aware delete: only remove sightings from sources that returned
     # results.  Sightings from failed/timed-out connectors are preserved.
     # Map nexar → {nexar, octopart} since Octopart results come via NexarConnector
@@ -2176,14 +2388,18 @@ def _save_sightings(
         retry path below, since a rolled-back commit undoes this delete too).
         """
         if req is not None:
+            keep_filter = [~Sighting.id.in_(keep_ids)] if keep_ids else []
             if succeeded_sources:
                 db.query(Sighting).filter(
                     Sighting.requirement_id == requirement_id,
                     Sighting.source_type.in_(expanded),
+                    *keep_filter,
                 ).delete(synchronize_session="fetch")
             else:
                 # Fallback: no source info → wipe all (legacy behaviour)
-                db.query(Sighting).filter_by(requirement_id=requirement_id).delete()
+                db.query(Sighting).filter(Sighting.requirement_id == requirement_id, *keep_filter).delete(
+                    synchronize_session="fetch"
+                )
             return
 
         incoming_keys = {
@@ -2288,39 +2504,12 @@ def _save_sightings(
         db.add(s)
         sightings.append(s)
 
-    # PR 3: Compute multi-factor v2 scores with median price context. Prices are
-    # converted to USD before the median and the per-offer comparison (currency-blind
-    # price scoring bug — a search mixing e.g. JPY and USD listings previously compared
-    # raw numbers across currencies). `sightings` is built 1:1 from `fresh` above (one
-    # Sighting appended per row, no filtering), so zip pairs each new Sighting with its
-    # source dict for the real freshness tag: age_hours=0.0 is correct for a genuinely
-    # live connector hit, but a row served from the 15-min search-result Redis cache
-    # (`_fetch_fresh`'s cache-HIT path) carries its real elapsed age in
-    # `_source_age_hours` instead of falsely scoring as brand-fresh.
-    prices_usd = [
-        p
-        for p in (to_usd(s.unit_price, s.currency) for s in sightings if s.unit_price and s.unit_price > 0)
-        if p is not None
-    ]
-    median_price = _median(prices_usd)
-    target_qty = (req.target_qty if req.target_qty else None) if req is not None else None
-    for s, r in zip(sightings, fresh):
-        norm_name = s.vendor_name_normalized or ""
-        v2_total, v2_comp = score_sighting_v2(
-            vendor_score=_effective_trust_score(norm_name),
-            is_authorized=s.is_authorized,
-            unit_price=to_usd(s.unit_price, s.currency),
-            median_price=median_price,
-            qty_available=s.qty_available,
-            target_qty=target_qty,
-            age_hours=r.get("_source_age_hours", 0.0),
-            has_price=s.unit_price is not None,
-            has_qty=s.qty_available is not None,
-            has_lead_time=s.lead_time_days is not None,
-            has_condition=s.condition is not None,
-        )
-        s.score = v2_total
-        s.score_components = v2_comp
+    # PR 3: Compute multi-factor v2 scores with median price context. `sightings` is
+    # built 1:1 from `fresh` above (one Sighting appended per row, no filtering), so
+    # each new Sighting pairs with its source dict's freshness tag: age_hours=0.0 for a
+    # genuinely live connector hit, the real elapsed age (`_source_age_hours`) for a
+    # row served from the search-result Redis cache (`_fetch_fresh`'s cache-HIT path).
+    _apply_v2_scores(sightings, [r.get("_source_age_hours", 0.0) for r in fresh], req, _effective_trust_score)
 
     # Re-apply durable vendor+part unavailability knowledge before the rows
     # commit — a re-search (delete + recreate) must never resurrect a dead
@@ -2367,6 +2556,8 @@ def _save_sightings(
             .all()
         )
         for o in old:
+            if keep_ids and o.id in keep_ids:
+                continue
             if (o.vendor_name.lower(), (o.mpn_matched or "").lower()) in fresh_keys:
                 db.delete(o)
         db.commit()
@@ -2419,7 +2610,7 @@ def _save_sightings(
     if req is not None:
         from .services.sighting_aggregation import rebuild_vendor_summaries_from_sightings
 
-        rebuild_vendor_summaries_from_sightings(db, requirement_id, sightings)
+        rebuild_vendor_summaries_from_sightings(db, requirement_id, sightings, affected_only=scoped_summaries)
 
     return sightings  # type: ignore[return-value]  # mypy misinfers element type via ORM columns
 
@@ -3322,7 +3513,7 @@ async def stream_search_mpn(search_id: str, mpn: str) -> None:
 
                     async def _run(c=conn, pn=mpn):
                         t0 = time.time()
-                        hits = await c.search(pn)
+                        hits = await limited_search(c, pn, settings.search_total_timeout_s)
                         elapsed = int((time.time() - t0) * 1000)
                         return hits, elapsed
 
@@ -0,0 +1,122 @@
+"""Activity rollup service — window reads over activity_daily_rollups, plus repair.
+
+``activity_daily_rollups`` holds per-day activity counts keyed by (user, company,
+vendor card, vendor contact, site contact, channel, direction, activity type). The
+ActivityLog listeners in models/activity_rollup.py keep it current as rows are
+written; this module reads window sums from it and rebuilds it from ``activity_log``.
+
+Windows are day-granular: a "last 30 days" read covers every bucket whose UTC day is
+on or after the day 30 days ago, so it can include up to one extra partial day
+compared with a timestamp cutoff.
+
+Called by: services/contact_intelligence.compute_all_contact_scores,
+    services/activity_service (days_since_last_activity, get_last_activity_at),
+    jobs/email_jobs._job_activity_rollup_repair (nightly rebuild).
+Depends on: models/activity_rollup.py, models/intelligence.py (ActivityLog).
+"""
+
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+
+from loguru import logger
+from sqlalchemy import Date, case, cast, delete, func, insert, literal_column, select
+from sqlalchemy.orm import Session
+
+from app.models import ActivityDailyRollup, ActivityLog
+
+# Activity types counted as a "win" in contact scoring.
+WIN_TYPES = ("po_issued", "quote_won", "deal_won")
+
+
+def contact_window_stats(db: Session, now: datetime | None = None) -> dict[int, dict[str, int]]:
+    """Per-vendor-contact activity stats in one grouped pass over the rollup.
+
+    Returns {vendor_contact_id: {"30d", "60d", "90d", "wins", "total", "channels"}}
+    for every contact with at least one logged activity.
+    """
+    now = now or datetime.now(UTC)
+    r = ActivityDailyRollup
+
+    def _since(days: int):
+        day = (now - timedelta(days=days)).date()
+        return func.sum(case((r.day >= day, r.activity_count), else_=0))
+
+    stmt = (
+        select(
+            r.vendor_contact_id,
+            _since(30).label("d30"),
+            _since(60).label("d60"),
+            _since(90).label("d90"),
+            func.sum(case((r.activity_type.in_(WIN_TYPES), r.activity_count), else_=0)).label("wins"),
+            func.sum(r.activity_count).label("total"),
+            func.count(func.distinct(func.nullif(r.channel, ""))).label("channels"),
+        )
+        .where(r.vendor_contact_id > 0, r.activity_count > 0)
+        .group_by(r.vendor_contact_id)
+    )
+    return {
+        row.vendor_contact_id: {
+            "30d": int(row.d30 or 0),
+            "60d": int(row.d60 or 0),
+            "90d": int(row.d90 or 0),
+            "wins": int(row.wins or 0),
+            "total": int(row.total or 0),
+            "channels": int(row.channels or 0),
+        }
+        for row in db.execute(stmt)
+    }
+
+
+def company_last_activity_at(db: Session, company_id: int, exclude_types: Iterable[str] = ()) -> datetime | None:
+    """Latest activity time on a company, optionally ignoring some activity types."""
+    r = ActivityDailyRollup
+    stmt = select(func.max(r.last_at)).where(r.company_id == company_id, r.activity_count > 0)
+    excluded = list(exclude_types)
+    if excluded:
+        stmt = stmt.where(r.activity_type.notin_(excluded))
+    latest = db.execute(stmt).scalar()
+    if latest is None:
+        return None
+    return latest.replace(tzinfo=UTC) if latest.tzinfo is None else latest
+
+
+def rebuild_activity_rollups(db: Session) -> int:
+    """Recompute every bucket from ``activity_log`` in one transaction.
+
+    Repairs drift the write listeners cannot see: bulk Core writes that bypass the
+    ORM, and ``ON DELETE SET NULL`` cascades when a company, contact or user is
+    removed. Also lowers ``last_at`` after deletes. Returns the bucket count.
+    """
+    a = ActivityLog
+    at = func.coalesce(a.occurred_at, a.created_at)
+    if db.get_bind().dialect.name == "postgresql":
+        day = cast(func.timezone(literal_column("'UTC'"), at), Date)
+    else:
+        day = func.date(at)
+    # Constants are inlined: bound parameters render as distinct placeholders in
+    # SELECT and GROUP BY, and PostgreSQL would reject the grouping.
+    zero, blank = literal_column("0"), literal_column("''")
+    keys = [
+        day.label("day"),
+        func.coalesce(a.user_id, zero).label("user_id"),
+        func.coalesce(a.company_id, zero).label("company_id"),
+        func.coalesce(a.vendor_card_id, zero).label("vendor_card_id"),
+        func.coalesce(a.vendor_contact_id, zero).label("vendor_contact_id"),
+        func.coalesce(a.site_contact_id, zero).label("site_contact_id"),
+        func.coalesce(a.channel, blank).label("channel"),
+        func.coalesce(a.direction, blank).label("direction"),
+        func.coalesce(a.activity_type, blank).label("activity_type"),
+    ]
+    grouped = (
+        select(*keys, func.count(a.id).label("activity_count"), func.max(at).label("last_at"))
+        .where(at.isnot(None))
+        .group_by(*keys)
+    )
+    columns = [k.name for k in keys] + ["activity_count", "last_at"]
+
+    db.execute(delete(ActivityDailyRollup))
+    db.execute(insert(ActivityDailyRollup).from_select(columns, grouped))
+    db.commit()
+    buckets = db.execute(select(func.count()).select_from(ActivityDailyRollup)).scalar() or 0
+    logger.info("Activity rollup rebuilt: {} buckets", buckets)
+    return int(buckets)
@@ -13,7 +13,7 @@ raw counts — no weighting, no blended score:
 Rows are returned ranked by ``total`` descending.
 
 Called by: routers/htmx/settings.py (settings/scorecard tab).
-Depends on: models (ActivityLog, Company, SiteContact, User), constants
+Depends on: models (ActivityDailyRollup, Company, SiteContact, User), constants
   (Channel, Direction), database session.
 """
 
@@ -27,7 +27,7 @@ from sqlalchemy import func as sqlfunc
 from sqlalchemy.orm import Session
 
 from ..constants import Channel, Direction
-from ..models import ActivityLog, Company, SiteContact, User
+from ..models import ActivityDailyRollup, Company, SiteContact, User
 
 # Valid time-range keys (the selector vocabulary). Default is this_month.
 TIME_RANGES: tuple[str, ...] = ("this_week", "this_month", "this_quarter", "all_time")
@@ -82,26 +82,28 @@ def range_start(time_range: str, *, now: datetime | None = None) -> datetime | N
 
 
 def _activity_metrics_by_user(db: Session, start: datetime | None) -> dict[int, dict[str, int]]:
-    """One GROUP BY query over activity_log → {user_id: {calls, emails}}.
+    """One GROUP BY query over activity_daily_rollups → {user_id: {calls, emails}}.
 
-    Aggregates the two ActivityLog-derived counts in a single pass using conditional
-    aggregates (FILTER-style CASE) so there is no per-user loop and no N+1. NULL user_id
-    rows (system/unattributed activity) are excluded.
+    Sums the daily rollup buckets with conditional aggregates (FILTER-style CASE) so
+    there is no per-user loop, no N+1 and no scan of raw activity rows. ``start`` is
+    always a UTC midnight (see ``range_start``), so the day filter is exact.
+    Unattributed buckets (user_id 0 — system activity) are excluded.
     """
-    is_phone = ActivityLog.channel == Channel.PHONE
-    is_email_out = (ActivityLog.channel == Channel.EMAIL) & (ActivityLog.direction == Direction.OUTBOUND)
+    r = ActivityDailyRollup
+    is_phone = r.channel == Channel.PHONE
+    is_email_out = (r.channel == Channel.EMAIL) & (r.direction == Direction.OUTBOUND)
 
-    calls_expr = sqlfunc.sum(case((is_phone, 1), else_=0))
-    emails_expr = sqlfunc.sum(case((is_email_out, 1), else_=0))
+    calls_expr = sqlfunc.sum(case((is_phone, r.activity_count), else_=0))
+    emails_expr = sqlfunc.sum(case((is_email_out, r.activity_count), else_=0))
 
     query = db.query(
-        ActivityLog.user_id,
+        r.user_id,
         calls_expr.label("calls"),
         emails_expr.label("emails"),
-    ).filter(ActivityLog.user_id.isnot(None))
+    ).filter(r.user_id > 0)
     if start is not None:
-        query = query.filter(ActivityLog.created_at >= start)
-    query = query.group_by(ActivityLog.user_id)
+        query = query.filter(r.day >= start.date())
+    query = query.group_by(r.user_id)
 
     return {
         row.user_id: {
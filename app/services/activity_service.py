@@ -11,7 +11,6 @@ from datetime import UTC, datetime, timedelta
 
 from loguru import logger
 from sqlalchemy import func
-from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Session, selectinload
 
 from app.config import settings
@@ -25,6 +24,8 @@ from app.constants import (
     OutreachChannel,
 )
 from app.models import ActivityLog, Company, CustomerSite, SiteContact, VendorCard, VendorContact
+from app.services.activity_rollup import company_last_activity_at
+from app.services.entity_resolver import resolve_many, vendor_for_phone
 from app.utils.phone import normalize_e164
 from app.utils.token_manager import _utc
 from app.vendor_utils import GENERIC_EMAIL_DOMAINS as _GENERIC_DOMAINS
@@ -55,38 +56,6 @@ _RULE_MEANINGFUL_TYPES: frozenset[str] = frozenset(
 # ═══════════════════════════════════════════════════════════════════════
 
 
-def _resolve_site_contact(email_lower: str, company_id: int, site_id: int | None, db: Session) -> int | None:
-    """Return the SiteContact.id whose email matches email_lower within the company's
-    sites.
-
-    Scoped to the matched site when known, otherwise searches all active sites for the
-    company. Prefers email_verified=True, then is_primary=True, then first found.
-    Returns None if no match — NO change to existing behaviour.
-    """
-    q = (
-        db.query(SiteContact)
-        .join(CustomerSite, SiteContact.customer_site_id == CustomerSite.id)
-        .filter(
-            func.lower(SiteContact.email) == email_lower,
-            CustomerSite.company_id == company_id,
-            CustomerSite.is_active.is_(True),
-        )
-    )
-    if site_id is not None:
-        q = q.filter(SiteContact.customer_site_id == site_id)
-    candidates = q.all()
-    if not candidates:
-        return None
-    # Prefer verified, then primary, then first
-    for sc in candidates:
-        if sc.email_verified:
-            return sc.id
-    for sc in candidates:
-        if sc.is_primary:
-            return sc.id
-    return candidates[0].id
-
-
 def match_email_to_entity(email_addr: str, db: Session) -> dict | None:
     """Match an email address to a company or vendor card.
 
@@ -94,124 +63,33 @@ def match_email_to_entity(email_addr: str, db: Session) -> dict | None:
     customer sites first, then vendor contacts, then vendor card email lists.
 
     Resolution order (most-specific wins):
-      1. Exact SiteContact.email match (highest-confidence — personal address)
+      1. Exact SiteContact.email match on an active site (highest-confidence —
+         personal address); verified, then primary, then lowest id.
       2. Exact CustomerSite.contact_email match
       3. Exact VendorContact.email match
       4. Domain → Company match; on multi-match fuzzy-scores against the email
          local-part via fuzzy_score_vendor and picks the best-scoring entity.
       5. Domain → VendorCard match; same fuzzy tie-break on multi-match.
 
-    For customer-side matches also resolves the SiteContact whose email equals the
-    address and includes site_contact_id in the result (None when no contact found).
+    Customer-side matches carry site_contact_id (None unless tier 1 matched — any
+    SiteContact with this address on an active site is a tier-1 hit).
+
+    Served from ``entity_resolver``'s index; callers matching a batch of addresses
+    should warm it with ``entity_resolver.resolve_many`` first.
     """
     if not email_addr:
         return None
-    email_lower = email_addr.strip().lower()
-    domain = email_lower.split("@")[-1] if "@" in email_lower else None
-    local_part = email_lower.split("@")[0] if "@" in email_lower else email_lower
-
-    # 1. Exact SiteContact.email match — resolves directly to company without
-    #    needing an intermediate CustomerSite lookup.
-    # Order: verified first, then primary, then lowest id — mirrors _resolve_site_contact.
-    sc_exact = (
-        db.query(SiteContact)
-        .join(CustomerSite, SiteContact.customer_site_id == CustomerSite.id)
-        .filter(
-            func.lower(SiteContact.email) == email_lower,
-            CustomerSite.is_active.is_(True),
-        )
-        .order_by(
-            SiteContact.email_verified.desc(),
-            SiteContact.is_primary.desc(),
-            SiteContact.id.asc(),
-        )
-        .first()
-    )
-    if sc_exact:
-        site = db.get(CustomerSite, sc_exact.customer_site_id)
-        if site:
-            return {
-                "type": "company",
-                "id": site.company_id,
-                "name": site.site_name,
-                "site_id": site.id,
-                "site_contact_id": sc_exact.id,
-            }
-
-    # 2. Exact CustomerSite.contact_email match
-    site = (
-        db.query(CustomerSite)
-        .filter(
-            func.lower(CustomerSite.contact_email) == email_lower,
-            CustomerSite.is_active.is_(True),
-        )
-        .first()
-    )
-    if site:
-        sc_id = _resolve_site_contact(email_lower, site.company_id, site.id, db)
-        return {
-            "type": "company",
-            "id": site.company_id,
-            "name": site.site_name,
-            "site_id": site.id,
-            "site_contact_id": sc_id,
-        }
+    return resolve_many([email_addr], db).get(email_addr.strip().lower())
 
-    # 3. Exact VendorContact.email match
-    vc = db.query(VendorContact).filter(func.lower(VendorContact.email) == email_lower).first()
-    if vc:
-        card = db.get(VendorCard, vc.vendor_card_id)
-        if card:
-            return {"type": "vendor", "id": card.id, "name": card.display_name, "vendor_contact_id": vc.id}
 
-    if not domain or domain in _GENERIC_DOMAINS:
-        return None
-
-    # 4. Domain match against companies — fuzzy tie-break when multiple match.
-    companies = db.query(Company).filter(func.lower(Company.domain) == domain, Company.is_active.is_(True)).all()
-    if companies:
-        from app.vendor_utils import fuzzy_score_vendor
-
-        best = max(companies, key=lambda c: fuzzy_score_vendor(local_part, c.name))
-        sc_id = _resolve_site_contact(email_lower, best.id, None, db)
-        return {"type": "company", "id": best.id, "name": best.name, "site_contact_id": sc_id}
-
-    # 5. Domain match against vendor_cards — fuzzy tie-break when multiple match.
-    vendors = (
-        db.query(VendorCard)
-        .filter(
-            func.lower(VendorCard.domain) == domain,
-            VendorCard.is_blacklisted.is_(False),
-        )
-        .all()
-    )
-    if vendors:
-        if len(vendors) == 1:
-            return {"type": "vendor", "id": vendors[0].id, "name": vendors[0].display_name}
-        from app.vendor_utils import fuzzy_score_vendor
-
-        best = max(vendors, key=lambda v: fuzzy_score_vendor(local_part, v.display_name))
-        return {"type": "vendor", "id": best.id, "name": best.display_name}
-
-    return None
-
-
-def _match_vendor_card_by_phone(db: Session, e164: str) -> VendorCard | None:
-    """Find one non-blacklisted VendorCard whose normalized_phones contains e164.
-
-    Pushes the membership test into the database instead of materializing every
-    non-blacklisted vendor card into Python.
+def _match_vendor_card_by_phone(db: Session, e164: str) -> tuple[int, str] | None:
+    """(id, display_name) of the first non-blacklisted VendorCard whose
+    normalized_phones contains e164.
 
-    Postgres: uses JSONB containment (``@>``). ``normalized_phones`` is a plain
-    ``JSON`` column (no ``@>``), so it is cast to ``JSONB`` at query time. SQLite
-    (the test DB) has neither ``JSONB`` nor ``@>``, so it falls back to a Python
-    membership test over the (blacklist-filtered) rows — the observable result is
-    identical; only Postgres gets the indexed/in-DB path.
+    Served from ``entity_resolver``'s E.164 → vendor index (one pass over
+    ``normalized_phones`` per index version) instead of a per-call JSON scan.
     """
-    base = db.query(VendorCard).filter(VendorCard.is_blacklisted.is_(False))
-    if bool(db.bind) and db.bind.dialect.name == "postgresql":
-        return base.filter(VendorCard.normalized_phones.cast(JSONB).contains([e164])).first()
-    return next((c for c in base.all() if e164 in (c.normalized_phones or [])), None)
+    return vendor_for_phone(e164, db)
 
 
 def match_phone_to_entity(phone: str, db: Session) -> dict | None:
@@ -367,19 +245,20 @@ def match_phone_to_entity(phone: str, db: Session) -> dict | None:
     # call-logging path when a higher-priority normalized-column match already
     # exists, and it must NOT materialize every non-blacklisted vendor card.
     if not candidates:
-        card = _match_vendor_card_by_phone(db, e164)
-        if card is not None:
-            key = ("vendor", card.id)
+        phone_match = _match_vendor_card_by_phone(db, e164)
+        if phone_match is not None:
+            card_id, card_name = phone_match
+            key = ("vendor", card_id)
             if key not in seen:
                 seen.add(key)
                 candidates.append(
                     {
                         "type": "vendor",
-                        "id": card.id,
-                        "name": card.display_name,
+                        "id": card_id,
+                        "name": card_name,
                         "source": "vendor_card",
                         "company_id": None,
-                        "vendor_card_id": card.id,
+                        "vendor_card_id": card_id,
                         "_site_id": None,
                         "_site_contact_id": None,
                         "_contact_name": None,
@@ -633,7 +512,7 @@ def log_meeting_activity(
 ) -> list["ActivityLog"]:
     """Log a calendar meeting, linking each matched external attendee.
 
-    Mirrors log_email_activity: resolves attendees via match_email_to_entity +
+    Mirrors log_email_activity: resolves attendees in one entity_resolver.resolve_many +
     _match_entity_links, filters own-domain / generic / junk addresses, and calls
     bump_clocks_from_activity for each linked row.
 
@@ -657,6 +536,7 @@ def log_meeting_activity(
 
     rows: list[ActivityLog] = []
     matched_entity_keys: set[str] = set()
+    matches = resolve_many(attendee_emails, db)
 
     for raw_email in attendee_emails:
         email_lower = raw_email.strip().lower()
@@ -667,7 +547,7 @@ def log_meeting_activity(
         if _is_junk_email(email_lower):
             continue
 
-        match = match_email_to_entity(email_lower, db)
+        match = matches.get(email_lower)
         if not match:
             continue
 
@@ -1013,17 +893,14 @@ def get_last_outbound_activity(db: Session, company_id: int) -> ActivityLog | No
 
 
 def days_since_last_activity(company_id: int, db: Session) -> int | None:
-    """Days since last activity on a company.
+    """Days since last activity on a company (read from the daily activity rollup).
 
     None if no activity ever.
     """
-    latest: datetime | None = (
-        db.query(func.max(ActivityLog.created_at)).filter(ActivityLog.company_id == company_id).scalar()
-    )
+    latest = company_last_activity_at(db, company_id)
     if not latest:
         return None
-    delta = datetime.now(UTC) - latest.replace(tzinfo=UTC)
-    return delta.days
+    return (datetime.now(UTC) - latest).days
 
 
 _NOTE_TYPES = frozenset(
@@ -1037,7 +914,7 @@ _NOTE_TYPES = frozenset(
 
 def get_last_activity_at(company_id: int, db: Session) -> datetime | None:
     """Return the UTC datetime of the most recent non-note ActivityLog entry for a
-    company.
+    company (its ``occurred_at``, else ``created_at`` — read from the daily rollup).
 
     None if no activity ever (or only note-type entries). Notes (NOTE, SALES_NOTE,
     CONTACT_NOTE) are excluded so that a quick note does not reset the dormancy clock.
@@ -1045,19 +922,7 @@ def get_last_activity_at(company_id: int, db: Session) -> datetime | None:
 
     Called by: app/services/prospect_reclamation.py
     """
-    latest: datetime | None = (
-        db.query(func.max(ActivityLog.created_at))
-        .filter(
-            ActivityLog.company_id == company_id,
-            ActivityLog.activity_type.notin_(_NOTE_TYPES),
-        )
-        .scalar()
-    )
-    if not latest:
-        return None
-    if latest.tzinfo is None:
-        return latest.replace(tzinfo=UTC)
-    return latest
+    return company_last_activity_at(db, company_id, exclude_types=_NOTE_TYPES)
 
 
 # ═══════════════════════════════════════════════════════════════════════
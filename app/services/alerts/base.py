@@ -74,7 +74,9 @@ def record_seen(db: Session, user: User, kind: str, ref_id: int) -> None:
     """Idempotently record that ``user`` has seen ``(kind, ref_id)``.
 
     Safe to call repeatedly: the unique constraint plus a check-then-insert (with an
-    IntegrityError fallback for the concurrent case) keeps exactly one row.
+    IntegrityError fallback for the concurrent case) keeps exactly one row. Committing
+    the insert marks this user's ``kind`` badge counter dirty, so the next badge read
+    recomputes it.
     """
     exists = (
         db.query(AlertSeen.id)
@@ -98,12 +100,17 @@ class AlertSource(abc.ABC):
     """Base class for a single tab alert.
 
     Concrete sources set ``key``, ``kind``, ``temperament`` and implement
-    ``count_for_user`` + ``new_items_for_user``.
+    ``count_for_user`` + ``new_items_for_user``. ``invalidated_by`` lists the models
+    whose writes can change a user's count; a committed write to one of them marks the
+    materialized counters of this kind dirty (services/alerts/counters.py) — for every
+    user, unless ``affected_user_ids`` narrows it. Per-user inputs (the User row, the
+    user's alert_seen rows) are invalidated per user and need not be listed.
     """
 
     key: str
     kind: AlertKind
     temperament: Temperament
+    invalidated_by: tuple[type, ...] = ()
 
     @abc.abstractmethod
     def count_for_user(self, db: Session, user: User) -> int:
@@ -113,6 +120,15 @@ class AlertSource(abc.ABC):
     def new_items_for_user(self, db: Session, user: User) -> list[AlertItem]:
         """The specific items to spotlight on tab entry (drives the glide/rail)."""
 
+    def affected_user_ids(self, obj: object) -> set[int] | None:
+        """Users whose count a write to ``obj`` (an ``invalidated_by`` instance) can change.
+
+        ``None`` (the default) means any user — the safe answer whenever ownership or
+        visibility rules reach beyond the row itself. Override only when the row names
+        every affected user (e.g. a single assignee column, old and new values).
+        """
+        return None
+
     # --- shared helpers ---------------------------------------------------
 
     def seen_ref_ids(self, db: Session, user: User) -> set[int]:
@@ -0,0 +1,365 @@
+"""Materialized alert badge counters — O(1) nav badges over the AlertSource registry.
+
+Each (user, alert kind) pair gets one ``alert_badge_counts`` row holding the last
+``count_for_user`` result, so a nav badge render is one indexed read of the tab's rows
+instead of one count query per registered source. Rows are kept honest three ways:
+
+  - Dirty marks: an after_flush listener maps every flushed model to the sources that
+    list it in ``invalidated_by`` and collects invalidation marks on the session; an
+    after_commit hook publishes them (rollback discards them). A mark is a timestamp —
+    "counters of this kind computed before now are out of date" — for one kind (all
+    users), one (user, kind) pair, or one user. A source narrows a write to the users
+    it can affect via ``AlertSource.affected_user_ids``; a flushed User or AlertSeen
+    row marks only that user, which is how ``record_seen`` drains an FYI badge. Marks
+    live in a Redis hash shared by every worker plus a process-local map (the fallback
+    while Redis is down); no counter row is written inside the domain transaction, so
+    hot-table writers never queue on counter row locks.
+  - Read-through: a missing, stale, marked, or aged-out row (``COUNTER_MAX_AGE`` — FYI
+    counts decay with the recency floor, and bulk ``query().update()`` paths bypass the
+    listener) is recomputed and stored on the read that finds it. ``computed_at`` is
+    the time the recompute STARTED, so a write committed mid-recompute still marks it.
+  - Reconcile: the alert_badge_reconcile job recomputes stale/marked/aged rows in
+    batches and returns which (user, tab) badges changed so the job can push them over
+    SSE. It also prunes marks older than ``COUNTER_MAX_AGE`` (age alone re-validates
+    the rows they covered).
+
+Fail-quiet like the registry: a source that raises contributes 0 and is not stored, so
+the next read retries it.
+
+Called by: services/alerts/registry.count_for_tab, jobs/alert_jobs.py, main.py
+           (register_counter_listeners at import).
+Depends on: models/alert_badge_count.py, models/alert_seen.py, models/auth.py,
+            services/alerts/registry.py, cache/intel_cache._get_redis (shared marks).
+"""
+
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+
+from loguru import logger
+from sqlalchemy import and_, event, or_, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.models.alert_badge_count import AlertBadgeCount
+from app.models.alert_seen import AlertSeen
+from app.models.auth import User
+
+from .base import AlertSource
+from .registry import _BY_KIND, source_for_kind, sources_for_tab, tab_for_kind
+
+# Upper bound on how long a non-stale counter is trusted without a recompute.
+COUNTER_MAX_AGE = timedelta(minutes=10)
+# Rows recomputed per reconcile pass (oldest first).
+RECONCILE_BATCH = 500
+
+# Shared dirty marks: Redis hash field -> epoch seconds of the committing write.
+_MARKS_REDIS_KEY = "alerts:badge:dirty"
+# Process-local copy — always written, read when Redis is unavailable.
+_local_marks: dict[str, float] = {}
+# session.info key holding the marks of flushed-but-uncommitted writes.
+_PENDING_INFO_KEY = "alert_badge_pending_marks"
+
+
+def _kind_mark(kind: str) -> str:
+    return f"k:{kind}"
+
+
+def _user_kind_mark(user_id: int, kind: str) -> str:
+    return f"u:{user_id}:{kind}"
+
+
+def _user_mark(user_id: int) -> str:
+    return f"u:{user_id}"
+
+
+def _marks_for_row(user_id: int, kind: str) -> tuple[str, str, str]:
+    return _kind_mark(kind), _user_kind_mark(user_id, kind), _user_mark(user_id)
+
+
+def _publish_marks(fields: set[str]) -> None:
+    """Stamp *fields* dirty as of now, locally and in the shared Redis hash."""
+    from app.cache.intel_cache import _get_redis
+
+    now = time.time()
+    for field in fields:
+        _local_marks[field] = now
+    r = _get_redis()
+    if r is None:
+        return
+    try:
+        r.hset(_MARKS_REDIS_KEY, mapping=dict.fromkeys(fields, now))
+    except Exception as e:  # noqa: BLE001 — the local map still holds the marks; age bounds other workers
+        logger.warning("alert badge dirty marks not shared: {}", e)
+
+
+def _read_marks(fields: list[str]) -> dict[str, float]:
+    """Newest mark per field across the shared hash and the local map (0.0 when unmarked)."""
+    from app.cache.intel_cache import _get_redis
+
+    marks = {f: _local_marks.get(f, 0.0) for f in fields}
+    r = _get_redis()
+    if r is None or not fields:
+        return marks
+    try:
+        shared = r.hmget(_MARKS_REDIS_KEY, fields)
+    except Exception as e:  # noqa: BLE001 — fall back to this worker's own marks
+        logger.warning("alert badge dirty marks unavailable: {}", e)
+        return marks
+    for field, raw in zip(fields, shared, strict=True):
+        if raw is not None:
+            marks[field] = max(marks[field], float(raw))
+    return marks
+
+
+def _all_marks() -> dict[str, float]:
+    """Every live mark (reconcile scan), pruning ones older than ``COUNTER_MAX_AGE``."""
+    from app.cache.intel_cache import _get_redis
+
+    floor = time.time() - COUNTER_MAX_AGE.total_seconds()
+    for field in [f for f, ts in _local_marks.items() if ts < floor]:
+        del _local_marks[field]
+    marks = dict(_local_marks)
+    r = _get_redis()
+    if r is None:
+        return marks
+    try:
+        shared = r.hgetall(_MARKS_REDIS_KEY)
+        expired = []
+        for raw_field, raw_ts in shared.items():
+            field = raw_field.decode() if isinstance(raw_field, bytes) else raw_field
+            ts = float(raw_ts)
+            if ts < floor:
+                expired.append(field)
+            else:
+                marks[field] = max(marks.get(field, 0.0), ts)
+        if expired:
+            r.hdel(_MARKS_REDIS_KEY, *expired)
+    except Exception as e:  # noqa: BLE001 — reconcile still covers stale/aged rows
+        logger.warning("alert badge dirty marks unavailable: {}", e)
+    return marks
+
+
+def _compute(db: Session, user: User, source: AlertSource) -> int | None:
+    """The live count for one source, or None when the source raised."""
+    try:
+        return source.count_for_user(db, user)
+    except Exception:  # noqa: BLE001 — a badge must never break the nav; the source retries next read
+        logger.exception("alert source {} count failed", source.kind)
+        return None
+
+
+def _store(
+    db: Session, user_id: int, kind: str, count: int, row: AlertBadgeCount | None, computed_at: datetime
+) -> None:
+    """Upsert one counter row (IntegrityError fallback for a concurrent first insert)."""
+    if row is not None:
+        row.count = count
+        row.stale = False
+        row.computed_at = computed_at
+        return
+    try:
+        with db.begin_nested():
+            db.add(AlertBadgeCount(user_id=user_id, alert_kind=kind, count=count, stale=False, computed_at=computed_at))
+    except IntegrityError:
+        # Inserted concurrently by another request — that writer's value stands.
+        pass
+
+
+def _is_fresh(row: AlertBadgeCount, cutoff: datetime, marks: dict[str, float]) -> bool:
+    if row.stale or row.computed_at < cutoff:
+        return False
+    newest_mark = max(marks.get(f, 0.0) for f in _marks_for_row(row.user_id, row.alert_kind))
+    return bool(row.computed_at.timestamp() > newest_mark)
+
+
+def tab_count(db: Session, user: User, tab_key: str) -> int:
+    """Sum of the tab's materialized counters, recomputing any missing/stale/aged row.
+
+    Commits only when it had to (re)store a counter and the session holds no
+    uncommitted writes of its own (those ride the caller's commit); a warm badge is a
+    single SELECT (plus one HMGET of the tab's dirty marks when Redis is up).
+    """
+    sources = sources_for_tab(tab_key)
+    if not sources:
+        return 0
+    kinds = [str(s.kind) for s in sources]
+    rows = {
+        r.alert_kind: r
+        for r in db.scalars(
+            select(AlertBadgeCount)
+            .where(AlertBadgeCount.user_id == user.id, AlertBadgeCount.alert_kind.in_(kinds))
+            .execution_options(populate_existing=True)
+        )
+    }
+    marks = _read_marks([f for kind in kinds for f in _marks_for_row(user.id, kind)])
+    # Marks of this session's own flushed-but-uncommitted writes: those counters are
+    # recomputed (read-your-writes) but never stored, and the caller's open transaction
+    # is never committed from here.
+    pending = db.info.get(_PENDING_INFO_KEY) or set()
+    cutoff = datetime.now(UTC) - COUNTER_MAX_AGE
+    total = 0
+    dirty = False
+    for source in sources:
+        row = rows.get(str(source.kind))
+        own_write = any(f in pending for f in _marks_for_row(user.id, str(source.kind)))
+        if row is not None and not own_write and _is_fresh(row, cutoff, marks):
+            total += row.count
+            continue
+        started = datetime.now(UTC)
+        count = _compute(db, user, source)
+        if count is None:
+            continue
+        total += count
+        if own_write:
+            continue
+        _store(db, user.id, str(source.kind), count, row, started)
+        dirty = True
+    if dirty and not pending:
+        try:
+            db.commit()
+        except SQLAlchemyError:
+            logger.exception("alert badge counter store failed for tab {}", tab_key)
+            db.rollback()
+    return total
+
+
+def _marked_clause(marks: dict[str, float]):
+    """SQL predicate matching the counter rows computed before a live mark covering them."""
+    clauses = []
+    for field, ts in marks.items():
+        at = datetime.fromtimestamp(ts, UTC)
+        parts = field.split(":")
+        if parts[0] == "k" and len(parts) == 2:
+            clauses.append(and_(AlertBadgeCount.alert_kind == parts[1], AlertBadgeCount.computed_at <= at))
+        elif parts[0] == "u" and len(parts) == 3:
+            clauses.append(
+                and_(
+                    AlertBadgeCount.user_id == int(parts[1]),
+                    AlertBadgeCount.alert_kind == parts[2],
+                    AlertBadgeCount.computed_at <= at,
+                )
+            )
+        elif parts[0] == "u" and len(parts) == 2:
+            clauses.append(and_(AlertBadgeCount.user_id == int(parts[1]), AlertBadgeCount.computed_at <= at))
+    return clauses
+
+
+def reconcile_counters(db: Session, batch_size: int = RECONCILE_BATCH) -> set[tuple[int, str]]:
+    """Recompute up to ``batch_size`` stale, marked or aged-out counters, oldest first.
+
+    Rows for an unregistered kind or an inactive/deleted user are dropped. Returns the
+    ``(user_id, tab_key)`` pairs whose count actually changed, for the SSE push.
+    """
+    cutoff = datetime.now(UTC) - COUNTER_MAX_AGE
+    rows = list(
+        db.scalars(
+            select(AlertBadgeCount)
+            .where(
+                or_(
+                    AlertBadgeCount.stale.is_(True),
+                    AlertBadgeCount.computed_at < cutoff,
+                    *_marked_clause(_all_marks()),
+                )
+            )
+            .order_by(AlertBadgeCount.computed_at.asc())
+            .limit(batch_size)
+        )
+    )
+    if not rows:
+        return set()
+    users = {
+        u.id: u
+        for u in db.scalars(select(User).where(User.id.in_({r.user_id for r in rows}), User.is_active.is_(True)))
+    }
+    changed: set[tuple[int, str]] = set()
+    for row in rows:
+        source = source_for_kind(row.alert_kind)
+        user = users.get(row.user_id)
+        if source is None or user is None:
+            db.delete(row)
+            continue
+        started = datetime.now(UTC)
+        count = _compute(db, user, source)
+        if count is None:
+            continue
+        if count != row.count:
+            tab_key = tab_for_kind(row.alert_kind)
+            if tab_key:
+                changed.add((row.user_id, tab_key))
+        _store(db, row.user_id, row.alert_kind, count, row, started)
+    db.commit()
+    return changed
+
+
+# --- invalidation listeners -----------------------------------------------
+
+
+def _sources_by_table() -> dict[str, list[AlertSource]]:
+    """table name → sources whose counts that table's writes can change."""
+    mapping: dict[str, list[AlertSource]] = defaultdict(list)
+    for source in _BY_KIND.values():
+        for model in source.invalidated_by:
+            mapping[model.__table__.name].append(source)
+    return mapping
+
+
+def _collect_marks_after_flush(session: Session, flush_context) -> None:
+    """Queue the dirty marks for this flush's writes on the session (no SQL).
+
+    Published by ``_publish_after_commit`` only if the transaction commits.
+    """
+    by_table: dict[str, list[AlertSource]] | None = None
+    fields: set[str] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, AlertBadgeCount):
+            continue
+        if isinstance(obj, User):
+            if obj.id is not None:
+                fields.add(_user_mark(obj.id))
+            continue
+        if isinstance(obj, AlertSeen):
+            if obj.user_id is not None:
+                fields.add(_user_kind_mark(obj.user_id, obj.alert_kind))
+            continue
+        table = getattr(obj, "__table__", None)
+        if table is None:
+            continue
+        if by_table is None:
+            by_table = _sources_by_table()
+        for source in by_table.get(table.name, ()):
+            kind = str(source.kind)
+            user_ids = source.affected_user_ids(obj)
+            if user_ids is None:
+                fields.add(_kind_mark(kind))
+            else:
+                fields.update(_user_kind_mark(uid, kind) for uid in user_ids)
+    if fields:
+        session.info.setdefault(_PENDING_INFO_KEY, set()).update(fields)
+
+
+def _publish_after_commit(session: Session) -> None:
+    if session.in_nested_transaction():
+        return  # SAVEPOINT release — the outer transaction may still roll back
+    fields = session.info.pop(_PENDING_INFO_KEY, None)
+    if fields:
+        _publish_marks(fields)
+
+
+def _discard_after_rollback(session: Session, previous_transaction: SessionTransaction) -> None:
+    # A SAVEPOINT rollback keeps the outer transaction's marks (over-marking is harmless).
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_INFO_KEY, None)
+
+
+def register_counter_listeners() -> None:
+    """Attach the invalidation listeners to every ORM Session.
+
+    Idempotent — SQLAlchemy deduplicates by (event_name, listener_fn) identity.
+    """
+    if not event.contains(Session, "after_flush", _collect_marks_after_flush):
+        event.listen(Session, "after_flush", _collect_marks_after_flush)
+        event.listen(Session, "after_commit", _publish_after_commit)
+        event.listen(Session, "after_soft_rollback", _discard_after_rollback)
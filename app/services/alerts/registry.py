@@ -5,7 +5,7 @@ source, e.g. Sales Hub = confirmed offers + vendor inbound). Concrete sources ar
 registered centrally in services/alerts/sources/__init__.py.
 
 Called by: the badge/seen routers, the list partials (markers_for_tab).
-Depends on: services/alerts/base.py.
+Depends on: services/alerts/base.py, services/alerts/counters.py (count_for_tab).
 """
 
 from __future__ import annotations
@@ -51,16 +51,14 @@ def tab_for_kind(kind: str) -> str | None:
 def count_for_tab(db: Session, user: User, tab_key: str) -> int:
     """Sum of this tab's sources' counts for ``user``.
 
-    Fail-quiet per source: a badge must never break the nav, so a source that raises
-    is logged and contributes 0.
+    Served from the materialized per-(user, kind) counters (services/alerts/counters.py):
+    one indexed read when warm, a live ``count_for_user`` only for a missing, stale or
+    aged-out counter. Fail-quiet per source: a badge must never break the nav, so a
+    source that raises is logged and contributes 0.
     """
-    total = 0
-    for source in sources_for_tab(tab_key):
-        try:
-            total += source.count_for_user(db, user)
-        except Exception:
-            logger.exception("alert source {} count failed", source.kind)
-    return total
+    from .counters import tab_count
+
+    return tab_count(db, user, tab_key)
 
 
 def markers_for_tab(db: Session, user: User, tab_key: str) -> dict[str, dict]:
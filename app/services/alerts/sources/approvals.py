@@ -41,6 +41,7 @@ class ApprovalRequestActionSource(AlertSource):
     key = "approval_action"
     kind = AlertKind.APPROVAL_ACTION
     temperament = Temperament.ACTION
+    invalidated_by = (ApprovalRequest, ApprovalStep, ApprovalStepRecipient)
 
     def _actionable_items(self, db: Session, user: User) -> list[AlertItem]:
         """REQUESTED requests where the user holds a PENDING recipient row.
@@ -36,6 +36,7 @@ from app.constants import (
     SOVerificationStatus,
 )
 from app.dependencies import can_approve_buy_plans
+from app.models.approvals import ApprovalRequest
 from app.models.auth import User
 from app.models.buy_plan import BuyPlan, BuyPlanLine, VerificationGroupMember
 
@@ -48,6 +49,7 @@ class BuyplanActionSource(AlertSource):
     key = "buy_plans_action"
     kind = AlertKind.BUYPLAN_ACTION
     temperament = Temperament.ACTION
+    invalidated_by = (BuyPlan, BuyPlanLine, VerificationGroupMember, ApprovalRequest)
 
     def _actionable_items(self, db: Session, user: User) -> list[AlertItem]:
         """The union of open buy-plan steps this user personally owns.
@@ -99,7 +101,6 @@ class BuyplanActionSource(AlertSource):
         #    here so it never goes invisible.
         if can_approve_buy_plans(user):
             from app.constants import ApprovalRequestStatus, ApprovalSubjectType
-            from app.models.approvals import ApprovalRequest
 
             open_req_subq = (
                 db.query(ApprovalRequest.subject_id)
@@ -47,6 +47,7 @@ class InboundCustomerSource(AlertSource):
     key = "crm_inbound"
     kind = AlertKind.INBOUND_CUSTOMER
     temperament = Temperament.FYI
+    invalidated_by = (ActivityLog, Company, CustomerSite)
 
     def _eligible_query(self, db: Session, user: User) -> Query[ActivityLog]:
         """Inbound, recent, mine, undismissed, unseen activity — ordered oldest-first.
@@ -32,6 +32,7 @@ class OfferConfirmedSource(AlertSource):
     key = "sales_hub_offers"
     kind = AlertKind.OFFER_CONFIRMED
     temperament = Temperament.FYI
+    invalidated_by = (Offer, Requirement, Requisition)
 
     def _eligible_query(self, db: Session, user: User) -> Query[Offer]:
         """Confirmed, qualified, recent, mine, unseen offers — ordered oldest-first.
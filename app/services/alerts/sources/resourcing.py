@@ -35,6 +35,7 @@ class BuyplanResourcingSource(AlertSource):
     key = "buy_plans_resourcing"
     kind = AlertKind.BUYPLAN_RESOURCING
     temperament = Temperament.ACTION
+    invalidated_by = (BuyPlan, BuyPlanLine)
 
     def _pool(self, db: Session, user: User) -> list[AlertItem]:
         if user.role not in _PO_CUTTER_ROLES:
@@ -20,10 +20,12 @@ Depends on: services/alerts/base.AlertSource, constants.AlertKind,
 
 from __future__ import annotations
 
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 
 from app.constants import AlertKind
 from app.models.auth import User
+from app.models.task import RequisitionTask
 from app.services.task_service import get_my_tasks, get_my_tasks_summary
 
 from ..base import AlertItem, AlertSource, Temperament
@@ -35,6 +37,17 @@ class TasksActionSource(AlertSource):
     key = "tasks"
     kind = AlertKind.TASKS_ACTION
     temperament = Temperament.ACTION
+    invalidated_by = (RequisitionTask,)
+
+    def affected_user_ids(self, obj: object) -> set[int] | None:
+        """The task's assignee before and after the write — nobody else's count moves."""
+        state = inspect(obj)
+        if "assigned_to_id" in state.unloaded:
+            return None  # expired row — the assignee is unknown without a query
+        history = state.attrs.assigned_to_id.history
+        if state.has_identity and history.added and not history.deleted:
+            return None  # reassigned while expired — the previous assignee was never loaded
+        return {uid for uid in history.sum() if uid is not None}
 
     def count_for_user(self, db: Session, user: User) -> int:
         """The open-tasks-assigned-to-me count (the summary's ``assigned_to_me``)."""
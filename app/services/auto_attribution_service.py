@@ -36,6 +36,7 @@ def run_auto_attribution(db: Session) -> dict:
         match_email_to_entity,
         match_phone_to_entity,
     )
+    from .entity_resolver import resolve_many
 
     stats = {"rule_matched": 0, "ai_matched": 0, "auto_dismissed": 0, "skipped": 0}
 
@@ -61,7 +62,8 @@ def run_auto_attribution(db: Session) -> dict:
     cutoff_30d = now - timedelta(days=30)
     still_unmatched = []
 
-    # Pass 1: Rule-based matching (free, fast)
+    # Pass 1: Rule-based matching (free, fast). One batch resolve for every email.
+    resolve_many((act.contact_email for act in activities), db)
     for act in activities:
         match = None
         if act.contact_email:
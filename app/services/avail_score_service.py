@@ -12,42 +12,18 @@ Sales outcomes:   Win Rate, Revenue, Quote Volume, Proactive Conversion, Strateg
 Bonus: 1st place $500, 2nd $250, 3rd $100 — must meet minimum score thresholds.
 
 Called by: scheduler.py (daily), routers/performance.py (on-demand)
-Depends on: models (Requisition, Contact, Offer, Quote, BuyPlan, ActivityLog, etc.)
+Depends on: services/scoring_context.py (month data), models (AvailScoreSnapshot, User)
 """
 
-from datetime import UTC, date, timedelta
+from datetime import date, timedelta
 
 from loguru import logger
-from sqlalchemy import and_, or_
-from sqlalchemy import func as sqlfunc
 from sqlalchemy.orm import Session
 
-from ..constants import (
-    ActivityType,
-    BuyPlanStatus,
-    ContactStatus,
-    Direction,
-    ProactiveOfferStatus,
-    QuoteStatus,
-    UserRole,
-)
-from ..models import (
-    ActivityLog,
-    BuyPlan,
-    BuyPlanLine,
-    Company,
-    Contact,
-    CustomerSite,
-    Offer,
-    ProactiveOffer,
-    Quote,
-    Requisition,
-    SiteContact,
-    StockListHash,
-    User,
-)
+from ..constants import ContactStatus, UserRole
+from ..models import User
 from ..models.performance import AvailScoreSnapshot
-from .scoring_helpers import month_range
+from .scoring_context import QUOTE_FOLLOWUP_DAYS, QUOTED_STATUSES, MonthScoringContext, as_utc
 
 # ── Bonus thresholds ─────────────────────────────────────────────────
 BONUS_1ST = 500.0
@@ -73,178 +49,76 @@ def _tier(value, thresholds):
     return 0
 
 
-def _as_utc(dt):
-    """Treat a naive datetime as UTC; pass tz-aware datetimes through unchanged."""
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=UTC)
-    return dt
-
-
 # ══════════════════════════════════════════════════════════════════════
 #  BUYER AVAIL SCORE
 # ══════════════════════════════════════════════════════════════════════
 
 
-def compute_buyer_avail_score(db: Session, user_id: int, month: date) -> dict:
+def compute_buyer_avail_score(db: Session, user_id: int, month: date, ctx: MonthScoringContext | None = None) -> dict:
     """Compute all 10 buyer metrics for a given month.
 
+    Reads everything from *ctx* (built for this user alone when not given), so scoring
+    every buyer against one shared context issues no per-user queries.
+
     Returns dict with b1–b5, o1–o5 scores, labels, raw values, and totals.
     """
-    start_dt, end_dt = month_range(month)
+    ctx = ctx or MonthScoringContext(db, month, user_ids=[user_id])
 
-    # ── Fetch user's reqs for the month ──
+    # ── User's reqs for the month ──
     # Include reqs the user created, sent RFQs on, or logged offers for
-    created_ids = {
-        rid
-        for (rid,) in db.query(Requisition.id)
-        .filter(
-            Requisition.created_by == user_id,
-            Requisition.created_at >= start_dt,
-            Requisition.created_at < end_dt,
-        )
-        .all()
-    }
-    rfq_req_ids = {
-        rid
-        for (rid,) in db.query(Contact.requisition_id.distinct())
-        .filter(
-            Contact.user_id == user_id,
-            Contact.created_at >= start_dt,
-            Contact.created_at < end_dt,
-        )
-        .all()
-    }
-    offer_req_ids = {
-        rid
-        for (rid,) in db.query(Offer.requisition_id.distinct())
-        .filter(
-            Offer.entered_by_id == user_id,
-            Offer.created_at >= start_dt,
-            Offer.created_at < end_dt,
-        )
-        .all()
-        if rid is not None
-    }
-    all_req_ids = created_ids | rfq_req_ids | offer_req_ids
-    user_reqs = db.query(Requisition).filter(Requisition.id.in_(all_req_ids)).all() if all_req_ids else []
-    req_ids = [r.id for r in user_reqs]
+    req_ids = sorted(rid for rid in ctx.req_ids_by_user.get(user_id, ()) if rid in ctx.requisition_created_at)
     total_reqs = len(req_ids)
 
-    # Pre-load offer IDs in quotes and buy plans (same pattern as existing leaderboard)
-    quoted_offer_ids = set()
-    # No arbitrary row cap: a global .limit() silently dropped offers past the cap and
-    # undercounted O2/O4 (which drive real payouts). Scan all sent/won/lost quotes.
-    for (items,) in (
-        db.query(Quote.line_items).filter(Quote.status.in_([QuoteStatus.SENT, QuoteStatus.WON, QuoteStatus.LOST])).all()
-    ):
-        for item in items or []:
-            oid = item.get("offer_id")
-            if oid:
-                quoted_offer_ids.add(oid)
-
-    po_confirmed_offer_ids = set()
-    bp_offer_ids = set()
-    for bp_status, offer_id in (
-        db.query(BuyPlan.status, BuyPlanLine.offer_id)
-        .join(BuyPlanLine, BuyPlanLine.buy_plan_id == BuyPlan.id)
-        .filter(BuyPlanLine.offer_id.isnot(None))
-        .all()
-    ):
-        bp_offer_ids.add(offer_id)
-        if bp_status in (BuyPlanStatus.COMPLETED.value,):
-            po_confirmed_offer_ids.add(offer_id)
-
     # User's offers this month
-    user_offers = (
-        db.query(Offer)
-        .filter(
-            Offer.entered_by_id == user_id,
-            Offer.created_at >= start_dt,
-            Offer.created_at < end_dt,
-        )
-        .all()
-    )
+    user_offers = ctx.month_offers_by_user.get(user_id, [])
     user_offer_ids = {o.id for o in user_offers}
 
     # ── B1: Speed to Source ──
     # Avg hours from req created → first RFQ sent
-    b1_score, b1_raw = _buyer_b1_speed_to_source(db, req_ids, user_reqs)
+    b1_score, b1_raw = _buyer_b1_speed_to_source(ctx, req_ids)
 
     # ── B2: Multi-Source Discipline ──
     # Avg distinct vendors contacted per req
-    b2_score, b2_raw = _buyer_b2_multi_source(db, req_ids, user_id)
+    b2_score, b2_raw = _buyer_b2_multi_source(ctx, req_ids, user_id)
 
     # ── B3: Vendor Follow-Up ──
     # % of stale RFQs that got a 2nd contact
-    b3_score, b3_raw = _buyer_b3_vendor_followup(db, req_ids, user_id, start_dt, end_dt)
+    b3_score, b3_raw = _buyer_b3_vendor_followup(ctx, req_ids, user_id)
 
     # ── B4: Pipeline Hygiene ──
     # % of reqs with offers within 5 days
-    b4_score, b4_raw = _buyer_b4_pipeline_hygiene(db, req_ids, user_reqs)
+    b4_score, b4_raw = _buyer_b4_pipeline_hygiene(ctx, req_ids)
 
     # ── B5: Stock List Processing ──
-    b5_count = (
-        db.query(sqlfunc.count(StockListHash.id))
-        .filter(
-            StockListHash.user_id == user_id,
-            StockListHash.first_seen_at >= start_dt,
-            StockListHash.first_seen_at < end_dt,
-        )
-        .scalar()
-    ) or 0
+    b5_count = ctx.stock_lists_by_user.get(user_id, 0)
     b5_score = _tier(b5_count, [(10, 10), (8, 8), (5, 6), (3, 4), (1, 2)])
     b5_raw = f"{b5_count} lists"
 
     behavior_total = b1_score + b2_score + b3_score + b4_score + b5_score
 
     # ── O1: Sourcing Ratio ──
-    reqs_with_offers = 0
-    if req_ids:
-        reqs_with_offers = (
-            db.query(sqlfunc.count(Requisition.id.distinct()))
-            .join(Offer, Offer.requisition_id == Requisition.id)
-            .filter(Requisition.id.in_(req_ids))
-            .scalar()
-        ) or 0
+    reqs_with_offers = sum(1 for rid in req_ids if rid in ctx.first_offer_at)
     sourcing_pct = round(reqs_with_offers / total_reqs * 100) if total_reqs else 0
     o1_score = _tier(sourcing_pct, [(90, 10), (80, 8), (70, 6), (60, 4), (1, 2)])
     o1_raw = f"{sourcing_pct}% ({reqs_with_offers}/{total_reqs})"
 
     # ── O2: Offer→Quote Rate ──
-    offers_in_quotes = sum(1 for oid in user_offer_ids if oid in quoted_offer_ids)
+    offers_in_quotes = sum(1 for oid in user_offer_ids if oid in ctx.quoted_offer_ids)
     total_user_offers = len(user_offers)
     oq_pct = round(offers_in_quotes / total_user_offers * 100) if total_user_offers else 0
     o2_score = _tier(oq_pct, [(60, 10), (50, 8), (40, 6), (30, 4), (1, 2)])
     o2_raw = f"{oq_pct}% ({offers_in_quotes}/{total_user_offers})"
 
     # ── O3: Win Rate ──
-    won = (
-        db.query(sqlfunc.count(Quote.id))
-        .filter(
-            Quote.created_by_id == user_id,
-            Quote.result == QuoteStatus.WON,
-            Quote.result_at >= start_dt,
-            Quote.result_at < end_dt,
-        )
-        .scalar()
-    ) or 0
-    lost = (
-        db.query(sqlfunc.count(Quote.id))
-        .filter(
-            Quote.created_by_id == user_id,
-            Quote.result == QuoteStatus.LOST,
-            Quote.result_at >= start_dt,
-            Quote.result_at < end_dt,
-        )
-        .scalar()
-    ) or 0
+    won = ctx.quotes_won_by_user.get(user_id, 0)
+    lost = ctx.quotes_lost_by_user.get(user_id, 0)
     win_pct = round(won / (won + lost) * 100) if (won + lost) else 0
     o3_score = _tier(win_pct, [(60, 10), (50, 8), (40, 6), (30, 4), (1, 2)])
     o3_raw = f"{win_pct}% ({won}W/{lost}L)"
 
     # ── O4: Buy Plan Completion ──
-    user_bp_offer_ids = user_offer_ids & bp_offer_ids
-    user_po_offer_ids = user_offer_ids & po_confirmed_offer_ids
+    user_bp_offer_ids = user_offer_ids & ctx.bp_offer_ids
+    user_po_offer_ids = user_offer_ids & ctx.po_offer_ids
     bp_total = len(user_bp_offer_ids)
     bp_confirmed = len(user_po_offer_ids)
     bp_pct = round(bp_confirmed / bp_total * 100) if bp_total else 0
@@ -252,16 +126,7 @@ def compute_buyer_avail_score(db: Session, user_id: int, month: date) -> dict:
     o4_raw = f"{bp_pct}% ({bp_confirmed}/{bp_total})"
 
     # ── O5: Vendor Diversity ──
-    vendor_count = (
-        db.query(sqlfunc.count(Offer.vendor_card_id.distinct()))
-        .filter(
-            Offer.entered_by_id == user_id,
-            Offer.created_at >= start_dt,
-            Offer.created_at < end_dt,
-            Offer.vendor_card_id.isnot(None),
-        )
-        .scalar()
-    ) or 0
+    vendor_count = len({o.vendor_card_id for o in user_offers if o.vendor_card_id is not None})
     o5_score = _tier(vendor_count, [(15, 10), (12, 8), (8, 6), (5, 4), (1, 2)])
     o5_raw = f"{vendor_count} vendors"
 
@@ -307,29 +172,20 @@ def compute_buyer_avail_score(db: Session, user_id: int, month: date) -> dict:
     }
 
 
-def _buyer_b1_speed_to_source(db, req_ids, user_reqs):
+def _buyer_b1_speed_to_source(ctx, req_ids):
     """B1: Avg hours from req created → first RFQ sent."""
     if not req_ids:
         return 0, "no reqs"
 
-    # First contact per req
-    first_contacts = (
-        db.query(
-            Contact.requisition_id,
-            sqlfunc.min(Contact.created_at).label("first_at"),
-        )
-        .filter(Contact.requisition_id.in_(req_ids))
-        .group_by(Contact.requisition_id)
-        .all()
-    )
-    fc_map = {r: fa for r, fa in first_contacts}
-
     total_hours = 0
     counted = 0
-    for req in user_reqs:
-        first_at = fc_map.get(req.id)
-        if first_at and req.created_at:
-            hours = (_as_utc(first_at) - _as_utc(req.created_at)).total_seconds() / 3600
+    for rid in req_ids:
+        # First contact per req (any user)
+        contact_times = [as_utc(c.created_at) for c in ctx.req_contacts.get(rid, []) if c.created_at]
+        created_at = ctx.requisition_created_at.get(rid)
+        if contact_times and created_at:
+            first_at = min(contact_times)
+            hours = (first_at - as_utc(created_at)).total_seconds() / 3600
             if hours >= 0:
                 total_hours += hours
                 counted += 1
@@ -354,101 +210,79 @@ def _buyer_b1_speed_to_source(db, req_ids, user_reqs):
     return score, f"{avg_hours:.1f}h avg"
 
 
-def _buyer_b2_multi_source(db, req_ids, user_id):
+def _buyer_b2_multi_source(ctx, req_ids, user_id):
     """B2: Avg distinct vendors contacted per req."""
     if not req_ids:
         return 0, "no reqs"
 
-    vendor_counts = (
-        db.query(
-            Contact.requisition_id,
-            sqlfunc.count(Contact.vendor_name_normalized.distinct()).label("cnt"),
-        )
-        .filter(
-            Contact.requisition_id.in_(req_ids),
-            Contact.user_id == user_id,
-        )
-        .group_by(Contact.requisition_id)
-        .all()
-    )
+    vendor_counts = []
+    for rid in req_ids:
+        mine = [c for c in ctx.req_contacts.get(rid, []) if c.user_id == user_id]
+        if mine:
+            vendor_counts.append(len({c.vendor_name_normalized for c in mine} - {None}))
 
     if not vendor_counts:
         return 0, "0 vendors/req"
 
-    avg_vendors = sum(vc.cnt for vc in vendor_counts) / len(vendor_counts)
+    avg_vendors = sum(vendor_counts) / len(vendor_counts)
     score = _tier(avg_vendors, [(4, 10), (3, 8), (2, 6), (1.5, 4), (1, 2)])
     return score, f"{avg_vendors:.1f} vendors/req"
 
 
-def _buyer_b3_vendor_followup(db, req_ids, user_id, start_dt, end_dt):
+def _buyer_b3_vendor_followup(ctx, req_ids, user_id):
     """B3: % of stale RFQs (>48h no reply) that got a follow-up contact."""
     if not req_ids:
         return 0, "no reqs"
 
-    cutoff_48h = end_dt - timedelta(hours=48)
+    cutoff_48h = ctx.end_dt - timedelta(hours=48)
 
-    # Stale: status=sent, created >48h ago, in this month's reqs
-    stale_contacts = (
-        db.query(Contact)
-        .filter(
-            Contact.requisition_id.in_(req_ids),
-            Contact.user_id == user_id,
-            Contact.status == ContactStatus.SENT,
-            Contact.created_at >= start_dt,
-            Contact.created_at <= cutoff_48h,
-        )
-        .all()
-    )
-
-    if not stale_contacts:
-        return 10, "no stale RFQs"  # all got responses = perfect
-
-    # Check which stale contacts have a follow-up (same req + same vendor, later date)
+    # Stale: status=sent, created >48h ago, in this month's reqs.
+    # Follow-up: a later contact on the same req + vendor by the same user.
+    stale = 0
     followed_up = 0
-    for sc in stale_contacts:
-        followup = (
-            db.query(Contact.id)
-            .filter(
-                Contact.requisition_id == sc.requisition_id,
-                Contact.vendor_name_normalized == sc.vendor_name_normalized,
-                Contact.user_id == user_id,
-                Contact.created_at > sc.created_at,
-            )
-            .first()
-        )
-        if followup:
-            followed_up += 1
+    for rid in req_ids:
+        mine = [c for c in ctx.req_contacts.get(rid, []) if c.user_id == user_id]
+        for sc in mine:
+            if sc.status != ContactStatus.SENT or not sc.created_at:
+                continue
+            sent_at = as_utc(sc.created_at)
+            if not ctx.start_dt <= sent_at <= cutoff_48h:
+                continue
+            stale += 1
+            if sc.vendor_name_normalized is not None and any(
+                c.vendor_name_normalized == sc.vendor_name_normalized
+                and c.created_at
+                and as_utc(c.created_at) > sent_at
+                for c in mine
+            ):
+                followed_up += 1
+
+    if not stale:
+        return 10, "no stale RFQs"  # all got responses = perfect
 
-    pct = round(followed_up / len(stale_contacts) * 100)
+    pct = round(followed_up / stale * 100)
     score = _tier(pct, [(80, 10), (60, 8), (40, 6), (20, 4), (1, 2)])
-    return score, f"{pct}% ({followed_up}/{len(stale_contacts)})"
+    return score, f"{pct}% ({followed_up}/{stale})"
 
 
-def _buyer_b4_pipeline_hygiene(db, req_ids, user_reqs):
+def _buyer_b4_pipeline_hygiene(ctx, req_ids):
     """B4: % of reqs that got at least one offer within 5 days of creation."""
     if not req_ids:
         return 0, "no reqs"
 
     progressed = 0
-    for req in user_reqs:
-        if not req.created_at:
+    for rid in req_ids:
+        created_at = ctx.requisition_created_at.get(rid)
+        if not created_at:
             continue
-        deadline = _as_utc(req.created_at) + timedelta(days=5)
-
-        has_offer = (
-            db.query(Offer.id)
-            .filter(
-                Offer.requisition_id == req.id,
-                Offer.created_at <= deadline,
-            )
-            .first()
-        )
-        if has_offer:
+        deadline = as_utc(created_at) + timedelta(days=5)
+        first_offer = ctx.first_offer_at.get(rid)
+        if first_offer is not None and as_utc(first_offer) <= deadline:
             progressed += 1
 
-    pct = round(progressed / len(user_reqs) * 100) if user_reqs else 0
+    pct = round(progressed / len(req_ids) * 100)
     score = _tier(pct, [(90, 10), (80, 8), (70, 6), (60, 4), (1, 2)])
-    return score, f"{pct}% ({progressed}/{len(user_reqs)})"
+    return score, f"{pct}% ({progressed}/{len(req_ids)})"
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -456,104 +290,45 @@ def _buyer_b4_pipeline_hygiene(db, req_ids, user_reqs):
 # ══════════════════════════════════════════════════════════════════════
 
 
-def compute_sales_avail_score(db: Session, user_id: int, month: date) -> dict:
-    """Compute all 10 sales metrics for a given month."""
-    start_dt, end_dt = month_range(month)
-    # Calls + emails, direction-agnostic: the prior tuple held both call
-    # directions, so call_logged (canonical, any direction) preserves intent.
-    call_and_email_types = (ActivityType.EMAIL_SENT, ActivityType.CALL_LOGGED)
+def compute_sales_avail_score(db: Session, user_id: int, month: date, ctx: MonthScoringContext | None = None) -> dict:
+    """Compute all 10 sales metrics for a given month.
+
+    Reads everything from *ctx* (built for this user alone when not given).
+    """
+    ctx = ctx or MonthScoringContext(db, month, user_ids=[user_id])
 
     # ── B1: Account Coverage ──
-    # % of owned accounts with outbound activity this month
-    owned_company_ids = [
-        r[0] for r in db.query(CustomerSite.company_id).filter(CustomerSite.owner_id == user_id).distinct().all()
-    ]
+    # % of owned accounts with outbound (call / email) activity this month
+    owned_company_ids = ctx.owned_company_ids_by_user.get(user_id, set())
     total_owned = len(owned_company_ids)
-
-    contacted_ids = set()
-    if owned_company_ids:
-        contacted_ids = {
-            r[0]
-            for r in db.query(ActivityLog.company_id)
-            .filter(
-                ActivityLog.user_id == user_id,
-                ActivityLog.activity_type.in_(call_and_email_types),
-                ActivityLog.company_id.in_(owned_company_ids),
-                ActivityLog.created_at >= start_dt,
-                ActivityLog.created_at < end_dt,
-            )
-            .distinct()
-            .all()
-        }
+    outreach_companies = ctx.outreach_companies(user_id)
+    contacted_ids = outreach_companies & owned_company_ids
     coverage_pct = round(len(contacted_ids) / total_owned * 100) if total_owned else 0
     b1_score = _tier(coverage_pct, [(90, 10), (80, 8), (70, 6), (50, 4), (1, 2)])
     b1_raw = f"{coverage_pct}% ({len(contacted_ids)}/{total_owned})"
 
     # ── B2: Outreach Consistency ──
     # Distinct days this month with ≥1 outbound activity
-    active_days = (
-        db.query(sqlfunc.count(sqlfunc.distinct(sqlfunc.date(ActivityLog.created_at))))
-        .filter(
-            ActivityLog.user_id == user_id,
-            ActivityLog.activity_type.in_(call_and_email_types),
-            ActivityLog.created_at >= start_dt,
-            ActivityLog.created_at < end_dt,
-        )
-        .scalar()
-    ) or 0
+    active_days = ctx.outreach_days(user_id)
     b2_score = _tier(active_days, [(18, 10), (15, 8), (12, 6), (8, 4), (1, 2)])
     b2_raw = f"{active_days} days"
 
     # ── B3: Quote Follow-Up ──
     # % of sent quotes that got a follow-up activity within 5 days
-    b3_score, b3_raw = _sales_b3_quote_followup(db, user_id, start_dt, end_dt)
+    b3_score, b3_raw = _sales_b3_quote_followup(ctx, user_id)
 
     # ── B4: Proactive Selling ──
-    proactive_sent = (
-        db.query(sqlfunc.count(ProactiveOffer.id))
-        .filter(
-            ProactiveOffer.salesperson_id == user_id,
-            ProactiveOffer.sent_at >= start_dt,
-            ProactiveOffer.sent_at < end_dt,
-        )
-        .scalar()
-    ) or 0
+    proactive_sent = ctx.proactive_sent_by_user.get(user_id, 0)
     b4_score = _tier(proactive_sent, [(10, 10), (7, 8), (5, 6), (3, 4), (1, 2)])
     b4_raw = f"{proactive_sent} sent"
 
     # ── B5: New Business Dev ──
     # Counts new accounts created, new contacts added, AND prospect outreach
     # (calls/emails to companies the user doesn't own — open pool / unowned)
-    new_accounts = (
-        db.query(sqlfunc.count(Company.id))
-        .filter(
-            Company.account_owner_id == user_id,
-            Company.created_at >= start_dt,
-            Company.created_at < end_dt,
-        )
-        .scalar()
-    ) or 0
-    new_contacts = (
-        db.query(sqlfunc.count(SiteContact.id))
-        .join(CustomerSite, CustomerSite.id == SiteContact.customer_site_id)
-        .filter(
-            CustomerSite.owner_id == user_id,
-            SiteContact.created_at >= start_dt,
-            SiteContact.created_at < end_dt,
-        )
-        .scalar()
-    ) or 0
+    new_accounts = ctx.new_accounts_by_user.get(user_id, 0)
+    new_contacts = ctx.new_contacts_by_user.get(user_id, 0)
     # Distinct prospect companies contacted (not owned by this user)
-    prospect_q = db.query(sqlfunc.count(sqlfunc.distinct(ActivityLog.company_id))).filter(
-        ActivityLog.user_id == user_id,
-        ActivityLog.activity_type.in_(call_and_email_types),
-        ActivityLog.company_id.isnot(None),
-        ActivityLog.created_at >= start_dt,
-        ActivityLog.created_at < end_dt,
-    )
-    if owned_company_ids:
-        prospect_q = prospect_q.filter(~ActivityLog.company_id.in_(owned_company_ids))
-    prospect_companies = prospect_q.scalar() or 0
+    prospect_companies = len(outreach_companies - owned_company_ids)
     new_biz = new_accounts + new_contacts + prospect_companies
     b5_score = _tier(new_biz, [(8, 10), (6, 8), (4, 6), (2, 4), (1, 2)])
     b5_raw = f"{new_accounts} accts + {new_contacts} contacts + {prospect_companies} prospects"
@@ -566,108 +341,39 @@ def compute_sales_avail_score(db: Session, user_id: int, month: date) -> dict:
     # 0-110 — easier to clear the absolute QUALIFY gates (60/50/40) that drive real
     # $500/$250/$100 payouts — and b6 was never persisted, so the breakdown could not
     # reconcile (b1..b5 ≠ behavior_total).
-    avg_quality_raw = (
-        db.query(sqlfunc.avg(ActivityLog.quality_score))
-        .filter(
-            ActivityLog.user_id == user_id,
-            ActivityLog.is_meaningful.is_(True),
-            ActivityLog.quality_assessed_at.isnot(None),
-            ActivityLog.created_at >= start_dt,
-            ActivityLog.created_at <= end_dt,
-        )
-        .scalar()
-    ) or 0.0
+    avg_quality_raw = ctx.avg_quality_by_user.get(user_id, 0.0)
     b6 = _tier(avg_quality_raw, [(80, 10), (60, 8), (40, 6), (20, 4), (1, 2)])
 
     behavior_total = b1_score + b2_score + b3_score + b4_score + b5_score
 
     # ── O1: Win Rate ──
-    won = (
-        db.query(sqlfunc.count(Quote.id))
-        .filter(
-            Quote.created_by_id == user_id,
-            Quote.result == QuoteStatus.WON,
-            Quote.result_at >= start_dt,
-            Quote.result_at < end_dt,
-        )
-        .scalar()
-    ) or 0
-    lost = (
-        db.query(sqlfunc.count(Quote.id))
-        .filter(
-            Quote.created_by_id == user_id,
-            Quote.result == QuoteStatus.LOST,
-            Quote.result_at >= start_dt,
-            Quote.result_at < end_dt,
-        )
-        .scalar()
-    ) or 0
+    won = ctx.quotes_won_by_user.get(user_id, 0)
+    lost = ctx.quotes_lost_by_user.get(user_id, 0)
     win_pct = round(won / (won + lost) * 100) if (won + lost) else 0
     o1_score = _tier(win_pct, [(60, 10), (50, 8), (40, 6), (30, 4), (1, 2)])
     o1_raw = f"{win_pct}% ({won}W/{lost}L)"
 
     # ── O2: Revenue (normalized to team median) ──
     # We score absolute revenue here; normalization happens at ranking time
-    revenue = (
-        db.query(sqlfunc.coalesce(sqlfunc.sum(Quote.won_revenue), 0))
-        .filter(
-            Quote.created_by_id == user_id,
-            Quote.result == QuoteStatus.WON,
-            Quote.result_at >= start_dt,
-            Quote.result_at < end_dt,
-        )
-        .scalar()
-    ) or 0
-    revenue = float(revenue)
+    revenue = ctx.won_revenue_by_user.get(user_id, 0.0)
     # Threshold-based: $50K+/mo = 10, $30K = 8, $15K = 6, $5K = 4, >0 = 2
     o2_score = _tier(revenue, [(50000, 10), (30000, 8), (15000, 6), (5000, 4), (1, 2)])
     o2_raw = f"${revenue:,.0f}"
 
     # ── O3: Quote Volume ──
-    quotes_sent = (
-        db.query(sqlfunc.count(Quote.id))
-        .filter(
-            Quote.created_by_id == user_id,
-            Quote.sent_at >= start_dt,
-            Quote.sent_at < end_dt,
-        )
-        .scalar()
-    ) or 0
+    quotes_sent = len(ctx.sent_quotes_by_user.get(user_id, []))
     o3_score = _tier(quotes_sent, [(15, 10), (12, 8), (8, 6), (5, 4), (1, 2)])
     o3_raw = f"{quotes_sent} quotes"
 
     # ── O4: Proactive Conversion ──
-    proactive_converted = (
-        db.query(sqlfunc.count(ProactiveOffer.id))
-        .filter(
-            ProactiveOffer.salesperson_id == user_id,
-            ProactiveOffer.status == ProactiveOfferStatus.CONVERTED,
-            ProactiveOffer.converted_at >= start_dt,
-            ProactiveOffer.converted_at < end_dt,
-        )
-        .scalar()
-    ) or 0
+    proactive_converted = ctx.proactive_converted_by_user.get(user_id, 0)
     proactive_conv_pct = round(proactive_converted / proactive_sent * 100) if proactive_sent else 0
     o4_score = _tier(proactive_conv_pct, [(40, 10), (30, 8), (20, 6), (10, 4), (1, 2)])
     o4_raw = f"{proactive_conv_pct}% ({proactive_converted}/{proactive_sent})"
 
     # ── O5: Strategic Account Wins ──
     # Wins on quotes linked to strategic-flagged companies
-    strategic_wins = 0
-    if won > 0:
-        strategic_wins = (
-            db.query(sqlfunc.count(Quote.id))
-            .join(CustomerSite, Quote.customer_site_id == CustomerSite.id)
-            .join(Company, CustomerSite.company_id == Company.id)
-            .filter(
-                Quote.created_by_id == user_id,
-                Quote.result == QuoteStatus.WON,
-                Quote.result_at >= start_dt,
-                Quote.result_at < end_dt,
-                Company.is_strategic.is_(True),
-            )
-            .scalar()
-        ) or 0
+    strategic_wins = ctx.strategic_wins_by_user.get(user_id, 0) if won > 0 else 0
     o5_score = _tier(strategic_wins, [(5, 10), (4, 8), (3, 6), (2, 4), (1, 2)])
     o5_raw = f"{strategic_wins} strategic wins"
 
@@ -675,16 +381,7 @@ def compute_sales_avail_score(db: Session, user_id: int, month: date) -> dict:
     total_score = behavior_total + outcome_total
 
     # Activity count for qualification
-    total_activities = (
-        db.query(sqlfunc.count(ActivityLog.id))
-        .filter(
-            ActivityLog.user_id == user_id,
-            ActivityLog.activity_type.in_(call_and_email_types),
-            ActivityLog.created_at >= start_dt,
-            ActivityLog.created_at < end_dt,
-        )
-        .scalar()
-    ) or 0
+    total_activities = ctx.outreach_count(user_id)
 
     return {
         "role_type": "sales",
@@ -728,53 +425,23 @@ def compute_sales_avail_score(db: Session, user_id: int, month: date) -> dict:
     }
 
 
-def _sales_b3_quote_followup(db, user_id, start_dt, end_dt):
+def _sales_b3_quote_followup(ctx, user_id):
     """B3: % of sent quotes followed up within 5 days."""
-    sent_quotes = (
-        db.query(Quote)
-        .filter(
-            Quote.created_by_id == user_id,
-            Quote.sent_at >= start_dt,
-            Quote.sent_at < end_dt,
-            Quote.status.in_([QuoteStatus.SENT, QuoteStatus.WON, QuoteStatus.LOST]),
-        )
-        .all()
-    )
+    sent_quotes = [q for q in ctx.sent_quotes_by_user.get(user_id, []) if q.status in QUOTED_STATUSES]
 
     if not sent_quotes:
         return 10, "no quotes sent"  # nothing to follow up on
 
     followed_up = 0
     for q in sent_quotes:
-        if not q.sent_at:  # pragma: no cover
+        sent_at = as_utc(q.sent_at)
+        followup_deadline = sent_at + timedelta(days=QUOTE_FOLLOWUP_DAYS)
+
+        # Outbound activity on the quote's company (via its customer site) after it was sent
+        company_id = ctx.site_company_ids.get(q.customer_site_id)
+        if company_id is None:
             continue
-        sent_at = _as_utc(q.sent_at)
-        followup_deadline = sent_at + timedelta(days=5)
-
-        # Look for outbound activity on the same company after quote was sent
-        has_followup = (
-            db.query(ActivityLog.id)
-            .filter(
-                ActivityLog.user_id == user_id,
-                or_(
-                    ActivityLog.activity_type == ActivityType.EMAIL_SENT,
-                    and_(
-                        ActivityLog.activity_type == ActivityType.CALL_LOGGED,
-                        ActivityLog.direction == Direction.OUTBOUND,
-                    ),
-                ),
-                ActivityLog.created_at > sent_at,
-                ActivityLog.created_at <= followup_deadline,
-            )
-            .filter(
-                # Match by company through the quote's customer_site
-                ActivityLog.company_id.in_(
-                    db.query(CustomerSite.company_id).filter(CustomerSite.id == q.customer_site_id)
-                )
-            )
-            .first()
-        )
-        if has_followup:
+        if any(sent_at < t <= followup_deadline for t in ctx.followup_times.get((user_id, company_id), [])):
             followed_up += 1
 
     pct = round(followed_up / len(sent_quotes) * 100)
@@ -787,12 +454,16 @@ def _sales_b3_quote_followup(db, user_id, start_dt, end_dt):
 # ══════════════════════════════════════════════════════════════════════
 
 
-def compute_all_avail_scores(db: Session, month: date | None = None) -> dict:
+def compute_all_avail_scores(db: Session, month: date | None = None, ctx: MonthScoringContext | None = None) -> dict:
     """Compute Avail Scores for all buyers and salespeople, rank, assign bonuses.
 
+    Every user is scored from one shared MonthScoringContext (*ctx*, or one built
+    here), so the month's data is read once instead of once per user.
+
     Returns summary dict with counts.
     """
     month = (month or date.today()).replace(day=1)
+    ctx = ctx or MonthScoringContext(db, month)
 
     # Exclude system/bot users (e.g. AvailAI Agent)
     _human = [User.is_active.is_(True), ~User.email.like("%@availai.local")]
@@ -807,7 +478,7 @@ def compute_all_avail_scores(db: Session, month: date | None = None) -> dict:
     buyer_results = []
     for user in buyers:
         try:
-            result = compute_buyer_avail_score(db, user.id, month)
+            result = compute_buyer_avail_score(db, user.id, month, ctx)
             result["user_id"] = user.id
             result["user_name"] = user.name
             buyer_results.append(result)
@@ -817,7 +488,7 @@ def compute_all_avail_scores(db: Session, month: date | None = None) -> dict:
     sales_results = []
     for user in sales + multi_role:
         try:
-            result = compute_sales_avail_score(db, user.id, month)
+            result = compute_sales_avail_score(db, user.id, month, ctx)
             result["user_id"] = user.id
             result["user_name"] = user.name
             sales_results.append(result)
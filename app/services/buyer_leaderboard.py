@@ -1,24 +1,16 @@
 """Buyer Leaderboard — Multiplier scoring with 7-day grace period and stock list dedup.
 
 Called by: scheduler.py (monthly), routers/performance.py (on-demand)
-Depends on: models, database
+Depends on: models, services/scoring_context.py (month data)
 """
 
-from datetime import UTC, date, datetime, timedelta
+from datetime import UTC, date, datetime
 
-from sqlalchemy import func as sqlfunc
 from sqlalchemy.orm import Session
 
-from ..constants import BuyPlanStatus, UserRole
-from ..models import (
-    BuyerLeaderboardSnapshot,
-    BuyPlan,
-    BuyPlanLine,
-    Offer,
-    Quote,
-    StockListHash,
-    User,
-)
+from ..constants import UserRole
+from ..models import BuyerLeaderboardSnapshot, User
+from .scoring_context import MonthScoringContext
 
 # Buyer point multipliers
 PTS_LOGGED = 1
@@ -27,93 +19,28 @@ PTS_BUYPLAN = 5
 PTS_PO_CONFIRMED = 8
 PTS_STOCK_LIST = 2
 
-GRACE_DAYS = 7
 
+def compute_buyer_leaderboard(db: Session, month: date, ctx: MonthScoringContext | None = None) -> dict:
+    """Compute buyer leaderboard for a given month.
 
-def compute_buyer_leaderboard(db: Session, month: date) -> dict:
-    """Compute buyer leaderboard for a given month."""
-    # Normalize to first of month
+    Offer status sets, offers and stock-list counts come from *ctx* (one shared
+    MonthScoringContext, or one built here).
+    """
     month_start = month.replace(day=1)
-    if month_start.month == 12:
-        month_end = month_start.replace(year=month_start.year + 1, month=1)
-    else:
-        month_end = month_start.replace(month=month_start.month + 1)
-
-    month_start_dt = datetime(month_start.year, month_start.month, month_start.day, tzinfo=UTC)
-    month_end_dt = datetime(month_end.year, month_end.month, month_end.day, tzinfo=UTC)
-
-    # Grace period: last 7 days of previous month
-    grace_start_dt = month_start_dt - timedelta(days=GRACE_DAYS)
+    ctx = ctx or MonthScoringContext(db, month_start)
 
     # Get all buyers
     buyers = db.query(User).filter(User.role.in_([UserRole.BUYER, UserRole.TRADER])).all()
 
-    # Collect all offer_ids that appear in quotes and buy plans (for status checks)
-    quoted_offer_ids = set()
-    for (items,) in db.query(Quote.line_items).filter(Quote.status.in_(["sent", "won", "lost"])).limit(10000).all():
-        for item in items or []:
-            oid = item.get("offer_id")
-            if oid:
-                quoted_offer_ids.add(oid)
-
-    # Buy plans: get offer_ids from BuyPlanLine rows
-    buyplan_offer_ids = set()
-    po_confirmed_offer_ids = set()
-    for bp_status, offer_id in (
-        db.query(BuyPlan.status, BuyPlanLine.offer_id)
-        .join(BuyPlanLine, BuyPlanLine.buy_plan_id == BuyPlan.id)
-        .filter(BuyPlanLine.offer_id.isnot(None))
-        .limit(10000)
-        .all()
-    ):
-        buyplan_offer_ids.add(offer_id)
-        if bp_status in (BuyPlanStatus.COMPLETED.value,):
-            po_confirmed_offer_ids.add(offer_id)
-
-    # Batch-fetch all offers and stock counts to avoid N+1 per buyer
-    buyer_ids = [b.id for b in buyers]
-
-    all_month_offers = (
-        db.query(Offer)
-        .filter(
-            Offer.entered_by_id.in_(buyer_ids),
-            Offer.created_at >= month_start_dt,
-            Offer.created_at < month_end_dt,
-        )
-        .all()
-    )
-    month_offers_by_buyer: dict[int, list] = {}
-    for o in all_month_offers:
-        month_offers_by_buyer.setdefault(o.entered_by_id, []).append(o)
-
-    all_grace_offers = (
-        db.query(Offer)
-        .filter(
-            Offer.entered_by_id.in_(buyer_ids),
-            Offer.created_at >= grace_start_dt,
-            Offer.created_at < month_start_dt,
-        )
-        .all()
-    )
-    grace_offers_by_buyer: dict[int, list] = {}
-    for o in all_grace_offers:
-        grace_offers_by_buyer.setdefault(o.entered_by_id, []).append(o)
-
-    stock_counts = dict(
-        db.query(StockListHash.user_id, sqlfunc.count(StockListHash.id))
-        .filter(
-            StockListHash.user_id.in_(buyer_ids),
-            StockListHash.first_seen_at >= month_start_dt,
-            StockListHash.first_seen_at < month_end_dt,
-        )
-        .group_by(StockListHash.user_id)
-        .all()
-    )
+    # Offer ids that appear in quotes and buy plans (for status checks)
+    quoted_offer_ids = ctx.quoted_offer_ids
+    buyplan_offer_ids = ctx.bp_offer_ids
+    po_confirmed_offer_ids = ctx.po_offer_ids
 
     entries = []
     for buyer in buyers:
-        month_offers = month_offers_by_buyer.get(buyer.id, [])
-        grace_offers = grace_offers_by_buyer.get(buyer.id, [])
+        month_offers = ctx.month_offers_by_user.get(buyer.id, [])
+        grace_offers = ctx.grace_offers_by_user.get(buyer.id, [])
 
         # Grace offers only count if they advanced during this month
         grace_advanced = [o for o in grace_offers if o.id in quoted_offer_ids or o.id in buyplan_offer_ids]
@@ -125,7 +52,7 @@ def compute_buyer_leaderboard(db: Session, month: date) -> dict:
         quoted = sum(1 for oid in offer_ids if oid in quoted_offer_ids)
         in_buyplan = sum(1 for oid in offer_ids if oid in buyplan_offer_ids)
         po_confirmed = sum(1 for oid in offer_ids if oid in po_confirmed_offer_ids)
-        stock_uploaded = stock_counts.get(buyer.id, 0)
+        stock_uploaded = ctx.stock_lists_by_user.get(buyer.id, 0)
 
         pts_logged = logged * PTS_LOGGED
         pts_quoted = quoted * PTS_QUOTED
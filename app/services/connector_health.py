@@ -4,12 +4,15 @@ Reads the ApiSource telemetry columns that health_monitor.ping_source /
 deep_test_source and the search path maintain (status, last_success, last_error,
 error_count_24h, avg_response_ms, total_searches) and applies the shared
 auto-degrade heuristic: >=4 errors in the last 24h AND more failures than
-successes reports DEGRADED regardless of the stored status.
+successes reports DEGRADED regardless of the stored status. Each row also carries the
+live adaptive-limiter state of the serving process (concurrency limit, in-flight calls,
+p50/p95 latency, 429 and deadline counts — connectors/limits.py).
 
 Called by: app.routers.htmx.settings.admin_api_health (HTMX partial, embedded in the
     settings System tab) and app.routers.admin.system api_connector_health +
     api_health_dashboard (JSON — effective_status only).
-Depends on: app.models.config.ApiSource, app.constants.ApiSourceStatus.
+Depends on: app.models.config.ApiSource, app.constants.ApiSourceStatus,
+    app.connectors.limits (live limiter snapshots).
 """
 
 from datetime import datetime
@@ -17,6 +20,7 @@ from typing import TypedDict
 
 from sqlalchemy.orm import Session
 
+from ..connectors.limits import LimiterSnapshot, limiter_snapshots
 from ..constants import ApiSourceStatus
 from ..models.config import ApiSource
 
@@ -36,6 +40,7 @@ class ConnectorRow(TypedDict):
     error_count_24h: int
     avg_response_ms: int
     total_searches: int
+    live: LimiterSnapshot | None
 
 
 class HealthDashboard(TypedDict):
@@ -89,7 +94,12 @@ def _overall_status(connectors: list[ConnectorRow]) -> str:
 
 def get_health_dashboard(db: Session) -> HealthDashboard:
     """Assemble the connector-health dashboard context from api_sources telemetry."""
+    from ..search_service import _CONNECTOR_SOURCE_MAP
+
     sources = db.query(ApiSource).order_by(ApiSource.display_name).all()
+    # Limiters are keyed by connector class; a process that has not searched a source
+    # yet has no limiter for it (live=None).
+    live = {_CONNECTOR_SOURCE_MAP.get(cls, cls): snap for cls, snap in limiter_snapshots().items()}
     connectors: list[ConnectorRow] = [
         ConnectorRow(
             name=src.display_name or src.name,
@@ -101,6 +111,7 @@ def get_health_dashboard(db: Session) -> HealthDashboard:
             error_count_24h=src.error_count_24h or 0,
             avg_response_ms=src.avg_response_ms or 0,
             total_searches=src.total_searches or 0,
+            live=live.get(src.name),
         )
         for src in sources
     ]
@@ -15,12 +15,11 @@ Core functions:
 from __future__ import annotations
 
 from collections.abc import Coroutine
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
 import sqlalchemy.exc
 from loguru import logger
-from sqlalchemy import func as sqlfunc
 from sqlalchemy.orm import Session
 
 if TYPE_CHECKING:
@@ -412,146 +411,68 @@ def _compute_trend(interactions_30d: int, interactions_60d: int, interactions_90
     return "stable"
 
 
+# VendorContacts loaded and flushed per scoring page.
+_SCORE_PAGE = 500
+
+
 def compute_all_contact_scores(db: Session) -> dict:
     """Batch-compute scores for all VendorContacts.
 
+    Activity stats come from one grouped read of the daily activity rollup; contacts
+    are walked in id-ordered pages so every contact is scored, however many exist.
+
     Returns {updated: int, skipped: int}.
     """
-    from ..models import ActivityLog, VendorContact
+    from ..models import VendorCard, VendorContact
+    from .activity_rollup import contact_window_stats
 
     now = datetime.now(UTC)
-    cutoff_30d = now - timedelta(days=30)
-    cutoff_60d = now - timedelta(days=60)
-    cutoff_90d = now - timedelta(days=90)
-
-    contacts = db.query(VendorContact).limit(5000).all()
-    if not contacts:
-        return {"updated": 0, "skipped": 0}
-
-    contact_ids = [c.id for c in contacts]
-
-    # Batch query: interaction counts per contact per window
-    def _count_window(since):
-        rows = (
-            db.query(
-                ActivityLog.vendor_contact_id,
-                sqlfunc.count(ActivityLog.id),
-            )
-            .filter(
-                ActivityLog.vendor_contact_id.in_(contact_ids),
-                ActivityLog.occurred_at >= since,
-            )
-            .group_by(ActivityLog.vendor_contact_id)
-            .all()
-        )
-        return {r[0]: r[1] for r in rows}
-
-    counts_30d = _count_window(cutoff_30d)
-    counts_60d = _count_window(cutoff_60d)
-    counts_90d = _count_window(cutoff_90d)
-
-    # Channel diversity per contact
-    channel_rows = (
-        db.query(
-            ActivityLog.vendor_contact_id,
-            sqlfunc.count(sqlfunc.distinct(ActivityLog.channel)),
-        )
-        .filter(ActivityLog.vendor_contact_id.in_(contact_ids))
-        .group_by(ActivityLog.vendor_contact_id)
-        .all()
-    )
-    channel_map = {r[0]: r[1] for r in channel_rows}
-
-    # Win counts: activities with type containing 'won' or 'po_issued'
-    win_rows = (
-        db.query(
-            ActivityLog.vendor_contact_id,
-            sqlfunc.count(ActivityLog.id),
-        )
-        .filter(
-            ActivityLog.vendor_contact_id.in_(contact_ids),
-            ActivityLog.activity_type.in_(["po_issued", "quote_won", "deal_won"]),
-        )
-        .group_by(ActivityLog.vendor_contact_id)
-        .all()
-    )
-    win_map = {r[0]: r[1] for r in win_rows}
-
-    # Total interactions per contact
-    total_rows = (
-        db.query(
-            ActivityLog.vendor_contact_id,
-            sqlfunc.count(ActivityLog.id),
-        )
-        .filter(ActivityLog.vendor_contact_id.in_(contact_ids))
-        .group_by(ActivityLog.vendor_contact_id)
-        .all()
-    )
-    total_map = {r[0]: r[1] for r in total_rows}
+    stats = contact_window_stats(db, now)
 
     updated = 0
     skipped = 0
-    batch = []
-
-    # Build vendor_card_id → avg_response_hours map
-    vc_ids = {c.vendor_card_id for c in contacts if c.vendor_card_id}
-    response_hours_map: dict[int, float | None] = {}
-    if vc_ids:
-        from app.models import VendorCard
-
-        vc_rows = (
-            db.query(VendorCard.id, VendorCard.avg_response_hours)
-            .filter(
-                VendorCard.id.in_(vc_ids),
-                VendorCard.avg_response_hours.isnot(None),
-            )
+    last_id = 0
+    while True:
+        contacts = (
+            db.query(VendorContact)
+            .filter(VendorContact.id > last_id)
+            .order_by(VendorContact.id)
+            .limit(_SCORE_PAGE)
             .all()
         )
-        response_hours_map = {r[0]: r[1] for r in vc_rows}
-
-    for contact in contacts:
-        cid = contact.id
-        i30 = counts_30d.get(cid, 0)
-        i60 = counts_60d.get(cid, 0)
-        i90 = counts_90d.get(cid, 0)
-
-        result = compute_contact_relationship_score(
-            last_interaction_at=contact.last_interaction_at,
-            interactions_30d=i30,
-            interactions_60d=i60,
-            interactions_90d=i90,
-            avg_response_hours=response_hours_map.get(contact.vendor_card_id),
-            wins=win_map.get(cid, 0),
-            total_interactions=total_map.get(cid, 0),
-            distinct_channels=channel_map.get(cid, 0),
-            now=now,
-        )
-
-        contact.relationship_score = result["relationship_score"]
-        contact.activity_trend = result["activity_trend"]
-        contact.score_computed_at = now
-        batch.append(contact)
-        updated += 1
-
-        # Flush in batches of 500
-        if len(batch) >= 500:
-            try:
-                db.flush()
-                batch = []
-            except sqlalchemy.exc.SQLAlchemyError as e:
-                logger.warning("Batch score flush error: {}", e)
-                db.rollback()
-                skipped += len(batch)
-                batch = []
-
-    # Final flush
-    if batch:
+        if not contacts:
+            break
+        last_id = contacts[-1].id
+        vc_ids = {c.vendor_card_id for c in contacts if c.vendor_card_id}
+        response_hours_map: dict[int, float | None] = {
+            r[0]: r[1]
+            for r in db.query(VendorCard.id, VendorCard.avg_response_hours).filter(
+                VendorCard.id.in_(vc_ids), VendorCard.avg_response_hours.isnot(None)
+            )
+        }
+        for contact in contacts:
+            s = stats.get(contact.id, {})
+            result = compute_contact_relationship_score(
+                last_interaction_at=contact.last_interaction_at,
+                interactions_30d=s.get("30d", 0),
+                interactions_60d=s.get("60d", 0),
+                interactions_90d=s.get("90d", 0),
+                avg_response_hours=response_hours_map.get(contact.vendor_card_id),
+                wins=s.get("wins", 0),
+                total_interactions=s.get("total", 0),
+                distinct_channels=s.get("channels", 0),
+                now=now,
+            )
+            contact.relationship_score = result["relationship_score"]
+            contact.activity_trend = result["activity_trend"]
+            contact.score_computed_at = now
         try:
             db.flush()
+            updated += len(contacts)
         except sqlalchemy.exc.SQLAlchemyError as e:
-            logger.warning("Final score flush error: {}", e)
+            logger.warning("Batch score flush error: {}", e)
             db.rollback()
-            skipped += len(batch)
+            skipped += len(contacts)
 
     try:
         db.commit()
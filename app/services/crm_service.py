@@ -12,10 +12,12 @@ Depends on: app/models (Company, CustomerSite, SiteContact, Quote),
 """
 
 from datetime import UTC, datetime, timedelta
+from typing import Any
 
 from sqlalchemy import and_, func, or_, select
 from sqlalchemy import case as sa_case
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.sql.elements import ColumnElement
 
 from ..constants import RequisitionStatus
 from ..dependencies import is_manager_or_admin
@@ -84,6 +86,17 @@ _CLOCK_COLUMNS = {
 _CLOCK_COLUMN = _CLOCK_COLUMNS[Company]
 
 
+def clock_sort_keys(clock: str, *, model=Company) -> list[tuple[ColumnElement[Any], bool]]:
+    """The stalest-first clock order as ``(expression, descending)`` sort keys.
+
+    The single definition behind order_by_clock, exposed as keys so keyset-paged lists
+    (list_paging.page_rows) sort by exactly the same expressions. Callers append their
+    own unique tiebreaker (the primary key).
+    """
+    col = _CLOCK_COLUMNS[model][clock]
+    return [(col.isnot(None), False), (col, False)]
+
+
 def order_by_clock(query, clock: str, *, model=Company, now=None):
     """Order rows stalest-first: NULL clocks (never contacted) first, then oldest.
 
@@ -93,8 +106,9 @@ def order_by_clock(query, clock: str, *, model=Company, now=None):
     NULLs-first is portable across SQLite (tests) and PostgreSQL (prod) by
     ordering on the IS-NULL flag before the timestamp.
     """
-    col = _CLOCK_COLUMNS[model][clock]
-    return query.order_by(col.isnot(None), col.asc())
+    return query.order_by(
+        *[expr.desc() if descending else expr.asc() for expr, descending in clock_sort_keys(clock, model=model)]
+    )
 
 
 def cadence_state(tier: str | None, last_outbound_at: datetime | None, now: datetime | None = None) -> str:
@@ -1,11 +1,13 @@
-"""PDF document generation using WeasyPrint."""
+"""PDF document generation using WeasyPrint (via services/pdf_renderer)."""
 
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING
 
 from jinja2 import Environment, FileSystemLoader
 from sqlalchemy.orm import Session
 
+from app.services import pdf_renderer
+
 if TYPE_CHECKING:
     from app.constants import CustomerBidStatus
 
@@ -17,16 +19,14 @@ _jinja_env = Environment(
 
 def _render_pdf(template_name: str, **context) -> bytes:
     """Render a document template to PDF, injecting the shared ``generated_at``
-    stamp."""
-    from weasyprint import HTML
+    stamp.
 
+    The HTML is rendered with a stamp placeholder so ``pdf_renderer`` can key its cache
+    on the page content; layout runs in the renderer's process pool.
+    """
     template = _jinja_env.get_template(template_name)
-    html = template.render(
-        generated_at=datetime.now(UTC).strftime("%Y-%m-%d %H:%M UTC"),
-        **context,
-    )
-    # cast: weasyprint is untyped; write_pdf() without a target returns the PDF bytes.
-    return cast(bytes, HTML(string=html).write_pdf())
+    html = template.render(generated_at=pdf_renderer.STAMP_PLACEHOLDER, **context)
+    return pdf_renderer.render(template_name, html, datetime.now(UTC).strftime("%Y-%m-%d %H:%M UTC"))
 
 
 def generate_rfq_summary_pdf(requisition_id: int, db: Session) -> bytes:
@@ -2,7 +2,18 @@
 
 Fetches vendor email threads from Microsoft Graph API and links them
 to requirements via conversationId, subject tokens, part numbers,
-or vendor domain. Provides in-memory caching with 5-minute TTL.
+or vendor domain.
+
+Caching (shared by every worker through Redis; a bounded per-process LRU copy serves
+while Redis is down):
+- Thread lists per requirement / vendor — 5-minute TTL.
+- Conversations per (user, conversationId) — the Graph message fields in
+  ``_MESSAGE_SELECT`` (previews only, never bodies), kept newest-first up to
+  ``CONVERSATION_MAX_MESSAGES``. The inbox and Sent Items delta scans append new
+  messages to conversations already cached (``record_delta_messages``), and a read
+  older than the TTL asks Graph only for messages received after the newest one held.
+  Redis keeps at most ``SHARED_CONVERSATION_LIMIT`` conversations, evicting the least
+  recently read.
 
 Business Rules:
 - Never store full email bodies in PostgreSQL — Graph API is source of truth
@@ -10,25 +21,44 @@ Business Rules:
 - Detect "needs response" when last message is from vendor with no reply in 24h
 - Cache fetched threads for 5 minutes to avoid excessive Graph calls
 
-Called by: routers/emails.py
-Depends on: utils/graph_client.py, models.py, services/activity_service.py
+Called by: routers/emails.py, routers/htmx/email_views.py, email_service.poll_inbox and
+    jobs/email_jobs.scan_sent_folder (record_delta_messages)
+Depends on: utils/graph_client.py, models.py, services/activity_service.py,
+    cache/intel_cache._get_redis
 """
 
 import asyncio
+import hashlib
 import re
 import time
+from collections import OrderedDict
 from datetime import UTC, datetime, timedelta
 
 from loguru import logger
 from sqlalchemy.orm import Session
 
 from app.models import Contact, Requirement, Sighting, VendorCard, VendorContact, VendorResponse
+from app.utils import json_helpers as json
 from app.utils.graph_client import GraphClient
 
-# ── In-memory cache ────────────────────────────────────────────────────
-# key → (timestamp, data)
-_thread_cache: dict[str, tuple[float, list]] = {}
+# ── Caches ─────────────────────────────────────────────────────────────
+# Thread lists: key → (timestamp, data)
+_thread_cache: OrderedDict[str, tuple[float, list]] = OrderedDict()
+# Conversations: "{user_id}:{conversation_id}" → {"messages", "watermark", "checked_at"}
+_conversations: OrderedDict[str, dict] = OrderedDict()
 _CACHE_TTL = 300  # 5 minutes
+# Entries kept per process in each local cache.
+LOCAL_LIMIT = 512
+# Conversations kept in Redis across all users; least recently read go first.
+SHARED_CONVERSATION_LIMIT = 20_000
+# Newest messages kept per conversation (the thread viewer's page size).
+CONVERSATION_MAX_MESSAGES = 100
+# Conversations live this long in Redis without being read.
+_CONVERSATION_REDIS_TTL = 7 * 86400
+
+_LIST_REDIS_PREFIX = "emthr:list:"
+_CONV_REDIS_PREFIX = "emthr:conv:"
+_CONV_LRU_KEY = "emthr:conv:lru"
 
 from ..config import settings as _settings  # noqa: E402
 
@@ -38,10 +68,34 @@ _TRIOSCS_DOMAINS = _settings.own_domains or frozenset({"trioscs.com"})
 
 # Shared Graph $select field list for message queries
 _MESSAGE_SELECT = "id,subject,from,toRecipients,bodyPreview,receivedDateTime,conversationId"
+_MESSAGE_FIELDS = tuple(_MESSAGE_SELECT.split(","))
+
+
+def _redis():
+    from app.cache.intel_cache import _get_redis
+
+    return _get_redis()
+
+
+def _local_put(store: OrderedDict, key: str, value) -> None:
+    store[key] = value
+    store.move_to_end(key)
+    while len(store) > LOCAL_LIMIT:
+        store.popitem(last=False)
 
 
 def _cache_get(key: str) -> list | None:
-    """Return cached data if still valid, else None."""
+    """Return cached data if still valid, else None.
+
+    Redis is authoritative when reachable; the local copy serves while it is down.
+    """
+    r = _redis()
+    if r is not None:
+        try:
+            raw = r.get(_LIST_REDIS_PREFIX + key)
+            return list(json.loads(raw)) if raw else None
+        except Exception as e:  # fall through to the local copy
+            logger.warning("Thread list cache read failed: {}", e)
     entry = _thread_cache.get(key)
     if entry is None:
         return None
@@ -49,17 +103,160 @@ def _cache_get(key: str) -> list | None:
     if time.time() - ts > _CACHE_TTL:
         del _thread_cache[key]
         return None
+    _thread_cache.move_to_end(key)
     return data
 
 
 def _cache_set(key: str, data: list) -> None:
     """Store data in cache with current timestamp."""
-    _thread_cache[key] = (time.time(), data)
+    _local_put(_thread_cache, key, (time.time(), data))
+    r = _redis()
+    if r is None:
+        return
+    try:
+        r.setex(_LIST_REDIS_PREFIX + key, _CACHE_TTL, json.dumps(data))
+    except Exception as e:  # the local copy still serves this worker
+        logger.warning("Thread list cache write failed: {}", e)
 
 
 def clear_cache() -> None:
-    """Clear all cached threads (useful for testing)."""
+    """Clear all cached threads and conversations held by this process (tests)."""
     _thread_cache.clear()
+    _conversations.clear()
+
+
+# ── Conversation store ─────────────────────────────────────────────────
+
+
+def _conv_key(user_id: int, conversation_id: str) -> str:
+    # Graph conversation ids are long base64 strings; hash them into a fixed-size key.
+    return f"{user_id}:{hashlib.sha1(conversation_id.encode(), usedforsecurity=False).hexdigest()}"
+
+
+def _slim(msg: dict) -> dict:
+    """Keep only the ``_MESSAGE_SELECT`` fields (drops bodies, headers, etc.).
+
+    Sent Items delta rows carry ``sentDateTime`` instead of ``receivedDateTime``.
+    """
+    slim = {f: msg[f] for f in _MESSAGE_FIELDS if f in msg}
+    if not slim.get("receivedDateTime") and msg.get("sentDateTime"):
+        slim["receivedDateTime"] = msg["sentDateTime"]
+    return slim
+
+
+def _merge_messages(entry: dict, messages: list[dict]) -> None:
+    """Add *messages* to a stored conversation, newest first, de-duplicated by id."""
+    by_id = {m.get("id"): m for m in entry["messages"]}
+    for m in messages:
+        by_id[m.get("id")] = _slim(m)
+    merged = sorted(by_id.values(), key=lambda m: m.get("receivedDateTime") or "", reverse=True)
+    entry["messages"] = merged[:CONVERSATION_MAX_MESSAGES]
+    entry["watermark"] = merged[0].get("receivedDateTime") if merged else None
+
+
+def _conversation_get(key: str) -> dict | None:
+    """Stored conversation for *key*: Redis when reachable, else the local copy."""
+    r = _redis()
+    if r is not None:
+        try:
+            raw = r.get(_CONV_REDIS_PREFIX + key)
+            if not raw:
+                return None
+            r.zadd(_CONV_LRU_KEY, {key: time.time()})
+            return dict(json.loads(raw))
+        except Exception as e:  # fall through to the local copy
+            logger.warning("Conversation cache read failed: {}", e)
+    entry = _conversations.get(key)
+    if entry is not None:
+        _conversations.move_to_end(key)
+    return entry
+
+
+def _conversation_put(key: str, entry: dict) -> None:
+    _local_put(_conversations, key, entry)
+    r = _redis()
+    if r is None:
+        return
+    try:
+        pipe = r.pipeline()
+        pipe.setex(_CONV_REDIS_PREFIX + key, _CONVERSATION_REDIS_TTL, json.dumps(entry))
+        pipe.zadd(_CONV_LRU_KEY, {key: time.time()})
+        pipe.zcard(_CONV_LRU_KEY)
+        size = pipe.execute()[-1]
+        if size > SHARED_CONVERSATION_LIMIT:
+            evicted = [
+                k.decode() if isinstance(k, bytes) else k
+                for k, _ in r.zpopmin(_CONV_LRU_KEY, size - SHARED_CONVERSATION_LIMIT)
+            ]
+            if evicted:
+                r.delete(*[_CONV_REDIS_PREFIX + k for k in evicted])
+    except Exception as e:  # the local copy still serves this worker
+        logger.warning("Conversation cache write failed: {}", e)
+
+
+def record_delta_messages(user_id: int, messages: list[dict]) -> int:
+    """Fold messages from a mailbox delta round into conversations already cached.
+
+    Conversations nobody has opened are not created here — the store only follows
+    threads that have been read. Returns the number of conversations updated.
+    """
+    by_conv: dict[str, list[dict]] = {}
+    for m in messages:
+        cid = m.get("conversationId")
+        if cid and m.get("id"):
+            by_conv.setdefault(cid, []).append(m)
+    updated = 0
+    for cid, msgs in by_conv.items():
+        key = _conv_key(user_id, cid)
+        entry = _conversation_get(key)
+        if entry is None:
+            continue
+        _merge_messages(entry, msgs)
+        _conversation_put(key, entry)
+        updated += 1
+    return updated
+
+
+async def _conversation_messages(gc: GraphClient, conv_id: str, user_id: int | None) -> list[dict]:
+    """All stored messages of one conversation (newest first), refreshing as needed.
+
+    A conversation not yet cached is fetched whole. A cached one older than the TTL
+    asks Graph only for messages received after its newest one.
+    """
+    key = _conv_key(user_id, conv_id) if user_id is not None else None
+    entry = _conversation_get(key) if key else None
+    if entry is not None and time.time() - entry["checked_at"] <= _CACHE_TTL:
+        return list(entry["messages"])
+
+    if entry is not None and entry.get("watermark"):
+        new_msgs = await gc.get_all_pages(
+            "/me/messages",
+            params={
+                "$filter": f"receivedDateTime gt {entry['watermark']} and conversationId eq '{conv_id}'",
+                "$select": _MESSAGE_SELECT,
+                "$orderby": "receivedDateTime asc",
+                "$top": "50",
+            },
+            max_items=CONVERSATION_MAX_MESSAGES,
+        )
+        _merge_messages(entry, new_msgs)
+    else:
+        full = await gc.get_all_pages(
+            "/me/messages",
+            params={
+                "$filter": f"conversationId eq '{conv_id}'",
+                "$select": _MESSAGE_SELECT,
+                "$orderby": "receivedDateTime desc",
+                "$top": "50",
+            },
+            max_items=CONVERSATION_MAX_MESSAGES,
+        )
+        entry = {"messages": [], "watermark": None}
+        _merge_messages(entry, full)
+    entry["checked_at"] = time.time()
+    if key:
+        _conversation_put(key, entry)
+    return list(entry["messages"])
 
 
 # ── Thread Grouping by Headers ────────────────────────────────────────────
@@ -310,19 +507,9 @@ def _collect_threads_by_conversation(messages: list[dict], known: dict[str, dict
     return summaries
 
 
-async def _fetch_conversation(gc: GraphClient, conv_id: str) -> list[dict]:
+async def _fetch_conversation(gc: GraphClient, conv_id: str, user_id: int | None = None) -> list[dict]:
     """Fetch all external (vendor-facing) messages in a single conversation."""
-    messages = await gc.get_all_pages(
-        "/me/messages",
-        params={
-            "$filter": f"conversationId eq '{conv_id}'",
-            "$select": _MESSAGE_SELECT,
-            "$orderby": "receivedDateTime desc",
-            "$top": "50",
-        },
-        max_items=50,
-    )
-    return _filter_external(messages)
+    return _filter_external(await _conversation_messages(gc, conv_id, user_id))
 
 
 async def fetch_threads_for_requirement(
@@ -370,7 +557,7 @@ async def fetch_threads_for_requirement(
         conv_id = contact.graph_conversation_id
         if conv_id and conv_id not in threads:
             try:
-                external_msgs = await _fetch_conversation(gc, conv_id)
+                external_msgs = await _fetch_conversation(gc, conv_id, user_id)
                 if external_msgs:
                     threads[conv_id] = _build_thread_summary(conv_id, external_msgs, "conversation_id")
             except Exception as e:
@@ -389,7 +576,7 @@ async def fetch_threads_for_requirement(
         conv_id = vr.graph_conversation_id
         if conv_id and conv_id not in threads:
             try:
-                external_msgs = await _fetch_conversation(gc, conv_id)
+                external_msgs = await _fetch_conversation(gc, conv_id, user_id)
                 if external_msgs:
                     threads[conv_id] = _build_thread_summary(conv_id, external_msgs, "conversation_id")
             except Exception as e:
@@ -511,12 +698,13 @@ def _build_thread_summary(conversation_id: str, messages: list[dict], matched_vi
 # ── Thread message fetching ────────────────────────────────────────────
 
 
-async def fetch_thread_messages(conversation_id: str, user_token: str) -> list[dict]:
+async def fetch_thread_messages(conversation_id: str, user_token: str, user_id: int | None = None) -> list[dict]:
     """Fetch all messages in a conversation thread.
 
     Args:
         conversation_id: The Graph API conversationId
         user_token: Valid M365 access token
+        user_id: Mailbox owner — keys the shared conversation cache (uncached if None)
 
     Returns:
         List of message dicts sorted by date ascending (oldest first)
@@ -524,22 +712,13 @@ async def fetch_thread_messages(conversation_id: str, user_token: str) -> list[d
     gc = GraphClient(user_token)
 
     try:
-        messages = await gc.get_all_pages(
-            "/me/messages",
-            params={
-                "$filter": f"conversationId eq '{conversation_id}'",
-                "$select": _MESSAGE_SELECT,
-                "$orderby": "receivedDateTime asc",
-                "$top": "50",
-            },
-            max_items=100,
-        )
+        messages = await _conversation_messages(gc, conversation_id, user_id)
     except Exception as e:
         logger.error(f"Failed to fetch thread messages for {conversation_id[:20]}: {e}")
         return []
 
     result = []
-    for msg in messages:
+    for msg in reversed(messages):
         msg_dict = _message_to_dict(msg)
         # Skip internal messages (compares against the cleaned recipient list)
         if _is_internal_message(msg_dict["from_email"], msg_dict["to"]):
@@ -0,0 +1,363 @@
+"""Entity resolver — bulk email / phone → company or vendor lookup behind a versioned
+in-process index.
+
+``activity_service.match_email_to_entity`` used to cost up to five queries per
+address (SiteContact, CustomerSite, VendorContact, Company by domain, VendorCard by
+domain), and inbox / sent-folder / webhook / calendar scans call it once per message
+participant. This module answers a whole batch instead:
+
+  - ``resolve_many(addresses, db)`` normalizes the batch, serves every address already
+    in the index, and resolves the rest with one set-based query per tier (``IN`` over
+    the batch's emails, then over its domains). Results — including "no match" — go
+    into the index, so a repeat correspondent costs a dict lookup.
+  - Index: exact email → match, domain → (company candidates, vendor candidates), and
+    E.164 → vendor card (built in one pass over ``VendorCard.normalized_phones``, the
+    last-resort tier of ``match_phone_to_entity``).
+  - Invalidation: a flush that inserts / deletes a SiteContact, CustomerSite,
+    VendorContact, Company or VendorCard, or changes a column the matcher reads, bumps
+    a version — locally at flush (the writing session sees its own change), and in
+    Redis at commit so every worker drops its index within ``VERSION_CHECK_SECONDS``.
+    ``INDEX_MAX_AGE`` bounds staleness for writes that bypass the ORM.
+
+Resolution order and tie-breaks are exactly ``match_email_to_entity``'s (see there).
+
+Called by: services/activity_service.py (match_email_to_entity, log_meeting_activity,
+    match_phone_to_entity), email_service.poll_inbox, jobs/email_jobs.scan_sent_folder,
+    services/auto_attribution_service.py, management/reattribute_activity.py,
+    main.py (register_resolver_listeners at import).
+Depends on: app.models, cache/intel_cache._get_redis, vendor_utils.fuzzy_score_vendor.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterable
+
+from loguru import logger
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.models import Company, CustomerSite, SiteContact, VendorCard, VendorContact
+from app.vendor_utils import GENERIC_EMAIL_DOMAINS
+
+# Seconds between reads of the shared (Redis) version; bounds cross-worker staleness.
+VERSION_CHECK_SECONDS = 5
+# Upper bound (seconds) on index reuse, for writes that skip the flush listener.
+INDEX_MAX_AGE = 600
+# Addresses / domains held before the index is dropped and refilled.
+INDEX_MAX_ENTRIES = 50_000
+# Addresses per set-based query round (keeps IN lists under driver parameter limits).
+_BATCH = 1000
+
+_VERSION_REDIS_KEY = "entity_resolver:version"
+# session.info flag: a flush touched a watched row; bump the shared version on commit.
+_PENDING_INFO_KEY = "entity_resolver_pending"
+
+# Columns each watched model contributes to a match; changes elsewhere don't invalidate.
+_WATCHED: dict[type, frozenset[str]] = {
+    SiteContact: frozenset({"email", "email_verified", "is_primary", "customer_site_id"}),
+    CustomerSite: frozenset({"contact_email", "is_active", "site_name", "company_id"}),
+    VendorContact: frozenset({"email", "vendor_card_id"}),
+    Company: frozenset({"domain", "is_active", "name"}),
+    VendorCard: frozenset({"domain", "is_blacklisted", "display_name", "normalized_phones"}),
+}
+
+# (id, name) pairs per domain, in id order.
+Candidates = list[tuple[int, str]]
+
+_lock = threading.Lock()
+_local_version = 0
+_index: dict = {}
+
+
+def _empty_index(version: tuple[int, int]) -> dict:
+    return {
+        "version": version,
+        "built_at": time.monotonic(),
+        "checked_at": time.monotonic(),
+        "emails": {},
+        "domains": {},
+        "phones": None,
+    }
+
+
+def _redis():
+    from app.cache.intel_cache import _get_redis
+
+    return _get_redis()
+
+
+def _shared_version() -> int:
+    r = _redis()
+    if r:
+        try:
+            return int(r.get(_VERSION_REDIS_KEY) or 0)
+        except Exception as e:  # noqa: BLE001 — Redis down: local version only
+            logger.warning("Entity resolver version read failed: {}", e)
+    return 0
+
+
+def _current() -> dict:
+    """The live index, dropped first if a write, age or size limit invalidated it."""
+    global _index
+    now = time.monotonic()
+    with _lock:
+        idx = _index
+        if idx and now - idx["checked_at"] < VERSION_CHECK_SECONDS and idx["version"][0] == _local_version:
+            return idx
+    version = (_local_version, _shared_version())
+    with _lock:
+        idx = _index
+        stale = (
+            not idx
+            or idx["version"] != version
+            or now - idx["built_at"] > INDEX_MAX_AGE
+            or len(idx["emails"]) + len(idx["domains"]) > INDEX_MAX_ENTRIES
+        )
+        if stale:
+            _index = idx = _empty_index(version)
+        idx["checked_at"] = now
+        return idx
+
+
+def bump() -> None:
+    """Invalidate the index in this process and (via Redis) in every other worker."""
+    global _local_version
+    with _lock:
+        _local_version += 1
+    r = _redis()
+    if r:
+        try:
+            r.incr(_VERSION_REDIS_KEY)
+        except Exception as e:  # noqa: BLE001 — local index already invalidated
+            logger.warning("Entity resolver version bump failed: {}", e)
+
+
+def clear() -> None:
+    """Drop the process-local index (tests)."""
+    global _index
+    with _lock:
+        _index = {}
+
+
+def _split(email_lower: str) -> tuple[str, str | None]:
+    if "@" not in email_lower:
+        return email_lower, None
+    return email_lower.split("@")[0], email_lower.split("@")[-1]
+
+
+def _exact_matches(emails: set[str], db: Session) -> dict[str, dict]:
+    """Tiers 1-3: exact SiteContact / CustomerSite / VendorContact email matches."""
+    found: dict[str, dict] = {}
+
+    # 1. SiteContact on an active site — verified, then primary, then lowest id.
+    rows = db.execute(
+        select(
+            func.lower(SiteContact.email).label("email"),
+            SiteContact.id,
+            CustomerSite.id.label("site_id"),
+            CustomerSite.company_id,
+            CustomerSite.site_name,
+        )
+        .join(CustomerSite, SiteContact.customer_site_id == CustomerSite.id)
+        .where(func.lower(SiteContact.email).in_(emails), CustomerSite.is_active.is_(True))
+        .order_by(SiteContact.email_verified.desc(), SiteContact.is_primary.desc(), SiteContact.id.asc())
+    )
+    for row in rows:
+        found.setdefault(
+            row.email,
+            {
+                "type": "company",
+                "id": row.company_id,
+                "name": row.site_name,
+                "site_id": row.site_id,
+                "site_contact_id": row.id,
+            },
+        )
+
+    # 2. CustomerSite.contact_email. Any SiteContact carrying this address on an active
+    #    site would have matched tier 1, so the site-contact lookup is always empty here.
+    remaining = emails - found.keys()
+    if remaining:
+        rows = db.execute(
+            select(
+                func.lower(CustomerSite.contact_email).label("email"),
+                CustomerSite.id,
+                CustomerSite.company_id,
+                CustomerSite.site_name,
+            )
+            .where(func.lower(CustomerSite.contact_email).in_(remaining), CustomerSite.is_active.is_(True))
+            .order_by(CustomerSite.id)
+        )
+        for row in rows:
+            found.setdefault(
+                row.email,
+                {
+                    "type": "company",
+                    "id": row.company_id,
+                    "name": row.site_name,
+                    "site_id": row.id,
+                    "site_contact_id": None,
+                },
+            )
+
+    # 3. VendorContact.email.
+    remaining = emails - found.keys()
+    if remaining:
+        rows = db.execute(
+            select(
+                func.lower(VendorContact.email).label("email"),
+                VendorContact.id,
+                VendorCard.id.label("card_id"),
+                VendorCard.display_name,
+            )
+            .join(VendorCard, VendorContact.vendor_card_id == VendorCard.id)
+            .where(func.lower(VendorContact.email).in_(remaining))
+            .order_by(VendorContact.id)
+        )
+        for row in rows:
+            found.setdefault(
+                row.email,
+                {"type": "vendor", "id": row.card_id, "name": row.display_name, "vendor_contact_id": row.id},
+            )
+    return found
+
+
+def _domain_candidates(domains: set[str], db: Session) -> dict[str, tuple[Candidates, Candidates]]:
+    """Tiers 4-5: active companies and non-blacklisted vendor cards per domain."""
+    out: dict[str, tuple[Candidates, Candidates]] = {d: ([], []) for d in domains}
+    if not domains:
+        return out
+    rows = db.execute(
+        select(func.lower(Company.domain).label("domain"), Company.id, Company.name)
+        .where(func.lower(Company.domain).in_(domains), Company.is_active.is_(True))
+        .order_by(Company.id)
+    )
+    for row in rows:
+        out[row.domain][0].append((row.id, row.name))
+    vendor_domains = {d for d, (companies, _) in out.items() if not companies}
+    if vendor_domains:
+        rows = db.execute(
+            select(func.lower(VendorCard.domain).label("domain"), VendorCard.id, VendorCard.display_name)
+            .where(func.lower(VendorCard.domain).in_(vendor_domains), VendorCard.is_blacklisted.is_(False))
+            .order_by(VendorCard.id)
+        )
+        for row in rows:
+            out[row.domain][1].append((row.id, row.display_name))
+    return out
+
+
+def _domain_match(local_part: str, companies: Candidates, vendors: Candidates) -> dict | None:
+    """Pick among a domain's candidates — fuzzy tie-break on the local part."""
+    from app.vendor_utils import fuzzy_score_vendor
+
+    if companies:
+        cid, name = max(companies, key=lambda c: fuzzy_score_vendor(local_part, c[1]))
+        return {"type": "company", "id": cid, "name": name, "site_contact_id": None}
+    if vendors:
+        vid, name = (
+            vendors[0] if len(vendors) == 1 else max(vendors, key=lambda v: fuzzy_score_vendor(local_part, v[1]))
+        )
+        return {"type": "vendor", "id": vid, "name": name}
+    return None
+
+
+def resolve_many(addresses: Iterable[str | None], db: Session) -> dict[str, dict | None]:
+    """Resolve every address in *addresses* to its company / vendor match (or None).
+
+    Keys are the stripped, lower-cased addresses; each value is what
+    ``match_email_to_entity`` returns for that address (a fresh dict per call).
+    """
+    wanted = {a.strip().lower() for a in addresses if a and a.strip()}
+    if not wanted:
+        return {}
+    idx = _current()
+    emails: dict[str, dict | None] = idx["emails"]
+    domains: dict[str, tuple[Candidates, Candidates]] = idx["domains"]
+
+    pending = sorted(e for e in wanted if e not in emails)
+    for start in range(0, len(pending), _BATCH):
+        misses = set(pending[start : start + _BATCH])
+        exact = _exact_matches(misses, db)
+        unmatched = misses - exact.keys()
+        need_domains = set()
+        for email in unmatched:
+            domain = _split(email)[1]
+            if domain and domain not in GENERIC_EMAIL_DOMAINS and domain not in domains:
+                need_domains.add(domain)
+        fetched = _domain_candidates(need_domains, db)
+        with _lock:
+            domains.update(fetched)
+            emails.update(exact)
+            for email in unmatched:
+                local_part, domain = _split(email)
+                if not domain or domain in GENERIC_EMAIL_DOMAINS:
+                    emails[email] = None
+                else:
+                    emails[email] = _domain_match(local_part, *domains.get(domain, ([], [])))
+
+    return {e: (dict(m) if (m := emails.get(e)) else None) for e in wanted}
+
+
+def vendor_for_phone(e164: str, db: Session) -> tuple[int, str] | None:
+    """The first non-blacklisted vendor card (by id) listing *e164* in normalized_phones."""
+    idx = _current()
+    phones: dict[str, tuple[int, str]] | None = idx["phones"]
+    if phones is None:
+        phones = {}
+        rows = db.execute(
+            select(VendorCard.id, VendorCard.display_name, VendorCard.normalized_phones)
+            .where(VendorCard.is_blacklisted.is_(False), VendorCard.normalized_phones.is_not(None))
+            .order_by(VendorCard.id)
+        )
+        for card_id, name, numbers in rows:
+            for number in numbers or []:
+                if isinstance(number, str):
+                    phones.setdefault(number, (card_id, name))
+        with _lock:
+            idx["phones"] = phones
+    return phones.get(e164)
+
+
+def _changes_match_inputs(obj: object) -> bool:
+    """True if a dirty row changed a column the matcher reads."""
+    watched = _WATCHED.get(type(obj))
+    if watched is None:
+        return False
+    attrs = inspect(obj).attrs
+    return any(attrs[col].history.has_changes() for col in watched)
+
+
+def _invalidate_after_flush(session: Session, flush_context) -> None:
+    touched = any(type(o) in _WATCHED for o in (*session.new, *session.deleted)) or any(
+        _changes_match_inputs(o) for o in session.dirty
+    )
+    if touched:
+        global _local_version
+        with _lock:
+            _local_version += 1
+        session.info[_PENDING_INFO_KEY] = True
+
+
+def _bump_after_commit(session: Session) -> None:
+    if session.in_nested_transaction():
+        return  # SAVEPOINT release — the outer transaction may still roll back
+    if session.info.pop(_PENDING_INFO_KEY, False):
+        bump()
+
+
+def _drop_after_rollback(session: Session, previous_transaction: SessionTransaction) -> None:
+    # Lookups made inside the rolled-back transaction may have indexed its writes.
+    if previous_transaction.parent is None and session.info.pop(_PENDING_INFO_KEY, False):
+        global _local_version
+        with _lock:
+            _local_version += 1
+
+
+def register_resolver_listeners() -> None:
+    """Attach the flush / commit invalidation listeners. Idempotent."""
+    if not event.contains(Session, "after_flush", _invalidate_after_flush):
+        event.listen(Session, "after_flush", _invalidate_after_flush)
+        event.listen(Session, "after_commit", _bump_after_commit)
+        event.listen(Session, "after_soft_rollback", _drop_after_rollback)
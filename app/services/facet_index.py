@@ -0,0 +1,375 @@
+"""Facet index — in-process card bitsets behind the materials faceted sidebar.
+
+Sidebar counts used to be grouped ``COUNT(DISTINCT material_card_id)`` passes over
+``material_spec_facets`` (one per text / numeric facet, plus one per actively filtered
+facet for OR-within-facet self-exclusion), each re-deriving the card scope through
+``_apply_card_filters`` subqueries, so their cost grew with the catalog. This module
+keeps, per commodity:
+
+  - a dense bit position per live (non-deleted, in-commodity) card,
+  - ``live``: the bitset of those cards,
+  - ``text`` / ``numeric``: (spec_key, value) → bitset of cards carrying that facet value,
+  - ``attrs``: card-column value → bitset for the equality-filtered columns
+    (manufacturer, brand, enrichment / lifecycle / RoHS status, condition), and
+    ``flags`` for the boolean card filters (datasheet, needs review, internal part).
+
+Bitsets are Python ints over the dense positions, so counts are ``&`` + ``bit_count()``
+— a few machine words per 64 cards instead of a GROUP BY per facet.
+
+Refresh: a read first re-applies (a) cards a local flush touched — facet rows, or a
+watched card column — and (b) every ``REFRESH_SECONDS``, cards whose ``updated_at``
+moved past the watermark (``ix_material_cards_updated_at``). Facet writers
+(spec_write_service.record_spec, spec_tiers purges) always rewrite the owning card's
+``specs_structured``, so the card stamp covers facet changes made by other workers. The
+watermark scan overlaps by ``REFRESH_OVERLAP`` to absorb commit lag and clock skew;
+``INDEX_MAX_AGE`` rebuilds a commodity outright for writes that bypass the ORM.
+
+Called by: services/faceted_search_service.py (get_facet_counts,
+    get_global_facet_counts, search/page_materials_faceted totals),
+    main.py (register_facet_index_listeners at import).
+Depends on: app.models (MaterialCard, MaterialSpecFacet).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from app.models import MaterialCard, MaterialSpecFacet
+
+# Seconds between watermark scans for cards changed by other workers.
+REFRESH_SECONDS = 5
+# Upper bound (seconds) on a commodity index's age, for writes that skip the ORM.
+INDEX_MAX_AGE = 900
+# Watermark scans re-read this far back (commit lag / clock skew between workers).
+REFRESH_OVERLAP = timedelta(seconds=120)
+# Commodities held before the least recently used index is dropped.
+MAX_COMMODITIES = 64
+# Card ids per re-apply query round (keeps IN lists under driver parameter limits).
+_CHUNK = 1000
+
+# Card columns indexed for equality filters (attribute name → column).
+ATTR_COLUMNS = {
+    "manufacturer": MaterialCard.manufacturer,
+    "brand": MaterialCard.brand,
+    "enrichment_status": MaterialCard.enrichment_status,
+    "lifecycle_status": MaterialCard.lifecycle_status,
+    "rohs_status": MaterialCard.rohs_status,
+    "condition": MaterialCard.condition,
+}
+# Boolean card filters (flag name → predicate).
+FLAG_PREDICATES = {
+    "has_datasheet": lambda: MaterialCard.datasheet_url.isnot(None),
+    "has_validation_conflict": lambda: MaterialCard.has_validation_conflict.is_(True),
+    "internal": lambda: MaterialCard.is_internal_part.is_(True),
+}
+# Card columns whose change moves a card between bitsets. ``specs_structured`` is the
+# JSON mirror every facet write / purge rewrites alongside the facet rows.
+_WATCHED = frozenset(
+    {
+        "category",
+        "deleted_at",
+        "datasheet_url",
+        "has_validation_conflict",
+        "is_internal_part",
+        "specs_structured",
+        *ATTR_COLUMNS,
+    }
+)
+# session.info key: card ids a flush touched, re-queued at commit / rollback.
+_PENDING_INFO_KEY = "facet_index_pending"
+
+_CATEGORY_NORM = func.lower(func.trim(MaterialCard.category))
+
+
+class CommodityIndex:
+    """Bitsets for one commodity. Mutated only under the module lock."""
+
+    def __init__(self, commodity: str):
+        self.commodity = commodity
+        self.built_at = time.monotonic()
+        self.pos: dict[int, int] = {}
+        self.live = 0
+        self.text: dict[str, dict[str, int]] = {}
+        self.numeric: dict[str, dict[float, int]] = {}
+        self.attrs: dict[str, dict[str, int]] = {name: {} for name in ATTR_COLUMNS}
+        self.flags: dict[str, int] = dict.fromkeys(FLAG_PREDICATES, 0)
+
+    def _position(self, card_id: int) -> int:
+        bit = self.pos.get(card_id)
+        if bit is None:
+            bit = self.pos[card_id] = len(self.pos)
+        return bit
+
+    def _add_card(self, row: dict) -> int:
+        bit = 1 << self._position(row["id"])
+        self.live |= bit
+        for name in ATTR_COLUMNS:
+            value = row[name]
+            if value is not None:
+                values = self.attrs[name]
+                values[value] = values.get(value, 0) | bit
+        for name in FLAG_PREDICATES:
+            if row[name]:
+                self.flags[name] |= bit
+        return bit
+
+    def _add_facet(self, bit: int, spec_key: str, value_text: str | None, value_numeric: float | None) -> None:
+        if value_text is not None:
+            values = self.text.setdefault(spec_key, {})
+            values[value_text] = values.get(value_text, 0) | bit
+        if value_numeric is not None:
+            numbers = self.numeric.setdefault(spec_key, {})
+            numbers[value_numeric] = numbers.get(value_numeric, 0) | bit
+
+    def _clear(self, mask: int) -> None:
+        keep = ~mask
+        self.live &= keep
+        for groups in (*self.text.values(), *self.numeric.values(), *self.attrs.values()):
+            for value in groups:
+                groups[value] &= keep
+        for name in self.flags:
+            self.flags[name] &= keep
+
+    def ids_to_bits(self, card_ids: Iterable[int]) -> int:
+        """Bitset of *card_ids* (ids outside this commodity are ignored)."""
+        bits = 0
+        for card_id in card_ids:
+            bit = self.pos.get(card_id)
+            if bit is not None:
+                bits |= 1 << bit
+        return bits
+
+    def attr_bits(self, name: str, values: Iterable) -> int:
+        """Cards whose *name* column is any of *values* (OR-within)."""
+        groups = self.attrs[name]
+        bits = 0
+        for value in values:
+            if isinstance(value, str):
+                bits |= groups.get(value, 0)
+        return bits
+
+    def facet_filter_bits(self, filters: dict) -> int:
+        """Cards matching every spec-facet filter (AND across keys, OR within a list).
+
+        Same key grammar as faceted_search_service._apply_facet_filters: ``{key}__vals``
+        numeric chips, ``{key}_min`` / ``{key}_max`` ranges, and value lists.
+        """
+        bits = self.live
+        for key, values in filters.items():
+            if key.endswith("__vals"):
+                if not (isinstance(values, list) and values):
+                    continue
+                numbers = self.numeric.get(key[: -len("__vals")], {})
+                match = 0
+                for value in values:
+                    try:
+                        match |= numbers.get(float(value), 0)
+                    except (TypeError, ValueError):
+                        continue
+            elif key.endswith("_min") or key.endswith("_max"):
+                try:
+                    bound = float(values)
+                except (TypeError, ValueError):
+                    continue
+                numbers = self.numeric.get(key[:-4], {})
+                lower = key.endswith("_min")
+                match = 0
+                for number, number_bits in numbers.items():
+                    if (number >= bound) if lower else (number <= bound):
+                        match |= number_bits
+            elif isinstance(values, list) and values:
+                texts = self.text.get(key, {})
+                match = 0
+                for value in values:
+                    if isinstance(value, str):
+                        match |= texts.get(value, 0)
+            else:
+                continue
+            bits &= match
+        return bits
+
+
+_lock = threading.Lock()
+_indexes: OrderedDict[str, CommodityIndex] = OrderedDict()
+_pending: set[int] = set()
+_state: dict = {"watermark": None, "checked_at": 0.0, "seen": {}}
+
+
+def clear_index() -> None:
+    """Drop every commodity index and pending change (tests, manual invalidation)."""
+    with _lock:
+        _indexes.clear()
+        _pending.clear()
+        _state.update(watermark=None, checked_at=0.0, seen={})
+
+
+def _card_columns() -> list:
+    return [
+        MaterialCard.id,
+        _CATEGORY_NORM.label("commodity"),
+        MaterialCard.deleted_at,
+        *(column.label(name) for name, column in ATTR_COLUMNS.items()),
+        *(predicate().label(name) for name, predicate in FLAG_PREDICATES.items()),
+    ]
+
+
+def _build(db: Session, commodity: str) -> CommodityIndex:
+    idx = CommodityIndex(commodity)
+    cards = db.execute(
+        select(*_card_columns())
+        .where(MaterialCard.deleted_at.is_(None), _CATEGORY_NORM == commodity)
+        .order_by(MaterialCard.id)
+    )
+    for row in cards.mappings():
+        idx._add_card(dict(row))
+    facets = db.execute(
+        select(
+            MaterialSpecFacet.material_card_id,
+            MaterialSpecFacet.spec_key,
+            MaterialSpecFacet.value_text,
+            MaterialSpecFacet.value_numeric,
+        ).where(MaterialSpecFacet.category == commodity)
+    )
+    for card_id, spec_key, value_text, value_numeric in facets:
+        bit = idx.pos.get(card_id)
+        if bit is not None:
+            idx._add_facet(1 << bit, spec_key, value_text, value_numeric)
+    return idx
+
+
+def _reapply(db: Session, card_ids: set[int]) -> None:
+    """Re-read *card_ids* and move them to their current bitsets in every loaded index."""
+    ids = sorted(card_ids)
+    cards: dict[int, dict] = {}
+    facets: dict[int, list[tuple]] = {}
+    for start in range(0, len(ids), _CHUNK):
+        chunk = ids[start : start + _CHUNK]
+        for row in db.execute(select(*_card_columns()).where(MaterialCard.id.in_(chunk))).mappings():
+            cards[row["id"]] = dict(row)
+        for card_id, category, spec_key, value_text, value_numeric in db.execute(
+            select(
+                MaterialSpecFacet.material_card_id,
+                MaterialSpecFacet.category,
+                MaterialSpecFacet.spec_key,
+                MaterialSpecFacet.value_text,
+                MaterialSpecFacet.value_numeric,
+            ).where(MaterialSpecFacet.material_card_id.in_(chunk))
+        ):
+            facets.setdefault(card_id, []).append((category, spec_key, value_text, value_numeric))
+
+    with _lock:
+        for commodity, idx in _indexes.items():
+            members = [
+                row for row in cards.values() if row["deleted_at"] is None and (row["commodity"] or "") == commodity
+            ]
+            mask = idx.ids_to_bits(ids)
+            if not mask and not members:
+                continue
+            idx._clear(mask)
+            for row in members:
+                bit = idx._add_card(row)
+                for category, spec_key, value_text, value_numeric in facets.get(row["id"], ()):
+                    if category == commodity:
+                        idx._add_facet(bit, spec_key, value_text, value_numeric)
+
+
+def _changed_since_watermark(db: Session) -> set[int]:
+    """Card ids whose ``updated_at`` moved past the watermark (with overlap)."""
+    watermark: datetime | None = _state["watermark"]
+    if watermark is None:
+        latest = db.execute(select(func.max(MaterialCard.updated_at))).scalar()
+        _state["watermark"] = latest or datetime.now(UTC)
+        return set()
+    since = watermark - REFRESH_OVERLAP
+    seen: dict[int, datetime] = _state["seen"]
+    changed: set[int] = set()
+    for card_id, updated_at in db.execute(
+        select(MaterialCard.id, MaterialCard.updated_at).where(MaterialCard.updated_at > since)
+    ):
+        if seen.get(card_id) != updated_at:
+            changed.add(card_id)
+            seen[card_id] = updated_at
+        if updated_at > watermark:
+            watermark = updated_at
+    _state["watermark"] = watermark
+    _state["seen"] = {k: v for k, v in seen.items() if v > watermark - REFRESH_OVERLAP}
+    return changed
+
+
+def get_index(db: Session, commodity: str) -> CommodityIndex:
+    """The up-to-date bitset index for *commodity* (built on first use)."""
+    commodity = commodity.lower().strip()
+    now = time.monotonic()
+    with _lock:
+        changed = set(_pending)
+        _pending.clear()
+        scan = now - _state["checked_at"] >= REFRESH_SECONDS
+        if scan:
+            _state["checked_at"] = now
+    if scan:
+        changed |= _changed_since_watermark(db)
+    if changed:
+        _reapply(db, changed)
+
+    with _lock:
+        idx = _indexes.get(commodity)
+        if idx is not None and now - idx.built_at <= INDEX_MAX_AGE:
+            _indexes.move_to_end(commodity)
+            return idx
+    idx = _build(db, commodity)
+    with _lock:
+        _indexes[commodity] = idx
+        _indexes.move_to_end(commodity)
+        while len(_indexes) > MAX_COMMODITIES:
+            _indexes.popitem(last=False)
+    return idx
+
+
+def _touched_card_ids(session: Session) -> set[int]:
+    touched: set[int] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, MaterialSpecFacet):
+            state = inspect(obj)
+            card_id = state.dict.get("material_card_id")
+            history = state.attrs.material_card_id.history
+            touched.update(v for v in (card_id, *history.deleted) if v is not None)
+        elif isinstance(obj, MaterialCard):
+            state = inspect(obj)
+            if obj in session.dirty and not any(state.attrs[col].history.has_changes() for col in _WATCHED):
+                continue
+            card_id = state.dict.get("id")
+            if card_id is not None:
+                touched.add(card_id)
+    return touched
+
+
+def _queue_after_flush(session: Session, flush_context) -> None:
+    touched = _touched_card_ids(session)
+    if touched:
+        session.info.setdefault(_PENDING_INFO_KEY, set()).update(touched)
+        with _lock:
+            _pending.update(touched)
+
+
+def _requeue_after_end(session: Session, *args) -> None:
+    # A read between flush and commit / rollback may have applied a state other
+    # sessions never see (or that was rolled back); re-read those cards once more.
+    touched = session.info.pop(_PENDING_INFO_KEY, None)
+    if touched:
+        with _lock:
+            _pending.update(touched)
+
+
+def register_facet_index_listeners() -> None:
+    """Attach the flush / commit / rollback re-queue listeners. Idempotent."""
+    if not event.contains(Session, "after_flush", _queue_after_flush):
+        event.listen(Session, "after_flush", _queue_after_flush)
+        event.listen(Session, "after_commit", _requeue_after_end)
+        event.listen(Session, "after_soft_rollback", _requeue_after_end)
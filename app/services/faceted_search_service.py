@@ -1,20 +1,23 @@
 """Faceted search query service.
 
 What: Builds faceted queries on material_cards + material_spec_facets.
-      Provides commodity counts, facet counts, sub-filter options.
+      Provides commodity counts, facet counts, sub-filter options. Commodity-scoped
+      counts and result totals are bitset intersections over services/facet_index.py.
 Called by: htmx_views.py faceted search routes
-Depends on: MaterialCard, MaterialSpecFacet, CommoditySpecSchema
+Depends on: MaterialCard, MaterialSpecFacet, CommoditySpecSchema, services/facet_index.py
 """
 
 import re
 from datetime import UTC, datetime, timedelta
-from typing import NamedTuple
+from typing import Any, NamedTuple
 
-from sqlalchemy import Text, and_, cast, exists, func, or_
+from sqlalchemy import Numeric, Text, and_, cast, exists, func, or_, select
 from sqlalchemy.orm import Session
 
 from app.constants import MaterialEnrichmentStatus
 from app.models import CommoditySpecSchema, FruLink, MaterialCard, MaterialSpecFacet, MaterialVendorHistory
+from app.services import facet_index
+from app.services.list_paging import KeysetKey, ListCount, list_count, page_rows
 from app.utils.search_builder import SearchBuilder
 
 # Max distinct values rendered for an open-vocabulary (no enum_values) enum facet.
@@ -51,6 +54,11 @@ SEARCHED_WITHIN_VALUES = ("any", *SEARCHED_WITHIN_DAYS)  # "any" = no-op sentine
 # heap-fetching the raw column.
 _CATEGORY_NORM = func.lower(func.trim(MaterialCard.category))
 
+# Card filters the facet index cannot answer from bitsets (text search, vendor-history
+# and crosswalk EXISTS, recency, search counts). When any is active, commodity-scoped
+# counts narrow by ONE _apply_card_filters id query instead.
+_SQL_ONLY_CARD_FILTERS = ("q", "has_stock", "has_price", "has_crosses", "searched_within", "min_searches")
+
 
 def _natural_sort_key(s: str):
     """Split on digit runs so '205' sorts before '1210' (numeric runs compared as ints).
@@ -185,74 +193,40 @@ def get_facet_counts(
     commodity = commodity.lower().strip()
     active_filters = active_filters or {}
 
-    # Card-level scope — built by the SAME predicate builder as the results list, so
-    # counts can never use different predicates than the list. Always applied (even
-    # with no active card filters) for the universal deleted_at guard and card-category
-    # agreement: facet rows whose card was deleted or re-categorized since the facet
-    # was written must not produce phantom counts.
+    # Card-level scope — the index twin of the results list's _apply_card_filters (see
+    # _index_card_scope). Always applied (even with no active card filters): ``live``
+    # holds only non-deleted cards currently in this commodity, so facet rows whose card
+    # was deleted or re-categorized since the facet was written never produce counts.
     # commodity is the positional arg, and spec narrowing rides active_filters (which
     # carries the pass-2 self-exclusion) — strip both so a stray sub_filters in
     # card_filters can never double-narrow pass 2 and silently break self-exclusion.
     card_level = {k: v for k, v in (card_filters or {}).items() if k not in ("commodity", "sub_filters")}
-    card_scope_query, _ = _apply_card_filters(db.query(MaterialCard.id), db, commodity=commodity, **card_level)
-    card_scope = card_scope_query.subquery()
+    idx = facet_index.get_index(db, commodity)
+    scope = _index_card_scope(idx, card_level, _sql_scope_bits(db, idx, commodity, card_level))
 
-    def _grouped_counts(narrow_filters: dict, only_spec_key: str | None = None) -> list:
-        base = db.query(MaterialSpecFacet.material_card_id).filter(
-            MaterialSpecFacet.category == commodity,
-            MaterialSpecFacet.material_card_id.in_(db.query(card_scope.c.id)),
-        )
-        if narrow_filters:
-            base = _apply_facet_filters(base, db, commodity, narrow_filters)
-        card_ids_subq = base.distinct().subquery()
-        q = db.query(
-            MaterialSpecFacet.spec_key,
-            MaterialSpecFacet.value_text,
-            func.count(MaterialSpecFacet.material_card_id.distinct()),
-        ).filter(
-            MaterialSpecFacet.category == commodity,
-            MaterialSpecFacet.value_text.isnot(None),
-            MaterialSpecFacet.material_card_id.in_(db.query(card_ids_subq.c.material_card_id)),
-        )
-        if only_spec_key is not None:
-            q = q.filter(MaterialSpecFacet.spec_key == only_spec_key)
-        return q.group_by(MaterialSpecFacet.spec_key, MaterialSpecFacet.value_text).all()
-
-    def _grouped_numeric_counts(narrow_filters: dict, only_spec_key: str | None = None) -> list:
-        # Twin of _grouped_counts for numeric common-value chips: groups by value_numeric
-        # (IS NOT NULL) instead of value_text. Same card_scope + facet-narrowing shape,
-        # so chip counts can never diverge from the enum/results predicates.
-        base = db.query(MaterialSpecFacet.material_card_id).filter(
-            MaterialSpecFacet.category == commodity,
-            MaterialSpecFacet.material_card_id.in_(db.query(card_scope.c.id)),
-        )
-        if narrow_filters:
-            base = _apply_facet_filters(base, db, commodity, narrow_filters)
-        card_ids_subq = base.distinct().subquery()
-        q = db.query(
-            MaterialSpecFacet.spec_key,
-            MaterialSpecFacet.value_numeric,
-            func.count(MaterialSpecFacet.material_card_id.distinct()),
-        ).filter(
-            MaterialSpecFacet.category == commodity,
-            MaterialSpecFacet.value_numeric.isnot(None),
-            MaterialSpecFacet.material_card_id.in_(db.query(card_ids_subq.c.material_card_id)),
-        )
-        if only_spec_key is not None:
-            q = q.filter(MaterialSpecFacet.spec_key == only_spec_key)
-        rows: list = q.group_by(MaterialSpecFacet.spec_key, MaterialSpecFacet.value_numeric).all()
-        return rows
+    def _value_counts(groups: dict, cards: int) -> dict:
+        # Only values with at least one card, matching the GROUP BY these counts replace.
+        return {value: n for value, bits in groups.items() if (n := (bits & cards).bit_count())}
+
+    def _text_counts(narrow_filters: dict) -> dict[str, dict]:
+        cards = scope & idx.facet_filter_bits(narrow_filters)
+        counts = {spec_key: _value_counts(values, cards) for spec_key, values in idx.text.items()}
+        return {spec_key: values for spec_key, values in counts.items() if values}
+
+    def _numeric_counts(narrow_filters: dict) -> dict[str, dict]:
+        # Twin of _text_counts for numeric common-value chips (keyed by value_numeric).
+        cards = scope & idx.facet_filter_bits(narrow_filters)
+        counts = {spec_key: _value_counts(values, cards) for spec_key, values in idx.numeric.items()}
+        return {spec_key: values for spec_key, values in counts.items() if values}
 
     # Pass 1: every facet narrowed by ALL active filters — correct for facets the user has NOT
     # filtered on (they should reflect the full current narrowing).
-    result: dict[str, dict[str, int]] = {}
-    for spec_key, value, count in _grouped_counts(active_filters):
-        result.setdefault(spec_key, {})[value] = count
+    result: dict[str, dict[str, int]] = _text_counts(active_filters)
     # Pass 1 numeric: chip counts string-keyed by value so the template looks up by
     # str(chip.value). A numeric spec_key never collides with an enum spec_key (a spec is
     # one data_type), so this never overwrites enum counts.
-    for spec_key, value, count in _grouped_numeric_counts(active_filters):
-        result.setdefault(spec_key, {})[str(value)] = count
+    for spec_key, values in _numeric_counts(active_filters).items():
+        result.setdefault(spec_key, {}).update({str(value): count for value, count in values.items()})
 
     # Pass 2: OR-within-facet correctness — recompute each ACTIVELY-FILTERED facet's own
     # value counts against the set narrowed by every OTHER facet (excluding its own selection),
@@ -264,7 +238,7 @@ def get_facet_counts(
         # Exclude the facet's own selection and any sibling variant of the same spec_key.
         own_variants = (fk, f"{fk}_min", f"{fk}_max", f"{fk}__vals")
         others = {k: v for k, v in active_filters.items() if k not in own_variants}
-        result[fk] = {value: count for _sk, value, count in _grouped_counts(others, only_spec_key=fk)}
+        result[fk] = _value_counts(idx.text.get(fk, {}), scope & idx.facet_filter_bits(others))
 
     # Pass 2 numeric: each ACTIVELY-FILTERED "__vals" chip facet recomputed without its own
     # selection (its siblings stay full — selecting one chip never zeroes the others).
@@ -276,12 +250,72 @@ def get_facet_counts(
         # the enum Pass-2 own_variants contract above.
         own_variants = (spec_key, f"{spec_key}_min", f"{spec_key}_max", fk)
         others = {k: v for k, v in active_filters.items() if k not in own_variants}
-        result[spec_key] = {
-            str(value): count for _sk, value, count in _grouped_numeric_counts(others, only_spec_key=spec_key)
-        }
+        chip_counts = _value_counts(idx.numeric.get(spec_key, {}), scope & idx.facet_filter_bits(others))
+        result[spec_key] = {str(value): count for value, count in chip_counts.items()}
     return result
 
 
+def _sql_scope_bits(db: Session, idx: facet_index.CommodityIndex, commodity: str, filters: dict) -> int | None:
+    """Bitset of the cards passing the active SQL-only card filters (None when none are).
+
+    One ``_apply_card_filters`` id query over the commodity, so those predicates stay
+    defined in one place; everything else is answered by ``_index_card_scope``.
+    """
+    sql_filters = {k: filters[k] for k in _SQL_ONLY_CARD_FILTERS if k in filters}
+    active = (
+        sql_filters.get("q")
+        or sql_filters.get("has_stock")
+        or sql_filters.get("has_price")
+        or sql_filters.get("has_crosses")
+        or sql_filters.get("searched_within") in SEARCHED_WITHIN_DAYS
+        or (sql_filters.get("min_searches") or 0) > 0
+    )
+    if not active:
+        return None
+    stmt, _ = _apply_card_filters(select(MaterialCard.id), db, commodity=commodity, **sql_filters)
+    return idx.ids_to_bits(db.execute(stmt).scalars())
+
+
+def _index_card_scope(idx: facet_index.CommodityIndex, filters: dict, sql_bits: int | None) -> int:
+    """Cards passing every card-level filter — the bitset twin of ``_apply_card_filters``.
+
+    *filters* are ``_apply_card_filters`` keyword args minus ``commodity``; a
+    ``sub_filters`` entry narrows by spec facets. *sql_bits* is ``_sql_scope_bits``'s
+    result for the same filters.
+    """
+    bits = idx.live
+    manufacturers = filters.get("manufacturers")
+    if manufacturers:
+        # Dual-brand: OR across manufacturer and brand (see _apply_card_filters).
+        bits &= idx.attr_bits("manufacturer", manufacturers) | idx.attr_bits("brand", manufacturers)
+    if filters.get("statuses"):
+        bits &= idx.attr_bits("enrichment_status", filters["statuses"])
+    elif filters.get("verified_only"):
+        bits &= idx.attr_bits("enrichment_status", [MaterialEnrichmentStatus.VERIFIED])
+    for key, column in (("lifecycle", "lifecycle_status"), ("rohs", "rohs_status"), ("condition", "condition")):
+        if filters.get(key):
+            bits &= idx.attr_bits(column, filters[key])
+    for flag in ("has_datasheet", "has_validation_conflict"):
+        if filters.get(flag):
+            bits &= idx.flags[flag]
+    internal = filters.get("internal", "all")
+    if internal == "internal":
+        bits &= idx.flags["internal"]
+    elif internal == "standard":
+        bits &= ~idx.flags["internal"]
+    if sql_bits is not None:
+        bits &= sql_bits
+    if filters.get("sub_filters"):
+        bits &= idx.facet_filter_bits(filters["sub_filters"])
+    return bits
+
+
+def _index_total(db: Session, commodity: str, filters: dict) -> int:
+    """Result count of a commodity-scoped faceted search, from the facet index."""
+    idx = facet_index.get_index(db, commodity)
+    return _index_card_scope(idx, filters, _sql_scope_bits(db, idx, idx.commodity, filters)).bit_count()
+
+
 def get_manufacturer_options(
     db: Session,
     commodity: str | None = None,
@@ -341,6 +375,8 @@ def get_global_facet_counts(
               "has_datasheet": {"true": count}}
     """
     filters = filters or {}
+    if commodity:
+        return _index_global_facet_counts(db, commodity, filters)
 
     def _scope(own_key: str | None):
         # Narrow by every active filter EXCEPT the facet's own selection. The shared
@@ -379,6 +415,34 @@ def get_global_facet_counts(
     }
 
 
+def _index_global_facet_counts(db: Session, commodity: str, filters: dict) -> dict[str, dict[str, int]]:
+    """Commodity-scoped get_global_facet_counts, from the facet index.
+
+    The facets' own keys (lifecycle, rohs, condition, has_datasheet,
+    has_validation_conflict) are all index-served, so the SQL-only scope is shared
+    across every facet's self-excluded count.
+    """
+    idx = facet_index.get_index(db, commodity)
+    sql_bits = _sql_scope_bits(db, idx, idx.commodity, filters)
+
+    def _scope(own_key: str) -> int:
+        return _index_card_scope(idx, {k: v for k, v in filters.items() if k != own_key}, sql_bits)
+
+    def _count_attr(column: str, own_key: str) -> dict[str, int]:
+        cards = _scope(own_key)
+        return {val: n for val, bits in idx.attrs[column].items() if val and (n := (bits & cards).bit_count())}
+
+    return {
+        "lifecycle": _count_attr("lifecycle_status", "lifecycle"),
+        "rohs": _count_attr("rohs_status", "rohs"),
+        "condition": _count_attr("condition", "condition"),
+        "has_datasheet": {"true": (_scope("has_datasheet") & idx.flags["has_datasheet"]).bit_count()},
+        "needs_review": {
+            "true": (_scope("has_validation_conflict") & idx.flags["has_validation_conflict"]).bit_count()
+        },
+    }
+
+
 def _apply_card_filters(
     query,
     db: Session,
@@ -601,21 +665,81 @@ def search_materials_faceted(
         min_searches=min_searches,
     )
 
-    total = db.query(func.count()).select_from(query.subquery()).scalar()
-
-    if ts_query is not None:
-        # PG multi-word FTS branch: relevance ranking first.
-        query = query.order_by(
-            func.ts_rank(MaterialCard.search_vector, ts_query).desc(),
-            MaterialCard.search_count.desc(),
+    if commodity:
+        total = _index_total(
+            db,
+            commodity,
+            {
+                "q": q,
+                "sub_filters": sub_filters,
+                "manufacturers": manufacturers,
+                "verified_only": verified_only,
+                "statuses": statuses,
+                "lifecycle": lifecycle,
+                "rohs": rohs,
+                "condition": condition,
+                "has_datasheet": has_datasheet,
+                "has_validation_conflict": has_validation_conflict,
+                "has_stock": has_stock,
+                "has_price": has_price,
+                "has_crosses": has_crosses,
+                "internal": internal,
+                "searched_within": searched_within,
+                "min_searches": min_searches,
+            },
         )
     else:
-        query = query.order_by(MaterialCard.search_count.desc(), MaterialCard.created_at.desc())
+        total = db.query(func.count()).select_from(query.subquery()).scalar()
+
+    query = query.order_by(
+        *[expr.desc() if descending else expr.asc() for expr, descending in _material_sort_keys(ts_query)]
+    )
 
     materials = query.offset(offset).limit(limit).all()
     return materials, total
 
 
+def _material_sort_keys(ts_query) -> list[KeysetKey]:
+    """The materials list order as ``(expression, descending)`` keys, ending on ``id``.
+
+    Single definition for search_materials_faceted (ORDER BY) and page_materials_faceted
+    (keyset cursor), so the two orderings cannot drift apart. PG multi-word FTS ranks by
+    relevance first. ``ts_rank`` returns float4, and a cursor value bound back as a
+    numeric literal is compared as float8 — ``0.1::real = 0.1`` is false, so the rank is
+    cast to a fixed NUMERIC in both the ORDER BY and the cursor predicate.
+    """
+    if ts_query is not None:
+        rank = cast(func.ts_rank(MaterialCard.search_vector, ts_query), Numeric(12, 8))
+        return [(rank, True), (MaterialCard.search_count, True), (MaterialCard.id, True)]
+    return [(MaterialCard.search_count, True), (MaterialCard.created_at, True), (MaterialCard.id, True)]
+
+
+def page_materials_faceted(
+    db: Session,
+    *,
+    cursor: str = "",
+    limit: int = 50,
+    offset: int = 0,
+    **filters: Any,
+) -> tuple[list[MaterialCard], ListCount, str | None]:
+    """Keyset-paged variant of :func:`search_materials_faceted` for the list partial.
+
+    Same filters (``**filters`` are ``_apply_card_filters`` keywords) and the same sort
+    (``_material_sort_keys``). The total is exact from the facet index when a commodity
+    is set, else from ``list_count`` (cached / estimated) instead of a COUNT per request. Returns ``(materials, total, next_cursor)``.
+    """
+    stmt, ts_query = _apply_card_filters(select(MaterialCard), db, **filters)
+    commodity = filters.get("commodity")
+    if commodity:
+        scoped = {k: v for k, v in filters.items() if k != "commodity"}
+        total = ListCount(_index_total(db, commodity, scoped))
+    else:
+        total = list_count(db, stmt)
+    scope = "materials:fts" if ts_query is not None else "materials:default"
+    page = page_rows(stmt, _material_sort_keys(ts_query), scope=scope, cursor=cursor, offset=offset, limit=limit, db=db)
+    return page.rows, total, page.next_cursor
+
+
 def get_subfilter_options(db: Session, commodity: str) -> list[dict]:
     """Get sub-filter options for a commodity from schema + actual data.
 
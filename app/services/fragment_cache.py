@@ -0,0 +1,295 @@
+"""Fragment cache — ETag/304 and rendered-HTML reuse for hot HTMX detail partials.
+
+The sightings detail, vendor detail, material card and requisition tab partials are
+re-requested on every HTMX poll and SSE-triggered refresh. Each render is a full query
+set plus a Jinja pass, yet most refreshes find nothing changed. This module gives those
+routes a version to compare instead:
+
+  - Scopes: an entity a partial renders, as ``(kind, id)`` — ``("requirement", 12)``,
+    ``("vendor", 4)``. Each scope has a revision counter in a Redis hash shared by every
+    worker (plus a process-local map, the fallback while Redis is down).
+  - Invalidation: an after_flush listener maps every flushed row to the scopes it
+    belongs to — the row itself for the scoped models, and its ``requirement_id`` /
+    ``requisition_id`` / ``vendor_card_id`` / ``material_card_id`` foreign keys for
+    everything else — and an after_commit hook bumps them (rollback discards them). SSE
+    publishes bump the scopes named in their JSON payload too, so a change announced
+    to the browser is never answered from the cache.
+  - ETag: a hash of the request URL, the viewing user, the scope revisions, any row
+    versions the route passes (``updated_at``), and a ``FRAGMENT_MAX_AGE`` time bucket.
+    The bucket bounds staleness for inputs outside the tracked scopes — cross-entity
+    aggregates, bulk ``query().update()`` paths that skip the listener.
+
+A matching ``If-None-Match`` is answered 304 before any rendering; otherwise the HTML
+stored under the ETag is served, and only a miss renders. The browser's HTTP cache does
+the revalidation for HTMX requests on its own (``Cache-Control: private, no-cache``).
+
+Routes must run their access check BEFORE asking for the ETag — a 304 still discloses
+that the fragment exists.
+
+Called by: routers/sightings.py (detail), routers/htmx/vendors.py (detail),
+           routers/htmx/materials.py (card detail), routers/htmx/_shared_tabs.py
+           (requisition tabs), main.py (register_fragment_listeners at import).
+Depends on: cache/intel_cache._get_redis, services/sse_broker.py.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+from loguru import logger
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.utils import json_helpers as json
+
+REQUIREMENT = "requirement"
+REQUISITION = "requisition"
+VENDOR = "vendor"
+MATERIAL = "material"
+
+Scope = tuple[str, int]
+
+# Upper bound (seconds) on how long a fragment is reused without any tracked change.
+FRAGMENT_MAX_AGE = 300
+# Rendered fragments (HTML + X-* headers) kept per process when Redis is unavailable.
+LOCAL_HTML_LIMIT = 256
+
+_REV_REDIS_KEY = "frag:rev"
+_HTML_REDIS_PREFIX = "frag:html:"
+_local_revs: dict[str, int] = {}
+_local_html: OrderedDict[str, dict] = OrderedDict()
+# session.info key holding the scopes of flushed-but-uncommitted writes.
+_PENDING_INFO_KEY = "fragment_cache_pending_scopes"
+
+# Foreign-key columns that place a row inside a scope.
+_FK_SCOPES = {
+    "requirement_id": REQUIREMENT,
+    "requisition_id": REQUISITION,
+    "vendor_card_id": VENDOR,
+    "material_card_id": MATERIAL,
+}
+# Tables whose own primary key is a scope.
+_TABLE_SCOPES = {
+    "requirements": REQUIREMENT,
+    "requisitions": REQUISITION,
+    "vendor_cards": VENDOR,
+    "material_cards": MATERIAL,
+}
+
+
+def _redis():
+    from app.cache.intel_cache import _get_redis
+
+    return _get_redis()
+
+
+def _field(scope: Scope) -> str:
+    return f"{scope[0]}:{scope[1]}"
+
+
+def revisions(scopes: Iterable[Scope]) -> list[int]:
+    """Current revision of each scope (0 for a scope never bumped)."""
+    fields = [_field(s) for s in scopes]
+    if not fields:
+        return []
+    r = _redis()
+    if r:
+        try:
+            return [int(v or 0) for v in r.hmget(_REV_REDIS_KEY, fields)]
+        except Exception as e:  # noqa: BLE001 — Redis down: serve the local revisions
+            logger.warning("Fragment revision read failed: {}", e)
+    return [_local_revs.get(f, 0) for f in fields]
+
+
+def bump(scopes: Iterable[Scope]) -> None:
+    """Advance the revision of each scope, invalidating every fragment that renders it."""
+    fields = sorted({_field(s) for s in scopes})
+    if not fields:
+        return
+    for f in fields:
+        _local_revs[f] = _local_revs.get(f, 0) + 1
+    r = _redis()
+    if r:
+        try:
+            pipe = r.pipeline(transaction=False)
+            for f in fields:
+                pipe.hincrby(_REV_REDIS_KEY, f, 1)
+            pipe.execute()
+        except Exception as e:  # noqa: BLE001 — local revisions already advanced
+            logger.warning("Fragment revision bump failed: {}", e)
+
+
+def fragment_etag(
+    request: Request,
+    scopes: Iterable[Scope],
+    *,
+    user: object = None,
+    versions: Iterable[object] = (),
+) -> str:
+    """Weak ETag for the fragment at ``request.url`` as seen by ``user``."""
+    scope_list = sorted(set(scopes))
+    parts = [
+        request.url.path,
+        str(sorted(request.query_params.multi_items())),
+        f"{getattr(user, 'id', '')}:{getattr(user, 'role', '')}",
+        str(int(time.time() // FRAGMENT_MAX_AGE)),
+        *(f"{_field(s)}={rev}" for s, rev in zip(scope_list, revisions(scope_list), strict=True)),
+        *(str(v) for v in versions),
+    ]
+    digest = hashlib.sha1("|".join(parts).encode(), usedforsecurity=False).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/ prefixes are ignored on both sides (RFC 9110 §13.1.2).
+    ours = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == ours for tag in header.split(","))
+
+
+def _get_stored(etag: str) -> dict | None:
+    r = _redis()
+    if r:
+        try:
+            data = r.get(_HTML_REDIS_PREFIX + etag)
+            return dict(json.loads(data)) if data else None
+        except Exception as e:  # noqa: BLE001 — fall through to the local store
+            logger.warning("Fragment read failed: {}", e)
+    stored = _local_html.get(etag)
+    if stored is not None:
+        _local_html.move_to_end(etag)
+    return stored
+
+
+def _put_stored(etag: str, stored: dict) -> None:
+    r = _redis()
+    if r:
+        try:
+            r.setex(_HTML_REDIS_PREFIX + etag, FRAGMENT_MAX_AGE, json.dumps(stored))
+            return
+        except Exception as e:  # noqa: BLE001 — keep it locally instead
+            logger.warning("Fragment write failed: {}", e)
+    _local_html[etag] = stored
+    _local_html.move_to_end(etag)
+    while len(_local_html) > LOCAL_HTML_LIMIT:
+        _local_html.popitem(last=False)
+
+
+def _with_validators(resp: Response, etag: str) -> Response:
+    resp.headers["ETag"] = etag
+    resp.headers["Cache-Control"] = "private, no-cache"
+    return resp
+
+
+async def cached_fragment(request: Request, etag: str, render: Callable[[], Awaitable[Response]]) -> Response:
+    """Answer with 304, the stored HTML for ``etag``, or a fresh ``render()``.
+
+    Only a plain 200 GET render is stored — error pages, redirects and responses
+    carrying HX-* headers (toasts, triggers) are passed through uncached.
+    """
+    if request.method != "GET":
+        return await render()
+    if _etag_matches(request, etag):
+        return _with_validators(Response(status_code=304), etag)
+    stored = _get_stored(etag)
+    if stored is not None:
+        return _with_validators(HTMLResponse(stored["html"], headers=stored["headers"]), etag)
+    resp = await render()
+    if resp.status_code != 200 or any(k.lower().startswith("hx-") for k in resp.headers):
+        return resp
+    body = getattr(resp, "body", None)
+    if isinstance(body, bytes):
+        # Route-set X-* headers (X-Rendered-Req-Id) travel with the stored HTML.
+        headers = {k: v for k, v in resp.headers.items() if k.lower().startswith("x-")}
+        _put_stored(etag, {"html": body.decode(), "headers": headers})
+    return _with_validators(resp, etag)
+
+
+def clear() -> None:
+    """Drop the process-local revisions and stored fragments (tests)."""
+    _local_revs.clear()
+    _local_html.clear()
+
+
+def scopes_for_event(data: str) -> set[Scope]:
+    """Scopes named in an SSE payload (``{"requirement_id": 12, ...}``)."""
+    if not data or not data.lstrip().startswith("{"):
+        return set()
+    try:
+        payload = json.loads(data)
+    except ValueError:
+        return set()
+    if not isinstance(payload, dict):
+        return set()
+    scopes: set[Scope] = set()
+    for col, kind in _FK_SCOPES.items():
+        value = payload.get(col)
+        if isinstance(value, int):
+            scopes.add((kind, value))
+    return scopes
+
+
+def _bump_for_event(channel: str, event_name: str, data: str) -> None:
+    bump(scopes_for_event(data))
+
+
+def _scopes_for_row(obj: object) -> set[Scope]:
+    """Scopes a flushed row belongs to, read from loaded state only (no SQL)."""
+    table = getattr(obj, "__table__", None)
+    if table is None:
+        return set()
+    loaded = inspect(obj).dict
+    scopes: set[Scope] = set()
+    own = _TABLE_SCOPES.get(table.name)
+    if own is not None and isinstance(loaded.get("id"), int):
+        scopes.add((own, loaded["id"]))
+    for col, kind in _FK_SCOPES.items():
+        value = loaded.get(col)
+        if isinstance(value, int):
+            scopes.add((kind, value))
+    return scopes
+
+
+def _collect_scopes_after_flush(session: Session, flush_context) -> None:
+    scopes: set[Scope] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        scopes |= _scopes_for_row(obj)
+    if scopes:
+        session.info.setdefault(_PENDING_INFO_KEY, set()).update(scopes)
+
+
+def _bump_after_commit(session: Session) -> None:
+    if session.in_nested_transaction():
+        return  # SAVEPOINT release — the outer transaction may still roll back
+    scopes = session.info.pop(_PENDING_INFO_KEY, None)
+    if scopes:
+        bump(scopes)
+
+
+def _discard_after_rollback(session: Session, previous_transaction: SessionTransaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_INFO_KEY, None)
+
+
+def register_fragment_listeners() -> None:
+    """Attach the flush/commit invalidation listeners and the SSE publish hook.
+
+    Idempotent — SQLAlchemy deduplicates by (event_name, listener_fn) identity and the
+    broker keeps each hook once.
+    """
+    from app.services.sse_broker import broker
+
+    broker.add_publish_hook(_bump_for_event)
+    if not event.contains(Session, "after_flush", _collect_scopes_after_flush):
+        event.listen(Session, "after_flush", _collect_scopes_after_flush)
+        event.listen(Session, "after_commit", _bump_after_commit)
+        event.listen(Session, "after_soft_rollback", _discard_after_rollback)
@@ -0,0 +1,278 @@
+"""Opt-in keyset paging + cheap total counts for the big HTMX list partials.
+
+Two independent helpers a list route layers over its existing filtered query:
+
+  - ``page_rows`` — cursor (keyset) paging on the route's existing sort order. The sort
+    expressions are selected alongside each row, the last row's values become an opaque
+    ``next_cursor``, and the next request filters ``(k1, k2, …, id) > cursor`` instead
+    of ``OFFSET n`` — page 10,000 costs the same as page 1. NULLs sort last in both
+    directions (matching the lists' ``nullslast()`` ordering) and the final key must be
+    a unique, non-NULL tiebreaker (the primary key). Without a cursor it falls back to
+    plain ``OFFSET`` so Prev links and deep links keep working, and still returns a
+    cursor for the following page.
+  - ``list_count`` — the "N total" figure without a ``COUNT(*)`` per request. An exact
+    count is cached in Redis (keyed by the compiled SQL + params) and refreshed off the
+    request thread once it is older than ``COUNT_FRESH_SECONDS``. On a cold cache over
+    PostgreSQL a large result is answered from the planner's row estimate (flagged
+    ``approximate``) while the exact count is computed in the background. Without Redis
+    (tests, degraded mode) it is a plain inline count.
+
+Called by: routers/htmx/requisitions.py, routers/htmx/vendors.py,
+           routers/htmx/materials.py, routers/sightings.py.
+Depends on: cache/intel_cache._get_redis, database.SessionLocal,
+            utils/async_helpers.hold_bg_task.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import Select, and_, false, func, or_, select
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.elements import ColumnElement
+
+# An exact cached count younger than this is served as-is; older ones are served and
+# refreshed in the background.
+COUNT_FRESH_SECONDS = 30
+# Hard expiry of a cached count (a list nobody opens stops occupying Redis).
+COUNT_TTL_SECONDS = 600
+# Below this planner estimate an inline exact COUNT is cheap enough (and estimates on
+# small filtered sets are too coarse to show).
+ESTIMATE_MIN_ROWS = 10_000
+# Single-flight guard so a burst of requests triggers one background recount.
+_REFRESH_LOCK_SECONDS = 30
+_COUNT_KEY_PREFIX = "listcount:"
+
+# (sort expression, descending?) — the last key must be a unique non-NULL tiebreaker.
+KeysetKey = tuple[ColumnElement[Any], bool]
+
+
+@dataclass(frozen=True)
+class ListCount:
+    """A list total; ``approximate`` when it is a planner estimate (render as ``~N``)."""
+
+    value: int
+    approximate: bool = False
+
+
+@dataclass
+class KeysetPage:
+    rows: list[Any]
+    next_cursor: str | None
+
+
+# ── cursor encoding ───────────────────────────────────────────────────────
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"$n": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "$dt" in value:
+            return datetime.fromisoformat(value["$dt"])
+        if "$d" in value:
+            return date.fromisoformat(value["$d"])
+        if "$n" in value:
+            return Decimal(value["$n"])
+        raise ValueError("unknown cursor value tag")
+    return value
+
+
+def encode_cursor(scope: str, values: Sequence[Any]) -> str:
+    """Opaque URL-safe token for the row after which the next page starts."""
+    payload = json.dumps({"s": scope, "k": [_encode_value(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, scope: str, n_keys: int) -> list[Any] | None:
+    """The key values in ``token``, or None when it is absent, malformed, or was issued
+    for a different list/sort (``scope``) — the caller then serves the first page."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        if payload.get("s") != scope or len(payload.get("k", [])) != n_keys:
+            return None
+        return [_decode_value(v) for v in payload["k"]]
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        return None
+
+
+# ── keyset paging ─────────────────────────────────────────────────────────
+
+
+def _after(keys: Sequence[KeysetKey], values: Sequence[Any]) -> ColumnElement[bool]:
+    """Rows strictly after ``values`` in ``ORDER BY k1 [DESC] NULLS LAST, …`` order.
+
+    Expanded lexicographically: (k1 beyond v1) OR (k1 = v1 AND k2 beyond v2) OR …, where
+    "beyond" a non-NULL value includes the NULL tail and nothing is beyond a NULL.
+    """
+    clauses = []
+    equal_prefix: list[ColumnElement[bool]] = []
+    for (expr, descending), value in zip(keys, values, strict=True):
+        if value is None:
+            beyond: ColumnElement[bool] = false()
+            equal: ColumnElement[bool] = expr.is_(None)
+        else:
+            beyond = or_(expr < value if descending else expr > value, expr.is_(None))
+            equal = expr == value
+        clauses.append(and_(*equal_prefix, beyond))
+        equal_prefix.append(equal)
+    return or_(*clauses)
+
+
+def page_rows(
+    query: Query[Any] | Select[Any],
+    keys: Sequence[KeysetKey],
+    *,
+    scope: str,
+    cursor: str = "",
+    offset: int = 0,
+    limit: int,
+    db: Session | None = None,
+) -> KeysetPage:
+    """One page of ``query`` ordered by ``keys``, plus the cursor for the next page.
+
+    ``query`` is a legacy ``Query`` or a 2.0 ``select()`` of one entity (which needs
+    ``db`` to execute). ``scope`` names the list + sort (e.g.
+    ``"vendors:display_name:asc"``) so a cursor from another sort is ignored rather than
+    misapplied. A valid ``cursor`` takes precedence over ``offset``.
+    """
+    labelled = [expr.label(f"_ks{i}") for i, (expr, _) in enumerate(keys)]
+    ordered = query.order_by(None).order_by(
+        *[expr.desc().nullslast() if descending else expr.asc().nullslast() for expr, descending in keys]
+    )
+    values = decode_cursor(cursor, scope, len(keys))
+    if values is not None:
+        ordered = ordered.filter(_after(keys, values))
+    elif offset:
+        ordered = ordered.offset(offset)
+    ordered = ordered.add_columns(*labelled).limit(limit + 1)
+    if isinstance(ordered, Select):
+        if db is None:
+            raise ValueError("page_rows needs db= to execute a select()")
+        fetched = list(db.execute(ordered).all())
+    else:
+        fetched = ordered.all()
+    rows = [r[0] for r in fetched[:limit]]
+    next_cursor = encode_cursor(scope, list(fetched[limit - 1][1:])) if len(fetched) > limit else None
+    return KeysetPage(rows=rows, next_cursor=next_cursor)
+
+
+# ── cheap counts ──────────────────────────────────────────────────────────
+
+
+def _count_key(db: Session, stmt: Any) -> str:
+    compiled = stmt.compile(dialect=db.get_bind().dialect)
+    digest = hashlib.sha256(
+        (str(compiled) + json.dumps(compiled.params, sort_keys=True, default=str)).encode()
+    ).hexdigest()
+    return f"{_COUNT_KEY_PREFIX}{digest}"
+
+
+def _planner_estimate(db: Session, inner: Any) -> int | None:
+    """PostgreSQL's estimated row count for ``inner`` (EXPLAIN, never executes it)."""
+    try:
+        # SAVEPOINT: a failed EXPLAIN must not abort the request's transaction.
+        with db.begin_nested():
+            conn = db.connection()
+            compiled = inner.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+            plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception:  # noqa: BLE001 — an estimate is optional; the exact count path follows
+        logger.opt(exception=True).debug("list_count planner estimate failed")
+        return None
+
+
+def _store_count(r: Any, key: str, value: int) -> None:
+    try:
+        r.setex(key, COUNT_TTL_SECONDS, json.dumps({"n": value, "at": time.time()}))
+    except Exception as e:  # noqa: BLE001 — cache write is best-effort
+        logger.warning("list_count cache write failed: {}", e)
+
+
+def _refresh_count(stmt: Any, key: str) -> None:
+    """Run the exact count in a fresh session (worker thread) and cache it."""
+    from app.cache.intel_cache import _get_redis
+    from app.database import SessionLocal
+
+    r = _get_redis()
+    if r is None:
+        return
+    try:
+        with SessionLocal() as db:
+            value = int(db.execute(stmt).scalar() or 0)
+    except Exception:  # noqa: BLE001 — background recount must never surface; next request retries
+        logger.opt(exception=True).warning("list_count background refresh failed")
+        return
+    _store_count(r, key, value)
+
+
+def _schedule_refresh(r: Any, stmt: Any, key: str) -> None:
+    try:
+        if not r.set(f"{key}:lock", "1", nx=True, ex=_REFRESH_LOCK_SECONDS):
+            return  # another request already scheduled this recount
+        loop = asyncio.get_running_loop()
+    except Exception:  # noqa: BLE001 — no loop / Redis hiccup: the cached value stands
+        return
+    from app.utils.async_helpers import hold_bg_task
+
+    hold_bg_task(loop.create_task(asyncio.to_thread(_refresh_count, stmt, key), name="list_count_refresh"))
+
+
+def list_count(db: Session, query: Query[Any] | Select[Any]) -> ListCount:
+    """Total rows ``query`` (legacy Query or ``select()``) matches, served from a cached
+    exact count when possible."""
+    from app.cache.intel_cache import _get_redis
+
+    inner = (
+        query.order_by(None) if isinstance(query, Select) else query.enable_eagerloads(False).order_by(None).statement
+    )
+    stmt = select(func.count()).select_from(inner.subquery())
+    r = _get_redis()
+    if r is None:
+        return ListCount(int(db.execute(stmt).scalar() or 0))
+
+    key = _count_key(db, stmt)
+    try:
+        cached = r.get(key)
+    except Exception as e:  # noqa: BLE001 — Redis read failure degrades to an inline count
+        logger.warning("list_count cache read failed: {}", e)
+        cached = None
+    if cached:
+        entry = json.loads(cached)
+        if time.time() - float(entry.get("at", 0)) > COUNT_FRESH_SECONDS:
+            _schedule_refresh(r, stmt, key)
+        return ListCount(int(entry["n"]))
+
+    if db.get_bind().dialect.name == "postgresql":
+        estimate = _planner_estimate(db, inner)
+        if estimate is not None and estimate >= ESTIMATE_MIN_ROWS:
+            _schedule_refresh(r, stmt, key)
+            return ListCount(estimate, approximate=True)
+
+    value = int(db.execute(stmt).scalar() or 0)
+    _store_count(r, key, value)
+    return ListCount(value)
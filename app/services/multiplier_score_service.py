@@ -12,29 +12,18 @@ Bonus winners require minimum Avail Score thresholds:
   2nd: $250 — Avail Score >=50, same minimums
 
 Called by: scheduler.py (daily), routers/performance.py (on-demand)
-Depends on: models (Offer, Quote, BuyPlan, Contact, StockListHash, etc.)
+Depends on: services/scoring_context.py (month data), models (snapshots, User)
 """
 
-from datetime import date, timedelta
+from datetime import date
 
 from loguru import logger
-from sqlalchemy import func as sqlfunc
 from sqlalchemy.orm import Session
 
-from ..constants import BuyPlanStatus, UserRole
-from ..models import (
-    BuyPlan,
-    BuyPlanLine,
-    Company,
-    Contact,
-    Offer,
-    ProactiveOffer,
-    Quote,
-    StockListHash,
-    User,
-)
+from ..constants import UserRole
+from ..models import User
 from ..models.performance import AvailScoreSnapshot, MultiplierScoreSnapshot
-from .scoring_helpers import month_range
+from .scoring_context import QUOTED_STATUSES, MonthScoringContext
 
 # ── Point values ─────────────────────────────────────────────────────
 # Buyer offer pipeline (non-stacking — highest tier only)
@@ -65,90 +54,27 @@ MIN_OFFERS_BUYER = 10
 MIN_ACTIVITIES_SALES = 20
 
 
-# ══════════════════════════════════════════════════════════════════════
-#  HELPERS
-# ══════════════════════════════════════════════════════════════════════
-
-
-def _load_quoted_offer_ids(db: Session) -> set[int]:
-    """Return set of offer IDs that appear in any sent/won/lost quote line_items."""
-    ids = set()
-    for (items,) in db.query(Quote.line_items).filter(Quote.status.in_(["sent", "won", "lost"])).limit(10000).all():
-        for item in items or []:
-            oid = item.get("offer_id")
-            if oid:
-                ids.add(oid)
-    return ids
-
-
-def _load_buyplan_offer_ids(db: Session) -> tuple[set[int], set[int]]:
-    """Return (bp_offer_ids, po_confirmed_offer_ids) from buy plan lines."""
-    bp_ids = set()
-    po_ids = set()
-    for bp_status, offer_id in (
-        db.query(BuyPlan.status, BuyPlanLine.offer_id)
-        .join(BuyPlanLine, BuyPlanLine.buy_plan_id == BuyPlan.id)
-        .filter(BuyPlanLine.offer_id.isnot(None))
-        .limit(10000)
-        .all()
-    ):
-        bp_ids.add(offer_id)
-        if bp_status in (BuyPlanStatus.COMPLETED.value,):
-            po_ids.add(offer_id)
-    return bp_ids, po_ids
-
-
 # ══════════════════════════════════════════════════════════════════════
 #  BUYER MULTIPLIER
 # ══════════════════════════════════════════════════════════════════════
 
 
-def compute_buyer_multiplier(
-    db: Session,
-    user_id: int,
-    month: date,
-    *,
-    quoted_ids: set[int] | None = None,
-    bp_ids: set[int] | None = None,
-    po_ids: set[int] | None = None,
-) -> dict:
+def compute_buyer_multiplier(db: Session, user_id: int, month: date, ctx: MonthScoringContext | None = None) -> dict:
     """Compute multiplier points for a buyer in a given month.
 
     Non-stacking: each offer earns ONLY its highest achieved tier.
     Plus bonus points from RFQs sent and stock list uploads.
 
-    Pre-loaded lookup sets can be passed to avoid re-querying per user.
+    Reads everything from *ctx* (built for this user alone when not given).
     """
-    start_dt, end_dt = month_range(month)
-
-    # Load global lookups if not provided
-    if quoted_ids is None:
-        quoted_ids = _load_quoted_offer_ids(db)
-    if bp_ids is None or po_ids is None:
-        bp_ids, po_ids = _load_buyplan_offer_ids(db)
+    ctx = ctx or MonthScoringContext(db, month, user_ids=[user_id])
+    quoted_ids, bp_ids, po_ids = ctx.quoted_offer_ids, ctx.bp_offer_ids, ctx.po_offer_ids
 
     # User's offers this month
-    user_offers = (
-        db.query(Offer)
-        .filter(
-            Offer.entered_by_id == user_id,
-            Offer.created_at >= start_dt,
-            Offer.created_at < end_dt,
-        )
-        .all()
-    )
+    user_offers = ctx.month_offers_by_user.get(user_id, [])
 
     # Grace period: offers from last 7 days of previous month that advanced
-    grace_start = start_dt - timedelta(days=7)
-    grace_offers = (
-        db.query(Offer)
-        .filter(
-            Offer.entered_by_id == user_id,
-            Offer.created_at >= grace_start,
-            Offer.created_at < start_dt,
-        )
-        .all()
-    )
+    grace_offers = ctx.grace_offers_by_user.get(user_id, [])
     grace_advanced = [o for o in grace_offers if o.id in quoted_ids or o.id in bp_ids]
     all_offers = user_offers + grace_advanced
 
@@ -175,28 +101,11 @@ def compute_buyer_multiplier(
     offer_points = pts_base + pts_quoted + pts_bp + pts_po
 
     # Bonus: RFQs sent this month
-    rfqs_sent = (
-        db.query(sqlfunc.count(Contact.id))
-        .filter(
-            Contact.user_id == user_id,
-            Contact.contact_type == "email",
-            Contact.created_at >= start_dt,
-            Contact.created_at < end_dt,
-        )
-        .scalar()
-    ) or 0
+    rfqs_sent = ctx.rfq_emails_by_user.get(user_id, 0)
     pts_rfqs = rfqs_sent * PTS_RFQ_SENT
 
     # Bonus: Stock lists uploaded this month
-    stock_lists = (
-        db.query(sqlfunc.count(StockListHash.id))
-        .filter(
-            StockListHash.user_id == user_id,
-            StockListHash.first_seen_at >= start_dt,
-            StockListHash.first_seen_at < end_dt,
-        )
-        .scalar()
-    ) or 0
+    stock_lists = ctx.stock_lists_by_user.get(user_id, 0)
     pts_stock = stock_lists * PTS_STOCK_LIST
 
     bonus_points = pts_rfqs + pts_stock
@@ -238,36 +147,18 @@ def compute_buyer_multiplier(
 # ══════════════════════════════════════════════════════════════════════
 
 
-def compute_sales_multiplier(db: Session, user_id: int, month: date) -> dict:
+def compute_sales_multiplier(db: Session, user_id: int, month: date, ctx: MonthScoringContext | None = None) -> dict:
     """Compute multiplier points for a salesperson in a given month.
 
     Quote progression is non-stacking (won replaces sent). Proactive conversion is non-
-    stacking (converted replaces sent). New account points are additive.
+    stacking (converted replaces sent). New account points are additive. Reads
+    everything from *ctx* (built for this user alone when not given).
     """
-    start_dt, end_dt = month_range(month)
+    ctx = ctx or MonthScoringContext(db, month, user_ids=[user_id])
 
     # ── Quotes: non-stacking (won replaces sent) ──
-    quotes_sent = (
-        db.query(sqlfunc.count(Quote.id))
-        .filter(
-            Quote.created_by_id == user_id,
-            Quote.sent_at >= start_dt,
-            Quote.sent_at < end_dt,
-            Quote.status.in_(["sent", "won", "lost"]),
-        )
-        .scalar()
-    ) or 0
-
-    quotes_won = (
-        db.query(sqlfunc.count(Quote.id))
-        .filter(
-            Quote.created_by_id == user_id,
-            Quote.result == "won",
-            Quote.result_at >= start_dt,
-            Quote.result_at < end_dt,
-        )
-        .scalar()
-    ) or 0
+    quotes_sent = sum(1 for q in ctx.sent_quotes_by_user.get(user_id, []) if q.status in QUOTED_STATUSES)
+    quotes_won = ctx.quotes_won_by_user.get(user_id, 0)
 
     count_quote_won = quotes_won
     count_quote_sent_only = max(0, quotes_sent - quotes_won)
@@ -275,26 +166,8 @@ def compute_sales_multiplier(db: Session, user_id: int, month: date) -> dict:
     pts_quote_sent = count_quote_sent_only * PTS_QUOTE_SENT
 
     # ── Proactive: non-stacking (converted replaces sent) ──
-    proactive_sent = (
-        db.query(sqlfunc.count(ProactiveOffer.id))
-        .filter(
-            ProactiveOffer.salesperson_id == user_id,
-            ProactiveOffer.sent_at >= start_dt,
-            ProactiveOffer.sent_at < end_dt,
-        )
-        .scalar()
-    ) or 0
-
-    proactive_converted = (
-        db.query(sqlfunc.count(ProactiveOffer.id))
-        .filter(
-            ProactiveOffer.salesperson_id == user_id,
-            ProactiveOffer.status == "converted",
-            ProactiveOffer.converted_at >= start_dt,
-            ProactiveOffer.converted_at < end_dt,
-        )
-        .scalar()
-    ) or 0
+    proactive_sent = ctx.proactive_sent_by_user.get(user_id, 0)
+    proactive_converted = ctx.proactive_converted_by_user.get(user_id, 0)
 
     count_proactive_converted = proactive_converted
     count_proactive_sent_only = max(0, proactive_sent - proactive_converted)
@@ -302,15 +175,7 @@ def compute_sales_multiplier(db: Session, user_id: int, month: date) -> dict:
     pts_proactive_sent = count_proactive_sent_only * PTS_PROACTIVE_SENT
 
     # ── New accounts: additive ──
-    new_accounts = (
-        db.query(sqlfunc.count(Company.id))
-        .filter(
-            Company.account_owner_id == user_id,
-            Company.created_at >= start_dt,
-            Company.created_at < end_dt,
-        )
-        .scalar()
-    ) or 0
+    new_accounts = ctx.new_accounts_by_user.get(user_id, 0)
     pts_accounts = new_accounts * PTS_NEW_ACCOUNT
 
     offer_points = pts_quote_won + pts_quote_sent + pts_proactive_converted + pts_proactive_sent
@@ -344,9 +209,15 @@ def compute_sales_multiplier(db: Session, user_id: int, month: date) -> dict:
 # ══════════════════════════════════════════════════════════════════════
 
 
-def compute_all_multiplier_scores(db: Session, month: date | None = None) -> dict:
-    """Compute multiplier scores for all users, rank, and assign bonuses."""
+def compute_all_multiplier_scores(
+    db: Session, month: date | None = None, ctx: MonthScoringContext | None = None
+) -> dict:
+    """Compute multiplier scores for all users, rank, and assign bonuses.
+
+    Every user is scored from one shared MonthScoringContext (*ctx*, or one built here).
+    """
     month = (month or date.today()).replace(day=1)
+    ctx = ctx or MonthScoringContext(db, month)
 
     _human = [User.is_active.is_(True), ~User.email.like("%@availai.local")]
 
@@ -354,21 +225,10 @@ def compute_all_multiplier_scores(db: Session, month: date | None = None) -> dic
     sales = db.query(User).filter(User.role.in_([UserRole.SALES, UserRole.MANAGER]), *_human).all()
     multi_role = db.query(User).filter(User.role == UserRole.TRADER, *_human).all()
 
-    # Pre-load offer status lookups once for all buyers
-    quoted_ids = _load_quoted_offer_ids(db)
-    bp_ids, po_ids = _load_buyplan_offer_ids(db)
-
     buyer_results = []
     for user in buyers:
         try:
-            result = compute_buyer_multiplier(
-                db,
-                user.id,
-                month,
-                quoted_ids=quoted_ids,
-                bp_ids=bp_ids,
-                po_ids=po_ids,
-            )
+            result = compute_buyer_multiplier(db, user.id, month, ctx)
             result["user_name"] = user.name
             buyer_results.append(result)
         except Exception as e:
@@ -377,7 +237,7 @@ def compute_all_multiplier_scores(db: Session, month: date | None = None) -> dic
     sales_results = []
     for user in sales + multi_role:
         try:
-            result = compute_sales_multiplier(db, user.id, month)
+            result = compute_sales_multiplier(db, user.id, month, ctx)
             result["user_name"] = user.name
             sales_results.append(result)
         except Exception as e:
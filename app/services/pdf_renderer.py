@@ -0,0 +1,215 @@
+"""PDF renderer — WeasyPrint in a warmed process pool, fronted by a content-hash cache.
+
+WeasyPrint layout is pure-Python CPU work: hundreds of ms to seconds per quote or bid
+document. Callers already hand ``document_service`` to an executor thread, but a render
+still holds the GIL for its whole duration, so the event loop (and every other request
+on the worker) stalls behind it. This module moves the layout into separate processes:
+
+  - Pool: a lazily created ``ProcessPoolExecutor`` (``spawn`` — the app process holds
+    DB connections and scheduler threads a fork would copy) with
+    ``settings.pdf_render_workers`` processes. Each worker imports WeasyPrint once and
+    renders a warm-up page in the documents' shared font stack, so fontconfig / Pango
+    caches are hot and one ``FontConfiguration`` is reused for every document.
+  - Bounds: at most ``workers * PENDING_PER_WORKER`` renders are queued; further
+    callers block in their own thread until a slot frees. A render that exceeds
+    ``settings.pdf_render_timeout_s`` raises ``TimeoutError``, and the pool is
+    recycled so a wedged process cannot hold a slot forever.
+  - Cache: PDFs are keyed by a sha256 of the template name and the HTML rendered with
+    a fixed ``generated_at`` placeholder — i.e. of the template plus everything the
+    context put on the page. Re-downloading an unchanged quote is a dict lookup. The
+    cache is process-local, LRU, and bounded by ``settings.pdf_cache_max_mb``. A cached
+    PDF keeps the "Generated" stamp of its first render.
+
+With ``pdf_render_workers = 0`` or under TESTING, renders run inline in the calling
+thread (the test suite stubs ``weasyprint.HTML`` in-process).
+
+Metrics: ``pdf_render_seconds`` (by template), ``pdf_render_queue_depth`` and
+``pdf_render_cache_total`` (hit / miss).
+
+Called by: services/document_service._render_pdf, main.py lifespan (shutdown).
+Depends on: weasyprint (imported in the rendering process only), app.config,
+    app.prometheus_metrics.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, cast
+
+from loguru import logger
+
+from app.config import settings
+from app.prometheus_metrics import PDF_RENDER_CACHE, PDF_RENDER_QUEUE_DEPTH, PDF_RENDER_SECONDS
+
+# Queued renders allowed per worker process before callers wait for a slot.
+PENDING_PER_WORKER = 4
+# Substituted for ``generated_at`` when hashing, so the per-minute stamp never busts
+# the cache; swapped for the real stamp before a miss is rendered.
+STAMP_PLACEHOLDER = "__PDF_GENERATED_AT__"
+
+# Warm-up page in the documents' shared font stack (see app/templates/documents/*).
+_WARMUP_HTML = (
+    "<html><head><style>"
+    "@page { size: letter; margin: 0.75in; }"
+    "body { font-family: Arial, Helvetica, sans-serif; font-size: 10pt; }"
+    "th { font-weight: bold; font-size: 9pt; } h1 { font-size: 18pt; }"
+    "</style></head><body><h1>Warm-up</h1><table><tr><th>MPN</th></tr>"
+    "<tr><td>LM317T 1,000 $0.4500</td></tr></table></body></html>"
+)
+
+_cache: OrderedDict[str, bytes] = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+_pool: ProcessPoolExecutor | None = None
+_slots: threading.BoundedSemaphore | None = None
+_pool_lock = threading.Lock()
+_pending = 0
+
+# Worker-process state, set by _init_worker.
+_font_config: Any = None
+
+
+def _init_worker() -> None:
+    """Pool initializer: import WeasyPrint and lay out one page to warm font caches."""
+    global _font_config
+    from weasyprint import HTML
+    from weasyprint.text.fonts import FontConfiguration
+
+    _font_config = FontConfiguration()
+    HTML(string=_WARMUP_HTML).write_pdf(font_config=_font_config)
+
+
+def _render_html(html: str) -> bytes:
+    """Lay out *html* to PDF bytes (runs in a pool worker, or inline)."""
+    from weasyprint import HTML
+
+    # cast: weasyprint is untyped; write_pdf() without a target returns the PDF bytes.
+    if _font_config is None:
+        return cast(bytes, HTML(string=html).write_pdf())
+    return cast(bytes, HTML(string=html).write_pdf(font_config=_font_config))
+
+
+def _inline() -> bool:
+    return settings.pdf_render_workers <= 0 or bool(os.environ.get("TESTING"))
+
+
+def _get_pool() -> tuple[ProcessPoolExecutor, threading.BoundedSemaphore]:
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is None or _slots is None:
+            workers = settings.pdf_render_workers
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            _slots = threading.BoundedSemaphore(workers * PENDING_PER_WORKER)
+        return _pool, _slots
+
+
+def _recycle_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop *pool* (if still current) so the next render starts a fresh one."""
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is pool:
+            _pool, _slots = None, None
+    pool.shutdown(wait=False, cancel_futures=True)
+    for proc in list(getattr(pool, "_processes", {}).values()):
+        proc.terminate()
+
+
+def _track_pending(delta: int) -> None:
+    global _pending
+    with _pool_lock:
+        _pending += delta
+        PDF_RENDER_QUEUE_DEPTH.set(_pending)
+
+
+def _render_in_pool(html: str) -> bytes:
+    pool, slots = _get_pool()
+    _track_pending(1)
+    try:
+        with slots:
+            future: Future[bytes] = pool.submit(_render_html, html)
+            try:
+                return future.result(timeout=settings.pdf_render_timeout_s)
+            except FutureTimeoutError:
+                logger.error("PDF render exceeded {}s — recycling the render pool", settings.pdf_render_timeout_s)
+                _recycle_pool(pool)
+                raise TimeoutError("PDF render timed out") from None
+            except BrokenProcessPool:
+                logger.error("PDF render pool broke — recycling")
+                _recycle_pool(pool)
+                raise
+    finally:
+        _track_pending(-1)
+
+
+def _cache_get(key: str) -> bytes | None:
+    with _cache_lock:
+        pdf = _cache.get(key)
+        if pdf is not None:
+            _cache.move_to_end(key)
+        return pdf
+
+
+def _cache_put(key: str, pdf: bytes) -> None:
+    global _cache_bytes
+    limit = settings.pdf_cache_max_mb * 1024 * 1024
+    if len(pdf) > limit:
+        return
+    with _cache_lock:
+        if key in _cache:
+            return
+        _cache[key] = pdf
+        _cache_bytes += len(pdf)
+        while _cache_bytes > limit:
+            _, evicted = _cache.popitem(last=False)
+            _cache_bytes -= len(evicted)
+
+
+def render(template_name: str, html: str, generated_at: str) -> bytes:
+    """Return the PDF for *html*, rendered from *template_name*.
+
+    *html* must carry ``STAMP_PLACEHOLDER`` wherever the template printed
+    ``generated_at``; the cache key is taken over that stamp-free HTML.
+    """
+    key = hashlib.sha256(f"{template_name}\x00{html}".encode()).hexdigest()
+    pdf = _cache_get(key)
+    if pdf is not None:
+        PDF_RENDER_CACHE.labels(result="hit").inc()
+        return pdf
+    PDF_RENDER_CACHE.labels(result="miss").inc()
+
+    page = html.replace(STAMP_PLACEHOLDER, generated_at)
+    start = time.perf_counter()
+    pdf = _render_html(page) if _inline() else _render_in_pool(page)
+    PDF_RENDER_SECONDS.labels(template=template_name).observe(time.perf_counter() - start)
+    _cache_put(key, pdf)
+    return pdf
+
+
+def clear() -> None:
+    """Empty the PDF cache (tests; ops after a template deploy is a restart anyway)."""
+    global _cache_bytes
+    with _cache_lock:
+        _cache.clear()
+        _cache_bytes = 0
+
+
+def shutdown() -> None:
+    """Stop the render pool, if one was started."""
+    global _pool, _slots
+    with _pool_lock:
+        pool, _pool, _slots = _pool, None, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,75 @@
+"""services/quote_offer_links.py — reads and rebuilds of the ``quote_offer_links``
+projection.
+
+``quote_offer_links`` mirrors the offer ids in every quote's ``line_items`` JSON
+together with the quote's status. The ``Quote`` listeners in ``app/models/quotes.py``
+keep it current on every create / edit / send / result. This module answers "which of
+these offers were quoted (or won)" with one indexed query, and rebuilds the projection
+from the JSON for the backfill command.
+
+Called by: services/scoring_context.py, services/vendor_score.py,
+    services/vendor_scorecard.py, management/backfill_quote_offer_links.py.
+Depends on: app.models.quotes (Quote, QuoteOfferLink, offer_ids_from_line_items).
+"""
+
+from collections.abc import Collection
+
+from loguru import logger
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.constants import QuoteStatus
+from app.models.quotes import Quote, QuoteOfferLink, offer_ids_from_line_items
+
+QUOTED_STATUSES = (QuoteStatus.SENT, QuoteStatus.WON, QuoteStatus.LOST)
+
+
+def quoted_offer_ids(
+    db: Session,
+    statuses: Collection[str] = QUOTED_STATUSES,
+    offer_ids: Collection[int] | None = None,
+) -> set[int]:
+    """Offer ids that appear on at least one quote in *statuses*.
+
+    With *offer_ids* the lookup is restricted to those offers (single-vendor paths);
+    without it every quoted offer is returned (batch scoring).
+    """
+    stmt = select(QuoteOfferLink.offer_id).where(QuoteOfferLink.status.in_(list(statuses))).distinct()
+    if offer_ids is not None:
+        if not offer_ids:
+            return set()
+        stmt = stmt.where(QuoteOfferLink.offer_id.in_(list(offer_ids)))
+    return set(db.scalars(stmt))
+
+
+def backfill_quote_offer_links(db: Session, batch_size: int = 500) -> int:
+    """Rebuild ``quote_offer_links`` from every quote's JSON line items.
+
+    Idempotent: each batch of quotes has its links deleted and re-inserted, then
+    committed. Returns the number of links written.
+    """
+    written = 0
+    last_id = 0
+    while True:
+        batch = db.execute(
+            select(Quote.id, Quote.status, Quote.line_items)
+            .where(Quote.id > last_id)
+            .order_by(Quote.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            break
+        quote_ids = [row.id for row in batch]
+        db.execute(delete(QuoteOfferLink).where(QuoteOfferLink.quote_id.in_(quote_ids)))
+        rows = [
+            {"quote_id": row.id, "offer_id": oid, "status": row.status}
+            for row in batch
+            for oid in sorted(offer_ids_from_line_items(row.line_items))
+        ]
+        if rows:
+            db.execute(insert(QuoteOfferLink), rows)
+        db.commit()
+        written += len(rows)
+        last_id = quote_ids[-1]
+    logger.info("QUOTE_OFFER_LINKS backfill: wrote {} links", written)
+    return written
@@ -0,0 +1,408 @@
+"""Month-scoped scoring context — the shared data behind the performance leaderboards.
+
+The Avail Score, multiplier and buyer-leaderboard computations read the same month of
+data: which offers were quoted or reached a buy plan, each user's requisitions, RFQ
+contacts, quotes, proactive offers and outbound activity. Computed user by user, every
+score re-ran its own quote, requisition, contact and offer queries, so a recompute cost
+users x data.
+
+``MonthScoringContext`` loads each of those datasets ONCE, with one grouped query per
+dataset, on first use (``functools.cached_property``), and exposes per-user maps. The
+per-user score functions then only do dictionary lookups and arithmetic, so a full
+leaderboard recompute costs one pass over the month's data regardless of head count.
+The scoring job builds one context per month and shares it across all three
+leaderboards (the unified leaderboard reads their snapshots).
+
+A context built with ``user_ids`` narrows the user-keyed queries to those users (the
+single-user, on-demand path); the offer-status sets are always global.
+
+Called by: services/avail_score_service.py, services/multiplier_score_service.py,
+           services/buyer_leaderboard.py, jobs/offers_jobs.py (_job_performance_tracking)
+Depends on: models, services/scoring_helpers.py (month_range),
+            services/quote_offer_links.py (quoted offer ids)
+"""
+
+from collections import defaultdict
+from collections.abc import Collection
+from datetime import UTC, date, datetime, timedelta
+from functools import cached_property
+from typing import Any
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy import func as sqlfunc
+from sqlalchemy.orm import Session
+
+from ..constants import ActivityType, BuyPlanStatus, Direction, ProactiveOfferStatus, QuoteStatus
+from ..models import (
+    ActivityLog,
+    BuyPlan,
+    BuyPlanLine,
+    Company,
+    Contact,
+    CustomerSite,
+    Offer,
+    ProactiveOffer,
+    Quote,
+    Requisition,
+    SiteContact,
+    StockListHash,
+)
+from . import quote_offer_links
+from .scoring_helpers import month_range
+
+GRACE_DAYS = 7  # offers from the last week of the previous month count if they advanced
+QUOTE_FOLLOWUP_DAYS = 5
+QUOTED_STATUSES = (QuoteStatus.SENT, QuoteStatus.WON, QuoteStatus.LOST)
+# Calls + emails, direction-agnostic (call_logged is canonical for any direction).
+OUTREACH_TYPES = (ActivityType.EMAIL_SENT, ActivityType.CALL_LOGGED)
+
+
+def as_utc(dt: datetime) -> datetime:
+    """Treat a naive datetime as UTC; pass tz-aware datetimes through unchanged."""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=UTC)
+    return dt
+
+
+class MonthScoringContext:
+    """Lazily loaded, grouped month data for scoring many users at once."""
+
+    def __init__(self, db: Session, month: date, user_ids: Collection[int] | None = None):
+        self.db = db
+        self.month = month.replace(day=1)
+        self.start_dt, self.end_dt = month_range(self.month)
+        self.grace_start_dt = self.start_dt - timedelta(days=GRACE_DAYS)
+        self.user_ids = set(user_ids) if user_ids is not None else None
+
+    def _users(self, column: Any) -> list:
+        """Filter clause narrowing a user-keyed column to ``user_ids`` (none when unscoped)."""
+        return [column.in_(self.user_ids)] if self.user_ids is not None else []
+
+    def _in_month(self, column: Any) -> list:
+        return [column >= self.start_dt, column < self.end_dt]
+
+    def _count_by_user(self, user_col: Any, *where: Any) -> dict[int, int]:
+        stmt = select(user_col, sqlfunc.count()).where(*where, *self._users(user_col)).group_by(user_col)
+        return {uid: n for uid, n in self.db.execute(stmt)}
+
+    # ── Offer status (global) ─────────────────────────────────────────
+
+    @cached_property
+    def quoted_offer_ids(self) -> set[int]:
+        """Offer ids on any sent / won / lost quote (indexed ``quote_offer_links``)."""
+        return quote_offer_links.quoted_offer_ids(self.db, QUOTED_STATUSES)
+
+    @cached_property
+    def _buy_plan_offer_ids(self) -> tuple[set[int], set[int]]:
+        bp_ids: set[int] = set()
+        po_ids: set[int] = set()
+        stmt = (
+            select(BuyPlan.status, BuyPlanLine.offer_id)
+            .join(BuyPlanLine, BuyPlanLine.buy_plan_id == BuyPlan.id)
+            .where(BuyPlanLine.offer_id.isnot(None))
+        )
+        for bp_status, offer_id in self.db.execute(stmt):
+            bp_ids.add(offer_id)
+            if bp_status == BuyPlanStatus.COMPLETED.value:
+                po_ids.add(offer_id)
+        return bp_ids, po_ids
+
+    @property
+    def bp_offer_ids(self) -> set[int]:
+        """Offer ids on any buy plan line."""
+        return self._buy_plan_offer_ids[0]
+
+    @property
+    def po_offer_ids(self) -> set[int]:
+        """Offer ids on a completed (PO-confirmed) buy plan."""
+        return self._buy_plan_offer_ids[1]
+
+    # ── Buyer data ────────────────────────────────────────────────────
+
+    @cached_property
+    def _offers_by_user(self) -> tuple[dict[int, list], dict[int, list]]:
+        month_offers: dict[int, list] = defaultdict(list)
+        grace_offers: dict[int, list] = defaultdict(list)
+        stmt = select(
+            Offer.id, Offer.entered_by_id, Offer.requisition_id, Offer.vendor_card_id, Offer.created_at
+        ).where(
+            Offer.entered_by_id.isnot(None),
+            Offer.created_at >= self.grace_start_dt,
+            Offer.created_at < self.end_dt,
+            *self._users(Offer.entered_by_id),
+        )
+        for row in self.db.execute(stmt):
+            in_month = as_utc(row.created_at) >= self.start_dt
+            (month_offers if in_month else grace_offers)[row.entered_by_id].append(row)
+        return month_offers, grace_offers
+
+    @property
+    def month_offers_by_user(self) -> dict[int, list]:
+        """User id -> offer rows (id, requisition_id, vendor_card_id, created_at) entered this month."""
+        return self._offers_by_user[0]
+
+    @property
+    def grace_offers_by_user(self) -> dict[int, list]:
+        """User id -> offer rows entered in the grace week before the month."""
+        return self._offers_by_user[1]
+
+    @cached_property
+    def req_ids_by_user(self) -> dict[int, set[int]]:
+        """User id -> requisitions they created, sent RFQs on, or logged offers for this month."""
+        by_user: dict[int, set[int]] = defaultdict(set)
+        created = select(Requisition.created_by, Requisition.id).where(
+            Requisition.created_by.isnot(None),
+            *self._in_month(Requisition.created_at),
+            *self._users(Requisition.created_by),
+        )
+        rfqs = (
+            select(Contact.user_id, Contact.requisition_id)
+            .where(
+                Contact.user_id.isnot(None),
+                Contact.requisition_id.isnot(None),
+                *self._in_month(Contact.created_at),
+                *self._users(Contact.user_id),
+            )
+            .distinct()
+        )
+        for uid, rid in (*self.db.execute(created), *self.db.execute(rfqs)):
+            by_user[uid].add(rid)
+        for uid, offers in self.month_offers_by_user.items():
+            by_user[uid].update(o.requisition_id for o in offers if o.requisition_id is not None)
+        return by_user
+
+    @cached_property
+    def requisition_created_at(self) -> dict[int, datetime | None]:
+        """Requisition id -> created_at for every requisition in any user's set."""
+        ids = set().union(*self.req_ids_by_user.values())
+        if not ids:
+            return {}
+        stmt = select(Requisition.id, Requisition.created_at).where(Requisition.id.in_(ids))
+        return {rid: created_at for rid, created_at in self.db.execute(stmt)}
+
+    @cached_property
+    def req_contacts(self) -> dict[int, list]:
+        """Requisition id -> all its RFQ contacts (user_id, vendor_name_normalized, status, created_at)."""
+        by_req: dict[int, list] = defaultdict(list)
+        if not self.requisition_created_at:
+            return by_req
+        stmt = select(
+            Contact.requisition_id,
+            Contact.user_id,
+            Contact.vendor_name_normalized,
+            Contact.status,
+            Contact.created_at,
+        ).where(Contact.requisition_id.in_(self.requisition_created_at))
+        for row in self.db.execute(stmt):
+            by_req[row.requisition_id].append(row)
+        return by_req
+
+    @cached_property
+    def first_offer_at(self) -> dict[int, datetime]:
+        """Requisition id -> its earliest offer (any user, any time) for the users' requisitions."""
+        if not self.requisition_created_at:
+            return {}
+        stmt = (
+            select(Offer.requisition_id, sqlfunc.min(Offer.created_at))
+            .where(Offer.requisition_id.in_(self.requisition_created_at))
+            .group_by(Offer.requisition_id)
+        )
+        return {rid: first for rid, first in self.db.execute(stmt) if first is not None}
+
+    @cached_property
+    def stock_lists_by_user(self) -> dict[int, int]:
+        return self._count_by_user(StockListHash.user_id, *self._in_month(StockListHash.first_seen_at))
+
+    @cached_property
+    def rfq_emails_by_user(self) -> dict[int, int]:
+        return self._count_by_user(
+            Contact.user_id, Contact.contact_type == "email", *self._in_month(Contact.created_at)
+        )
+
+    # ── Quotes ────────────────────────────────────────────────────────
+
+    @cached_property
+    def _quote_results(self) -> tuple[dict[int, int], dict[int, int], dict[int, float]]:
+        won: dict[int, int] = {}
+        lost: dict[int, int] = {}
+        revenue: dict[int, float] = {}
+        stmt = (
+            select(
+                Quote.created_by_id,
+                Quote.result,
+                sqlfunc.count(),
+                sqlfunc.coalesce(sqlfunc.sum(Quote.won_revenue), 0),
+            )
+            .where(
+                Quote.result.in_([QuoteStatus.WON, QuoteStatus.LOST]),
+                *self._in_month(Quote.result_at),
+                *self._users(Quote.created_by_id),
+            )
+            .group_by(Quote.created_by_id, Quote.result)
+        )
+        for uid, result, n, total in self.db.execute(stmt):
+            if result == QuoteStatus.WON:
+                won[uid] = n
+                revenue[uid] = float(total or 0)
+            else:
+                lost[uid] = n
+        return won, lost, revenue
+
+    @property
+    def quotes_won_by_user(self) -> dict[int, int]:
+        return self._quote_results[0]
+
+    @property
+    def quotes_lost_by_user(self) -> dict[int, int]:
+        return self._quote_results[1]
+
+    @property
+    def won_revenue_by_user(self) -> dict[int, float]:
+        return self._quote_results[2]
+
+    @cached_property
+    def sent_quotes_by_user(self) -> dict[int, list]:
+        """User id -> quotes sent this month (id, status, sent_at, customer_site_id), any status."""
+        by_user: dict[int, list] = defaultdict(list)
+        stmt = select(Quote.id, Quote.created_by_id, Quote.status, Quote.sent_at, Quote.customer_site_id).where(
+            Quote.created_by_id.isnot(None), *self._in_month(Quote.sent_at), *self._users(Quote.created_by_id)
+        )
+        for row in self.db.execute(stmt):
+            by_user[row.created_by_id].append(row)
+        return by_user
+
+    @cached_property
+    def strategic_wins_by_user(self) -> dict[int, int]:
+        stmt = (
+            select(Quote.created_by_id, sqlfunc.count(Quote.id))
+            .join(CustomerSite, Quote.customer_site_id == CustomerSite.id)
+            .join(Company, CustomerSite.company_id == Company.id)
+            .where(
+                Quote.result == QuoteStatus.WON,
+                *self._in_month(Quote.result_at),
+                Company.is_strategic.is_(True),
+                *self._users(Quote.created_by_id),
+            )
+            .group_by(Quote.created_by_id)
+        )
+        return {uid: n for uid, n in self.db.execute(stmt)}
+
+    # ── Sales data ────────────────────────────────────────────────────
+
+    @cached_property
+    def owned_company_ids_by_user(self) -> dict[int, set[int]]:
+        by_user: dict[int, set[int]] = defaultdict(set)
+        stmt = (
+            select(CustomerSite.owner_id, CustomerSite.company_id)
+            .where(CustomerSite.owner_id.isnot(None), *self._users(CustomerSite.owner_id))
+            .distinct()
+        )
+        for uid, company_id in self.db.execute(stmt):
+            by_user[uid].add(company_id)
+        return by_user
+
+    @cached_property
+    def _outreach(self) -> dict[int, dict]:
+        by_user: dict[int, dict] = defaultdict(lambda: {"companies": set(), "days": set(), "count": 0})
+        day = sqlfunc.date(ActivityLog.created_at)
+        stmt = (
+            select(ActivityLog.user_id, ActivityLog.company_id, day, sqlfunc.count())
+            .where(
+                ActivityLog.activity_type.in_(OUTREACH_TYPES),
+                *self._in_month(ActivityLog.created_at),
+                *self._users(ActivityLog.user_id),
+            )
+            .group_by(ActivityLog.user_id, ActivityLog.company_id, day)
+        )
+        for uid, company_id, activity_day, n in self.db.execute(stmt):
+            entry = by_user[uid]
+            if company_id is not None:
+                entry["companies"].add(company_id)
+            entry["days"].add(activity_day)
+            entry["count"] += n
+        return by_user
+
+    def outreach_companies(self, user_id: int) -> set[int]:
+        """Companies the user called or emailed this month."""
+        return self._outreach[user_id]["companies"] if user_id in self._outreach else set()
+
+    def outreach_days(self, user_id: int) -> int:
+        """Distinct days this month with at least one call or email."""
+        return len(self._outreach[user_id]["days"]) if user_id in self._outreach else 0
+
+    def outreach_count(self, user_id: int) -> int:
+        """Calls + emails logged this month."""
+        return self._outreach[user_id]["count"] if user_id in self._outreach else 0
+
+    @cached_property
+    def followup_times(self) -> dict[tuple[int, int], list[datetime]]:
+        """(user id, company id) -> times of outbound follow-ups within reach of this month's quotes."""
+        by_key: dict[tuple[int, int], list[datetime]] = defaultdict(list)
+        stmt = select(ActivityLog.user_id, ActivityLog.company_id, ActivityLog.created_at).where(
+            or_(
+                ActivityLog.activity_type == ActivityType.EMAIL_SENT,
+                and_(
+                    ActivityLog.activity_type == ActivityType.CALL_LOGGED,
+                    ActivityLog.direction == Direction.OUTBOUND,
+                ),
+            ),
+            ActivityLog.company_id.isnot(None),
+            ActivityLog.created_at > self.start_dt,
+            ActivityLog.created_at <= self.end_dt + timedelta(days=QUOTE_FOLLOWUP_DAYS),
+            *self._users(ActivityLog.user_id),
+        )
+        for uid, company_id, created_at in self.db.execute(stmt):
+            by_key[(uid, company_id)].append(as_utc(created_at))
+        return by_key
+
+    @cached_property
+    def site_company_ids(self) -> dict[int, int]:
+        """Customer site id -> company id for the sites on this month's sent quotes."""
+        site_ids = {q.customer_site_id for quotes in self.sent_quotes_by_user.values() for q in quotes}
+        site_ids.discard(None)
+        if not site_ids:
+            return {}
+        stmt = select(CustomerSite.id, CustomerSite.company_id).where(CustomerSite.id.in_(site_ids))
+        return {site_id: company_id for site_id, company_id in self.db.execute(stmt)}
+
+    @cached_property
+    def proactive_sent_by_user(self) -> dict[int, int]:
+        return self._count_by_user(ProactiveOffer.salesperson_id, *self._in_month(ProactiveOffer.sent_at))
+
+    @cached_property
+    def proactive_converted_by_user(self) -> dict[int, int]:
+        return self._count_by_user(
+            ProactiveOffer.salesperson_id,
+            ProactiveOffer.status == ProactiveOfferStatus.CONVERTED,
+            *self._in_month(ProactiveOffer.converted_at),
+        )
+
+    @cached_property
+    def new_accounts_by_user(self) -> dict[int, int]:
+        return self._count_by_user(Company.account_owner_id, *self._in_month(Company.created_at))
+
+    @cached_property
+    def new_contacts_by_user(self) -> dict[int, int]:
+        stmt = (
+            select(CustomerSite.owner_id, sqlfunc.count(SiteContact.id))
+            .join(CustomerSite, CustomerSite.id == SiteContact.customer_site_id)
+            .where(*self._in_month(SiteContact.created_at), *self._users(CustomerSite.owner_id))
+            .group_by(CustomerSite.owner_id)
+        )
+        return {uid: n for uid, n in self.db.execute(stmt)}
+
+    @cached_property
+    def avg_quality_by_user(self) -> dict[int, float]:
+        """Mean quality_score of assessed, meaningful activities (month end inclusive)."""
+        stmt = (
+            select(ActivityLog.user_id, sqlfunc.avg(ActivityLog.quality_score))
+            .where(
+                ActivityLog.is_meaningful.is_(True),
+                ActivityLog.quality_assessed_at.isnot(None),
+                ActivityLog.created_at >= self.start_dt,
+                ActivityLog.created_at <= self.end_dt,
+                *self._users(ActivityLog.user_id),
+            )
+            .group_by(ActivityLog.user_id)
+        )
+        return {uid: float(avg) for uid, avg in self.db.execute(stmt) if avg is not None}
@@ -4,7 +4,8 @@ Groups sightings by (vendor_name, requirement_id), computes aggregated qty
 (AI-estimated or sum fallback), averaged price, best price, score (max),
 and tier label. Summaries are materialized in VendorSightingSummary.
 
-Called by: search_service._save_sightings() after sighting upsert
+Called by: search_service._save_sightings() after sighting upsert (per progressive
+    batch with vendor scoping, then a full rebuild)
 Depends on: VendorSightingSummary model, Sighting model, VendorCard model
 """
 
@@ -13,6 +14,7 @@ from __future__ import annotations
 from datetime import UTC, datetime
 
 from loguru import logger
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.models.sourcing import Sighting
@@ -144,7 +146,9 @@ def rebuild_vendor_summaries(
 
     query = db.query(Sighting).filter(*base_filter)
     if vendor_names:
-        query = query.filter(Sighting.vendor_name.in_(vendor_names))
+        # Match on the grouping key below (lower/trimmed), not the raw column.
+        keys = sorted({(vn or "unknown").lower().strip() for vn in vendor_names})
+        query = query.filter(func.lower(func.trim(Sighting.vendor_name)).in_(keys))
 
     sightings = query.all()
 
@@ -253,22 +257,24 @@ def rebuild_vendor_summaries_from_sightings(
     db: Session,
     requirement_id: int,
     sightings: list,
+    affected_only: bool = False,
 ) -> None:
-    """Rebuild all vendor summaries for the requirement when new sightings land.
+    """Rebuild vendor summaries for the requirement when new sightings land.
+
+    Rebuilds ALL vendors by default. ``affected_only`` limits the rebuild to the
+    vendors carried by *sightings* (a progressive search's per-connector batch); the
+    search's final full rebuild then sweeps stale rows.
 
     Silently catches errors so callers don't need try/except boilerplate.
     """
     try:
-        # Skip cheaply when no sighting carries a usable vendor_name; otherwise
-        # always rebuild ALL vendors for the requirement. The previous
-        # implementation passed normalize_vendor_name(...) names into
-        # rebuild_vendor_summaries(vendor_names=...), which filters
-        # Sighting.vendor_name (raw, mixed-case, with suffixes) via IN — so
-        # only vendors whose raw name happened to equal the normalized form
-        # (e.g. "element14") ever produced summary rows.
-        has_vendor = any(s.vendor_name and s.vendor_name.strip() for s in sightings)
-        if has_vendor:
-            rebuild_vendor_summaries(db, requirement_id)
+        # Skip cheaply when no sighting carries a usable vendor_name. Vendor scoping
+        # passes the raw names — rebuild_vendor_summaries matches them on the same
+        # lower/trimmed key it groups by, so casing/whitespace variants of one vendor
+        # land in the same summary row.
+        names = sorted({s.vendor_name.strip() for s in sightings if s.vendor_name and s.vendor_name.strip()})
+        if names:
+            rebuild_vendor_summaries(db, requirement_id, vendor_names=names if affected_only else None)
     except Exception:
         logger.warning("Vendor summary rebuild failed for requirement {}", requirement_id, exc_info=True)
 
@@ -22,11 +22,13 @@ Depends on:
 from __future__ import annotations
 
 import uuid
+from collections import defaultdict
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
 from app.models.sourcing import Requirement, Sighting
@@ -201,28 +203,47 @@ def get_vendor_feedback_adjustment(db: Session, vendor_card_id: int | None) -> V
     """
     if not vendor_card_id:
         return _NO_FEEDBACK_ADJUSTMENT
+    return get_vendor_feedback_adjustments(db, [vendor_card_id]).get(vendor_card_id, _NO_FEEDBACK_ADJUSTMENT)
+
+
+def get_vendor_feedback_adjustments(
+    db: Session, vendor_card_ids: Iterable[int | None]
+) -> dict[int, VendorFeedbackAdjustment]:
+    """Bulk get_vendor_feedback_adjustment — one query for any number of vendors.
+
+    Vendors with no feedback inside the lookback window are absent from the result;
+    callers default them to no adjustment.
+    """
+    ids = {vid for vid in vendor_card_ids if vid}
+    if not ids:
+        return {}
 
     cutoff = _now_utc() - timedelta(days=FEEDBACK_LOOKBACK_DAYS)
     rows = db.execute(
-        select(LeadFeedbackEvent.status, LeadFeedbackEvent.created_at)
+        select(SourcingLead.vendor_card_id, LeadFeedbackEvent.status, LeadFeedbackEvent.created_at)
         .join(SourcingLead, LeadFeedbackEvent.lead_id == SourcingLead.id)
         .where(
-            SourcingLead.vendor_card_id == vendor_card_id,
+            SourcingLead.vendor_card_id.in_(ids),
             LeadFeedbackEvent.created_at >= cutoff,
         )
     ).all()
-    if not rows:
-        return _NO_FEEDBACK_ADJUSTMENT
+    events_by_vendor: dict[int, list[tuple[str, datetime]]] = defaultdict(list)
+    for vendor_card_id, status, created_at in rows:
+        events_by_vendor[vendor_card_id].append((status, created_at))
+    return {vid: _fold_feedback_events(events) for vid, events in events_by_vendor.items()}
 
+
+def _fold_feedback_events(events: list[tuple[str, datetime]]) -> VendorFeedbackAdjustment:
+    now = _now_utc()
     confidence_penalty = 0.0
     safety_penalty = 0.0
     weighted_negative = 0.0
     do_not_contact = False
 
-    for status, created_at in rows:
+    for status, created_at in events:
         if status == "do_not_contact":
             do_not_contact = True
-        age_days = max(((_now_utc() - _as_utc(created_at)).total_seconds() / 86400.0), 0.0)
+        age_days = max(((now - _as_utc(created_at)).total_seconds() / 86400.0), 0.0)
         decay = 0.5 ** (age_days / FEEDBACK_HALF_LIFE_DAYS)
         confidence_penalty += _FEEDBACK_CONFIDENCE_WEIGHT.get(status, 0.0) * decay
         safety_penalty += _FEEDBACK_SAFETY_WEIGHT.get(status, 0.0) * decay
@@ -514,17 +535,64 @@ def _lead_key(requirement_id: int, vendor_normalized: str, matched_part: str) ->
     return f"{requirement_id}:{vendor_normalized}:{matched_part}".lower()
 
 
-def upsert_lead_from_sighting(db: Session, requirement: Requirement, sighting: Sighting) -> SourcingLead:
+@dataclass(frozen=True)
+class _LeadIdentity:
+    """Where a sighting lands: its lead's unique key plus the display names."""
+
+    vendor_name: str
+    vendor_normalized: str
+    requested_part: str
+    matched_part: str
+    matched_part_norm: str
+
+
+def _lead_identity(requirement: Requirement, sighting: Sighting) -> _LeadIdentity:
     vendor_name = (sighting.vendor_name or "").strip() or "Unknown Vendor"
     vendor_normalized = (normalize_vendor_name(vendor_name) or sighting.vendor_name_normalized or "").strip()
     matched_part = (sighting.mpn_matched or sighting.mpn or requirement.primary_mpn or "").strip()
     requested_part = (requirement.primary_mpn or "").strip()
     if not matched_part:
         matched_part = requested_part
+    return _LeadIdentity(
+        vendor_name=vendor_name,
+        vendor_normalized=vendor_normalized,
+        requested_part=requested_part,
+        matched_part=matched_part,
+        matched_part_norm=normalize_mpn_key(matched_part) or matched_part.lower(),
+    )
 
-    matched_part_norm = normalize_mpn_key(matched_part) or matched_part.lower()
-    vendor_card = _find_vendor_card(db, vendor_normalized)
+
+def upsert_lead_from_sighting(db: Session, requirement: Requirement, sighting: Sighting) -> SourcingLead:
+    ident = _lead_identity(requirement, sighting)
+    vendor_card = _find_vendor_card(db, ident.vendor_normalized)
     feedback = get_vendor_feedback_adjustment(db, vendor_card.id if vendor_card else None)
+    lead = (
+        db.query(SourcingLead)
+        .filter(
+            SourcingLead.requirement_id == requirement.id,
+            SourcingLead.vendor_name_normalized == ident.vendor_normalized,
+            SourcingLead.part_number_matched == ident.matched_part_norm,
+        )
+        .first()
+    )
+    return _apply_sighting_to_lead(db, requirement, sighting, ident, lead, vendor_card, feedback)
+
+
+def _apply_sighting_to_lead(
+    db: Session,
+    requirement: Requirement,
+    sighting: Sighting,
+    ident: _LeadIdentity,
+    lead: SourcingLead | None,
+    vendor_card: VendorCard | None,
+    feedback: VendorFeedbackAdjustment,
+) -> SourcingLead:
+    """Create (when *lead* is None) or refresh a lead from one sighting — no queries."""
+    vendor_name = ident.vendor_name
+    vendor_normalized = ident.vendor_normalized
+    requested_part = ident.requested_part
+    matched_part = ident.matched_part
+    matched_part_norm = ident.matched_part_norm
     source_reliability = _source_reliability(sighting.source_type, sighting.evidence_tier)
     freshness = _freshness_score(sighting.created_at)
     contactability = _contactability_score(sighting, vendor_card)
@@ -536,16 +604,6 @@ def upsert_lead_from_sighting(db: Session, requirement: Requirement, sighting: S
         vendor_card, contactability, feedback.safety_penalty, feedback.do_not_contact
     )
 
-    lead = (
-        db.query(SourcingLead)
-        .filter(
-            SourcingLead.requirement_id == requirement.id,
-            SourcingLead.vendor_name_normalized == vendor_normalized,
-            SourcingLead.part_number_matched == matched_part_norm,
-        )
-        .first()
-    )
-
     if lead is None:
         lead = SourcingLead(
             lead_id=f"ld_{uuid.uuid4().hex[:24]}",
@@ -671,9 +729,13 @@ def _count_dedup_signals(
     lead: SourcingLead,
     other: SourcingLead,
     vendor_card: VendorCard | None,
+    cards: dict[int, VendorCard] | None = None,
 ) -> int:
     """Count how many dedup signals match between two leads.
 
+    *cards* is an optional preloaded id -> VendorCard map (the batched sync); without
+    it the other lead's card is fetched with ``db.get``.
+
     Returns count of matching signals:
     - vendor_card_id match = 2 (strong — counts as exact duplicate per spec)
     - domain match = 1
@@ -688,7 +750,7 @@ def _count_dedup_signals(
     if not other.vendor_card_id:
         return signals
 
-    other_card = db.get(VendorCard, other.vendor_card_id)
+    other_card = cards.get(other.vendor_card_id) if cards is not None else db.get(VendorCard, other.vendor_card_id)
     if not other_card:
         return signals
 
@@ -730,7 +792,9 @@ def _check_duplicate_candidates(
     db: Session,
     lead: SourcingLead,
     vendor_card: VendorCard | None,
-) -> None:
+    peers: list[SourcingLead] | None = None,
+    cards: dict[int, VendorCard] | None = None,
+) -> SourcingLead | None:
     """Detect and handle duplicate leads for the same part.
 
     Per the handoff dedup spec:
@@ -740,37 +804,47 @@ def _check_duplicate_candidates(
 
     Auto-merge only happens when the weaker lead is still in 'new' status
     (buyer has not acted on it). Otherwise, flags both as duplicate_candidate.
+
+    *peers* / *cards* let the batched sync pass the requirement's other leads for
+    this part and their vendor cards, already loaded. Returns the lead deleted by an
+    auto-merge, if any.
     """
     if not lead.requirement_id:
-        return
+        return None
 
-    other_leads = (
-        db.query(SourcingLead)
-        .filter(
-            SourcingLead.requirement_id == lead.requirement_id,
-            SourcingLead.part_number_matched == lead.part_number_matched,
-            SourcingLead.id != lead.id,
+    if peers is None:
+        other_leads = (
+            db.query(SourcingLead)
+            .filter(
+                SourcingLead.requirement_id == lead.requirement_id,
+                SourcingLead.part_number_matched == lead.part_number_matched,
+                SourcingLead.id != lead.id,
+            )
+            .all()
         )
-        .all()
-    )
+    else:
+        other_leads = [p for p in peers if p.id != lead.id]
     if not other_leads:
-        return
+        return None
 
     for other in other_leads:
-        signals = _count_dedup_signals(db, lead, other, vendor_card)
+        signals = _count_dedup_signals(db, lead, other, vendor_card, cards)
 
         if signals >= 2:
             # Exact or strong likely duplicate — auto-merge
             # Survivor = lead with higher confidence or more evidence
             if (lead.confidence_score or 0) >= (other.confidence_score or 0):
-                _auto_merge_leads(db, lead, other)
+                survivor, duplicate = lead, other
             else:
-                _auto_merge_leads(db, other, lead)
-            return
+                survivor, duplicate = other, lead
+            _auto_merge_leads(db, survivor, duplicate)
+            # A buyer-touched duplicate is flagged, not merged (and not deleted).
+            return duplicate if duplicate.buyer_status == "new" else None
         elif signals == 1:
             # Possible duplicate — flag only
             _add_risk_flag(lead, "duplicate_candidate")
             _add_risk_flag(other, "duplicate_candidate")
+    return None
 
 
 def _add_risk_flag(lead: SourcingLead, flag: str) -> None:
@@ -780,20 +854,36 @@ def _add_risk_flag(lead: SourcingLead, flag: str) -> None:
         lead.risk_flags = sorted(set(existing + [flag]))
 
 
+def _evidence_key(lead_id: int, sighting: Sighting) -> tuple[int, str, str, str]:
+    """The (lead, source type, source reference, observed part) an evidence row is unique on."""
+    return (
+        lead_id,
+        sighting.source_type or "",
+        _source_reference(sighting),
+        sighting.mpn_matched or sighting.mpn or "",
+    )
+
+
 def append_evidence_from_sighting(db: Session, lead: SourcingLead, sighting: Sighting) -> None:
-    source_ref = _source_reference(sighting)
+    _, source_type, source_ref, part_observed = _evidence_key(lead.id, sighting)
     exists = (
         db.query(LeadEvidence.id)
         .filter(
             LeadEvidence.lead_id == lead.id,
-            LeadEvidence.source_type == (sighting.source_type or ""),
+            LeadEvidence.source_type == source_type,
             LeadEvidence.source_reference == source_ref,
-            LeadEvidence.part_number_observed == (sighting.mpn_matched or sighting.mpn or ""),
+            LeadEvidence.part_number_observed == part_observed,
         )
         .first()
     )
     if exists:
         return
+    db.add(LeadEvidence(**_evidence_values(lead.id, sighting)))
+
+
+def _evidence_values(lead_id: int, sighting: Sighting) -> dict:
+    """Column values for a new raw LeadEvidence row observed in *sighting*."""
+    source_ref = _source_reference(sighting)
 
     freshness_days = None
     if sighting.created_at:
@@ -803,9 +893,9 @@ def append_evidence_from_sighting(db: Session, lead: SourcingLead, sighting: Sig
     src_type = sighting.source_type or "unknown"
     src_reliability = _source_reliability(src_type, sighting.evidence_tier)
 
-    evidence = LeadEvidence(
+    return dict(
         evidence_id=f"ev_{uuid.uuid4().hex[:24]}",
-        lead_id=lead.id,
+        lead_id=lead_id,
         signal_type=_signal_type_for_source(src_type),
         source_type=src_type,
         source_name=_source_name(src_type),
@@ -821,53 +911,144 @@ def append_evidence_from_sighting(db: Session, lead: SourcingLead, sighting: Sig
         source_reliability_band=_reliability_band(src_reliability),
         verification_state="raw",
     )
-    db.add(evidence)
 
 
 def _refresh_lead_evidence_rollups(db: Session, lead: SourcingLead) -> None:
-    evidence_rows = db.query(LeadEvidence.source_type).filter(LeadEvidence.lead_id == lead.id).all()
-    evidence_count = len(evidence_rows)
-    # Corroboration requires evidence from 2+ distinct source CATEGORIES
-    # (e.g., api + marketplace), not just 2 different connectors within the same category
-    categories = {_source_category(row.source_type) for row in evidence_rows}
-    lead.evidence_count = evidence_count
-    lead.corroborated = len(categories) >= 2
-    # The +5 corroboration bump must NOT touch a buyer-owned score. Once buyer_status
-    # leaves 'new', buyer feedback owns confidence_score (see upsert_lead_from_sighting);
-    # bumping it here on every re-sync would both restore a buyer-lowered 'no_stock' lead to
-    # a high band AND — now that upsert preserves the score — accumulate unbounded to 100.
-    if lead.corroborated and lead.confidence_score is not None and (lead.buyer_status or "new") == "new":
-        lead.confidence_score = _clamp(float(lead.confidence_score) + 5.0)
-        lead.confidence_band = _confidence_band(float(lead.confidence_score))
+    _refresh_evidence_rollups(db, [lead])
+
+
+def _refresh_evidence_rollups(db: Session, leads: list[SourcingLead]) -> None:
+    """Recompute evidence_count / corroborated (and the +5 bump) for *leads* in one pass.
+
+    One evidence query for all the leads and at most one UPDATE promoting raw evidence.
+    """
+    if not leads:
+        return
+    source_types: dict[int, list[str]] = defaultdict(list)
+    for lead_id, source_type in db.execute(
+        select(LeadEvidence.lead_id, LeadEvidence.source_type).where(
+            LeadEvidence.lead_id.in_([lead.id for lead in leads])
+        )
+    ):
+        source_types[lead_id].append(source_type)
+
+    promote_ids: list[int] = []
+    for lead in leads:
+        evidence_types = source_types.get(lead.id, [])
+        # Corroboration requires evidence from 2+ distinct source CATEGORIES
+        # (e.g., api + marketplace), not just 2 different connectors within the same category
+        categories = {_source_category(t) for t in evidence_types}
+        lead.evidence_count = len(evidence_types)
+        lead.corroborated = len(categories) >= 2
+        # The +5 corroboration bump must NOT touch a buyer-owned score. Once buyer_status
+        # leaves 'new', buyer feedback owns confidence_score (see upsert_lead_from_sighting);
+        # bumping it here on every re-sync would both restore a buyer-lowered 'no_stock' lead to
+        # a high band AND — now that upsert preserves the score — accumulate unbounded to 100.
+        if lead.corroborated and lead.confidence_score is not None and (lead.buyer_status or "new") == "new":
+            lead.confidence_score = _clamp(float(lead.confidence_score) + 5.0)
+            lead.confidence_band = _confidence_band(float(lead.confidence_score))
+            promote_ids.append(lead.id)
+
+    if promote_ids:
         # Promote raw evidence to inferred when corroborated by multiple source categories
-        db.query(LeadEvidence).filter(
-            LeadEvidence.lead_id == lead.id,
-            LeadEvidence.verification_state == "raw",
-        ).update({"verification_state": "inferred"})
+        db.execute(
+            update(LeadEvidence)
+            .where(LeadEvidence.lead_id.in_(promote_ids), LeadEvidence.verification_state == "raw")
+            .values(verification_state="inferred")
+        )
 
 
 def sync_leads_for_sightings(db: Session, requirement: Requirement, sightings: list[Sighting]) -> int:
+    """Upsert the leads and evidence for a batch of saved sightings, then commit.
+
+    Round trips scale with the batch, not the sighting count: the vendor cards,
+    their feedback adjustments and the requirement's existing leads are preloaded
+    in one query each; leads are applied in memory (several sightings of one lead
+    fold in order, last writer wins) and flushed together; new evidence goes in as
+    one multi-row INSERT; rollups and duplicate checks run once per touched lead.
+    """
     if not sightings:
         return 0
-    synced = 0
-    for sighting in sightings:
-        if not sighting.vendor_name:
+    batch = [(s, _lead_identity(requirement, s)) for s in sightings if s.vendor_name]
+    if not batch:
+        return 0
+
+    vendor_names = {ident.vendor_normalized for _, ident in batch} - {""}
+    cards_by_name = (
+        {
+            vc.normalized_name: vc
+            for vc in db.scalars(select(VendorCard).where(VendorCard.normalized_name.in_(vendor_names)))
+        }
+        if vendor_names
+        else {}
+    )
+    feedback_by_card = get_vendor_feedback_adjustments(db, (vc.id for vc in cards_by_name.values()))
+    requirement_leads = list(db.scalars(select(SourcingLead).where(SourcingLead.requirement_id == requirement.id)))
+    leads_by_key = {(lead.vendor_name_normalized, lead.part_number_matched): lead for lead in requirement_leads}
+
+    touched: dict[tuple[str, str], SourcingLead] = {}
+    lead_sightings: list[tuple[SourcingLead, Sighting]] = []
+    for sighting, ident in batch:
+        key = (ident.vendor_normalized, ident.matched_part_norm)
+        vendor_card = cards_by_name.get(ident.vendor_normalized)
+        feedback = (
+            feedback_by_card.get(vendor_card.id, _NO_FEEDBACK_ADJUSTMENT) if vendor_card else _NO_FEEDBACK_ADJUSTMENT
+        )
+        existing = leads_by_key.get(key)
+        lead = _apply_sighting_to_lead(db, requirement, sighting, ident, existing, vendor_card, feedback)
+        if existing is None:
+            leads_by_key[key] = lead
+            requirement_leads.append(lead)
+        touched.setdefault(key, lead)
+        lead_sightings.append((lead, sighting))
+    db.flush()
+
+    touched_leads = list(touched.values())
+    seen_evidence = set(
+        db.execute(
+            select(
+                LeadEvidence.lead_id,
+                LeadEvidence.source_type,
+                LeadEvidence.source_reference,
+                LeadEvidence.part_number_observed,
+            ).where(LeadEvidence.lead_id.in_([lead.id for lead in touched_leads]))
+        ).tuples()
+    )
+    new_evidence = []
+    for lead, sighting in lead_sightings:
+        key = _evidence_key(lead.id, sighting)
+        if key in seen_evidence:
             continue
-        lead = upsert_lead_from_sighting(db, requirement, sighting)
-        db.flush()
-        append_evidence_from_sighting(db, lead, sighting)
-        db.flush()
-        _refresh_lead_evidence_rollups(db, lead)
-        vc = db.get(VendorCard, lead.vendor_card_id) if lead.vendor_card_id else None
-        _check_duplicate_candidates(db, lead, vc)
-        synced += 1
+        seen_evidence.add(key)
+        new_evidence.append(_evidence_values(lead.id, sighting))
+    if new_evidence:
+        db.execute(insert(LeadEvidence), new_evidence)
+
+    _refresh_evidence_rollups(db, touched_leads)
+
+    # Duplicate checks compare against every lead of the requirement for the same part.
+    card_ids = {lead.vendor_card_id for lead in requirement_leads if lead.vendor_card_id}
+    cards = {vc.id: vc for vc in db.scalars(select(VendorCard).where(VendorCard.id.in_(card_ids)))} if card_ids else {}
+    peers_by_part: dict[str, list[SourcingLead]] = defaultdict(list)
+    for lead in requirement_leads:
+        peers_by_part[lead.part_number_matched].append(lead)
+    merged_away: set[int] = set()
+    for lead in touched_leads:
+        if lead.id in merged_away:
+            continue
+        peers = [p for p in peers_by_part[lead.part_number_matched] if p.id not in merged_away]
+        vc = cards.get(lead.vendor_card_id) if lead.vendor_card_id else None
+        gone = _check_duplicate_candidates(db, lead, vc, peers=peers, cards=cards)
+        if gone is not None:
+            merged_away.add(gone.id)
+
     try:
         db.commit()
     except Exception as exc:
         logger.warning("Sourcing lead sync failed for requirement {}: {}", requirement.id, exc)
         db.rollback()
         return 0
-    return synced
+    return len(batch)
 
 
 def attach_lead_metadata_to_results(db: Session, results_by_requirement: dict[int, list[dict]]) -> None:
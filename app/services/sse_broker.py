@@ -2,15 +2,18 @@
 
 Manages a set of connected SSE clients per channel. When a change
 event fires (e.g. requisition status change), all listeners on
-that channel receive a push notification.
+that channel receive a push notification. Publish hooks see every event
+before fan-out (services/fragment_cache.py invalidates cached partials
+from them).
 
-Called by: app/routers/htmx_views.py (stream endpoint + action endpoints)
+Called by: app/routers/htmx_views.py (stream endpoint + action endpoints),
+           app/services/fragment_cache.py (publish hook)
 Depends on: asyncio
 """
 
 import asyncio
 from collections import defaultdict
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 
 from loguru import logger
 
@@ -25,6 +28,12 @@ class SSEBroker:
     def __init__(self):
         self._channels: dict[str, set[asyncio.Queue]] = defaultdict(set)
         self._queue_maxsize = 200
+        self._publish_hooks: list[Callable[[str, str, str], None]] = []
+
+    def add_publish_hook(self, hook: Callable[[str, str, str], None]) -> None:
+        """Call ``hook(channel, event, data)`` on every publish (registered once)."""
+        if hook not in self._publish_hooks:
+            self._publish_hooks.append(hook)
 
     def subscribe(self, channel: str) -> asyncio.Queue:
         """Create a new listener queue for the given channel."""
@@ -40,6 +49,11 @@ class SSEBroker:
 
     async def publish(self, channel: str, event: str, data: str = ""):
         """Push an event to all listeners on the channel."""
+        for hook in self._publish_hooks:
+            try:
+                hook(channel, event, data)
+            except Exception:  # noqa: BLE001 — a hook must never block the fan-out
+                logger.warning("SSE: publish hook failed on '{}'", channel, exc_info=True)
         listeners = list(self._channels.get(channel, set()))
         for q in listeners:
             try:
@@ -1,53 +1,294 @@
 """Vendor Affinity Service — finds vendors likely to supply a given MPN.
 
 What: Three-level affinity matching (L1: same manufacturer, L2: same commodity, L3: AI classification)
+L1 and L3 read the precomputed vendor x manufacturer / category matrix
+(``vendor_affinity_cells``, built by ``rebuild_vendor_affinity`` nightly and
+``refresh_vendor_affinity`` hourly) as a top-k indexed lookup; until the first build
+they aggregate live. L3's MPN classification is cached per MPN prefix in intel_cache.
 L3 excludes the resell mirror's synthetic "Customer Excess" sightings
 (``excess_mirror.mirror_sighting_filter()``) — a raw vendor-name aggregation that would
 otherwise suggest the synthetic label as a contactable supplier (finding #59, THEME F).
-Called by: app/search_service.py during search fan-out
-Depends on: app.models (MaterialCard, Sighting, MaterialVendorHistory, EntityTag, Tag, VendorCard),
-            app.services.excess_mirror (mirror_sighting_filter), Claude API for L3
+Called by: app/search_service.py during search fan-out, routers/sightings.py (vendor modal),
+           jobs/tagging_jobs.py (matrix build / refresh)
+Depends on: app.models (MaterialCard, Sighting, MaterialVendorHistory, EntityTag, Tag, VendorCard,
+            VendorAffinityCell), app.services.excess_mirror (mirror_sighting_filter),
+            app.cache.intel_cache (L3 prefix cache), Claude API for L3
 """
 
 from __future__ import annotations
 
+from collections.abc import Collection, Iterable
+from datetime import UTC, datetime
+
 from loguru import logger
-from sqlalchemy import func, select
+from sqlalchemy import Select, delete, func, insert, literal, or_, select
 from sqlalchemy.orm import Session
 
+from app.database import UTCDateTime
 from app.models import (
     EntityTag,
     MaterialCard,
     MaterialVendorHistory,
     Sighting,
     Tag,
+    VendorAffinityCell,
     VendorCard,
 )
 from app.services.excess_mirror import mirror_sighting_filter
 from app.utils.sql_helpers import escape_like
 
+TOP_K = 20  # vendors returned per level
+MANUFACTURER = "manufacturer"
+CATEGORY = "category"
+_KEY_CHUNK = 500  # dimension keys per incremental delete / insert statement
+_L3_PREFIX_LEN = 6  # MPNs sharing this many leading characters share a classification
+_L3_CACHE_TTL_DAYS = 30
+
+
+def _vendor_card_ids(db: Session, normalized_names: Iterable[str]) -> dict[str, int]:
+    """normalized_name -> VendorCard.id for every name that has a card (one query)."""
+    names = {n for n in normalized_names if n}
+    if not names:
+        return {}
+    rows = db.execute(select(VendorCard.normalized_name, VendorCard.id).where(VendorCard.normalized_name.in_(names)))
+    return {name: vc_id for name, vc_id in rows}
+
+
+def _match(vendor_name: str, vendor_id: int | None, mpn_count: int, manufacturer: str | None, level: int) -> dict:
+    return {
+        "vendor_name": vendor_name,
+        "vendor_id": vendor_id,
+        "mpn_count": mpn_count,
+        "manufacturer": manufacturer,
+        "level": level,
+        "confidence": 0.0,
+    }
+
 
 def _vendor_results_from_rows(rows, db: Session, manufacturer: str | None, level: int) -> list[dict]:
     """Build affinity-match dicts from (vendor_name_normalized, vendor_name, mpn_count)
     rows.
 
-    Shared by L1 and L3, which produce identical result shapes apart from the level.
+    Shared by the live L1 and L3 paths, which produce identical result shapes apart
+    from the level. Vendor cards are resolved in one query for all rows.
     """
-    results = []
-    for row in rows:
-        vendor_norm = row.vendor_name_normalized or row.vendor_name.lower()
-        vc = db.query(VendorCard).filter(VendorCard.normalized_name == vendor_norm).first()
-        results.append(
-            {
-                "vendor_name": row.vendor_name,
-                "vendor_id": vc.id if vc else None,
-                "mpn_count": row.mpn_count,
-                "manufacturer": manufacturer,
-                "level": level,
-                "confidence": 0.0,
-            }
+    rows = list(rows)
+    norms = [row.vendor_name_normalized or row.vendor_name.lower() for row in rows]
+    card_ids = _vendor_card_ids(db, norms)
+    return [
+        _match(row.vendor_name, card_ids.get(norm), row.mpn_count, manufacturer, level)
+        for row, norm in zip(rows, norms, strict=True)
+    ]
+
+
+# ── Precomputed matrix ───────────────────────────────────────────────
+
+
+def _cell_vendor_card_join(vendor_norm_col, vendor_name_col):
+    """Outer-join condition resolving a vendor name pair to its VendorCard."""
+    return VendorCard.normalized_name == func.coalesce(func.nullif(vendor_norm_col, ""), func.lower(vendor_name_col))
+
+
+def _manufacturer_cells(now: datetime, keys: Collection[str] | None = None) -> Select:
+    """SELECT of manufacturer cells: distinct MPNs per (manufacturer, vendor) in history."""
+    mpn_count = func.count(func.distinct(MaterialCard.normalized_mpn))
+    stmt = (
+        select(
+            literal(MANUFACTURER),
+            MaterialCard.manufacturer,
+            MaterialVendorHistory.vendor_name_normalized,
+            MaterialVendorHistory.vendor_name,
+            VendorCard.id,
+            mpn_count,
+            literal(now, UTCDateTime()),
         )
-    return results
+        .join(MaterialCard, MaterialVendorHistory.material_card_id == MaterialCard.id)
+        .outerjoin(
+            VendorCard,
+            _cell_vendor_card_join(MaterialVendorHistory.vendor_name_normalized, MaterialVendorHistory.vendor_name),
+        )
+        .where(MaterialCard.manufacturer.isnot(None), MaterialCard.manufacturer != "")
+        .group_by(
+            MaterialCard.manufacturer,
+            MaterialVendorHistory.vendor_name_normalized,
+            MaterialVendorHistory.vendor_name,
+            VendorCard.id,
+        )
+    )
+    if keys is not None:
+        stmt = stmt.where(MaterialCard.manufacturer.in_(list(keys)))
+    return stmt
+
+
+def _category_cells(now: datetime, keys: Collection[str] | None = None) -> Select:
+    """SELECT of category cells: distinct sighted MPNs per (category, vendor), mirror rows excluded."""
+    category = func.lower(MaterialCard.category)
+    mpn_count = func.count(func.distinct(Sighting.normalized_mpn))
+    stmt = (
+        select(
+            literal(CATEGORY),
+            category,
+            Sighting.vendor_name_normalized,
+            Sighting.vendor_name,
+            VendorCard.id,
+            mpn_count,
+            literal(now, UTCDateTime()),
+        )
+        .join(MaterialCard, Sighting.material_card_id == MaterialCard.id)
+        .outerjoin(VendorCard, _cell_vendor_card_join(Sighting.vendor_name_normalized, Sighting.vendor_name))
+        .where(MaterialCard.category.isnot(None), MaterialCard.category != "", mirror_sighting_filter())
+        .group_by(category, Sighting.vendor_name_normalized, Sighting.vendor_name, VendorCard.id)
+    )
+    if keys is not None:
+        stmt = stmt.where(category.in_(list(keys)))
+    return stmt
+
+
+_CELL_COLUMNS = [
+    "dimension",
+    "dim_key",
+    "vendor_name_normalized",
+    "vendor_name",
+    "vendor_card_id",
+    "mpn_count",
+    "computed_at",
+]
+
+
+def _write_cells(db: Session, cells: Select) -> int:
+    result = db.execute(insert(VendorAffinityCell).from_select(_CELL_COLUMNS, cells))
+    return max(result.rowcount or 0, 0)
+
+
+def rebuild_vendor_affinity(db: Session) -> dict:
+    """Rebuild the whole matrix in one transaction (nightly).
+
+    Readers keep seeing the previous build until the commit.
+    """
+    now = datetime.now(UTC)
+    db.execute(delete(VendorAffinityCell))
+    written = _write_cells(db, _manufacturer_cells(now)) + _write_cells(db, _category_cells(now))
+    db.commit()
+    logger.info("Vendor affinity matrix rebuilt: {} cells", written)
+    return {"mode": "full", "cells": written}
+
+
+def _touched_keys(db: Session, since: datetime) -> tuple[set[str], set[str]]:
+    """Manufacturer and category keys whose source rows changed since *since*."""
+    manufacturers = set(
+        db.scalars(
+            select(MaterialCard.manufacturer)
+            .join(MaterialVendorHistory, MaterialVendorHistory.material_card_id == MaterialCard.id)
+            .where(
+                MaterialCard.manufacturer.isnot(None),
+                or_(MaterialVendorHistory.first_seen >= since, MaterialVendorHistory.last_seen >= since),
+            )
+            .distinct()
+        )
+    )
+    categories = set(
+        db.scalars(
+            select(func.lower(MaterialCard.category))
+            .join(Sighting, Sighting.material_card_id == MaterialCard.id)
+            .where(MaterialCard.category.isnot(None), Sighting.created_at >= since)
+            .distinct()
+        )
+    )
+    return manufacturers - {""}, categories - {""}
+
+
+def refresh_vendor_affinity(db: Session) -> dict:
+    """Recompute only the matrix keys touched since the last build (hourly).
+
+    Falls back to a full rebuild when the matrix has never been built.
+    """
+    since = db.scalar(select(func.max(VendorAffinityCell.computed_at)))
+    if since is None:
+        return rebuild_vendor_affinity(db)
+    now = datetime.now(UTC)
+    manufacturers, categories = _touched_keys(db, since)
+    written = 0
+    for dimension, keys, cells in (
+        (MANUFACTURER, sorted(manufacturers), _manufacturer_cells),
+        (CATEGORY, sorted(categories), _category_cells),
+    ):
+        for i in range(0, len(keys), _KEY_CHUNK):
+            chunk = keys[i : i + _KEY_CHUNK]
+            db.execute(
+                delete(VendorAffinityCell).where(
+                    VendorAffinityCell.dimension == dimension, VendorAffinityCell.dim_key.in_(chunk)
+                )
+            )
+            written += _write_cells(db, cells(now, chunk))
+    db.commit()
+    logger.info(
+        "Vendor affinity matrix refreshed: {} manufacturers, {} categories, {} cells",
+        len(manufacturers),
+        len(categories),
+        written,
+    )
+    return {"mode": "incremental", "manufacturers": len(manufacturers), "categories": len(categories), "cells": written}
+
+
+def _matrix_built(db: Session) -> bool:
+    return db.scalar(select(VendorAffinityCell.id).limit(1)) is not None
+
+
+def _l1_from_matrix(db: Session, card: MaterialCard, manufacturer: str) -> list[dict]:
+    """Top-k manufacturer cells, minus the target MPN itself.
+
+    Cells count every MPN a vendor supplied for the manufacturer; L1 wants OTHER MPNs,
+    so vendors with history on the target card lose one. Reading ``TOP_K`` + that many
+    cells is enough for the adjusted top ``TOP_K`` to be exact.
+    """
+    on_target = set(
+        db.execute(
+            select(MaterialVendorHistory.vendor_name_normalized, MaterialVendorHistory.vendor_name)
+            .where(MaterialVendorHistory.material_card_id == card.id)
+            .distinct()
+        ).tuples()
+    )
+    cells = db.execute(
+        select(
+            VendorAffinityCell.vendor_name_normalized,
+            VendorAffinityCell.vendor_name,
+            VendorAffinityCell.vendor_card_id,
+            VendorAffinityCell.mpn_count,
+        )
+        .where(VendorAffinityCell.dimension == MANUFACTURER, VendorAffinityCell.dim_key == manufacturer)
+        .order_by(VendorAffinityCell.mpn_count.desc())
+        .limit(TOP_K + len(on_target))
+    ).all()
+    adjusted = []
+    for norm, name, card_id, count in cells:
+        count -= 1 if (norm, name) in on_target else 0
+        if count > 0:
+            adjusted.append(_match(name, card_id, count, manufacturer, level=1))
+    adjusted.sort(key=lambda m: m["mpn_count"], reverse=True)
+    return adjusted[:TOP_K]
+
+
+def _l3_from_matrix(db: Session, category: str, manufacturer: str | None) -> list[dict]:
+    """Top-k vendors summed over every category cell whose key contains *category*."""
+    mpn_count = func.sum(VendorAffinityCell.mpn_count)
+    rows = db.execute(
+        select(
+            VendorAffinityCell.vendor_name,
+            func.max(VendorAffinityCell.vendor_card_id),
+            mpn_count,
+        )
+        .where(
+            VendorAffinityCell.dimension == CATEGORY,
+            VendorAffinityCell.dim_key.like(f"%{escape_like(category.lower())}%", escape="\\"),
+        )
+        .group_by(VendorAffinityCell.vendor_name_normalized, VendorAffinityCell.vendor_name)
+        .order_by(mpn_count.desc())
+        .limit(TOP_K)
+    ).all()
+    return [_match(name, card_id, int(count), manufacturer, level=3) for name, card_id, count in rows]
+
+
+# ── Lookups ──────────────────────────────────────────────────────────
 
 
 def find_affinity_vendors_l1(mpn: str, db: Session) -> list[dict]:
@@ -61,6 +302,11 @@ def find_affinity_vendors_l1(mpn: str, db: Session) -> list[dict]:
 
     manufacturer = card.manufacturer
 
+    if _matrix_built(db):
+        results = _l1_from_matrix(db, card, manufacturer)
+        logger.info("L1: found {} vendors for manufacturer={} (MPN={})", len(results), manufacturer, mpn)
+        return results
+
     # Find vendors who have supplied OTHER MPNs from the same manufacturer via MaterialVendorHistory.
     # Join MaterialVendorHistory -> MaterialCard to filter by manufacturer, excluding the target MPN.
     rows = (
@@ -79,7 +325,7 @@ def find_affinity_vendors_l1(mpn: str, db: Session) -> list[dict]:
             MaterialVendorHistory.vendor_name,
         )
         .order_by(func.count(func.distinct(MaterialCard.normalized_mpn)).desc())
-        .limit(20)
+        .limit(TOP_K)
         .all()
     )
 
@@ -142,13 +388,17 @@ def find_affinity_vendors_l2(mpn: str, db: Session, exclude_vendors: set[str] |
         )
         .group_by(EntityTag.entity_id)
         .order_by(func.count(EntityTag.tag_id).desc())
-        .limit(20)
+        .limit(TOP_K)
         .all()
     )
+    cards = {
+        vc.id: vc
+        for vc in db.scalars(select(VendorCard).where(VendorCard.id.in_([r.entity_id for r in other_vendors])))
+    }
 
     results = []
     for row in other_vendors:
-        vc = db.query(VendorCard).filter(VendorCard.id == row.entity_id).first()
+        vc = cards.get(row.entity_id)
         if not vc:
             continue
         if vc.normalized_name in exclude:
@@ -181,11 +431,16 @@ def find_affinity_vendors_l3(mpn: str, manufacturer: str | None, db: Session) ->
         logger.debug("L3: no Anthropic credential configured, skipping")
         return []
 
-    # Classify the MPN into a sourcing category using Claude Haiku.
-    category = _classify_mpn(mpn, manufacturer, api_key)
+    # Classify the MPN into a sourcing category using Claude Haiku (cached per prefix).
+    category = _classify_mpn_cached(mpn, manufacturer, api_key)
     if not category:
         return []
 
+    if _matrix_built(db):
+        results = _l3_from_matrix(db, category, manufacturer)
+        logger.info("L3: found {} vendors for category={} (MPN={})", len(results), category, mpn)
+        return results
+
     # Query sightings for vendors who supplied MPNs in that category.
     rows = (
         db.query(
@@ -198,7 +453,7 @@ def find_affinity_vendors_l3(mpn: str, manufacturer: str | None, db: Session) ->
         .filter(mirror_sighting_filter())
         .group_by(Sighting.vendor_name_normalized, Sighting.vendor_name)
         .order_by(func.count(func.distinct(Sighting.normalized_mpn)).desc())
-        .limit(20)
+        .limit(TOP_K)
         .all()
     )
 
@@ -208,6 +463,33 @@ def find_affinity_vendors_l3(mpn: str, manufacturer: str | None, db: Session) ->
     return results
 
 
+def _mpn_prefix(mpn: str) -> str:
+    """Leading alphanumerics of the MPN — the part family that decides its category."""
+    return "".join(ch for ch in mpn.strip().upper() if ch.isalnum())[:_L3_PREFIX_LEN]
+
+
+def _classify_mpn_cached(mpn: str, manufacturer: str | None, api_key: str) -> str | None:
+    """``_classify_mpn`` behind an intel_cache entry keyed by MPN prefix.
+
+    Parts of one family (same leading characters) land in one sourcing category, so
+    each prefix costs one Claude call per ``_L3_CACHE_TTL_DAYS``. Failures are not
+    cached.
+    """
+    from app.cache.intel_cache import get_cached, set_cached
+
+    prefix = _mpn_prefix(mpn)
+    if not prefix:
+        return _classify_mpn(mpn, manufacturer, api_key)
+    key = f"affinity_l3_category:{prefix}"
+    hit = get_cached(key)
+    if hit and hit.get("category"):
+        return str(hit["category"])
+    category = _classify_mpn(mpn, manufacturer, api_key)
+    if category:
+        set_cached(key, {"category": category, "mpn": mpn}, ttl_days=_L3_CACHE_TTL_DAYS)
+    return category
+
+
 def _classify_mpn(mpn: str, manufacturer: str | None, api_key: str) -> str | None:
     """Call Claude Haiku to classify an MPN into a broad sourcing category."""
     try:
@@ -21,6 +21,7 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.constants import BuyPlanStatus, QuoteStatus
+from app.services.quote_offer_links import quoted_offer_ids
 
 MIN_OFFERS_FOR_SCORE = 5
 ADVANCEMENT_WEIGHT = 0.80
@@ -244,7 +245,7 @@ async def compute_all_vendor_scores(db: Session) -> dict:
     Preloads quote/buyplan offer-id sets for efficiency.
     Returns: {"updated": int, "skipped": int}
     """
-    from app.models import Offer, Quote, VendorCard, VendorReview
+    from app.models import Offer, VendorCard, VendorReview
     from app.models.buy_plan import BuyPlan, BuyPlanLine
     from app.vendor_utils import normalize_vendor_name
 
@@ -267,17 +268,8 @@ async def compute_all_vendor_scores(db: Session) -> dict:
             norm = normalize_vendor_name(vname)
             name_offer_ids.setdefault(norm, set()).add(oid)
 
-    # ── Preload quote line_items to find offer_ids used in quotes ──
-    quotes = db.query(Quote.line_items, Quote.status).filter(Quote.status.in_(QUOTE_USED_STATUSES)).limit(10000).all()
-    if len(quotes) >= 10000:
-        logger.warning("Vendor score quote query hit {} limit — scores may be inaccurate", 10000)
-    quote_offer_id_set: set[int] = set()
-    for line_items, _status in quotes:
-        if line_items:
-            for li in line_items:
-                oid = li.get("offer_id")
-                if oid:
-                    quote_offer_id_set.add(oid)
+    # ── Preload offer_ids used in quotes (indexed quote_offer_links) ──
+    quote_offer_id_set = quoted_offer_ids(db, QUOTE_USED_STATUSES)
 
     # ── Preload buyplan lines (relational) ──
     bp_lines = (
@@ -395,17 +387,7 @@ async def compute_all_vendor_scores(db: Session) -> dict:
 
 def _get_quote_offer_ids(db: Session, offer_ids: set[int]) -> set[int]:
     """Get offer_ids that appear in sent/won/lost Quote line_items."""
-    from app.models import Quote
-
-    quotes = db.query(Quote.line_items).filter(Quote.status.in_(QUOTE_USED_STATUSES)).limit(10000).all()
-    found: set[int] = set()
-    for (line_items,) in quotes:
-        if line_items:
-            for li in line_items:
-                oid = li.get("offer_id")
-                if oid and oid in offer_ids:
-                    found.add(oid)
-    return found
+    return quoted_offer_ids(db, QUOTE_USED_STATUSES, offer_ids)
 
 
 def _get_buyplan_offer_ids(db: Session, offer_ids: set[int], statuses: set[str]) -> set[int]:
@@ -1,7 +1,7 @@
 """Vendor Scorecard — 6 metrics over 90-day rolling window with cold-start protection.
 
 Called by: scheduler.py (daily), routers/performance.py (on-demand)
-Depends on: models, database
+Depends on: models, database, services/quote_offer_links.py
 """
 
 from datetime import UTC, date, datetime, timedelta
@@ -16,13 +16,13 @@ from ..models import (
     BuyPlanLine,
     Contact,
     Offer,
-    Quote,
     VendorCard,
     VendorMetricsSnapshot,
     VendorResponse,
     VendorReview,
 )
 from ..utils.sql_helpers import escape_like
+from .quote_offer_links import quoted_offer_ids
 
 # ── Constants ──────────────────────────────────────────────────────────
 VENDOR_WINDOW_DAYS = 90
@@ -37,13 +37,7 @@ W_REVIEW_RATING = 0.25
 
 def _load_quoted_offer_ids(db: Session) -> set[int]:
     """Offer ids referenced by sent/won/lost quote line items."""
-    quoted_offer_ids: set[int] = set()
-    for (items,) in db.query(Quote.line_items).filter(Quote.status.in_(["sent", "won", "lost"])).limit(10000).all():
-        for item in items or []:
-            oid = item.get("offer_id")
-            if oid:
-                quoted_offer_ids.add(oid)
-    return quoted_offer_ids
+    return quoted_offer_ids(db)
 
 
 def _load_po_offer_ids(db: Session) -> set[int]:
@@ -1,30 +1,39 @@
 """Graph webhook service — subscribe to mail events, process notifications.
 
 Microsoft Graph sends push notifications when emails arrive or are sent.
-We validate, fetch the message details, and auto-log activities.
+The webhook endpoint only validates and enqueues them (graph_notification_queue)
+so Graph gets its 202 straight away; a scheduler drain fetches the message
+details, auto-logs activities and runs one coalesced inbox poll per user.
 
 Usage:
     # Create subscription for a user
     await create_mail_subscription(user, db)
 
-    # Handle incoming webhook POST (called from the FastAPI endpoint)
-    await handle_notification(payload, db)
+    # Incoming webhook POST (called from the FastAPI endpoint)
+    validated = validate_notifications(payload, db)
+    enqueue_notifications(validated, db)
+
+    # Drain the queue in batches (called from scheduler)
+    await drain_notification_queue(db)
 
     # Renew expiring subscriptions (called from scheduler)
     await renew_expiring_subscriptions(db)
 """
 
+import hashlib
 import hmac
 import secrets
 import time
 from datetime import UTC, datetime, timedelta
 
 from loguru import logger
+from sqlalchemy import delete, or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.constants import UserRole
-from app.models import ActivityLog, GraphSubscription, User
+from app.models import ActivityLog, GraphNotificationQueue, GraphSubscription, User
 
 # Graph webhook subscriptions for mail expire after max 3 days (4230 min)
 SUBSCRIPTION_LIFETIME_HOURS = 70  # ~3 days, renew before expiry
@@ -39,9 +48,23 @@ RENEW_BUFFER_HOURS = 6  # renew when less than 6h remaining
 RENEW_FAIL_THRESHOLD = 3
 _M365_SUB_ERROR_MSG = "Email tracking degraded — Graph subscription renewal failing"
 
-# Replay protection: reject duplicate notifications within this window
+# Replay protection: reject duplicate notifications within this window. The shared
+# set is Redis (SET NX EX, visible to every worker); the process-local dict is only
+# the fallback while Redis is down — the queue's UNIQUE dedup_key still catches
+# cross-worker duplicates in PostgreSQL then.
 REPLAY_WINDOW_SECONDS = 300  # 5 minutes
-_seen_notifications: dict[str, float] = {}  # key -> timestamp
+_REPLAY_REDIS_PREFIX = "graph:notif:seen:"
+_seen_notifications: dict[str, float] = {}  # key -> timestamp (Redis-down fallback)
+
+# Graph fetch errors that mean the message itself is gone or off-limits — retrying
+# cannot help, so the notification is dropped. Anything else (401 before the token
+# refresh, 429/5xx after the client's own retries) leaves the queue row pending.
+_PERMANENT_FETCH_ERRORS = {400, 403, 404}
+
+# Durable ingestion queue (graph_notification_queue) drain tuning.
+QUEUE_DRAIN_BATCH = 200  # rows claimed per drain pass
+QUEUE_CLAIM_LEASE_SECONDS = 300  # a claim older than this is treated as abandoned
+MAX_QUEUE_FAIL_COUNT = 5  # dead-letter after this many failed drains (row kept for diagnosis)
 
 # Validation-echo bounds. Microsoft Graph requires the raw ``validationToken``
 # query param to be echoed back as text/plain on subscription creation. Graph's
@@ -340,6 +363,54 @@ def _prune_replay_cache():
         del _seen_notifications[k]
 
 
+def _dedup_key(replay_key: str) -> str:
+    """Fixed-width key for *replay_key* (Graph resource paths can be long)."""
+    return hashlib.sha256(replay_key.encode()).hexdigest()
+
+
+def _claim_replay_key(replay_key: str, now: float) -> bool:
+    """Claim *replay_key* in the shared replay set; ``False`` when already seen.
+
+    Redis ``SET NX EX`` makes the claim visible to every worker. When Redis is
+    unavailable the process-local ``_seen_notifications`` dict is used instead.
+    """
+    from app.cache.intel_cache import _get_redis
+
+    r = _get_redis()
+    if r is not None:
+        try:
+            return bool(r.set(_REPLAY_REDIS_PREFIX + _dedup_key(replay_key), "1", nx=True, ex=REPLAY_WINDOW_SECONDS))
+        except Exception as e:
+            logger.warning("Graph replay set unavailable, using process-local fallback: {}", e)
+
+    if replay_key in _seen_notifications:
+        return False
+    _seen_notifications[replay_key] = now
+    return True
+
+
+def release_replay_keys(validated: list[dict]) -> None:
+    """Un-claim the replay keys of *validated* notifications that were not persisted.
+
+    The endpoint calls this when enqueueing (or inline processing) fails after
+    ``validate_notifications`` claimed the keys — otherwise Graph's retry of the same
+    notification would be rejected as a replay and the notification lost.
+    """
+    from app.cache.intel_cache import _get_redis
+
+    r = _get_redis()
+    for notif in validated:
+        replay_key = notif.get("_replay_key")
+        if not replay_key:
+            continue
+        _seen_notifications.pop(replay_key, None)
+        if r is not None:
+            try:
+                r.delete(_REPLAY_REDIS_PREFIX + _dedup_key(replay_key))
+            except Exception as e:
+                logger.warning("Graph replay key release failed for {}: {}", replay_key, e)
+
+
 def validate_notifications(payload: dict, db: Session) -> list[dict]:
     """Validate incoming Graph webhook notifications.
 
@@ -349,7 +420,9 @@ def validate_notifications(payload: dict, db: Session) -> list[dict]:
     - Replay protection (reject duplicate sub+resource within 5min window)
 
     Returns a list of validated notification dicts, each enriched with
-    ``_subscription`` and ``_user`` keys.
+    ``_subscription``, ``_user`` and ``_replay_key`` keys. The replay keys are
+    claimed here; a caller that fails to persist the notifications must hand them
+    back with ``release_replay_keys``.
     """
     notifications = payload.get("value", [])
     if not notifications:
@@ -393,10 +466,9 @@ def validate_notifications(payload: dict, db: Session) -> list[dict]:
         # Replay protection
         resource = notif.get("resource", "")
         replay_key = f"{sub_id}:{resource}"
-        if replay_key in _seen_notifications:
+        if not _claim_replay_key(replay_key, now):
             logger.warning(f"Replay detected for {replay_key}, ignoring")
             continue
-        _seen_notifications[replay_key] = now
 
         user = db.get(User, sub.user_id)
         if not user:
@@ -404,6 +476,7 @@ def validate_notifications(payload: dict, db: Session) -> list[dict]:
 
         notif["_subscription"] = sub
         notif["_user"] = user
+        notif["_replay_key"] = replay_key
         validated.append(notif)
 
     return validated
@@ -425,11 +498,6 @@ async def handle_notification(payload: dict, db: Session, validated: list[dict]
     from Graph, log it as an activity, and trigger inbox poll for RFQ
     reply matching when inbound messages are detected.
     """
-    from app.email_service import poll_inbox
-    from app.scheduler import get_valid_token
-    from app.services.activity_service import log_email_activity
-    from app.utils.graph_client import GraphClient
-
     # Use pre-validated list when available; otherwise fall back to
     # inline validation for backward compatibility with existing callers.
     if validated is not None:
@@ -471,8 +539,29 @@ async def handle_notification(payload: dict, db: Session, validated: list[dict]
     if not items:
         return
 
-    # Track users who received inbound messages so we can poll their inbox
-    users_with_inbound = {}  # user_id -> (user, token)
+    users_with_inbound = await _log_mail_notifications(items, db)
+    db.commit()
+    await _poll_inboxes(users_with_inbound, db)
+
+
+async def _log_mail_notifications(items: list[dict], db: Session) -> dict[int, tuple[User, str]]:
+    """Fetch each notified message from Graph and log it as an activity.
+
+    Does not commit. Returns ``{user_id: (user, token)}`` for users that received
+    inbound mail, so the caller can run one inbox poll per user however many of
+    their notifications arrived in the batch.
+
+    A notification that could not be fetched for a transient reason (no valid token,
+    Graph throttling / 5xx after retries, a connection error) is marked with an
+    ``_error`` key instead of being skipped silently, so the queue drain can keep its
+    row pending and retry it.
+    """
+    from app.scheduler import get_valid_token
+    from app.services.activity_service import log_email_activity
+    from app.utils.graph_client import GraphClient
+
+    users_with_inbound: dict[int, tuple[User, str]] = {}
+    tokens: dict[int, str | None] = {}
 
     for notif in items:
         user = notif["_user"]
@@ -482,8 +571,11 @@ async def handle_notification(payload: dict, db: Session, validated: list[dict]
         if change_type != "created":
             continue
 
-        token = await get_valid_token(user, db)
+        if user.id not in tokens:
+            tokens[user.id] = await get_valid_token(user, db)
+        token = tokens[user.id]
         if not token:
+            notif["_error"] = "no valid Graph token"
             continue
 
         gc = GraphClient(token)
@@ -494,6 +586,12 @@ async def handle_notification(payload: dict, db: Session, validated: list[dict]
             )
         except Exception as e:
             logger.error(f"Failed to fetch message for notification: {e}")
+            notif["_error"] = f"Graph fetch failed: {e}"
+            continue
+
+        if "error" in msg:
+            if msg["error"] not in _PERMANENT_FETCH_ERRORS:
+                notif["_error"] = f"Graph fetch failed: {msg['error']} {msg.get('detail', '')}".strip()
             continue
 
         if msg.get("isDraft"):
@@ -522,11 +620,17 @@ async def handle_notification(payload: dict, db: Session, validated: list[dict]
         if user.id not in users_with_inbound:
             users_with_inbound[user.id] = (user, token)
 
-    db.commit()
+    return users_with_inbound
+
+
+async def _poll_inboxes(users_with_inbound: dict[int, tuple[User, str]], db: Session) -> None:
+    """Trigger one inbox poll per user who received inbound messages.
+
+    This matches vendor replies to outbound RFQ contacts in near-real-time.
+    """
+    from app.email_service import poll_inbox
 
-    # Trigger inbox poll for users who received inbound messages
-    # This matches vendor replies to outbound RFQ contacts in near-real-time
-    for user_id, (user, token) in users_with_inbound.items():
+    for user, token in users_with_inbound.values():
         try:
             new_responses = await poll_inbox(
                 token=token,
@@ -539,6 +643,149 @@ async def handle_notification(payload: dict, db: Session, validated: list[dict]
             logger.error(f"Webhook-triggered poll failed for {user.email}: {e}")
 
 
+# ═══════════════════════════════════════════════════════════════════════
+#  DURABLE INGESTION QUEUE
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def enqueue_notifications(validated: list[dict], db: Session) -> int:
+    """Persist validated mail notifications to ``graph_notification_queue``.
+
+    This is all the webhook endpoint does before answering 202 — no Graph calls, no
+    activity logging. Non-``created`` change types are dropped here (the drain would
+    skip them anyway). A notification whose ``dedup_key`` is already queued (a replay
+    that reached another worker while Redis was down) is skipped by the unique index.
+
+    Commits. Returns the number of rows queued.
+    """
+    queued = 0
+    for notif in validated:
+        if notif.get("changeType") != "created":
+            continue
+        sub = notif["_subscription"]
+        resource = notif.get("resource", "")
+        row = GraphNotificationQueue(
+            user_id=notif["_user"].id,
+            subscription_id=sub.subscription_id,
+            resource=resource,
+            change_type=notif["changeType"],
+            dedup_key=_dedup_key(f"{sub.subscription_id}:{resource}"),
+        )
+        try:
+            with db.begin_nested():
+                db.add(row)
+        except IntegrityError:
+            logger.warning(f"Replay detected for {sub.subscription_id}:{resource} (already queued), ignoring")
+            continue
+        queued += 1
+
+    db.commit()
+    return queued
+
+
+def _claim_queue_batch(db: Session, batch_size: int) -> list[GraphNotificationQueue]:
+    """Claim up to *batch_size* pending rows for this drain pass and commit the claim.
+
+    ``FOR UPDATE SKIP LOCKED`` (a no-op on SQLite) keeps concurrent drains in other
+    processes from claiming the same rows; the committed ``claimed_at`` lease keeps
+    them off the rows for the rest of the pass. A lease older than
+    ``QUEUE_CLAIM_LEASE_SECONDS`` (the claiming process died) is re-claimable.
+    """
+    now = datetime.now(UTC)
+    lease_cutoff = now - timedelta(seconds=QUEUE_CLAIM_LEASE_SECONDS)
+    rows = list(
+        db.scalars(
+            select(GraphNotificationQueue)
+            .where(
+                GraphNotificationQueue.processed_at.is_(None),
+                GraphNotificationQueue.fail_count < MAX_QUEUE_FAIL_COUNT,
+                or_(GraphNotificationQueue.claimed_at.is_(None), GraphNotificationQueue.claimed_at < lease_cutoff),
+            )
+            .order_by(GraphNotificationQueue.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+    )
+    for row in rows:
+        row.claimed_at = now
+    db.commit()
+    return rows
+
+
+def _purge_processed(db: Session) -> int:
+    """Delete processed rows older than the replay window.
+
+    Keeping them for ``REPLAY_WINDOW_SECONDS`` makes the unique ``dedup_key`` the
+    PostgreSQL replay set for exactly as long as the Redis one.
+    """
+    cutoff = datetime.now(UTC) - timedelta(seconds=REPLAY_WINDOW_SECONDS)
+    result = db.execute(
+        delete(GraphNotificationQueue)
+        .where(GraphNotificationQueue.processed_at.isnot(None), GraphNotificationQueue.processed_at < cutoff)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return int(getattr(result, "rowcount", 0) or 0)
+
+
+def _fail_queue_row(row: GraphNotificationQueue, error: str) -> None:
+    """Release *row* for the next drain with its failure recorded."""
+    row.fail_count = (row.fail_count or 0) + 1
+    row.last_error = error[:500]
+    row.claimed_at = None
+
+
+async def drain_notification_queue(db: Session, batch_size: int = QUEUE_DRAIN_BATCH) -> int:
+    """Drain one batch of queued Graph mail notifications.
+
+    Rows are grouped by user so each user costs one token lookup and, however many
+    of their notifications were queued, one inbox poll. Each user's group commits in
+    its own transaction: a failure rolls back only that group and increments its
+    ``fail_count`` (dead-lettered at ``MAX_QUEUE_FAIL_COUNT``) — the rest of the
+    batch still lands. A row whose message could not be fetched (no token, Graph
+    throttling / 5xx) is failed the same way on its own, while the rest of its
+    group is marked processed.
+
+    Returns the number of rows processed.
+    """
+    rows = _claim_queue_batch(db, batch_size)
+
+    by_user: dict[int, list[GraphNotificationQueue]] = {}
+    for row in rows:
+        by_user.setdefault(row.user_id, []).append(row)
+
+    processed = 0
+    users_with_inbound: dict[int, tuple[User, str]] = {}
+    for user_id, user_rows in by_user.items():
+        user = db.get(User, user_id)
+        # A deleted user's rows have nothing to log — they are simply marked processed.
+        items: list[dict] = [
+            {"_user": user, "resource": row.resource, "changeType": row.change_type} if user else {}
+            for row in user_rows
+        ]
+        try:
+            if user:
+                users_with_inbound.update(await _log_mail_notifications(items, db))
+            now = datetime.now(UTC)
+            for row, item in zip(user_rows, items, strict=True):
+                if "_error" in item:
+                    _fail_queue_row(row, item["_error"])
+                else:
+                    row.processed_at = now
+                    processed += 1
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Graph notification drain failed for user {user_id}: {e}")
+            for row in user_rows:
+                _fail_queue_row(row, str(e))
+            db.commit()
+
+    await _poll_inboxes(users_with_inbound, db)
+    _purge_processed(db)
+    return processed
+
+
 # ═══════════════════════════════════════════════════════════════════════
 #  TEAMS NOTIFICATION HANDLER
 # ═══════════════════════════════════════════════════════════════════════
@@ -0,0 +1,230 @@
+"""Per-request / per-job SQL profiler — query count, DB time, slowest statements, N+1s.
+
+Purpose: Engine-level (cursor event) instrumentation so every HTTP request and every
+    scheduler job knows how many statements it ran, how long it spent in the database,
+    which statements were slowest, and which statement *shapes* repeated often enough
+    to be a likely N+1 (the same SELECT issued once per row of a parent list). Results
+    feed the per-route Prometheus histograms in prometheus_metrics, a warning log line
+    per suspected N+1, and — outside production — a ``Server-Timing: db;dur=…`` response
+    header the browser devtools Network panel renders next to each HTMX partial.
+Called by: app.main (install() + SQLProfilerMiddleware), app.scheduler._traced_job
+    (profile_block per job run), tests/conftest.py (query_budget fixture via
+    capture_queries).
+Depends on: sqlalchemy Engine cursor events, prometheus_metrics (histograms + the
+    route-template / excluded-path helpers), config.settings, loguru.
+
+How the active profile is found: ``profile_block`` stores the profile in a ContextVar.
+asyncio tasks and ``run_in_threadpool`` / ``asyncio.to_thread`` copy the context, so a
+sync endpoint or a job's worker thread records into the profile of the request/job that
+spawned it. Statements with no active profile (startup, ad-hoc scripts) cost one
+ContextVar read. ``capture_queries`` is the process-wide variant for tests — the
+TestClient runs the app in another thread, where a test's own ContextVar is not
+visible.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .prometheus_metrics import DB_N_PLUS_ONE, DB_QUERIES, DB_TIME, _excluded, _handler_for
+
+# A statement shape repeated this many times inside one request/job is reported as a
+# likely N+1. Low enough to catch a per-row lazy load on a 5-row page; legitimate
+# repeats (a handful of identical existence checks) rarely reach it.
+N_PLUS_ONE_THRESHOLD = 5
+# Slowest statements kept per profile (for the slow-unit log line and test failures).
+SLOWEST_KEPT = 5
+# A request/job whose DB time exceeds this logs its slowest statements.
+SLOW_DB_SECONDS = 1.0
+
+_START_ATTR = "_sql_profiler_start"
+
+# Collapse bind-parameter lists ("IN (?, ?, ?)" / "IN (%(p_1)s, %(p_2)s)") and bare
+# integer literals so the per-row variants of one query share a shape.
+_PARAM = r"(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)"
+_IN_LIST_RE = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})+\s*\)")
+_INT_LITERAL_RE = re.compile(r"(?<![\w.])\d+(?![\w.])")
+_WS_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalised form of ``statement`` used to group repeats (N+1 detection)."""
+    shape = _WS_RE.sub(" ", statement).strip()
+    shape = _IN_LIST_RE.sub("(…)", shape)
+    return _INT_LITERAL_RE.sub("N", shape)
+
+
+class QueryProfile:
+    """Statements executed inside one unit of work (request, job run, or test block)."""
+
+    def __init__(self, label: str = "") -> None:
+        self.label = label
+        self.count = 0
+        self.total_seconds = 0.0
+        # Raw statement text → executions. SQLAlchemy's compiled cache hands back the same
+        # string for the same query, so this stays small; shapes are derived lazily.
+        self.statements: Counter[str] = Counter()
+        self.slowest: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.statements[statement] += 1
+            if len(self.slowest) < SLOWEST_KEPT or seconds > self.slowest[-1][0]:
+                self.slowest.append((seconds, statement))
+                self.slowest.sort(key=lambda item: item[0], reverse=True)
+                del self.slowest[SLOWEST_KEPT:]
+
+    def shapes(self) -> Counter[str]:
+        """Executions per normalised statement shape."""
+        with self._lock:
+            items = list(self.statements.items())
+        shapes: Counter[str] = Counter()
+        for statement, n in items:
+            shapes[statement_shape(statement)] += n
+        return shapes
+
+    def n_plus_one(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> list[tuple[str, int]]:
+        """``(shape, executions)`` for every shape repeated at least ``threshold`` times."""
+        return [(shape, n) for shape, n in self.shapes().most_common() if n >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_seconds * 1000:.1f};desc="{self.count} queries"'
+
+    def summary(self) -> str:
+        """Multi-line human-readable report (slowest statements + repeated shapes)."""
+        lines = [f"{self.count} queries, {self.total_seconds * 1000:.1f}ms in DB"]
+        for seconds, statement in self.slowest:
+            lines.append(f"  {seconds * 1000:7.1f}ms  {_WS_RE.sub(' ', statement)[:300]}")
+        for shape, n in self.n_plus_one():
+            lines.append(f"  repeated {n}x: {shape[:300]}")
+        return "\n".join(lines)
+
+
+_current_profile: ContextVar[QueryProfile | None] = ContextVar("sql_profiler_current", default=None)
+# Process-wide captures (capture_queries) — see module docstring.
+_captures: list[QueryProfile] = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and (_captures or _current_profile.get() is not None):
+        setattr(context, _START_ATTR, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    start = getattr(context, _START_ATTR, None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(statement, elapsed)
+    for capture in tuple(_captures):
+        capture.record(statement, elapsed)
+
+
+def install() -> None:
+    """Attach the cursor listeners to every Engine.
+
+    Idempotent — SQLAlchemy deduplicates by (event_name, listener_fn) identity.
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _report(kind: str, name: str, profile: QueryProfile) -> None:
+    """Export one finished unit of work: histograms, N+1 warnings, slow-unit log."""
+    DB_QUERIES.labels(kind=kind, handler=name).observe(profile.count)
+    DB_TIME.labels(kind=kind, handler=name).observe(profile.total_seconds)
+    repeated = profile.n_plus_one()
+    if repeated:
+        DB_N_PLUS_ONE.labels(kind=kind, handler=name).inc()
+        shape, n = repeated[0]
+        logger.warning("Likely N+1 in {} {}: {}x {}", kind, name, n, shape[:300])
+    if profile.total_seconds >= SLOW_DB_SECONDS:
+        logger.info("Slow DB time in {} {}: {}", kind, name, profile.summary())
+
+
+@contextmanager
+def profile_block(kind: str, name: str) -> Iterator[QueryProfile]:
+    """Profile the statements run inside the block and report them as ``kind``/``name``.
+
+    Used by _traced_job (kind="job", name=function name). Nested blocks are independent:
+    the inner one records only its own statements and the outer resumes afterwards.
+    """
+    profile = QueryProfile(name)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+        _report(kind, name, profile)
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryProfile]:
+    """Record every statement the process executes while the block is open (all threads)."""
+    install()
+    profile = QueryProfile("capture")
+    _captures.append(profile)
+    try:
+        yield profile
+    finally:
+        _captures.remove(profile)
+
+
+def _server_timing_enabled() -> bool:
+    """``Server-Timing`` exposes DB timings to the client — only outside production."""
+    from .config import settings
+
+    if settings.sql_server_timing is not None:
+        return settings.sql_server_timing
+    return not settings.app_url.startswith("https")
+
+
+class SQLProfilerMiddleware:
+    """Pure ASGI middleware: one QueryProfile per HTTP request.
+
+    The route template (``/v2/partials/vendors``) labels the histograms, so cardinality
+    stays bounded exactly like http_request_duration_seconds. The Server-Timing header
+    is added when the response starts; statements a streaming body issues afterwards
+    are still counted in the metrics.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.server_timing = _server_timing_enabled()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or _excluded(scope.get("path", "")):
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile(scope.get("path", ""))
+
+        async def send_wrapper(message: Message) -> None:
+            if self.server_timing and message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", profile.server_timing())
+            await send(message)
+
+        token = _current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            _report("request", _handler_for(scope), profile)
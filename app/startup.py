@@ -9,13 +9,16 @@ Depends on: database.py (engine), models.py (Base)
 """
 
 import os
+from collections.abc import Callable
 from pathlib import Path
 
 from loguru import logger
 from sqlalchemy import text as sqltext
+from sqlalchemy.engine import Connection
 from sqlalchemy.exc import DBAPIError, SQLAlchemyError
 
 from .constants import DeferredBackfillState
+from .data_migrations import Backfill, Checkpoint, run_pending
 from .database import SessionLocal, engine
 from .utils.normalization import normalize_mpn_key as _norm_key
 
@@ -217,9 +220,13 @@ def run_deferred_startup_backfills() -> None:
     schedules this function under TESTING=1 anyway; the guard here is defense-in-
     depth for tests that call it directly).
 
+    One-shot backfills run through the versioned ``data_migrations`` ledger (see
+    ``_startup_backfills``), so once each has completed at its current version a boot
+    skips it without touching the tables it repairs.
+
     Called by: main.py lifespan (background task, real boots only), tests (directly)
-    Depends on: database.py (engine), the _backfill_*/_seed_site_contacts/
-        _maybe_analyze_hot_tables helpers below
+    Depends on: database.py (engine), data_migrations.py (run_pending), the
+        _backfill_*/_seed_site_contacts/_maybe_analyze_hot_tables helpers below
     """
     global deferred_backfills_state
     if os.environ.get("TESTING"):
@@ -227,29 +234,13 @@ def run_deferred_startup_backfills() -> None:
         return
 
     try:
+        run_pending(engine, _startup_backfills())
+        # Per-boot, not ledgered: ANALYZE is already gated on BUILD_COMMIT, the sweep
+        # cooldown repair covers a crash window that can reopen on any boot, and the
+        # category check only logs.
         with engine.connect() as conn:
-            _backfill_fts(conn)
-            _seed_site_contacts(conn)
-            _backfill_company_counts(conn)
-            # Normalize legacy site_type 'headquarters' → 'hq' (idempotent)
-            _exec(conn, "UPDATE customer_sites SET site_type='hq' WHERE site_type='headquarters'")
-            _exec(
-                conn,
-                "UPDATE trouble_tickets SET resolved_at = COALESCE(diagnosed_at, created_at) + INTERVAL '1 hour' "
-                "WHERE status = 'resolved' AND resolved_at IS NULL",
-            )
             _maybe_analyze_hot_tables(conn)
-
-        _backfill_normalized_mpn()
-        _backfill_sighting_offer_normalized_mpn()
-        _backfill_sighting_vendor_normalized()
-        _backfill_offer_vendor_normalized()
-        _backfill_proactive_offer_qty()
-        _backfill_ticket_defaults()
-        _backfill_material_cards()
         _backfill_sweep_cooldown()
-        _backfill_resell_mirrors()
-        _complete_reverted_active_plans()
         _warn_non_canonical_categories()
     except Exception:
         deferred_backfills_state = DeferredBackfillState.FAILED
@@ -260,6 +251,57 @@ def run_deferred_startup_backfills() -> None:
         logger.info("Deferred startup backfills complete")
 
 
+def _with_conn(fn: Callable[[Connection], None]) -> Callable[[Checkpoint], None]:
+    """Adapt a connection-taking backfill to the ledger's ``run(checkpoint)`` shape."""
+
+    def run(_checkpoint: Checkpoint) -> None:
+        with engine.connect() as conn:
+            fn(conn)
+
+    return run
+
+
+def _startup_backfills() -> list[Backfill]:
+    """One-shot startup backfills, in run order, for the data_migrations ledger.
+
+    Bump an entry's version to make the next boot run it once more (e.g. after fixing
+    the backfill or when a deploy reintroduces rows it must repair). Entries call the
+    module-level functions through lambdas so they resolve at run time.
+    """
+    return [
+        Backfill("fts_search_vector", 1, _with_conn(lambda conn: _backfill_fts(conn))),
+        Backfill("seed_site_contacts", 1, _with_conn(lambda conn: _seed_site_contacts(conn))),
+        Backfill("company_counts", 1, _with_conn(lambda conn: _backfill_company_counts(conn))),
+        Backfill(
+            "site_type_headquarters_to_hq",
+            1,
+            _with_conn(
+                lambda conn: _exec(conn, "UPDATE customer_sites SET site_type='hq' WHERE site_type='headquarters'")
+            ),
+        ),
+        Backfill(
+            "ticket_resolved_at",
+            1,
+            _with_conn(
+                lambda conn: _exec(
+                    conn,
+                    "UPDATE trouble_tickets SET resolved_at = COALESCE(diagnosed_at, created_at) + INTERVAL '1 hour' "
+                    "WHERE status = 'resolved' AND resolved_at IS NULL",
+                )
+            ),
+        ),
+        Backfill("normalized_mpn", 1, lambda cp: _backfill_normalized_mpn(cp)),
+        Backfill("sighting_offer_normalized_mpn", 1, lambda cp: _backfill_sighting_offer_normalized_mpn(cp)),
+        Backfill("sighting_vendor_normalized", 1, lambda cp: _backfill_sighting_vendor_normalized(cp)),
+        Backfill("offer_vendor_normalized", 1, lambda cp: _backfill_offer_vendor_normalized(cp)),
+        Backfill("proactive_offer_qty", 1, lambda _cp: _backfill_proactive_offer_qty()),
+        Backfill("ticket_defaults", 1, lambda _cp: _backfill_ticket_defaults()),
+        Backfill("material_cards", 1, lambda _cp: _backfill_material_cards()),
+        Backfill("resell_mirrors", 1, lambda _cp: _backfill_resell_mirrors()),
+        Backfill("complete_reverted_active_plans", 1, lambda _cp: _complete_reverted_active_plans()),
+    ]
+
+
 def _seed_verification_group_from_admin_emails() -> None:
     """Seed the ops verification group from ADMIN_EMAILS (idempotent).
 
@@ -764,6 +806,47 @@ def _seed_site_contacts(conn) -> None:
 _BACKFILL_BATCH_SIZE = 500
 
 
+def _keyset_normalize(
+    conn,
+    checkpoint: Checkpoint,
+    table: str,
+    source: str,
+    target: str,
+    normalize: Callable[[str], str | None],
+) -> int:
+    """Fill ``table.target`` from ``normalize(table.source)`` where NULL, in id order.
+
+    Walks an id cursor rather than LIMIT/OFFSET: updated rows leave the ``IS NULL``
+    filter, so an offset would skip unvisited rows, and rows that normalize to nothing
+    would be re-selected forever. The cursor starts from (and advances) *checkpoint*
+    under the table name, so an interrupted run resumes after its last committed batch.
+    Returns the number of rows updated.
+    """
+    total = 0
+    last_id = checkpoint.get(table)
+    while True:
+        rows = conn.execute(
+            sqltext(
+                f"SELECT id, {source} FROM {table}"
+                f" WHERE {target} IS NULL AND {source} IS NOT NULL AND id > :last_id"
+                " ORDER BY id LIMIT :lim"
+            ),
+            {"last_id": last_id, "lim": _BACKFILL_BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        batch = [{"v": v, "id": r[0]} for r in rows if (v := normalize(r[1]))]
+        if batch:
+            conn.execute(sqltext(f"UPDATE {table} SET {target} = :v WHERE id = :id"), batch)
+        conn.commit()
+        total += len(batch)
+        checkpoint.advance(table, last_id, len(batch))
+        if len(rows) < _BACKFILL_BATCH_SIZE:
+            break
+    return total
+
+
 def _verify_encryption_canary() -> None:
     """Fail loudly at boot if the live ENCRYPTION_SALT/SECRET_KEY can't decrypt stored
     data.
@@ -782,35 +865,13 @@ def _verify_encryption_canary() -> None:
         db.close()
 
 
-def _backfill_normalized_mpn() -> None:
+def _backfill_normalized_mpn(checkpoint: Checkpoint | None = None) -> None:
     """One-time backfill: populate requirements.normalized_mpn and re-normalize material_cards."""
+    checkpoint = checkpoint or Checkpoint()
     with engine.connect() as conn:
-        # 1. Backfill requirements.normalized_mpn where NULL — chunked batch writes
+        # 1. Backfill requirements.normalized_mpn where NULL — keyset batches
         try:
-            offset = 0
-            total_reqs = 0
-            while True:
-                rows = conn.execute(
-                    sqltext(
-                        "SELECT id, primary_mpn FROM requirements"
-                        " WHERE normalized_mpn IS NULL AND primary_mpn IS NOT NULL"
-                        " LIMIT :lim OFFSET :off"
-                    ),
-                    {"lim": _BACKFILL_BATCH_SIZE, "off": offset},
-                ).fetchall()
-                if not rows:
-                    break
-                batch = [{"nk": nk, "id": r[0]} for r in rows if (nk := _norm_key(r[1]))]
-                if batch:
-                    conn.execute(
-                        sqltext("UPDATE requirements SET normalized_mpn = :nk WHERE id = :id"),
-                        batch,
-                    )
-                    conn.commit()
-                    total_reqs += len(batch)
-                offset += len(rows)
-                if len(rows) < _BACKFILL_BATCH_SIZE:
-                    break
+            total_reqs = _keyset_normalize(conn, checkpoint, "requirements", "primary_mpn", "normalized_mpn", _norm_key)
             if total_reqs:
                 logger.info("Backfilled normalized_mpn on {} requirements", total_reqs)
         except (SQLAlchemyError, DBAPIError) as e:
@@ -872,67 +933,24 @@ def _backfill_normalized_mpn() -> None:
             conn.rollback()
 
 
-def _backfill_sighting_offer_normalized_mpn() -> None:
+def _backfill_sighting_offer_normalized_mpn(checkpoint: Checkpoint | None = None) -> None:
     """One-time backfill: populate sightings.normalized_mpn and offers.normalized_mpn."""
+    checkpoint = checkpoint or Checkpoint()
     with engine.connect() as conn:
-        # Sightings: compute from mpn_matched — chunked batch writes
+        # Sightings: compute from mpn_matched — keyset batches
         try:
-            offset = 0
-            total_sightings = 0
-            while True:
-                rows = conn.execute(
-                    sqltext(
-                        "SELECT id, mpn_matched FROM sightings"
-                        " WHERE normalized_mpn IS NULL AND mpn_matched IS NOT NULL"
-                        " LIMIT :lim OFFSET :off"
-                    ),
-                    {"lim": _BACKFILL_BATCH_SIZE, "off": offset},
-                ).fetchall()
-                if not rows:
-                    break
-                batch = [{"nk": nk, "id": r[0]} for r in rows if (nk := _norm_key(r[1]))]
-                if batch:
-                    conn.execute(
-                        sqltext("UPDATE sightings SET normalized_mpn = :nk WHERE id = :id"),
-                        batch,
-                    )
-                    conn.commit()
-                    total_sightings += len(batch)
-                offset += len(rows)
-                if len(rows) < _BACKFILL_BATCH_SIZE:
-                    break
+            total_sightings = _keyset_normalize(
+                conn, checkpoint, "sightings", "mpn_matched", "normalized_mpn", _norm_key
+            )
             if total_sightings:
                 logger.info("Backfilled normalized_mpn on {} sightings", total_sightings)
         except (SQLAlchemyError, DBAPIError) as e:
             logger.warning("Backfill sightings.normalized_mpn failed: {}", e)
             conn.rollback()
 
-        # Offers: compute from mpn — chunked batch writes
+        # Offers: compute from mpn — keyset batches
         try:
-            offset = 0
-            total_offers = 0
-            while True:
-                rows = conn.execute(
-                    sqltext(
-                        "SELECT id, mpn FROM offers"
-                        " WHERE normalized_mpn IS NULL AND mpn IS NOT NULL"
-                        " LIMIT :lim OFFSET :off"
-                    ),
-                    {"lim": _BACKFILL_BATCH_SIZE, "off": offset},
-                ).fetchall()
-                if not rows:
-                    break
-                batch = [{"nk": nk, "id": r[0]} for r in rows if (nk := _norm_key(r[1]))]
-                if batch:
-                    conn.execute(
-                        sqltext("UPDATE offers SET normalized_mpn = :nk WHERE id = :id"),
-                        batch,
-                    )
-                    conn.commit()
-                    total_offers += len(batch)
-                offset += len(rows)
-                if len(rows) < _BACKFILL_BATCH_SIZE:
-                    break
+            total_offers = _keyset_normalize(conn, checkpoint, "offers", "mpn", "normalized_mpn", _norm_key)
             if total_offers:
                 logger.info("Backfilled normalized_mpn on {} offers", total_offers)
         except (SQLAlchemyError, DBAPIError) as e:
@@ -940,10 +958,11 @@ def _backfill_sighting_offer_normalized_mpn() -> None:
             conn.rollback()
 
 
-def _backfill_sighting_vendor_normalized() -> None:
+def _backfill_sighting_vendor_normalized(checkpoint: Checkpoint | None = None) -> None:
     """Backfill sightings.vendor_name_normalized from vendor_name until none remain."""
     from .vendor_utils import normalize_vendor_name
 
+    checkpoint = checkpoint or Checkpoint()
     with engine.connect() as conn:
         # Check column exists first
         try:
@@ -953,45 +972,18 @@ def _backfill_sighting_vendor_normalized() -> None:
             return  # Column not yet created
 
         total = 0
-        last_id = 0
-        while True:
-            try:
-                rows = conn.execute(
-                    sqltext(
-                        "SELECT id, vendor_name FROM sightings "
-                        "WHERE vendor_name_normalized IS NULL AND vendor_name IS NOT NULL "
-                        "AND id > :last_id ORDER BY id LIMIT :lim"
-                    ),
-                    {"last_id": last_id, "lim": _BACKFILL_BATCH_SIZE},
-                ).fetchall()
-                if not rows:
-                    break
-                # Advance the cursor past every row we examined. Rows whose vendor_name
-                # normalizes to '' (e.g. "LLC", "Inc.") never get an UPDATE, so filtering
-                # only on "IS NULL" would re-select them forever and hang startup; the
-                # id cursor skips them instead of looping on them.
-                last_id = rows[-1][0]
-                batch = []
-                for r in rows:
-                    nv = normalize_vendor_name(r[1])
-                    if nv:
-                        batch.append({"nv": nv, "id": r[0]})
-                if batch:
-                    conn.execute(
-                        sqltext("UPDATE sightings SET vendor_name_normalized = :nv WHERE id = :id"),
-                        batch,
-                    )
-                    conn.commit()
-                total += len(batch)
-            except Exception as e:
-                logger.warning("Backfill sightings.vendor_name_normalized failed: {}", e)
-                conn.rollback()
-                break
+        try:
+            total = _keyset_normalize(
+                conn, checkpoint, "sightings", "vendor_name", "vendor_name_normalized", normalize_vendor_name
+            )
+        except Exception as e:
+            logger.warning("Backfill sightings.vendor_name_normalized failed: {}", e)
+            conn.rollback()
         if total:
             logger.info("Backfilled vendor_name_normalized on {} sightings", total)
 
 
-def _backfill_offer_vendor_normalized() -> None:
+def _backfill_offer_vendor_normalized(checkpoint: Checkpoint | None = None) -> None:
     """Backfill offers.vendor_name_normalized from vendor_name until none remain.
 
     The vendor detail offers tab filters Offer.vendor_name_normalized == normalized_name
@@ -1001,6 +993,7 @@ def _backfill_offer_vendor_normalized() -> None:
     """
     from .vendor_utils import normalize_vendor_name
 
+    checkpoint = checkpoint or Checkpoint()
     with engine.connect() as conn:
         # Check column exists first
         try:
@@ -1010,40 +1003,13 @@ def _backfill_offer_vendor_normalized() -> None:
             return  # Column not yet created
 
         total = 0
-        last_id = 0
-        while True:
-            try:
-                rows = conn.execute(
-                    sqltext(
-                        "SELECT id, vendor_name FROM offers "
-                        "WHERE vendor_name_normalized IS NULL AND vendor_name IS NOT NULL "
-                        "AND id > :last_id ORDER BY id LIMIT :lim"
-                    ),
-                    {"last_id": last_id, "lim": _BACKFILL_BATCH_SIZE},
-                ).fetchall()
-                if not rows:
-                    break
-                # Advance the cursor past every row we examined. Rows whose vendor_name
-                # normalizes to '' (e.g. "LLC", "Inc.") never get an UPDATE, so filtering
-                # only on "IS NULL" would re-select them forever and hang startup; the
-                # id cursor skips them instead of looping on them.
-                last_id = rows[-1][0]
-                batch = []
-                for r in rows:
-                    nv = normalize_vendor_name(r[1])
-                    if nv:
-                        batch.append({"nv": nv, "id": r[0]})
-                if batch:
-                    conn.execute(
-                        sqltext("UPDATE offers SET vendor_name_normalized = :nv WHERE id = :id"),
-                        batch,
-                    )
-                    conn.commit()
-                total += len(batch)
-            except Exception as e:
-                logger.warning("Backfill offers.vendor_name_normalized failed: {}", e)
-                conn.rollback()
-                break
+        try:
+            total = _keyset_normalize(
+                conn, checkpoint, "offers", "vendor_name", "vendor_name_normalized", normalize_vendor_name
+            )
+        except Exception as e:
+            logger.warning("Backfill offers.vendor_name_normalized failed: {}", e)
+            conn.rollback()
         if total:
             logger.info("Backfilled vendor_name_normalized on {} offers", total)
 
@@ -1249,6 +1249,11 @@ Alpine.data('materialsFilter', () => ({
   subFilters: {},
   q: '',
   page: 0,
+  // Keyset cursor (server-issued next_cursor) and the page it was issued for. It is
+  // only sent while `page` still equals `cursorPage` (see activeCursor), so any code
+  // path that moves `page` on its own (URL sync, AI interpret) falls back to offset.
+  cursor: '',
+  cursorPage: -1,
   drawerOpen: false,
   displayNames: {},
   // Data-confidence selection — the flat list of enrichment tiers sent to the backend.
@@ -1462,6 +1467,7 @@ Alpine.data('materialsFilter', () => ({
       this.minSearches = (isNaN(minSearchesVal) || minSearchesVal < 0) ? 0 : minSearchesVal;
       const pageVal = parseInt(params.get('page') || '0', 10);
       this.page = isNaN(pageVal) ? 0 : pageVal;
+      this.cursor = '';
       this.subFilters = {};
       for (const [key, val] of params.entries()) {
         if (key.startsWith('sf_')) {
@@ -1511,6 +1517,7 @@ Alpine.data('materialsFilter', () => ({
       this.searchedWithin = 'any';
       this.minSearches = 0;
       this.page = 0;
+      this.cursor = '';
       this.subFilters = {};
     }
   },
@@ -1692,12 +1699,20 @@ Alpine.data('materialsFilter', () => ({
 
   applyFilters() {
     this.page = 0;
+    this.cursor = '';
     this.pushURL();
     document.body.dispatchEvent(new CustomEvent('filters-changed'));
   },
 
-  goToPage(newPage) {
+  // The cursor to send with the current request — '' unless it was issued for `page`.
+  activeCursor() {
+    return this.cursor && this.cursorPage === this.page ? this.cursor : '';
+  },
+
+  goToPage(newPage, cursor = '') {
     this.page = newPage;
+    this.cursor = cursor;
+    this.cursorPage = cursor ? newPage : -1;
     this.pushURL(true);
     document.body.dispatchEvent(new CustomEvent('filters-changed'));
   },
@@ -0,0 +1,535 @@
+"""scripts/bench_sourcing.py — Reproducible sourcing-pipeline benchmark (fake connectors).
+
+Measures the hot sourcing path stage by stage against a seeded dataset, with every
+market connector replaced by an in-process ``FakeConnector`` (a real ``BaseConnector``
+subclass, so the breaker / semaphore / retry wrapper is exercised) whose latency,
+jitter, error rate and hit count are configurable. A run is deterministic for a given
+``--seed`` and never touches a real API:
+
+  fetch_fresh         search_service._fetch_fresh — connector fan-out + flatten/dedupe
+  save_sightings      search_service._save_sightings — score + insert + vendor summaries
+  vendor_summaries    sighting_aggregation.rebuild_vendor_summaries
+  search_requirement  search_service.search_requirement — the full pipeline
+  sightings_board     routers.sightings._render_sightings_table — board partial render
+
+Each stage reports p50/p95/p99/max latency, throughput (ops/s) and SQL statements per
+op (``app.sql_profiler.capture_queries`` — process-wide, so worker-thread writes
+count). ``--write`` records the run as the baseline (``BASELINE_PATH``); ``--check``
+re-runs and exits 1 when a stage's p95 regressed by more than ``--threshold`` or its
+statements/op grew. Statement counts are deterministic; latency is machine-dependent,
+so compare against a baseline recorded on the same host. The committed baseline covers
+the ``small`` size at the default settings; ``--check`` re-runs exactly the sizes and
+iteration count the baseline holds. A host that gates on latency (the CI perf job)
+re-records it once with ``--sizes small --write`` and commits the result.
+
+The background material-enrichment kick (``_schedule_background_enrichment``) is
+replaced with a no-op — it fans out to external enrichment APIs off the request path —
+and the AI quantity estimate in the vendor-summary rebuild uses its deterministic
+no-AI fallback, so a configured ANTHROPIC_API_KEY never turns a run into API calls.
+
+Database: the default is a private in-memory SQLite (tables created from the models,
+with the same ARRAY/TSVECTOR/JSONB → JSON/TEXT adapters the test suite uses).
+``--database-url postgresql://…`` benchmarks a scratch Postgres instead — schema via
+``Base.metadata.create_all``; a database that already holds requisitions is refused.
+
+Called by: developers / CI perf job; tests/test_bench_sourcing.py (tiny smoke run +
+    the regression comparator).
+Depends on: app.search_service, app.services.sighting_aggregation, app.routers.sightings,
+    app.sql_profiler, app.connectors.sources.BaseConnector. App modules are imported
+    lazily so ``main`` can point DATABASE_URL/REDIS_URL at the bench target first.
+
+Usage:
+    python -m scripts.bench_sourcing                           # small + medium
+    python -m scripts.bench_sourcing --sizes large --iterations 50
+    python -m scripts.bench_sourcing --latency-ms 150 --error-rate 0.05
+    python -m scripts.bench_sourcing --sizes small --write     # record the baseline
+    python -m scripts.bench_sourcing --check --threshold 0.2   # exit 1 on regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BASELINE_PATH = REPO_ROOT / "scripts" / "bench_sourcing_baseline.json"
+
+# A stage regresses when its p95 grows by more than this fraction AND by more than
+# _MIN_P95_DELTA_MS (sub-millisecond stages are all noise).
+DEFAULT_THRESHOLD = 0.25
+_MIN_P95_DELTA_MS = 2.0
+# Statements/op may grow by this fraction before --check fails (0 would make a single
+# extra lookup on one seed-dependent path flaky).
+QUERY_SLACK = 0.10
+
+# Market connectors the fakes stand in for — class names must match
+# search_service._CONNECTOR_SOURCE_MAP so source stats attribute correctly.
+FAKE_CONNECTOR_CLASSES = (
+    "NexarConnector",
+    "BrokerBinConnector",
+    "EbayConnector",
+    "DigiKeyConnector",
+    "MouserConnector",
+    "OEMSecretsConnector",
+    "SourcengineConnector",
+    "Element14Connector",
+)
+
+_PG_ONLY_TABLES = {"buyer_profiles"}
+
+
+@dataclass(frozen=True)
+class DatasetSize:
+    requisitions: int
+    requirements_per_req: int
+    vendors: int
+    sightings_per_requirement: int
+
+
+SIZES: dict[str, DatasetSize] = {
+    "tiny": DatasetSize(requisitions=3, requirements_per_req=2, vendors=20, sightings_per_requirement=4),
+    "small": DatasetSize(requisitions=50, requirements_per_req=4, vendors=200, sightings_per_requirement=20),
+    "medium": DatasetSize(requisitions=200, requirements_per_req=5, vendors=1_000, sightings_per_requirement=40),
+    "large": DatasetSize(requisitions=1_000, requirements_per_req=5, vendors=5_000, sightings_per_requirement=80),
+}
+
+
+@dataclass(frozen=True)
+class FakeProfile:
+    """Behaviour of every fake connector in a run."""
+
+    latency_ms: float = 40.0
+    jitter_ms: float = 10.0
+    error_rate: float = 0.0
+    hits: int = 8
+
+
+@dataclass
+class Dataset:
+    user_id: int
+    requirement_ids: list[int] = field(default_factory=list)
+    vendor_names: list[str] = field(default_factory=list)
+
+
+@dataclass
+class StageResult:
+    n: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    ops_per_s: float
+    queries_per_op: float
+
+
+# ── fake connectors ───────────────────────────────────────────────────────
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list (q in 0..100)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def fake_hits(rng: random.Random, source: str, part_number: str, count: int, vendor_names: list[str]) -> list[dict]:
+    """``count`` connector-shaped result dicts for ``part_number``."""
+    return [
+        {
+            "vendor_name": rng.choice(vendor_names),
+            "manufacturer": "Bench Semi",
+            "mpn_matched": part_number,
+            "qty_available": rng.randint(1, 50_000),
+            "unit_price": round(rng.uniform(0.05, 250.0), 4),
+            "currency": "USD",
+            "source_type": source,
+            "is_authorized": rng.random() < 0.3,
+            "confidence": rng.randint(2, 5),
+            "vendor_sku": f"{source}-{part_number}-{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def make_fake_connectors(profile: FakeProfile, vendor_names: list[str], seed: int) -> list[Any]:
+    """One fake per market connector, each a ``BaseConnector`` subclass named after the
+    real class (so breaker, semaphore and source-stat bookkeeping key identically)."""
+    from app.connectors.errors import ConnectorError
+    from app.connectors.sources import BaseConnector
+
+    class FakeConnector(BaseConnector):
+        def __init__(self, source: str, rng: random.Random) -> None:
+            super().__init__(timeout=5.0, max_retries=0)
+            self.source = source
+            self.rng = rng
+
+        async def _do_search(self, part_number: str) -> list[dict]:
+            delay_ms = max(0.0, self.rng.gauss(profile.latency_ms, profile.jitter_ms))
+            await asyncio.sleep(delay_ms / 1000)
+            if self.rng.random() < profile.error_rate:
+                raise ConnectorError(f"{self.source}: injected benchmark failure")
+            return fake_hits(self.rng, self.source, part_number, profile.hits, vendor_names)
+
+    connectors = []
+    for i, class_name in enumerate(FAKE_CONNECTOR_CLASSES):
+        source = class_name.removesuffix("Connector").lower()
+        cls = type(class_name, (FakeConnector,), {"source_name": source})
+        connectors.append(cls(source, random.Random(seed * 1_000 + i)))
+    return connectors
+
+
+# ── dataset ───────────────────────────────────────────────────────────────
+
+
+def seed_dataset(db, size_name: str, seed: int) -> Dataset:
+    """Seed one dataset (names prefixed by ``size_name`` so sizes can share a DB)."""
+    from app.models import MaterialCard, Requirement, Requisition, Sighting, User, VendorCard
+
+    size = SIZES[size_name]
+    rng = random.Random(seed)
+    now = datetime.now(UTC)
+    tag = f"bench-{size_name}"
+
+    user = User(email=f"{tag}@bench.invalid", name=f"Bench {size_name}", role="buyer", azure_id=f"{tag}-azure")
+    db.add(user)
+    db.flush()
+
+    vendor_names = [f"{tag} vendor {i:05d}" for i in range(size.vendors)]
+    db.add_all(
+        VendorCard(
+            normalized_name=name,
+            display_name=name.title(),
+            sighting_count=rng.randint(0, 500),
+            vendor_score=rng.uniform(20, 95),
+        )
+        for name in vendor_names
+    )
+
+    data = Dataset(user_id=user.id, vendor_names=vendor_names)
+    for r in range(size.requisitions):
+        requisition = Requisition(
+            name=f"{tag.upper()}-{r:05d}", customer_name="Bench Customer", status="active", created_by=user.id
+        )
+        db.add(requisition)
+        db.flush()
+        for k in range(size.requirements_per_req):
+            mpn = f"{tag.upper().replace('-', '')}{r:05d}{k:02d}"
+            card = MaterialCard(normalized_mpn=mpn.lower(), display_mpn=mpn)
+            db.add(card)
+            db.flush()
+            requirement = Requirement(
+                requisition_id=requisition.id,
+                primary_mpn=mpn,
+                material_card_id=card.id,
+                target_qty=rng.randint(1, 5_000),
+                priority_score=rng.uniform(0, 100),
+            )
+            db.add(requirement)
+            db.flush()
+            data.requirement_ids.append(requirement.id)
+            for _ in range(size.sightings_per_requirement):
+                vendor = rng.choice(vendor_names)
+                db.add(
+                    Sighting(
+                        requirement_id=requirement.id,
+                        material_card_id=card.id,
+                        vendor_name=vendor,
+                        vendor_name_normalized=vendor,
+                        mpn_matched=mpn,
+                        normalized_mpn=mpn.lower(),
+                        qty_available=rng.randint(1, 10_000),
+                        unit_price=round(rng.uniform(0.05, 250.0), 4),
+                        source_type=rng.choice(("brokerbin", "nexar", "mouser", "email")),
+                        score=rng.uniform(0, 100),
+                        created_at=now,
+                    )
+                )
+        db.commit()
+    return data
+
+
+# ── stages ────────────────────────────────────────────────────────────────
+
+
+async def _measure(iterations: int, op: Callable[[int], Awaitable[Any]]) -> StageResult:
+    """Time ``op(0..iterations-1)`` after one unmeasured warm-up call (lazy imports,
+    template compilation and first-use caches otherwise land in the p95)."""
+    from app.sql_profiler import capture_queries
+
+    await op(iterations)
+    samples: list[float] = []
+    with capture_queries() as profile:
+        started = time.perf_counter()
+        for i in range(iterations):
+            t0 = time.perf_counter()
+            await op(i)
+            samples.append((time.perf_counter() - t0) * 1000)
+        wall = time.perf_counter() - started
+    samples.sort()
+    return StageResult(
+        n=iterations,
+        p50_ms=round(_percentile(samples, 50), 3),
+        p95_ms=round(_percentile(samples, 95), 3),
+        p99_ms=round(_percentile(samples, 99), 3),
+        max_ms=round(samples[-1], 3) if samples else 0.0,
+        ops_per_s=round(iterations / wall, 2) if wall else 0.0,
+        queries_per_op=round(profile.count / iterations, 2) if iterations else 0.0,
+    )
+
+
+def _board_request():
+    from starlette.requests import Request
+
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/v2/partials/sightings",
+            "query_string": b"",
+            "headers": [(b"hx-request", b"true")],
+        }
+    )
+
+
+async def run_stages(session_factory, data: Dataset, iterations: int, profile: FakeProfile, seed: int) -> dict:
+    """Run every stage ``iterations`` times against a seeded dataset."""
+    from app import search_service
+    from app.models import Requirement, User
+    from app.routers.sightings import _render_sightings_table
+    from app.schemas.sightings import SightingsListParams
+    from app.services import sighting_aggregation
+    from app.services.sighting_aggregation import rebuild_vendor_summaries
+
+    connectors = make_fake_connectors(profile, data.vendor_names, seed)
+    built = (connectors, {}, set())
+    ids = data.requirement_ids
+    results: dict[str, StageResult] = {}
+
+    async def _noop_enrichment(card_ids, db) -> None:
+        return None
+
+    with (
+        patch.object(search_service, "_build_connectors", return_value=built),
+        patch.object(search_service, "_schedule_background_enrichment", _noop_enrichment),
+        patch.object(sighting_aggregation, "_estimate_qty_with_ai", sighting_aggregation._estimate_qty_no_ai),
+    ):
+        db = session_factory()
+        try:
+            requirements = {r.id: r for r in db.query(Requirement).filter(Requirement.id.in_(ids)).all()}
+            user = db.get(User, data.user_id)
+            hit_rng = random.Random(seed)
+
+            async def fetch_fresh(i: int) -> None:
+                await search_service._fetch_fresh([requirements[ids[i % len(ids)]].primary_mpn], db)
+
+            async def save_sightings(i: int) -> None:
+                req = requirements[ids[i % len(ids)]]
+                source = connectors[i % len(connectors)].source
+                fresh = fake_hits(hit_rng, source, req.primary_mpn, profile.hits, data.vendor_names)
+                search_service._save_sightings(fresh, req, db, succeeded_sources={source})
+                db.commit()
+
+            async def vendor_summaries(i: int) -> None:
+                rebuild_vendor_summaries(db, ids[i % len(ids)], skip_ai_estimates=True)
+                db.commit()
+
+            async def search_requirement(i: int) -> None:
+                # Walk the list backwards so the 48h per-MPN cooldown (set by earlier
+                # stages' saves) leaves as many fresh MPNs as possible.
+                await search_service.search_requirement(requirements[ids[-1 - (i % len(ids))]], db)
+
+            async def sightings_board(i: int) -> None:
+                await _render_sightings_table(_board_request(), db, user, SightingsListParams())
+
+            stages: dict[str, Callable[[int], Awaitable[Any]]] = {
+                "fetch_fresh": fetch_fresh,
+                "save_sightings": save_sightings,
+                "vendor_summaries": vendor_summaries,
+                "search_requirement": search_requirement,
+                "sightings_board": sightings_board,
+            }
+            for name, op in stages.items():
+                results[name] = await _measure(iterations, op)
+        finally:
+            db.close()
+    return {name: asdict(r) for name, r in results.items()}
+
+
+def run_benchmark(
+    session_factory,
+    sizes: list[str],
+    iterations: int,
+    profile: FakeProfile | None = None,
+    seed: int = 7,
+) -> dict:
+    """Seed + run every size; returns the JSON-serialisable report."""
+    profile = profile or FakeProfile()
+    report: dict[str, Any] = {
+        "meta": {
+            "iterations": iterations,
+            "seed": seed,
+            "fake_profile": asdict(profile),
+            "python": sys.version.split()[0],
+            "recorded_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        },
+        "results": {},
+    }
+    for size_name in sizes:
+        db = session_factory()
+        try:
+            data = seed_dataset(db, size_name, seed)
+        finally:
+            db.close()
+        report["results"][size_name] = asyncio.run(run_stages(session_factory, data, iterations, profile, seed))
+    return report
+
+
+# ── baseline comparison ───────────────────────────────────────────────────
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """Human-readable regressions of ``current`` vs ``baseline`` (empty = pass).
+
+    Only (size, stage) pairs present in both reports are compared.
+    """
+    regressions: list[str] = []
+    for size_name, stages in current.get("results", {}).items():
+        base_stages = baseline.get("results", {}).get(size_name, {})
+        for stage, cur in stages.items():
+            base = base_stages.get(stage)
+            if not base:
+                continue
+            p95_delta = cur["p95_ms"] - base["p95_ms"]
+            if p95_delta > _MIN_P95_DELTA_MS and cur["p95_ms"] > base["p95_ms"] * (1 + threshold):
+                regressions.append(
+                    f"{size_name}/{stage}: p95 {base['p95_ms']:.1f}ms -> {cur['p95_ms']:.1f}ms "
+                    f"(+{p95_delta / base['p95_ms'] * 100 if base['p95_ms'] else math.inf:.0f}%)"
+                )
+            if cur["queries_per_op"] > base["queries_per_op"] * (1 + QUERY_SLACK) + 0.5:
+                regressions.append(
+                    f"{size_name}/{stage}: queries/op {base['queries_per_op']:.1f} -> {cur['queries_per_op']:.1f}"
+                )
+    return regressions
+
+
+def format_report(report: dict) -> str:
+    header = f"{'size':<8} {'stage':<20} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'ops/s':>9} {'q/op':>7}"
+    lines = [header, "-" * len(header)]
+    for size_name, stages in report["results"].items():
+        for stage, r in stages.items():
+            lines.append(
+                f"{size_name:<8} {stage:<20} {r['p50_ms']:>8.1f}m {r['p95_ms']:>8.1f}m {r['p99_ms']:>8.1f}m "
+                f"{r['max_ms']:>8.1f}m {r['ops_per_s']:>9.1f} {r['queries_per_op']:>7.1f}"
+            )
+    return "\n".join(lines)
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────
+
+
+def _prepare_database(database_url: str):
+    """Create the schema on the bench target and return its session factory."""
+    from app.database import SessionLocal, engine
+    from app.models import Base
+
+    if database_url.startswith("sqlite"):
+        from sqlalchemy.dialects.sqlite.base import SQLiteTypeCompiler
+
+        SQLiteTypeCompiler.visit_ARRAY = lambda self, type_, **kw: "JSON"
+        SQLiteTypeCompiler.visit_TSVECTOR = lambda self, type_, **kw: "TEXT"
+        SQLiteTypeCompiler.visit_JSONB = lambda self, type_, **kw: "JSON"
+        tables = [t for name, t in Base.metadata.tables.items() if name not in _PG_ONLY_TABLES]
+        Base.metadata.create_all(bind=engine, tables=tables)
+        return SessionLocal
+
+    from sqlalchemy import inspect, text
+
+    if inspect(engine).has_table("requisitions"):
+        with engine.connect() as conn:
+            if conn.execute(text("SELECT EXISTS (SELECT 1 FROM requisitions)")).scalar():
+                raise SystemExit("refusing to benchmark a database that already holds requisitions")
+    Base.metadata.create_all(bind=engine)
+    return SessionLocal
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument(
+        "--sizes", help=f"comma list of {', '.join(SIZES)} (default: small,medium; --check: the baseline's)"
+    )
+    parser.add_argument("--iterations", type=int, help="ops per stage (default: 20; --check: the baseline's)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--latency-ms", type=float, default=FakeProfile.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=FakeProfile.jitter_ms)
+    parser.add_argument("--error-rate", type=float, default=FakeProfile.error_rate)
+    parser.add_argument("--hits", type=int, default=FakeProfile.hits)
+    parser.add_argument("--database-url", default="sqlite://", help="scratch DB (default: in-memory SQLite)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--json", action="store_true", help="print the JSON report instead of the table")
+    parser.add_argument("--verbose", action="store_true", help="keep the app's INFO/DEBUG logging")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--write", action="store_true", help="record this run as the baseline")
+    mode.add_argument("--check", action="store_true", help="exit 1 if this run regressed vs the baseline")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.check:
+        if not args.baseline.exists():
+            print(f"no baseline at {args.baseline} — run with --write first", file=sys.stderr)
+            return 2
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    sizes_arg = args.sizes or (",".join(baseline["results"]) if baseline else "small,medium")
+    iterations = args.iterations or (baseline["meta"]["iterations"] if baseline else 20)
+    sizes = [s.strip() for s in sizes_arg.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)}")
+
+    if not args.verbose:
+        from loguru import logger
+
+        logger.remove()
+        logger.add(sys.stderr, level="WARNING")
+
+    # Point the app at the bench target BEFORE any app module is imported.
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["REDIS_URL"] = ""  # no search-result cache: every fetch hits the fakes
+    os.environ["CACHE_BACKEND"] = "none"
+    if args.database_url.startswith("sqlite"):
+        os.environ["TESTING"] = "1"  # config only accepts a sqlite URL in test mode
+
+    session_factory = _prepare_database(args.database_url)
+    profile = FakeProfile(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate, hits=args.hits
+    )
+    report = run_benchmark(session_factory, sizes, iterations, profile, args.seed)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+    if args.write:
+        args.baseline.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"baseline written: {args.baseline}")
+    elif baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print("REGRESSIONS:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            return 1
+        print("no regressions vs baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -191,6 +191,77 @@ def _clear_run_registries():
     _reset()
 
 
+@pytest.fixture(autouse=True)
+def _clear_fragment_cache():
+    """Clear the process-local fragment cache before and after each test.
+
+    Stored fragments are keyed by entity id and scope revision; the per-test row cleanup
+    lets SQLite reuse ids, so a fragment rendered by one test would otherwise be served
+    to the next test's same-id entity.
+    """
+    from app.services import fragment_cache
+
+    fragment_cache.clear()
+    yield
+    fragment_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_entity_resolver():
+    """Drop the process-local email/phone → entity index before and after each test.
+
+    The per-test row cleanup lets SQLite reuse ids and bypasses the ORM flush listener,
+    so an address resolved by one test would otherwise map to a deleted entity.
+    """
+    from app.services import entity_resolver
+
+    entity_resolver.clear()
+    yield
+    entity_resolver.clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_pdf_cache():
+    """Clear the process-local rendered-PDF cache before and after each test.
+
+    Tests stub ``weasyprint.HTML`` and assert it is called; a PDF cached by an earlier
+    test for identical HTML would skip the stub entirely.
+    """
+    from app.services import pdf_renderer
+
+    pdf_renderer.clear()
+    yield
+    pdf_renderer.clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_facet_index():
+    """Drop the process-local facet bitset index around each test.
+
+    Row cleanup between tests bypasses the ORM flush listeners, and SQLite reuses card
+    ids, so an index built by one test would answer the next test's counts.
+    """
+    from app.services import facet_index
+
+    facet_index.clear_index()
+    yield
+    facet_index.clear_index()
+
+
+@pytest.fixture(autouse=True)
+def _clear_email_thread_cache():
+    """Clear the process-local thread-list and conversation caches around each test.
+
+    Conversations are keyed by (user id, conversationId); test users reuse ids, so a
+    conversation cached by one test would answer another test's mocked Graph call.
+    """
+    from app.services import email_threads
+
+    email_threads.clear_cache()
+    yield
+    email_threads.clear_cache()
+
+
 @pytest.fixture(autouse=True)
 def _clear_anthropic_client_cache():
     """Clear the shared Anthropic SDK client cache before and after each test.
@@ -227,6 +298,21 @@ def _clear_connector_token_cache():
     _token_locks.clear()
 
 
+@pytest.fixture(autouse=True)
+def _clear_connector_limiters():
+    """Drop the per-connector adaptive limiters before and after each test.
+
+    Each limiter carries a rolling latency window and AIMD limit (one test's 429s must
+    not shrink the next test's concurrency) plus an ``asyncio.Condition`` bound to the
+    loop that first waited on it.
+    """
+    from app.connectors.limits import _limiters
+
+    _limiters.clear()
+    yield
+    _limiters.clear()
+
+
 @pytest.fixture(autouse=True)
 def _reset_ai_gate_state():
     """Reset every search-worker AI-gate's cooldown + classification cache per test.
@@ -606,6 +692,35 @@ def test_vendor_card(db_session: Session) -> VendorCard:
     return card
 
 
+@pytest.fixture()
+def query_budget():
+    """Assert a block stays within a SQL statement budget and issues no N+1 shapes.
+
+    Usage::
+
+        with query_budget(12):
+            client.get("/v2/partials/requisitions")
+
+    Captures process-wide (app.sql_profiler.capture_queries), so statements the
+    TestClient's app thread runs are counted. Pass ``n_plus_one=None`` to skip the
+    repeated-shape check for a block that legitimately repeats a statement.
+    """
+    from app.sql_profiler import N_PLUS_ONE_THRESHOLD, capture_queries
+
+    @contextmanager
+    def _budget(max_queries: int, *, n_plus_one: int | None = N_PLUS_ONE_THRESHOLD):
+        with capture_queries() as profile:
+            yield profile
+        assert profile.count <= max_queries, (
+            f"query budget exceeded: {profile.count} > {max_queries}\n{profile.summary()}"
+        )
+        if n_plus_one is not None:
+            repeated = profile.n_plus_one(n_plus_one)
+            assert not repeated, f"likely N+1: {repeated[0][1]}x {repeated[0][0]}\n{profile.summary()}"
+
+    return _budget
+
+
 @pytest.fixture()
 def client(db_session: Session, test_user: User) -> TestClient:
     """FastAPI TestClient with auth overridden to return test_user.
@@ -86,7 +86,7 @@ async def test_e2e_sprej_resolution_persists_sighting_and_pending(db_session, en
     db_session.commit()
     req_id = req.id
 
-    async def fake_fetch_fresh(mpns, db):
+    async def fake_fetch_fresh(mpns, db, on_batch=None):
         if list(mpns) == ["SPREJ"]:
             return ([], [{"source": "mouser", "status": "ok", "results": 0, "ms": 5, "error": None}])
         return (
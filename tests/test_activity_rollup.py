@@ -0,0 +1,152 @@
+"""Tests for the activity daily rollup — write listeners, nightly rebuild and readers.
+
+Covers per-bucket counting on insert, bucket moves on re-attribution and time edits,
+delete decrements, rebuild parity with the listener-maintained table, contact scoring
+past the old 5,000-contact page, the scorecard's rollup read and company recency.
+
+Called by: pytest
+Depends on: app.models.activity_rollup, app.services.activity_rollup,
+    tests/conftest.py db_session fixture
+"""
+
+from datetime import UTC, date, datetime, timedelta
+
+from sqlalchemy import select
+
+from app.constants import Channel, Direction
+from app.models import ActivityDailyRollup, ActivityLog, Company, User, VendorCard, VendorContact
+from app.services import activity_rollup, contact_intelligence
+from app.services.activity_scorecard import _activity_metrics_by_user
+
+
+def _buckets(db) -> dict[tuple, int]:
+    rows = db.execute(select(ActivityDailyRollup)).scalars().all()
+    return {
+        tuple(getattr(r, k) for k in ("day", "company_id", "vendor_contact_id", "channel", "activity_type")): (
+            r.activity_count
+        )
+        for r in rows
+        if r.activity_count
+    }
+
+
+def _log(db, at: datetime, **kw) -> ActivityLog:
+    kw.setdefault("activity_type", "email_sent")
+    kw.setdefault("channel", Channel.EMAIL)
+    row = ActivityLog(occurred_at=at, created_at=at, **kw)
+    db.add(row)
+    db.flush()
+    return row
+
+
+def _company(db, name="Acme") -> Company:
+    co = Company(name=name, is_active=True, created_at=datetime.now(UTC))
+    db.add(co)
+    db.flush()
+    return co
+
+
+T0 = datetime(2026, 10, 1, 15, 30, tzinfo=UTC)
+
+
+class TestListeners:
+    def test_insert_counts_per_bucket(self, db_session):
+        co = _company(db_session)
+        _log(db_session, T0, company_id=co.id)
+        _log(db_session, T0 + timedelta(hours=2), company_id=co.id)
+        _log(db_session, T0, company_id=co.id, channel=Channel.PHONE, activity_type="call_logged")
+        db_session.commit()
+        assert _buckets(db_session) == {
+            (date(2026, 10, 1), co.id, 0, Channel.EMAIL, "email_sent"): 2,
+            (date(2026, 10, 1), co.id, 0, Channel.PHONE, "call_logged"): 1,
+        }
+        last = db_session.execute(select(ActivityDailyRollup.last_at).where(ActivityDailyRollup.channel == "email"))
+        assert last.scalar() == T0 + timedelta(hours=2)
+
+    def test_reattribution_and_time_edit_move_bucket(self, db_session):
+        a, b = _company(db_session, "A"), _company(db_session, "B")
+        row = _log(db_session, T0, company_id=a.id)
+        db_session.commit()
+        row.company_id = b.id
+        db_session.commit()
+        row.occurred_at = T0 + timedelta(days=1)
+        db_session.commit()
+        assert _buckets(db_session) == {(date(2026, 10, 2), b.id, 0, Channel.EMAIL, "email_sent"): 1}
+
+    def test_unrelated_update_is_ignored(self, db_session):
+        co = _company(db_session)
+        row = _log(db_session, T0, company_id=co.id)
+        db_session.commit()
+        row.subject = "Re: quote"
+        db_session.commit()
+        assert _buckets(db_session) == {(date(2026, 10, 1), co.id, 0, Channel.EMAIL, "email_sent"): 1}
+
+    def test_delete_decrements(self, db_session):
+        co = _company(db_session)
+        keep = _log(db_session, T0, company_id=co.id)
+        drop = _log(db_session, T0, company_id=co.id)
+        db_session.commit()
+        db_session.delete(drop)
+        db_session.commit()
+        assert _buckets(db_session) == {(date(2026, 10, 1), co.id, 0, Channel.EMAIL, "email_sent"): 1}
+        db_session.delete(keep)
+        db_session.commit()
+        assert _buckets(db_session) == {}
+
+
+class TestRebuild:
+    def test_rebuild_matches_incremental(self, db_session):
+        co = _company(db_session)
+        for i in range(5):
+            _log(db_session, T0 - timedelta(days=i), company_id=co.id, direction=Direction.OUTBOUND)
+        row = ActivityLog(activity_type="note", channel="manual", company_id=co.id, created_at=T0)
+        db_session.add(row)
+        db_session.commit()
+        before = _buckets(db_session)
+
+        db_session.execute(ActivityDailyRollup.__table__.update().values(activity_count=99))
+        db_session.commit()
+        assert activity_rollup.rebuild_activity_rollups(db_session) == 6
+        assert _buckets(db_session) == before
+        assert activity_rollup.company_last_activity_at(db_session, co.id) == T0
+
+
+class TestReaders:
+    def test_contact_scoring_covers_every_contact(self, db_session, monkeypatch):
+        monkeypatch.setattr(contact_intelligence, "_SCORE_PAGE", 2)
+        card = VendorCard(normalized_name="arrow", display_name="Arrow")
+        db_session.add(card)
+        db_session.flush()
+        contacts = [
+            VendorContact(vendor_card_id=card.id, email=f"r{i}@arrow.com", full_name=f"R{i}", source="manual")
+            for i in range(5)
+        ]
+        db_session.add_all(contacts)
+        db_session.flush()
+        now = datetime.now(UTC)
+        busy = contacts[-1]
+        _log(db_session, now - timedelta(days=2), vendor_contact_id=busy.id)
+        _log(db_session, now - timedelta(days=45), vendor_contact_id=busy.id, channel=Channel.PHONE)
+        _log(db_session, now - timedelta(days=5), vendor_contact_id=busy.id, activity_type="po_issued")
+        db_session.commit()
+
+        stats = activity_rollup.contact_window_stats(db_session, now)[busy.id]
+        assert stats == {"30d": 2, "60d": 3, "90d": 3, "wins": 1, "total": 3, "channels": 2}
+
+        assert contact_intelligence.compute_all_contact_scores(db_session) == {"updated": 5, "skipped": 0}
+        scored = db_session.execute(select(VendorContact).where(VendorContact.score_computed_at.isnot(None)))
+        assert len(scored.scalars().all()) == 5
+
+    def test_scorecard_sums_user_buckets(self, db_session):
+        user = User(email="rep@trio.com", name="Rep", role="buyer", azure_id="az-rollup")
+        db_session.add(user)
+        db_session.flush()
+        start = datetime(2026, 10, 1, tzinfo=UTC)
+        _log(db_session, start + timedelta(hours=1), user_id=user.id, channel=Channel.PHONE)
+        _log(db_session, start + timedelta(hours=2), user_id=user.id, direction=Direction.OUTBOUND)
+        _log(db_session, start + timedelta(hours=3), user_id=user.id, direction=Direction.INBOUND)
+        _log(db_session, start - timedelta(hours=1), user_id=user.id, channel=Channel.PHONE)
+        _log(db_session, start, channel=Channel.PHONE)
+        db_session.commit()
+        assert _activity_metrics_by_user(db_session, start) == {user.id: {"calls": 1, "emails": 1}}
+        assert _activity_metrics_by_user(db_session, None) == {user.id: {"calls": 2, "emails": 1}}
@@ -58,12 +58,12 @@ class TestGraphWebhook:
             )
         assert resp.status_code == 403
 
-    def test_handle_notification_exception_returns_500(self, client):
-        """If handle_notification raises, endpoint returns 500."""
+    def test_enqueue_exception_returns_500(self, client):
+        """If enqueue_notifications raises, endpoint returns 500."""
         with patch("app.services.webhook_service.validate_notifications", return_value=[{"id": "1"}]):
             with patch(
-                "app.services.webhook_service.handle_notification",
-                new=AsyncMock(side_effect=RuntimeError("Processing error")),
+                "app.services.webhook_service.enqueue_notifications",
+                side_effect=RuntimeError("Processing error"),
             ):
                 resp = client.post(
                     "/api/webhooks/graph",
@@ -72,14 +72,19 @@ class TestGraphWebhook:
         assert resp.status_code == 500
 
     def test_valid_notification_accepted(self, client):
-        """Valid webhook notification returns 200 accepted."""
+        """Valid webhook notification is queued and acked with 202 — no inline processing."""
         with patch("app.services.webhook_service.validate_notifications", return_value=[{"id": "1"}]):
-            with patch("app.services.webhook_service.handle_notification", new=AsyncMock(return_value=None)):
+            with (
+                patch("app.services.webhook_service.enqueue_notifications", return_value=1) as mock_enqueue,
+                patch("app.services.webhook_service.handle_notification", new=AsyncMock()) as mock_handle,
+            ):
                 resp = client.post(
                     "/api/webhooks/graph",
                     json={"value": [{"id": "1"}]},
                 )
-        assert resp.status_code == 200
+        assert resp.status_code == 202
+        mock_enqueue.assert_called_once()
+        mock_handle.assert_not_awaited()
         assert resp.json()["status"] == "accepted"
 
 
@@ -840,13 +845,13 @@ class TestGraphWebhookDirect:
     handler."""
 
     async def test_payload_validate_and_accepted(self, db_session):
-        """Route body: parse payload, validate_notifications, handle_notification."""
+        """Route body: parse payload, validate_notifications, enqueue_notifications."""
 
         body = json.dumps({"value": [{"id": "1"}]}).encode()
         request = _make_request(body=body)
 
         with patch("app.services.webhook_service.validate_notifications", return_value=[{"id": "1"}]):
-            with patch("app.services.webhook_service.handle_notification", new=AsyncMock(return_value=None)):
+            with patch("app.services.webhook_service.enqueue_notifications", return_value=1):
                 result = await mod.graph_webhook(request, db_session)
         assert result == {"status": "accepted"}
 
@@ -861,16 +866,16 @@ class TestGraphWebhookDirect:
                 await mod.graph_webhook(request, db_session)
         assert exc_info.value.status_code == 403
 
-    async def test_handle_notification_exception_raises_500(self, db_session):
-        """handle_notification raises -> 500."""
+    async def test_enqueue_exception_raises_500(self, db_session):
+        """enqueue_notifications raises -> 500."""
 
         body = json.dumps({"value": [{"id": "x"}]}).encode()
         request = _make_request(body=body)
 
         with patch("app.services.webhook_service.validate_notifications", return_value=[{"id": "x"}]):
             with patch(
-                "app.services.webhook_service.handle_notification",
-                new=AsyncMock(side_effect=RuntimeError("boom")),
+                "app.services.webhook_service.enqueue_notifications",
+                side_effect=RuntimeError("boom"),
             ):
                 with pytest.raises(HTTPException) as exc_info:
                     await mod.graph_webhook(request, db_session)
@@ -0,0 +1,336 @@
+"""Tests for the materialized alert badge counters (services/alerts/counters.py).
+
+Covers read-through materialization (a warm badge never re-runs the source), the
+commit-time dirty marks (domain writes mark a kind for every user unless the source
+narrows them; a seen row or a User write marks only that user; a rollback marks
+nothing; no counter row is written in the domain transaction), aged-out recompute,
+fail-quiet sources, the reconcile pass (changed tabs reported, orphan rows dropped) and
+the reconcile job's SSE push.
+
+Depends on: services/alerts/counters, services/alerts/registry, conftest fixtures.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.constants import AlertKind, TaskStatus
+from app.models.alert_badge_count import AlertBadgeCount
+from app.models.auth import User
+from app.models.task import RequisitionTask
+from app.services.alerts import AlertItem, AlertSource, Temperament, count_for_tab, record_seen, register
+from app.services.alerts.counters import (
+    _PENDING_INFO_KEY,
+    COUNTER_MAX_AGE,
+    _local_marks,
+    reconcile_counters,
+    register_counter_listeners,
+    tab_count,
+)
+from app.services.alerts.sources.tasks import TasksActionSource
+from app.sql_profiler import capture_queries
+
+
+class _CountingSource(AlertSource):
+    """ACTION-style fake keyed to RequisitionTask writes; counts its own calls."""
+
+    key = "counting"
+    kind = AlertKind.TASKS_ACTION
+    temperament = Temperament.ACTION
+    invalidated_by = (RequisitionTask,)
+
+    def __init__(self, value: int = 3):
+        self.value = value
+        self.calls = 0
+
+    def count_for_user(self, db, user):
+        self.calls += 1
+        return self.value
+
+    def new_items_for_user(self, db, user):
+        return [AlertItem(ref_id=i) for i in range(self.value)]
+
+
+class _BrokenSource(AlertSource):
+    key = "broken"
+    kind = AlertKind.INBOUND_VENDOR
+    temperament = Temperament.FYI
+
+    def count_for_user(self, db, user):
+        raise RuntimeError("boom")
+
+    def new_items_for_user(self, db, user):
+        return []
+
+
+@pytest.fixture
+def isolate_registry():
+    """Snapshot + restore the module-global registry (fake sources must not leak)."""
+    import app.services.alerts.registry as reg
+
+    snap_tab = {k: list(v) for k, v in reg._BY_TAB.items()}
+    snap_kind = dict(reg._BY_KIND)
+    snap_tab_by_kind = dict(reg._TAB_BY_KIND)
+    yield
+    reg._BY_TAB.clear()
+    reg._BY_TAB.update({k: list(v) for k, v in snap_tab.items()})
+    reg._BY_KIND.clear()
+    reg._BY_KIND.update(snap_kind)
+    reg._TAB_BY_KIND.clear()
+    reg._TAB_BY_KIND.update(snap_tab_by_kind)
+
+
+@pytest.fixture
+def counting(isolate_registry) -> _CountingSource:
+    register_counter_listeners()
+    _local_marks.clear()
+    src = _CountingSource()
+    register("demo_tab", src)
+    yield src
+    _local_marks.clear()
+
+
+def _add_task(db: Session, requisition_id: int, assignee_id: int | None) -> RequisitionTask:
+    task = RequisitionTask(
+        requisition_id=requisition_id,
+        title="Chase LM317T",
+        status=TaskStatus.TODO.value,
+        assigned_to_id=assignee_id,
+    )
+    db.add(task)
+    db.commit()
+    return task
+
+
+def _row(db: Session, user: User, kind: str) -> AlertBadgeCount | None:
+    return db.query(AlertBadgeCount).filter_by(user_id=user.id, alert_kind=kind).populate_existing().one_or_none()
+
+
+def test_first_read_materializes_then_serves_from_row(db_session, test_user, counting):
+    assert count_for_tab(db_session, test_user, "demo_tab") == 3
+    assert counting.calls == 1
+    row = _row(db_session, test_user, AlertKind.TASKS_ACTION)
+    assert row is not None and row.count == 3 and row.stale is False
+
+    counting.value = 99  # a warm counter must not re-run the source
+    assert count_for_tab(db_session, test_user, "demo_tab") == 3
+    assert counting.calls == 1
+
+
+def test_own_uncommitted_write_is_counted_but_not_stored(db_session, test_user, test_requisition, counting):
+    tab_count(db_session, test_user, "demo_tab")
+    db_session.add(
+        RequisitionTask(
+            requisition_id=test_requisition.id,
+            title="Uncommitted",
+            status=TaskStatus.TODO.value,
+            assigned_to_id=test_user.id,
+        )
+    )
+    db_session.flush()
+
+    counting.value = 4
+    assert tab_count(db_session, test_user, "demo_tab") == 4  # read-your-writes
+    assert db_session.info.get(_PENDING_INFO_KEY)  # flushed, not committed
+    db_session.rollback()
+    # The recompute was never stored, so the rolled-back write leaves no trace.
+    counting.value = 3
+    assert tab_count(db_session, test_user, "demo_tab") == 3
+
+
+def test_domain_write_marks_kind_for_every_user(db_session, test_user, sales_user, test_requisition, counting):
+    tab_count(db_session, test_user, "demo_tab")
+    tab_count(db_session, sales_user, "demo_tab")
+
+    with capture_queries() as prof:
+        _add_task(db_session, test_requisition.id, test_user.id)
+    # The domain transaction never touches the shared counter rows.
+    assert not any("alert_badge_counts" in stmt for stmt in prof.statements)
+
+    counting.value = 4
+    assert tab_count(db_session, test_user, "demo_tab") == 4
+    assert tab_count(db_session, sales_user, "demo_tab") == 4
+    assert counting.calls == 4
+    # Recomputed after the mark → warm again.
+    assert tab_count(db_session, test_user, "demo_tab") == 4
+    assert counting.calls == 4
+
+
+def test_rolled_back_write_marks_nothing(db_session, test_user, test_requisition, counting):
+    tab_count(db_session, test_user, "demo_tab")
+    db_session.add(RequisitionTask(requisition_id=test_requisition.id, title="Draft", assigned_to_id=test_user.id))
+    db_session.flush()
+    db_session.rollback()
+
+    assert tab_count(db_session, test_user, "demo_tab") == 3
+    assert counting.calls == 1
+
+
+def test_unrelated_write_leaves_counters_fresh(db_session, test_user, counting):
+    from app.models.crm import Company
+
+    tab_count(db_session, test_user, "demo_tab")
+    db_session.add(Company(name="Unrelated Co"))
+    db_session.commit()
+    tab_count(db_session, test_user, "demo_tab")
+    assert counting.calls == 1
+
+
+def test_record_seen_marks_only_that_users_kind(db_session, test_user, sales_user, counting):
+    tab_count(db_session, test_user, "demo_tab")
+    tab_count(db_session, sales_user, "demo_tab")
+
+    record_seen(db_session, test_user, AlertKind.TASKS_ACTION, 7)
+
+    tab_count(db_session, sales_user, "demo_tab")
+    assert counting.calls == 2
+    tab_count(db_session, test_user, "demo_tab")
+    assert counting.calls == 3
+
+
+def test_source_can_narrow_marks_to_affected_users(db_session, test_user, sales_user, test_requisition, counting):
+    counting.affected_user_ids = TasksActionSource().affected_user_ids  # assignee-scoped
+    tab_count(db_session, test_user, "demo_tab")
+    tab_count(db_session, sales_user, "demo_tab")
+
+    task = _add_task(db_session, test_requisition.id, test_user.id)
+    tab_count(db_session, sales_user, "demo_tab")
+    assert counting.calls == 2  # not the assignee — still warm
+    tab_count(db_session, test_user, "demo_tab")
+    assert counting.calls == 3
+
+    db_session.refresh(task)
+    task.assigned_to_id = sales_user.id  # reassignment moves both users' counts
+    db_session.commit()
+    tab_count(db_session, test_user, "demo_tab")
+    tab_count(db_session, sales_user, "demo_tab")
+    assert counting.calls == 5
+
+
+def test_tasks_source_affected_users_are_old_and_new_assignee(db_session, test_user, sales_user, test_requisition):
+    source = TasksActionSource()
+    task = RequisitionTask(requisition_id=test_requisition.id, title="t", assigned_to_id=test_user.id)
+    assert source.affected_user_ids(task) == {test_user.id}
+    db_session.add(task)
+    db_session.commit()
+    assert source.affected_user_ids(task) is None  # expired — unknown assignee widens to every user
+
+    db_session.refresh(task)
+    task.assigned_to_id = sales_user.id
+    assert source.affected_user_ids(task) == {test_user.id, sales_user.id}
+    db_session.commit()
+    task.assigned_to_id = test_user.id  # reassigned blind: previous assignee never loaded
+    assert source.affected_user_ids(task) is None
+
+
+def test_aged_out_counter_is_recomputed(db_session, test_user, counting):
+    tab_count(db_session, test_user, "demo_tab")
+    row = _row(db_session, test_user, AlertKind.TASKS_ACTION)
+    row.computed_at = datetime.now(UTC) - COUNTER_MAX_AGE - timedelta(minutes=1)
+    db_session.commit()
+
+    counting.value = 5
+    assert tab_count(db_session, test_user, "demo_tab") == 5
+    assert counting.calls == 2
+
+
+def test_broken_source_contributes_zero_and_is_not_stored(db_session, test_user, counting):
+    register("demo_tab", _BrokenSource())
+    assert tab_count(db_session, test_user, "demo_tab") == 3
+    assert _row(db_session, test_user, AlertKind.INBOUND_VENDOR) is None
+
+
+def test_reconcile_reports_changed_tabs_and_drops_orphans(db_session, test_user, counting):
+    tab_count(db_session, test_user, "demo_tab")
+    db_session.add(AlertBadgeCount(user_id=test_user.id, alert_kind="retired_kind", count=1, stale=True))
+    row = _row(db_session, test_user, AlertKind.TASKS_ACTION)
+    row.stale = True
+    db_session.commit()
+
+    counting.value = 8
+    assert reconcile_counters(db_session) == {(test_user.id, "demo_tab")}
+    assert _row(db_session, test_user, AlertKind.TASKS_ACTION).count == 8
+    assert _row(db_session, test_user, "retired_kind") is None
+    # Nothing stale left → a second pass is a no-op.
+    assert reconcile_counters(db_session) == set()
+
+
+def test_reconcile_recomputes_marked_rows(db_session, test_user, test_requisition, counting):
+    tab_count(db_session, test_user, "demo_tab")
+    _add_task(db_session, test_requisition.id, test_user.id)
+
+    counting.value = 6
+    assert reconcile_counters(db_session) == {(test_user.id, "demo_tab")}
+    assert _row(db_session, test_user, AlertKind.TASKS_ACTION).count == 6
+    assert reconcile_counters(db_session) == set()
+
+
+def test_reconcile_unchanged_count_is_not_reported(db_session, test_user, counting):
+    tab_count(db_session, test_user, "demo_tab")
+    _row(db_session, test_user, AlertKind.TASKS_ACTION).stale = True
+    db_session.commit()
+    assert reconcile_counters(db_session) == set()
+    assert _row(db_session, test_user, AlertKind.TASKS_ACTION).stale is False
+
+
+async def test_reconcile_job_publishes_changed_badges(db_session, test_user):
+    from app.jobs.alert_jobs import _job_reconcile_alert_badges
+
+    with (
+        patch("app.database.SessionLocal", return_value=db_session),
+        patch("app.services.alerts.counters.reconcile_counters", return_value={(test_user.id, "crm")}),
+        patch("app.services.sse_broker.broker.publish", new_callable=AsyncMock) as publish,
+    ):
+        await _job_reconcile_alert_badges()
+    publish.assert_awaited_once_with(f"user:{test_user.id}", "alert-badge-crm", "")
+
+
+def test_register_alert_jobs_adds_reconcile_job():
+    from unittest.mock import MagicMock
+
+    from app.jobs.alert_jobs import register_alert_jobs
+
+    scheduler = MagicMock()
+    register_alert_jobs(scheduler, MagicMock())
+    assert scheduler.add_job.call_args.kwargs["id"] == "alert_badge_reconcile"
+
+
+class _FakeRedisHash:
+    """The four hash commands the dirty-mark store uses, over a dict."""
+
+    def __init__(self):
+        self.data: dict[str, float] = {}
+
+    def hset(self, key, mapping):
+        self.data.update(mapping)
+
+    def hmget(self, key, fields):
+        return [self.data.get(f) for f in fields]
+
+    def hgetall(self, key):
+        return dict(self.data)
+
+    def hdel(self, key, *fields):
+        for f in fields:
+            self.data.pop(f, None)
+
+
+def test_marks_are_shared_across_workers_via_redis(db_session, test_user, test_requisition, counting):
+    fake = _FakeRedisHash()
+    with patch("app.cache.intel_cache._get_redis", return_value=fake):
+        tab_count(db_session, test_user, "demo_tab")
+        _add_task(db_session, test_requisition.id, test_user.id)
+        assert f"k:{AlertKind.TASKS_ACTION}" in fake.data
+
+        _local_marks.clear()  # another worker: only the shared hash knows
+        tab_count(db_session, test_user, "demo_tab")
+        assert counting.calls == 2
+
+        # Marks past COUNTER_MAX_AGE are pruned by the reconcile scan.
+        fake.data = {k: v - COUNTER_MAX_AGE.total_seconds() - 60 for k, v in fake.data.items()}
+        reconcile_counters(db_session)
+        assert fake.data == {}
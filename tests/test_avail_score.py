@@ -635,6 +635,60 @@ class TestComputeAll:
         assert s1.total_score >= s2.total_score
 
 
+class TestSharedContext:
+    """One MonthScoringContext serves every user: same scores, flat query count."""
+
+    def _seed(self, db, n):
+        users = []
+        for i in range(n):
+            buyer = _make_user(db, f"Ctx Buyer {i}", "buyer", f"ctxb{n}-{i}")
+            req = _make_req(db, buyer.id, created_at=NOW - timedelta(hours=5 + i))
+            _make_contact(db, req.id, buyer.id, created_at=NOW - timedelta(hours=2))
+            _make_offer(db, req.id, buyer.id)
+            users.append(buyer)
+        db.commit()
+        return users
+
+    def test_shared_context_matches_per_user(self, db_session):
+        from app.services.scoring_context import MonthScoringContext
+
+        users = self._seed(db_session, 3)
+        ctx = MonthScoringContext(db_session, MONTH)
+        for u in users:
+            assert compute_buyer_avail_score(db_session, u.id, MONTH, ctx=ctx) == compute_buyer_avail_score(
+                db_session, u.id, MONTH
+            )
+            assert compute_sales_avail_score(db_session, u.id, MONTH, ctx=ctx) == compute_sales_avail_score(
+                db_session, u.id, MONTH
+            )
+
+    def test_statement_count_independent_of_user_count(self, db_session):
+        from sqlalchemy import event
+
+        from app.services.scoring_context import MonthScoringContext
+
+        engine = db_session.get_bind()
+
+        def _statements(users):
+            user_ids = [u.id for u in users]  # load outside the count (seeding expired them)
+            statements: list[str] = []
+
+            def _count(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+
+            event.listen(engine, "before_cursor_execute", _count)
+            try:
+                ctx = MonthScoringContext(db_session, MONTH, user_ids=user_ids)
+                for uid in user_ids:
+                    compute_buyer_avail_score(db_session, uid, MONTH, ctx=ctx)
+                    compute_sales_avail_score(db_session, uid, MONTH, ctx=ctx)
+            finally:
+                event.remove(engine, "before_cursor_execute", _count)
+            return len(statements)
+
+        assert _statements(self._seed(db_session, 1)) == _statements(self._seed(db_session, 4))
+
+
 # ── Integration: get_avail_scores query ─────────────────────────────
 
 
@@ -0,0 +1,85 @@
+"""Tests for the sourcing benchmark harness (scripts/bench_sourcing.py).
+
+A tiny end-to-end run against the test DB (every stage executes, fakes return hits,
+the report carries latency/throughput/query figures) plus the baseline comparator that
+``--check`` gates on.
+
+Depends on: scripts.bench_sourcing, conftest fixtures.
+"""
+
+from __future__ import annotations
+
+import copy
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.connectors.errors import ConnectorError
+from scripts.bench_sourcing import (
+    FakeProfile,
+    compare,
+    format_report,
+    make_fake_connectors,
+    run_benchmark,
+)
+
+_STAGES = {"fetch_fresh", "save_sightings", "vendor_summaries", "search_requirement", "sightings_board"}
+
+
+def _report(p95: float = 10.0, queries: float = 8.0) -> dict:
+    stage = {
+        "n": 5,
+        "p50_ms": 5.0,
+        "p95_ms": p95,
+        "p99_ms": p95,
+        "max_ms": p95,
+        "ops_per_s": 100.0,
+        "queries_per_op": queries,
+    }
+    return {"meta": {}, "results": {"small": {"fetch_fresh": dict(stage)}}}
+
+
+def test_tiny_run_reports_every_stage(db_session: Session):
+    factory = sessionmaker(bind=db_session.get_bind(), autoflush=False)
+    with patch("app.search_service.SessionLocal", factory):
+        report = run_benchmark(factory, ["tiny"], iterations=2, profile=FakeProfile(latency_ms=0, jitter_ms=0))
+
+    stages = report["results"]["tiny"]
+    assert set(stages) == _STAGES
+    for result in stages.values():
+        assert result["n"] == 2
+        assert result["p50_ms"] <= result["p95_ms"] <= result["max_ms"]
+        assert result["ops_per_s"] > 0
+    assert stages["save_sightings"]["queries_per_op"] > 0
+    assert "sightings_board" in format_report(report)
+
+
+async def test_fake_connectors_honour_profile():
+    fakes = make_fake_connectors(FakeProfile(latency_ms=0, jitter_ms=0, hits=3), ["vendor a"], seed=1)
+    assert [type(c).__name__ for c in fakes][:2] == ["NexarConnector", "BrokerBinConnector"]
+    hits = await fakes[0]._do_search("LM317T")
+    assert len(hits) == 3 and {h["mpn_matched"] for h in hits} == {"LM317T"}
+
+    failing = make_fake_connectors(FakeProfile(latency_ms=0, jitter_ms=0, error_rate=1.0), ["vendor a"], seed=1)
+    with pytest.raises(ConnectorError, match="injected benchmark failure"):
+        await failing[0]._do_search("LM317T")
+
+
+def test_compare_flags_p95_and_query_regressions():
+    base = _report()
+    assert compare(copy.deepcopy(base), base) == []
+
+    slower = _report(p95=20.0)
+    assert compare(slower, base, threshold=0.25) == ["small/fetch_fresh: p95 10.0ms -> 20.0ms (+100%)"]
+
+    more_queries = _report(queries=12.0)
+    assert compare(more_queries, base) == ["small/fetch_fresh: queries/op 8.0 -> 12.0"]
+
+
+def test_compare_ignores_noise_and_unknown_stages():
+    base = _report(p95=0.5)
+    assert compare(_report(p95=1.5), base) == []  # +200% but only 1ms — below the noise floor
+    current = _report()
+    current["results"]["large"] = current["results"].pop("small")
+    assert compare(current, _report()) == []
@@ -0,0 +1,234 @@
+"""Tests for app/connectors/limits.py — AIMD concurrency, deadlines and hedged GETs.
+
+Covers the limiter arithmetic (additive increase, multiplicative decrease on 429 /
+failure / latency spike, cooldown, floor and ceiling), the live slot cap, the
+p95-derived deadline, hedging for idempotent-GET connectors, BaseConnector outcome
+recording, and the live limiter fields on the connector-health dashboard.
+
+Called by: pytest
+Depends on: app.connectors.limits, app.connectors.sources, app.services.connector_health
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from app.connectors import limits
+from app.connectors.limits import (
+    MIN_SAMPLES,
+    AdaptiveLimiter,
+    get_limiter,
+    hedged_call,
+    limited_search,
+    limiter_snapshots,
+)
+from app.connectors.sources import BaseConnector
+
+
+def _warm(limiter: AdaptiveLimiter, latency_s: float = 0.1, n: int = MIN_SAMPLES) -> None:
+    for _ in range(n):
+        limiter.record_success(latency_s)
+
+
+class TestAimd:
+    def test_starts_at_configured_concurrency(self):
+        assert get_limiter("DigiKeyConnector").limit == 2
+        assert get_limiter("SomeUnknownConnector").limit == 3
+
+    def test_additive_increase_capped_at_max(self):
+        lim = AdaptiveLimiter("X", 2)
+        _warm(lim, n=100)
+        assert lim.limit == lim.max_limit == 4
+
+    def test_429_halves_and_failure_cuts_after_cooldown(self):
+        lim = AdaptiveLimiter("X", 8, max_limit=8)
+        lim.record_throttled()
+        assert lim.limit == 4
+        lim.record_throttled()  # same burst — inside the cooldown
+        assert lim.limit == 4
+        assert lim.throttled == 2
+        with patch("app.connectors.limits.time.monotonic", return_value=10**9):
+            lim.record_failure()
+        assert lim.limit == 3
+
+    def test_never_below_one(self):
+        lim = AdaptiveLimiter("X", 1)
+        for i in range(5):
+            with patch("app.connectors.limits.time.monotonic", return_value=10**6 * (i + 1)):
+                lim.record_throttled()
+        assert lim.limit == 1
+
+    def test_latency_spike_decreases(self):
+        lim = AdaptiveLimiter("X", 4, max_limit=4)
+        _warm(lim, 0.1)
+        lim.record_success(5.0)
+        assert lim.limit == 3
+
+    @pytest.mark.asyncio
+    async def test_slot_caps_in_flight_at_live_limit(self):
+        lim = AdaptiveLimiter("X", 1, max_limit=1)
+        entered = []
+
+        async def hold(tag, gate):
+            async with lim.slot():
+                entered.append(tag)
+                await gate.wait()
+
+        gate = asyncio.Event()
+        t1 = asyncio.create_task(hold("a", gate))
+        t2 = asyncio.create_task(hold("b", gate))
+        await asyncio.sleep(0.02)
+        assert entered == ["a"]
+        assert lim.in_flight == 1
+        gate.set()
+        await asyncio.gather(t1, t2)
+        assert entered == ["a", "b"]
+        assert lim.in_flight == 0
+
+
+class TestDeadline:
+    def test_budget_until_enough_samples(self):
+        lim = AdaptiveLimiter("X", 2)
+        _warm(lim, 0.1, n=MIN_SAMPLES - 1)
+        assert lim.deadline_s(12.0) == 12.0
+        assert lim.hedge_after_s() is None
+
+    def test_p95_derived_and_capped(self):
+        lim = AdaptiveLimiter("X", 2)
+        _warm(lim, 3.0)
+        assert lim.deadline_s(12.0) == pytest.approx(4.5)
+        assert lim.deadline_s(4.0) == 4.0
+        assert lim.hedge_after_s() == pytest.approx(3.0)
+
+    def test_floor(self):
+        lim = AdaptiveLimiter("X", 2)
+        _warm(lim, 0.01)
+        assert lim.deadline_s(12.0) == limits.MIN_DEADLINE_S
+
+
+class _SlowThenFast:
+    """First call hangs; later calls answer at once."""
+
+    idempotent_get = True
+
+    def __init__(self):
+        self.calls = 0
+
+    async def search(self, pn):
+        self.calls += 1
+        if self.calls == 1:
+            await asyncio.sleep(10)
+        return [{"mpn": pn, "call": self.calls}]
+
+
+class TestHedging:
+    @pytest.mark.asyncio
+    async def test_hedge_wins_and_primary_cancelled(self):
+        conn = _SlowThenFast()
+        lim = get_limiter("_SlowThenFast")
+        _warm(lim, 0.02)
+        result = await limited_search(conn, "LM317", budget_s=5.0)
+        assert result == [{"mpn": "LM317", "call": 2}]
+        assert lim.hedges == 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_for_non_idempotent_connector(self):
+        conn = _SlowThenFast()
+        conn.idempotent_get = False
+        lim = get_limiter("_SlowThenFast")
+        _warm(lim, 0.02)  # deadline floors at MIN_DEADLINE_S
+        with patch.object(limits, "MIN_DEADLINE_S", 0.1):
+            with pytest.raises(TimeoutError, match="deadline exceeded"):
+                await limited_search(conn, "LM317", budget_s=5.0)
+        assert conn.calls == 1
+        assert lim.deadline_misses == 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_free_slot(self):
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return "primary"
+
+        assert await hedged_call(call, 0.01, lambda: False) == "primary"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_hedge_falls_back_to_primary(self):
+        calls = []
+
+        async def call():
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError("hedge failed")
+            await asyncio.sleep(0.05)
+            return "primary"
+
+        assert await hedged_call(call, 0.01, lambda: True) == "primary"
+
+    @pytest.mark.asyncio
+    async def test_both_fail_raises_first_error(self):
+        async def call():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            await hedged_call(call, None, lambda: True)
+
+
+class _FakeConnector(BaseConnector):
+    def __init__(self, outcome):
+        super().__init__(timeout=1.0, max_retries=0)
+        self.outcome = outcome
+
+    async def _do_search(self, part_number):
+        if self.outcome == 429:
+            resp = MagicMock(status_code=429, headers={"Retry-After": "0.01"}, text="")
+            raise httpx.HTTPStatusError("429", request=MagicMock(), response=resp)
+        if self.outcome == 503:
+            resp = MagicMock(status_code=503, headers={}, text="")
+            raise httpx.HTTPStatusError("503", request=MagicMock(), response=resp)
+        return [{"ok": part_number}]
+
+
+class TestBaseConnectorRecording:
+    @pytest.mark.asyncio
+    async def test_success_records_latency(self):
+        conn = _FakeConnector("ok")
+        await conn.search("A")
+        assert conn._limiter.snapshot()["samples"] == 1
+
+    @pytest.mark.asyncio
+    async def test_429_is_throttled(self):
+        conn = _FakeConnector(429)
+        with pytest.raises(Exception, match="rate limited"):
+            await conn.search("A")
+        assert conn._limiter.throttled == 1
+
+    @pytest.mark.asyncio
+    async def test_5xx_decreases_limit(self):
+        limits._limiters["_FakeConnector"] = AdaptiveLimiter("_FakeConnector", 4, max_limit=4)
+        conn = _FakeConnector(503)
+        with pytest.raises(Exception):
+            await conn.search("A")
+        assert conn._limiter.limit == 3
+
+
+class TestHealthDashboard:
+    def test_live_limits_on_matching_row(self, db_session):
+        from app.models.config import ApiSource
+        from app.services.connector_health import get_health_dashboard
+
+        db_session.add(ApiSource(name="digikey", display_name="DigiKey", category="api", source_type="api"))
+        db_session.add(ApiSource(name="mouser", display_name="Mouser", category="api", source_type="api"))
+        db_session.commit()
+        _warm(get_limiter("DigiKeyConnector"), 0.2)
+
+        rows = {r["name"]: r for r in get_health_dashboard(db_session)["connectors"]}
+        assert rows["DigiKey"]["live"]["p95_ms"] == 200
+        assert rows["DigiKey"]["live"]["configured"] == 2
+        assert rows["Mouser"]["live"] is None
+        assert "DigiKeyConnector" in limiter_snapshots()
@@ -67,11 +67,11 @@ class TestParseRetryAfter:
 
 
 # ═══════════════════════════════════════════════════════════════════════
-#  Per-connector semaphore
+#  Per-connector concurrency limit
 # ═══════════════════════════════════════════════════════════════════════
 
 
-class TestConnectorSemaphore:
+class TestConnectorConcurrency:
     @pytest.mark.parametrize(
         ("connector_name", "expected_value"),
         [
@@ -80,10 +80,9 @@ class TestConnectorSemaphore:
         ],
     )
     def test_concurrency_limit(self, connector_name, expected_value):
-        from app.connectors.sources import _get_connector_semaphore
+        from app.connectors.limits import get_limiter
 
-        sem = _get_connector_semaphore(connector_name)
-        assert sem._value == expected_value
+        assert get_limiter(connector_name).limit == expected_value
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -365,7 +364,8 @@ class TestSemaphoreReleasedDuringRetrySleep:
         sleep, not held for its whole duration — otherwise every other concurrent call
         to the SAME connector class queues behind one slow retry (and, transitively, the
         caller's outer search-wide Semaphore(10))."""
-        from app.connectors.sources import BaseConnector, _connector_semaphores
+        from app.connectors.limits import AdaptiveLimiter, _limiters
+        from app.connectors.sources import BaseConnector
 
         class FakeConnector(BaseConnector):
             def __init__(self, *a, **kw):
@@ -379,10 +379,10 @@ class TestSemaphoreReleasedDuringRetrySleep:
                     raise httpx.HTTPStatusError("429", request=MagicMock(), response=resp)
                 return [{"ok": part_number}]
 
-        # Force a single-slot semaphore for this connector class — if it stayed
+        # Force a single-slot limiter for this connector class — if it stayed
         # held during the sleep, a second concurrent call would have to wait for
         # the full 429 backoff before even attempting its own request.
-        _connector_semaphores["FakeConnector"] = asyncio.Semaphore(1)
+        _limiters["FakeConnector"] = AdaptiveLimiter("FakeConnector", 1, max_limit=1)
 
         slow = FakeConnector(timeout=5.0, max_retries=1)
         slow._breaker.record_success()
@@ -0,0 +1,247 @@
+"""Tests for the Redis-shared connector state in app/connectors/sources.py.
+
+Circuit breaker state, cross-process concurrency leases and the OAuth bearer cache are
+shared through Redis when it is up and fall back to the in-process state when it is not.
+A small in-memory stand-in for the Redis commands used plays the shared server; two
+breaker/connector instances stand in for two processes.
+
+Called by: pytest
+Depends on: app.connectors.sources
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.connectors import sources
+from app.connectors.sources import (
+    CircuitBreaker,
+    _get_cached_token,
+    _invalidate_token,
+    _shared_connector_slot,
+    _token_cache,
+)
+
+
+class _FakeRedis:
+    """The subset of redis-py (decode_responses=True) the shared state uses."""
+
+    def __init__(self):
+        self.data: dict = {}
+
+    # strings
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value)
+        return True
+
+    def setex(self, key, ttl, value):
+        self.data[key] = str(value)
+
+    def delete(self, *keys):
+        for k in keys:
+            self.data.pop(k, None)
+
+    def expire(self, key, ttl):
+        return key in self.data
+
+    # hashes
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    def hset(self, key, field, value):
+        self.data.setdefault(key, {})[field] = str(value)
+
+    def hincrby(self, key, field, n):
+        h = self.data.setdefault(key, {})
+        h[field] = str(int(h.get(field, 0)) + n)
+        return int(h[field])
+
+    # sorted sets
+    def zremrangebyscore(self, key, lo, hi):
+        z = self.data.get(key, {})
+        for m in [m for m, s in z.items() if s <= float(hi)]:
+            del z[m]
+
+    def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    def zrank(self, key, member):
+        z = self.data.get(key, {})
+        if member not in z:
+            return None
+        return sorted(z, key=lambda m: (z[m], m)).index(member)
+
+    def zrem(self, key, member):
+        self.data.get(key, {}).pop(member, None)
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, r):
+        self._r = r
+        self._ops: list = []
+
+    def __getattr__(self, name):
+        def _queue(*a, **kw):
+            self._ops.append((name, a, kw))
+            return self
+
+        return _queue
+
+    def execute(self):
+        return [getattr(self._r, name)(*a, **kw) for name, a, kw in self._ops]
+
+
+class _BrokenRedis:
+    def __getattr__(self, name):
+        def _fail(*a, **kw):
+            raise ConnectionError("redis down")
+
+        return _fail
+
+
+@pytest.fixture()
+def shared_redis():
+    fake = _FakeRedis()
+    with patch.object(sources, "_shared_redis", return_value=fake):
+        yield fake
+
+
+class TestSharedBreaker:
+    def test_trip_in_one_process_opens_all(self, shared_redis):
+        a = CircuitBreaker("DigiKeyConnector", fail_max=3)
+        b = CircuitBreaker("DigiKeyConnector", fail_max=3)
+        a.record_failure()
+        b.record_failure()
+        a.record_failure()
+        assert a.current_state == b.current_state == "open"
+
+    def test_success_anywhere_closes(self, shared_redis):
+        a = CircuitBreaker("MouserConnector", fail_max=1)
+        b = CircuitBreaker("MouserConnector", fail_max=1)
+        a.record_failure()
+        b.record_success()
+        assert a.current_state == "closed"
+
+    def test_half_open_after_reset_timeout(self, shared_redis):
+        a = CircuitBreaker("NexarConnector", fail_max=1, reset_timeout=60)
+        a.record_failure()
+        with patch("app.connectors.sources.time.time", return_value=time.time() + 61):
+            assert a.current_state == "half_open"
+
+    def test_redis_down_uses_local_state(self):
+        with patch.object(sources, "_shared_redis", return_value=_BrokenRedis()):
+            a = CircuitBreaker("OEMSecretsConnector", fail_max=2)
+            a.record_failure()
+            assert a.current_state == "closed"
+            a.record_failure()
+            assert a.current_state == "open"
+
+
+class TestSharedSlots:
+    @pytest.mark.asyncio
+    async def test_cap_applies_across_processes(self, shared_redis):
+        """DigiKey's cap is 2: a third holder waits until one of the others releases."""
+        order = []
+        release_first = asyncio.Event()
+
+        async def holder(tag, hold):
+            async with _shared_connector_slot("DigiKeyConnector"):
+                order.append(f"in:{tag}")
+                await hold.wait()
+            order.append(f"out:{tag}")
+
+        never = asyncio.Event()
+        t1 = asyncio.create_task(holder("a", release_first))
+        t2 = asyncio.create_task(holder("b", never))
+        await asyncio.sleep(0.05)
+        t3 = asyncio.create_task(holder("c", asyncio.Event()))
+        await asyncio.sleep(0.15)
+        assert "in:c" not in order
+        release_first.set()
+        await asyncio.sleep(0.3)
+        assert order.index("in:c") > order.index("out:a")
+        for t in (t2, t3):
+            t.cancel()
+        await asyncio.gather(t1, t2, t3, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed(self, shared_redis):
+        key = "connectors:slots:DigiKeyConnector"
+        shared_redis.zadd(key, {"crashed-1": time.time() - 1, "crashed-2": time.time() - 1})
+        async with _shared_connector_slot("DigiKeyConnector"):
+            assert len(shared_redis.data[key]) == 1
+        assert shared_redis.data[key] == {}
+
+    @pytest.mark.asyncio
+    async def test_redis_down_is_noop(self):
+        with patch.object(sources, "_shared_redis", return_value=_BrokenRedis()):
+            async with _shared_connector_slot("DigiKeyConnector"):
+                pass
+
+
+class TestSharedToken:
+    @pytest.mark.asyncio
+    async def test_peer_process_reuses_minted_bearer(self, shared_redis):
+        key = ("DigiKeyConnector", "client-1")
+        mints = []
+
+        async def mint():
+            mints.append(1)
+            return "bearer-abc", 600
+
+        assert await _get_cached_token(key, mint) == "bearer-abc"
+        _token_cache.clear()  # a second process starts with a cold local cache
+        assert await _get_cached_token(key, mint) == "bearer-abc"
+        assert len(mints) == 1
+
+    @pytest.mark.asyncio
+    async def test_waits_for_peer_mint_in_flight(self, shared_redis):
+        key = ("NexarConnector", "client-2")
+        shared_redis.set("connectors:token:NexarConnector:client-2:mint", "1", nx=True)
+
+        async def peer_finishes():
+            await asyncio.sleep(0.15)
+            shared_redis.setex("connectors:token:NexarConnector:client-2", 600, f"peer-bearer|{time.time() + 600}")
+
+        async def mint():
+            raise AssertionError("must wait for the peer's mint")
+
+        task = asyncio.create_task(peer_finishes())
+        assert await _get_cached_token(key, mint) == "peer-bearer"
+        await task
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_shared_copy(self, shared_redis):
+        key = ("EbayConnector", "client-3")
+
+        async def mint():
+            return "old", 600
+
+        await _get_cached_token(key, mint)
+        _invalidate_token(key)
+        assert shared_redis.get("connectors:token:EbayConnector:client-3") is None
+
+        async def remint():
+            return "new", 600
+
+        assert await _get_cached_token(key, remint) == "new"
+
+    @pytest.mark.asyncio
+    async def test_near_expiry_shared_bearer_is_reminted(self, shared_redis):
+        key = ("DigiKeyConnector", "client-4")
+        shared_redis.setex("connectors:token:DigiKeyConnector:client-4", 30, f"stale|{time.time() + 30}")
+
+        async def mint():
+            return "fresh", 600
+
+        assert await _get_cached_token(key, mint) == "fresh"
@@ -54,16 +54,17 @@ class TestRegisterCoreJobs:
 
         job_ids = [call.kwargs["id"] for call in scheduler.add_job.call_args_list]
         assert "webhook_subs" in job_ids
+        assert "graph_notification_drain" in job_ids
 
     @pytest.mark.parametrize(
         ("activity_tracking_enabled", "expected_count"),
         [
             pytest.param(False, 5, id="without_webhooks"),
-            pytest.param(True, 6, id="with_webhooks"),
+            pytest.param(True, 7, id="with_webhooks"),
         ],
     )
     def test_total_job_count(self, activity_tracking_enabled: bool, expected_count: int):
-        """Exactly 5 jobs without activity tracking, 6 with it enabled."""
+        """Exactly 5 jobs without activity tracking, 7 with it enabled."""
         from app.jobs.core_jobs import register_core_jobs
 
         scheduler = MagicMock()
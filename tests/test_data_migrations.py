@@ -0,0 +1,101 @@
+"""Tests for app.data_migrations — the versioned startup-backfill ledger.
+
+Covers skipping backfills completed at their version, re-running on a version bump,
+resuming a failed run from its persisted checkpoint, recording failures, and the
+unledgered fallback when the table is missing.
+
+Called by: pytest
+Depends on: app.data_migrations, app.startup._keyset_normalize
+"""
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy import text as sqltext
+from sqlalchemy.pool import StaticPool
+
+from app.data_migrations import Backfill, Checkpoint, run_pending
+from app.models import DataMigration
+
+
+@pytest.fixture
+def ledger_engine():
+    eng = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    DataMigration.__table__.create(eng)
+    yield eng
+    eng.dispose()
+
+
+def _rows(eng) -> dict:
+    with eng.connect() as conn:
+        return {r.name: r for r in conn.execute(select(DataMigration.__table__))}
+
+
+class TestRunPending:
+    def test_completed_backfill_is_skipped_until_version_bump(self, ledger_engine):
+        calls = []
+        assert run_pending(ledger_engine, [Backfill("a", 1, lambda cp: calls.append(1))]) == 1
+        assert run_pending(ledger_engine, [Backfill("a", 1, lambda cp: calls.append(1))]) == 0
+        assert calls == [1]
+        assert run_pending(ledger_engine, [Backfill("a", 2, lambda cp: calls.append(2))]) == 1
+        assert calls == [1, 2]
+        row = _rows(ledger_engine)["a"]
+        assert (row.status, row.version) == ("completed", 2)
+        assert row.completed_at is not None
+
+    def test_failure_is_recorded_and_checkpoint_resumes(self, ledger_engine):
+        seen = []
+
+        def crash(cp: Checkpoint) -> None:
+            cp.advance("t", 500, rows=500)
+            raise RuntimeError("deploy interrupted")
+
+        with pytest.raises(RuntimeError):
+            run_pending(ledger_engine, [Backfill("b", 1, crash)])
+        row = _rows(ledger_engine)["b"]
+        assert row.status == "failed"
+        assert "deploy interrupted" in row.last_error
+        assert (row.checkpoint, row.rows_done) == ({"t": 500}, 500)
+
+        run_pending(ledger_engine, [Backfill("b", 1, lambda cp: seen.append(cp.get("t")))])
+        assert seen == [500]
+        assert _rows(ledger_engine)["b"].status == "completed"
+
+    def test_version_bump_discards_old_checkpoint(self, ledger_engine):
+        def crash(cp: Checkpoint) -> None:
+            cp.advance("t", 900)
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            run_pending(ledger_engine, [Backfill("c", 1, crash)])
+        seen = []
+        run_pending(ledger_engine, [Backfill("c", 2, lambda cp: seen.append(cp.get("t")))])
+        assert seen == [0]
+
+    def test_missing_ledger_runs_everything_unledgered(self):
+        eng = create_engine("sqlite://", poolclass=StaticPool)
+        calls = []
+        backfills = [Backfill("x", 1, lambda cp: calls.append("x")), Backfill("y", 1, lambda cp: calls.append("y"))]
+        assert run_pending(eng, backfills) == 2
+        assert run_pending(eng, backfills) == 2
+        assert calls == ["x", "y", "x", "y"]
+
+
+class TestKeysetNormalize:
+    def test_resumes_after_checkpoint_and_skips_unnormalizable_rows(self, ledger_engine, monkeypatch):
+        import app.startup as startup_mod
+
+        monkeypatch.setattr(startup_mod, "_BACKFILL_BATCH_SIZE", 2)
+        with ledger_engine.begin() as conn:
+            conn.execute(sqltext("CREATE TABLE parts (id INTEGER PRIMARY KEY, mpn TEXT, norm TEXT)"))
+            conn.execute(
+                sqltext("INSERT INTO parts (id, mpn) VALUES (1, 'A-1'), (2, '---'), (3, 'B-2'), (4, 'C-3'), (5, 'D-4')")
+            )
+        cp = Checkpoint()
+        cp.advance("parts", 1)
+        with ledger_engine.connect() as conn:
+            total = startup_mod._keyset_normalize(conn, cp, "parts", "mpn", "norm", startup_mod._norm_key)
+        assert total == 3
+        assert cp.get("parts") == 5
+        with ledger_engine.connect() as conn:
+            norms = dict(conn.execute(sqltext("SELECT id, norm FROM parts")).fetchall())
+        assert norms == {1: None, 2: None, 3: "b2", 4: "c3", 5: "d4"}
@@ -24,6 +24,7 @@ from unittest.mock import AsyncMock, patch
 import pytest
 
 from app.models import Contact, Sighting, VendorCard, VendorContact
+from app.services import email_threads
 from app.services.email_threads import (
     _build_thread_summary,
     _cache_get,
@@ -174,6 +175,124 @@ class TestCache:
         assert _cache_get("key2") is None
 
 
+class _FakeRedis:
+    """The string and sorted-set commands the conversation store uses, over dicts."""
+
+    def __init__(self):
+        self.data: dict[str, str] = {}
+        self.lru: dict[str, float] = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for k in keys:
+            self.data.pop(k, None)
+
+    def zadd(self, key, mapping):
+        self.lru.update(mapping)
+
+    def zcard(self, key):
+        return len(self.lru)
+
+    def zpopmin(self, key, count):
+        oldest = sorted(self.lru.items(), key=lambda kv: kv[1])[:count]
+        for k, _ in oldest:
+            del self.lru[k]
+        return oldest
+
+    def pipeline(self):
+        redis, results = self, []
+
+        class _Pipe:
+            def __getattr__(self, name):
+                return lambda *a: results.append(getattr(redis, name)(*a))
+
+            def execute(self):
+                return results
+
+        return _Pipe()
+
+
+def _conv_msg(mid: str, at: str, sender: str = "vendor@arrow.com", **extra) -> dict:
+    return {
+        "id": mid,
+        "conversationId": "conv-1",
+        "subject": "Re: RFQ",
+        "from": {"emailAddress": {"address": sender}},
+        "toRecipients": [{"emailAddress": {"address": "buyer@trioscs.com"}}],
+        "bodyPreview": mid,
+        "receivedDateTime": at,
+        **extra,
+    }
+
+
+class TestConversationStore:
+    @pytest.mark.asyncio
+    async def test_repeat_reads_hit_cache_then_refresh_incrementally(self, monkeypatch):
+        from app.services import email_threads
+
+        with patch("app.services.email_threads.GraphClient") as MockGC:
+            pages = MockGC.return_value.get_all_pages = AsyncMock(
+                return_value=[_conv_msg("m1", "2026-10-01T10:00:00Z")]
+            )
+            await fetch_thread_messages("conv-1", "tok", user_id=7)
+            await fetch_thread_messages("conv-1", "tok", user_id=7)
+            assert pages.await_count == 1
+
+            key = email_threads._conv_key(7, "conv-1")
+            email_threads._conversations[key]["checked_at"] -= 301
+            pages.return_value = [_conv_msg("m2", "2026-10-02T10:00:00Z")]
+            messages = await fetch_thread_messages("conv-1", "tok", user_id=7)
+
+        assert [m["id"] for m in messages] == ["m1", "m2"]
+        incremental = pages.await_args.kwargs["params"]["$filter"]
+        assert incremental.startswith("receivedDateTime gt 2026-10-01T10:00:00Z and ")
+
+    @pytest.mark.asyncio
+    async def test_delta_messages_extend_cached_conversations_only(self):
+        with patch("app.services.email_threads.GraphClient") as MockGC:
+            pages = MockGC.return_value.get_all_pages = AsyncMock(
+                return_value=[_conv_msg("m1", "2026-10-01T10:00:00Z")]
+            )
+            await fetch_thread_messages("conv-1", "tok", user_id=7)
+
+            reply = _conv_msg("m2", "2026-10-02T10:00:00Z", sender="buyer@trioscs.com", body={"content": "x"})
+            reply["toRecipients"] = [{"emailAddress": {"address": "vendor@arrow.com"}}]
+            other = dict(_conv_msg("m3", "2026-10-02T11:00:00Z"), conversationId="conv-unopened")
+            assert email_threads.record_delta_messages(7, [reply, other]) == 1
+
+            messages = await fetch_thread_messages("conv-1", "tok", user_id=7)
+
+        assert pages.await_count == 1
+        assert [(m["id"], m["direction"]) for m in messages] == [("m1", "received"), ("m2", "sent")]
+        stored = email_threads._conversations[email_threads._conv_key(7, "conv-1")]["messages"]
+        assert "body" not in stored[0]
+
+    @pytest.mark.asyncio
+    async def test_shared_store_is_bounded_lru(self, monkeypatch):
+        fake = _FakeRedis()
+        monkeypatch.setattr(email_threads, "SHARED_CONVERSATION_LIMIT", 2)
+        with (
+            patch("app.cache.intel_cache._get_redis", return_value=fake),
+            patch("app.services.email_threads.GraphClient") as MockGC,
+        ):
+            pages = MockGC.return_value.get_all_pages = AsyncMock(
+                return_value=[_conv_msg("m1", "2026-10-01T10:00:00Z")]
+            )
+            for conv in ("c1", "c2", "c3"):
+                await fetch_thread_messages(conv, "tok", user_id=7)
+            assert len(fake.lru) == 2
+            assert email_threads._conv_key(7, "c1") not in fake.lru
+
+            clear_cache()  # another worker: only Redis holds c3
+            await fetch_thread_messages("c3", "tok", user_id=7)
+        assert pages.await_count == 3
+
+
 # ═══════════════════════════════════════════════════════════════════════
 #  Thread Summary Builder
 # ═══════════════════════════════════════════════════════════════════════
@@ -0,0 +1,134 @@
+"""Tests for app.services.entity_resolver — batch email / phone → entity resolution.
+
+Covers batch parity with the per-address tiers, the fixed query count of a batch, the
+index serving repeat addresses without SQL, flush-time invalidation on watched columns
+(and not on unrelated ones), the E.164 → vendor index, and chunked resolution.
+
+Called by: pytest
+Depends on: app.services.entity_resolver, tests/conftest.py db_session fixture
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import event
+
+from app.models import Company, CustomerSite, SiteContact, VendorCard, VendorContact
+from app.services import entity_resolver
+
+
+def _seed(db):
+    co = Company(name="Acme Corp", domain="acme.com", is_active=True, created_at=datetime.now(UTC))
+    db.add(co)
+    db.flush()
+    site = CustomerSite(company_id=co.id, site_name="HQ", is_active=True, contact_email="buyer@acme.com")
+    db.add(site)
+    db.flush()
+    sc = SiteContact(customer_site_id=site.id, full_name="Jane", email="Jane@Acme.com", email_verified=True)
+    card = VendorCard(normalized_name="arrow", display_name="Arrow", domain="arrow.com", phones=["(800) 344-4539"])
+    db.add_all([sc, card])
+    db.flush()
+    vc = VendorContact(vendor_card_id=card.id, email="rep@arrow.com", full_name="Rep", source="manual")
+    db.add(vc)
+    db.commit()
+    return co, site, sc, card, vc
+
+
+class _Counter:
+    def __init__(self, db):
+        self.engine = db.get_bind()
+        self.count = 0
+
+    def _hit(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._hit)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._hit)
+
+
+class TestResolveMany:
+    def test_batch_resolves_every_tier(self, db_session):
+        co, site, sc, card, vc = _seed(db_session)
+        result = entity_resolver.resolve_many(
+            [" JANE@acme.com", "buyer@acme.com", "rep@arrow.com", "ceo@acme.com", "x@arrow.com", "a@gmail.com", None],
+            db_session,
+        )
+        assert result["jane@acme.com"] == {
+            "type": "company",
+            "id": co.id,
+            "name": "HQ",
+            "site_id": site.id,
+            "site_contact_id": sc.id,
+        }
+        assert result["buyer@acme.com"]["site_id"] == site.id
+        assert result["buyer@acme.com"]["site_contact_id"] is None
+        assert result["rep@arrow.com"] == {"type": "vendor", "id": card.id, "name": "Arrow", "vendor_contact_id": vc.id}
+        assert result["ceo@acme.com"] == {"type": "company", "id": co.id, "name": "Acme Corp", "site_contact_id": None}
+        assert result["x@arrow.com"] == {"type": "vendor", "id": card.id, "name": "Arrow"}
+        assert result["a@gmail.com"] is None
+
+    def test_batch_query_count_is_fixed_and_repeat_is_free(self, db_session):
+        _seed(db_session)
+        batch = [f"user{i}@acme.com" for i in range(20)] + [f"user{i}@arrow.com" for i in range(20)]
+        with _Counter(db_session) as first:
+            entity_resolver.resolve_many(batch, db_session)
+        assert first.count <= 5
+        with _Counter(db_session) as second:
+            entity_resolver.resolve_many(batch, db_session)
+        assert second.count == 0
+
+    def test_chunks_large_batches(self, db_session, monkeypatch):
+        _seed(db_session)
+        monkeypatch.setattr(entity_resolver, "_BATCH", 2)
+        result = entity_resolver.resolve_many(["jane@acme.com", "rep@arrow.com", "nobody@zzz.com"], db_session)
+        assert result["jane@acme.com"]["type"] == "company"
+        assert result["rep@arrow.com"]["type"] == "vendor"
+        assert result["nobody@zzz.com"] is None
+
+    def test_results_are_copies(self, db_session):
+        _seed(db_session)
+        entity_resolver.resolve_many(["rep@arrow.com"], db_session)["rep@arrow.com"]["name"] = "mutated"
+        assert entity_resolver.resolve_many(["rep@arrow.com"], db_session)["rep@arrow.com"]["name"] == "Arrow"
+
+
+class TestInvalidation:
+    def test_watched_write_invalidates(self, db_session):
+        co, *_ = _seed(db_session)
+        assert entity_resolver.resolve_many(["new@acme.com"], db_session)["new@acme.com"]["id"] == co.id
+        co.is_active = False
+        db_session.commit()
+        assert entity_resolver.resolve_many(["new@acme.com"], db_session)["new@acme.com"] is None
+
+    def test_new_contact_visible_after_flush(self, db_session):
+        _, _, _, card, _ = _seed(db_session)
+        assert (
+            entity_resolver.resolve_many(["buyer2@arrow.com"], db_session)["buyer2@arrow.com"].get("vendor_contact_id")
+            is None
+        )
+        db_session.add(VendorContact(vendor_card_id=card.id, email="buyer2@arrow.com", full_name="B", source="manual"))
+        db_session.flush()
+        match = entity_resolver.resolve_many(["buyer2@arrow.com"], db_session)["buyer2@arrow.com"]
+        assert match["vendor_contact_id"] is not None
+
+    def test_unrelated_column_keeps_index(self, db_session):
+        _, _, _, card, _ = _seed(db_session)
+        entity_resolver.resolve_many(["rep@arrow.com"], db_session)
+        card.sighting_count = 42
+        db_session.commit()
+        with _Counter(db_session) as counter:
+            entity_resolver.resolve_many(["rep@arrow.com"], db_session)
+        assert counter.count == 0
+
+
+class TestPhoneIndex:
+    def test_vendor_for_phone_and_blacklist(self, db_session):
+        _, _, _, card, _ = _seed(db_session)
+        card_id = card.id
+        assert entity_resolver.vendor_for_phone("+18003444539", db_session) == (card_id, "Arrow")
+        assert entity_resolver.vendor_for_phone("+18005550000", db_session) is None
+        card.is_blacklisted = True
+        db_session.commit()
+        assert entity_resolver.vendor_for_phone("+18003444539", db_session) is None
@@ -0,0 +1,101 @@
+"""Tests for app.services.facet_index — the per-commodity card bitset index.
+
+Covers repeat sidebar counts served without SQL, flush-time re-application of facet and
+card changes, the updated_at watermark refresh for writes made outside this process,
+and index-served result totals.
+
+Called by: pytest
+Depends on: app.services.facet_index, app.services.faceted_search_service,
+    tests/conftest.py db_session fixture
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import event, update
+
+from app.models import MaterialCard, MaterialSpecFacet
+from app.services import facet_index
+from app.services.faceted_search_service import get_facet_counts, search_materials_faceted
+
+
+def _card(db, mpn: str, interface: str, capacity: float, **card_fields) -> MaterialCard:
+    card = MaterialCard(normalized_mpn=mpn, display_mpn=mpn.upper(), category="hdd", **card_fields)
+    db.add(card)
+    db.flush()
+    db.add(MaterialSpecFacet(material_card_id=card.id, category="hdd", spec_key="interface", value_text=interface))
+    db.add(MaterialSpecFacet(material_card_id=card.id, category="hdd", spec_key="capacity_gb", value_numeric=capacity))
+    db.flush()
+    return card
+
+
+class _Counter:
+    def __init__(self, db):
+        self.engine = db.get_bind()
+        self.count = 0
+
+    def _hit(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._hit)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._hit)
+
+
+def test_repeat_counts_run_no_sql(db_session):
+    _card(db_session, "d1", "SATA", 1000.0)
+    _card(db_session, "d2", "SAS", 2000.0)
+    db_session.commit()
+    first = get_facet_counts(db_session, "hdd", active_filters={"capacity_gb__vals": [1000]})
+    assert first == {"interface": {"SATA": 1}, "capacity_gb": {"1000.0": 1, "2000.0": 1}}
+    with _Counter(db_session) as counter:
+        assert get_facet_counts(db_session, "hdd", active_filters={"capacity_gb__vals": [1000]}) == first
+    assert counter.count == 0
+
+
+def test_flushed_changes_are_reapplied(db_session):
+    card = _card(db_session, "d1", "SATA", 1000.0)
+    _card(db_session, "d2", "SATA", 2000.0)
+    db_session.commit()
+    assert get_facet_counts(db_session, "hdd")["interface"] == {"SATA": 2}
+
+    facet = db_session.query(MaterialSpecFacet).filter_by(material_card_id=card.id, spec_key="interface").one()
+    facet.value_text = "SAS"
+    db_session.commit()
+    assert get_facet_counts(db_session, "hdd")["interface"] == {"SATA": 1, "SAS": 1}
+
+    card.deleted_at = datetime.now(UTC)
+    db_session.commit()
+    assert get_facet_counts(db_session, "hdd")["interface"] == {"SATA": 1}
+
+
+def test_watermark_picks_up_writes_that_skip_local_flushes(db_session, monkeypatch):
+    card = _card(db_session, "d1", "SATA", 1000.0)
+    db_session.commit()
+    assert get_facet_counts(db_session, "hdd")["interface"] == {"SATA": 1}
+
+    # Another worker re-categorizes the card: no local flush, only the card stamp moves.
+    db_session.execute(
+        update(MaterialCard)
+        .where(MaterialCard.id == card.id)
+        .values(category="ssd", updated_at=datetime.now(UTC) + timedelta(seconds=1))
+    )
+    db_session.commit()
+    assert get_facet_counts(db_session, "hdd")["interface"] == {"SATA": 1}  # within REFRESH_SECONDS
+    monkeypatch.setattr(facet_index, "REFRESH_SECONDS", 0)
+    assert get_facet_counts(db_session, "hdd") == {}
+
+
+def test_search_total_comes_from_index(db_session):
+    _card(db_session, "d1", "SATA", 1000.0, lifecycle_status="active", manufacturer="Seagate")
+    _card(db_session, "d2", "SAS", 1000.0, lifecycle_status="eol", brand="Seagate")
+    _card(db_session, "d3", "SAS", 2000.0, lifecycle_status="active", manufacturer="WD")
+    db_session.commit()
+    rows, total = search_materials_faceted(
+        db_session, commodity="hdd", sub_filters={"capacity_gb_max": 1500}, manufacturers=["Seagate"], limit=1
+    )
+    assert total == 2 and len(rows) == 1
+    _, total = search_materials_faceted(db_session, commodity="hdd", lifecycle=["active"], q="d3")
+    assert total == 1
@@ -1347,3 +1347,55 @@ class TestFacetedSearchFtsRealPostgres:
 
         assert total == 0
         assert results == []
+
+
+def test_fts_sort_keys_cast_rank_in_order_and_cursor_predicate():
+    """ts_rank is float4; the keyset cursor binds its value back as a numeric literal and
+    ``real = numeric`` never matches, so both sides must use the NUMERIC cast."""
+    from decimal import Decimal
+
+    from sqlalchemy import func, select
+    from sqlalchemy.dialects import postgresql
+
+    from app.services.faceted_search_service import _material_sort_keys
+    from app.services.list_paging import _after
+
+    keys = _material_sort_keys(func.plainto_tsquery("english", "voltage regulator"))
+    stmt = (
+        select(MaterialCard.id)
+        .where(_after(keys, [Decimal("0.0607927"), 3, 42]))
+        .order_by(*[expr.desc() for expr, _ in keys])
+    )
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert sql.count("CAST(ts_rank(material_cards.search_vector, plainto_tsquery(") == sql.count("ts_rank(")
+    assert "NUMERIC(12, 8)" in sql
+    assert keys[-1][0] is MaterialCard.id
+
+
+@requires_postgres
+def test_fts_keyset_walk_visits_rank_ties_once(pg_session: Session):
+    """Cards with identical ts_rank page by id without repeating or skipping a row."""
+    from app.services.faceted_search_service import page_materials_faceted
+
+    cards = [
+        MaterialCard(
+            normalized_mpn=f"vreg{i:02d}",
+            display_mpn=f"VREG{i:02d}",
+            description="adjustable voltage regulator",
+            created_at=datetime.now(UTC),
+        )
+        for i in range(7)
+    ]
+    pg_session.add_all(cards)
+    pg_session.flush()
+    _populate_search_vector(pg_session, *[c.id for c in cards])
+
+    seen: list[int] = []
+    cursor = ""
+    for _ in range(10):
+        rows, _total, cursor = page_materials_faceted(pg_session, q="voltage regulator", cursor=cursor, limit=3)
+        seen += [c.id for c in rows]
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(c.id for c in cards)
+    assert len(seen) == len(set(seen))
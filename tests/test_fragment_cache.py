@@ -0,0 +1,245 @@
+"""Tests for app/services/fragment_cache.py — ETag/304 and stored-fragment reuse.
+
+Covers the ETag inputs (scope revisions, user, URL), If-None-Match handling, the
+commit-time invalidation listeners (rollback discards), the SSE publish hook, and the
+four wired partial routes end to end.
+
+Called by: pytest
+Depends on: app.services.fragment_cache, app.services.sse_broker, conftest fixtures
+"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.responses import HTMLResponse
+from starlette.requests import Request
+
+from app.models import Requirement, Requisition, VendorCard
+from app.models.intelligence import MaterialCard
+from app.models.sourcing import Sighting
+from app.models.vendor_sighting_summary import VendorSightingSummary
+from app.services import fragment_cache
+from app.services.fragment_cache import (
+    MATERIAL,
+    REQUIREMENT,
+    REQUISITION,
+    VENDOR,
+    bump,
+    cached_fragment,
+    fragment_etag,
+    register_fragment_listeners,
+    revisions,
+    scopes_for_event,
+)
+from app.services.sse_broker import SSEBroker, broker
+
+
+def _request(path: str = "/v2/partials/x", query: str = "", headers: dict | None = None, method: str = "GET"):
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": method, "path": path, "query_string": query.encode(), "headers": raw})
+
+
+class _User:
+    def __init__(self, uid: int, role: str = "buyer"):
+        self.id = uid
+        self.role = role
+
+
+def _seed(db_session):
+    req = Requisition(name="Frag RFQ", status="open", customer_name="Acme")
+    db_session.add(req)
+    db_session.flush()
+    r = Requirement(requisition_id=req.id, primary_mpn="FRAG-1", target_qty=10, sourcing_status="open")
+    db_session.add(r)
+    db_session.flush()
+    db_session.add(
+        VendorSightingSummary(requirement_id=r.id, vendor_name="Frag Vendor", estimated_qty=5, listing_count=1)
+    )
+    db_session.commit()
+    return req, r
+
+
+class TestEtag:
+    def test_stable_for_same_inputs(self):
+        req = _request()
+        assert fragment_etag(req, [(REQUIREMENT, 1)], user=_User(1)) == fragment_etag(
+            req, [(REQUIREMENT, 1)], user=_User(1)
+        )
+
+    def test_changes_with_revision_user_and_query(self):
+        base = fragment_etag(_request(), [(REQUIREMENT, 1)], user=_User(1))
+        assert fragment_etag(_request(), [(REQUIREMENT, 1)], user=_User(2)) != base
+        assert fragment_etag(_request(query="mpn=X"), [(REQUIREMENT, 1)], user=_User(1)) != base
+        bump([(REQUIREMENT, 1)])
+        assert fragment_etag(_request(), [(REQUIREMENT, 1)], user=_User(1)) != base
+
+    def test_unrelated_bump_keeps_etag(self):
+        base = fragment_etag(_request(), [(REQUIREMENT, 1)], user=_User(1))
+        bump([(REQUIREMENT, 2), (VENDOR, 1)])
+        assert fragment_etag(_request(), [(REQUIREMENT, 1)], user=_User(1)) == base
+
+    def test_time_bucket_bounds_staleness(self):
+        with patch("app.services.fragment_cache.time.time", return_value=1000.0):
+            first = fragment_etag(_request(), [(REQUIREMENT, 1)])
+        with patch("app.services.fragment_cache.time.time", return_value=1000.0 + fragment_cache.FRAGMENT_MAX_AGE):
+            assert fragment_etag(_request(), [(REQUIREMENT, 1)]) != first
+
+
+class TestCachedFragment:
+    @pytest.mark.asyncio
+    async def test_miss_renders_then_reuses_stored_html(self):
+        calls = []
+
+        async def render():
+            calls.append(1)
+            resp = HTMLResponse("<div>hi</div>")
+            resp.headers["X-Rendered-Req-Id"] = "7"
+            return resp
+
+        first = await cached_fragment(_request(), 'W/"abc"', render)
+        second = await cached_fragment(_request(), 'W/"abc"', render)
+        assert len(calls) == 1
+        assert second.body == b"<div>hi</div>"
+        assert second.headers["X-Rendered-Req-Id"] == "7"
+        assert first.headers["ETag"] == second.headers["ETag"] == 'W/"abc"'
+        assert first.headers["Cache-Control"] == "private, no-cache"
+
+    @pytest.mark.asyncio
+    async def test_if_none_match_is_304_without_render(self):
+        async def render():
+            raise AssertionError("must not render on a matching If-None-Match")
+
+        resp = await cached_fragment(_request(headers={"If-None-Match": '"zzz", W/"abc"'}), 'W/"abc"', render)
+        assert resp.status_code == 304
+
+    @pytest.mark.asyncio
+    async def test_errors_and_hx_responses_not_stored(self):
+        async def render_toast():
+            resp = HTMLResponse("<div/>")
+            resp.headers["HX-Trigger"] = "{}"
+            return resp
+
+        resp = await cached_fragment(_request(), 'W/"t"', render_toast)
+        assert "ETag" not in resp.headers
+        assert fragment_cache._get_stored('W/"t"') is None
+
+    @pytest.mark.asyncio
+    async def test_non_get_always_renders(self):
+        calls = []
+
+        async def render():
+            calls.append(1)
+            return HTMLResponse("<div/>")
+
+        await cached_fragment(_request(method="POST"), 'W/"p"', render)
+        await cached_fragment(_request(method="POST"), 'W/"p"', render)
+        assert len(calls) == 2
+
+
+class TestInvalidation:
+    def test_commit_bumps_row_and_fk_scopes(self, db_session):
+        register_fragment_listeners()
+        req, r = _seed(db_session)
+        before = revisions([(REQUIREMENT, r.id), (REQUISITION, req.id)])
+        db_session.add(Sighting(requirement_id=r.id, vendor_name="V", mpn_matched="FRAG-1"))
+        db_session.commit()
+        after = revisions([(REQUIREMENT, r.id), (REQUISITION, req.id)])
+        assert after[0] == before[0] + 1
+        assert after[1] == before[1]  # a sighting carries no requisition_id
+
+    def test_rollback_discards(self, db_session):
+        register_fragment_listeners()
+        _, r = _seed(db_session)
+        before = revisions([(REQUIREMENT, r.id)])
+        r.target_qty = 99
+        db_session.flush()
+        db_session.rollback()
+        assert revisions([(REQUIREMENT, r.id)]) == before
+
+    def test_event_payload_scopes(self):
+        assert scopes_for_event('{"requirement_id": 3, "requisition_id": 4}') == {(REQUIREMENT, 3), (REQUISITION, 4)}
+        assert scopes_for_event("<div>cards</div>") == set()
+        assert scopes_for_event("{not json") == set()
+
+    @pytest.mark.asyncio
+    async def test_sse_publish_bumps(self):
+        register_fragment_listeners()
+        before = revisions([(REQUIREMENT, 42)])
+        await broker.publish("user:1", "sighting-updated", '{"requirement_id": 42}')
+        assert revisions([(REQUIREMENT, 42)]) == [before[0] + 1]
+
+    @pytest.mark.asyncio
+    async def test_failing_hook_does_not_block_fanout(self):
+        b = SSEBroker()
+
+        def boom(channel, event, data):
+            raise RuntimeError("hook down")
+
+        b.add_publish_hook(boom)
+        q = b.subscribe("c")
+        await b.publish("c", "e", "d")
+        assert q.get_nowait() == {"event": "e", "data": "d"}
+
+
+class TestWiredRoutes:
+    def test_sightings_detail_304_then_refresh_after_write(self, client, db_session):
+        _, r = _seed(db_session)
+        url = f"/v2/partials/sightings/{r.id}/detail"
+        first = client.get(url)
+        etag = first.headers["ETag"]
+        assert first.headers["X-Rendered-Req-Id"] == str(r.id)
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+        db_session.add(
+            VendorSightingSummary(requirement_id=r.id, vendor_name="Late Vendor", estimated_qty=1, listing_count=1)
+        )
+        db_session.commit()
+        fresh = client.get(url, headers={"If-None-Match": etag})
+        assert fresh.status_code == 200
+        assert "Late Vendor" in fresh.text
+
+    def test_sightings_detail_checks_access_before_304(self, client, db_session):
+        _, r = _seed(db_session)
+        url = f"/v2/partials/sightings/{r.id}/detail"
+        etag = client.get(url).headers["ETag"]
+        with patch("app.routers.sightings.require_requisition_access", side_effect=PermissionError):
+            with pytest.raises(PermissionError):
+                client.get(url, headers={"If-None-Match": etag})
+
+    def test_parts_tab_tracks_requirement_scope(self, client, db_session):
+        req, r = _seed(db_session)
+        url = f"/v2/partials/requisitions/{req.id}/tab/parts"
+        etag = client.get(url).headers["ETag"]
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+        db_session.add(Sighting(requirement_id=r.id, vendor_name="V2", mpn_matched="FRAG-1"))
+        db_session.commit()
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+    def test_other_requisition_tabs_uncached(self, client, db_session):
+        req, _ = _seed(db_session)
+        resp = client.get(f"/v2/partials/requisitions/{req.id}/tab/offers")
+        assert resp.status_code == 200
+        assert "ETag" not in resp.headers
+
+    def test_vendor_detail_etag(self, client, db_session):
+        card = VendorCard(normalized_name="frag vendor", display_name="Frag Vendor")
+        db_session.add(card)
+        db_session.commit()
+        url = f"/v2/partials/vendors/{card.id}"
+        etag = client.get(url).headers["ETag"]
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+        card.display_name = "Renamed Vendor"
+        db_session.commit()
+        resp = client.get(url, headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert "Renamed Vendor" in resp.text
+
+    def test_material_detail_etag(self, client, db_session):
+        card = MaterialCard(normalized_mpn="frag1", display_mpn="FRAG1")
+        db_session.add(card)
+        db_session.commit()
+        url = f"/v2/partials/materials/{card.id}"
+        etag = client.get(url).headers["ETag"]
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+        bump([(MATERIAL, card.id)])
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
@@ -345,7 +345,8 @@ async def _run_fn_to_thread(fn, *args):
 
 class TestRegisterTaggingJobs:
     def test_registers_all_jobs_unconditionally(self):
-        """register_tagging_jobs adds the 5 tagging/spec jobs unconditionally.
+        """register_tagging_jobs adds the 5 tagging/spec jobs and the 2 vendor-affinity
+        matrix jobs unconditionally.
 
         SP1 (2026-06-09): the gated 'material_enrichment' Haiku job was removed and
         replaced with an always-on 'spec_enrichment' backlog sweep.
@@ -356,8 +357,10 @@ class TestRegisterTaggingJobs:
         mock_settings = MagicMock()
         register_tagging_jobs(mock_scheduler, mock_settings)
 
-        assert mock_scheduler.add_job.call_count == 5
+        assert mock_scheduler.add_job.call_count == 7
         job_ids = [c.kwargs["id"] for c in mock_scheduler.add_job.call_args_list]
+        assert "vendor_affinity_rebuild" in job_ids
+        assert "vendor_affinity_refresh" in job_ids
         assert "internal_confidence_boost" in job_ids
         assert "prefix_backfill" in job_ids
         assert "sighting_mining" in job_ids
@@ -753,7 +753,7 @@ class TestRegisterCoreJobs:
     @pytest.mark.parametrize(
         "activity_tracking_enabled, expected_jobs",
         [
-            pytest.param(True, 6, id="with_activity_tracking"),
+            pytest.param(True, 7, id="with_activity_tracking"),  # + graph_notification_drain
             pytest.param(False, 5, id="without_activity_tracking"),
         ],
     )
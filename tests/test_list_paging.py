@@ -0,0 +1,161 @@
+"""Tests for keyset paging + cached list counts (services/list_paging.py).
+
+Covers the cursor round-trip (tagged datetime/Decimal values, scope mismatch, garbage
+tokens), walking a list page by page with ties and NULL sort values in both directions
+(every row exactly once, same order as a plain ORDER BY), the offset fallback, and
+``list_count`` inline (no Redis), warm-cache, stale-refresh and cold-cache paths.
+
+Depends on: services/list_paging, conftest fixtures.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from datetime import UTC, datetime
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.vendors import VendorCard
+from app.services.list_paging import (
+    COUNT_FRESH_SECONDS,
+    ListCount,
+    decode_cursor,
+    encode_cursor,
+    list_count,
+    page_rows,
+)
+
+
+@pytest.fixture
+def vendors(db_session: Session) -> list[VendorCard]:
+    """12 cards with duplicate and NULL sighting counts."""
+    counts = [5, 5, 5, None, 3, None, 9, 1, 3, 5, None, 9]
+    cards = [
+        VendorCard(normalized_name=f"vendor {i:02d}", display_name=f"Vendor {i:02d}", sighting_count=c)
+        for i, c in enumerate(counts)
+    ]
+    db_session.add_all(cards)
+    db_session.commit()
+    return cards
+
+
+def _walk(db: Session, descending: bool, limit: int) -> list[int]:
+    keys = [(VendorCard.sighting_count, descending), (VendorCard.id, descending)]
+    seen: list[int] = []
+    cursor = ""
+    for _ in range(20):
+        page = page_rows(db.query(VendorCard), keys, scope="t", cursor=cursor, limit=limit)
+        seen += [v.id for v in page.rows]
+        if page.next_cursor is None:
+            return seen
+        cursor = page.next_cursor
+    raise AssertionError("paging did not terminate")
+
+
+def test_cursor_round_trips_tagged_values():
+    values = [datetime(2026, 3, 1, 12, 30, tzinfo=UTC), Decimal("1.25"), None, "LM317T", 42]
+    assert decode_cursor(encode_cursor("s", values), "s", 5) == values
+
+
+@pytest.mark.parametrize("token", ["", "not-base64!!", encode_cursor("other", [1, 2]), encode_cursor("s", [1])])
+def test_unusable_cursor_decodes_to_none(token):
+    assert decode_cursor(token, "s", 2) is None
+
+
+@pytest.mark.parametrize("descending", [True, False])
+@pytest.mark.parametrize("limit", [1, 5, 12, 50])
+def test_keyset_walk_matches_plain_order(db_session, vendors, descending, limit):
+    # ORDER BY sighting_count NULLS LAST, id — both in the same direction.
+    sign = -1 if descending else 1
+    expected = [
+        v.id
+        for v in sorted(vendors, key=lambda v: (v.sighting_count is None, sign * (v.sighting_count or 0), sign * v.id))
+    ]
+    assert _walk(db_session, descending, limit) == expected
+
+
+def test_no_cursor_falls_back_to_offset_and_still_returns_cursor(db_session, vendors):
+    keys = [(VendorCard.sighting_count, True), (VendorCard.id, True)]
+    full = page_rows(db_session.query(VendorCard), keys, scope="t", limit=12).rows
+    page = page_rows(db_session.query(VendorCard), keys, scope="t", offset=4, limit=4)
+    assert page.rows == full[4:8]
+    nxt = page_rows(db_session.query(VendorCard), keys, scope="t", cursor=page.next_cursor, offset=4, limit=4)
+    assert nxt.rows == full[8:12]
+    assert nxt.next_cursor is None
+
+
+def test_foreign_scope_cursor_serves_offset_page(db_session, vendors):
+    keys = [(VendorCard.sighting_count, True), (VendorCard.id, True)]
+    first = page_rows(db_session.query(VendorCard), keys, scope="a", limit=3)
+    other = page_rows(db_session.query(VendorCard), keys, scope="b", cursor=first.next_cursor, limit=3)
+    assert other.rows == first.rows
+
+
+def test_select_statement_pages_and_counts_like_query(db_session, vendors):
+    from sqlalchemy import select
+
+    keys = [(VendorCard.sighting_count, True), (VendorCard.id, True)]
+    legacy = page_rows(db_session.query(VendorCard), keys, scope="t", limit=5)
+    stmt = page_rows(select(VendorCard), keys, scope="t", limit=5, db=db_session)
+    assert stmt.rows == legacy.rows
+    assert stmt.next_cursor == legacy.next_cursor
+    nxt = page_rows(select(VendorCard), keys, scope="t", cursor=stmt.next_cursor, limit=5, db=db_session)
+    assert nxt.rows == page_rows(db_session.query(VendorCard), keys, scope="t", offset=5, limit=5).rows
+    with patch("app.cache.intel_cache._get_redis", return_value=None):
+        assert list_count(db_session, select(VendorCard)) == ListCount(12)
+
+
+def test_list_count_without_redis_is_inline_exact(db_session, vendors):
+    with patch("app.cache.intel_cache._get_redis", return_value=None):
+        assert list_count(db_session, db_session.query(VendorCard)) == ListCount(12)
+
+
+def test_list_count_caches_then_serves_from_redis(db_session, vendors):
+    r = MagicMock()
+    r.get.return_value = None
+    query = db_session.query(VendorCard).filter(VendorCard.sighting_count == 5)
+    with patch("app.cache.intel_cache._get_redis", return_value=r):
+        assert list_count(db_session, query) == ListCount(4)
+        _key, _ttl, payload = r.setex.call_args.args
+        assert json.loads(payload)["n"] == 4
+
+        r.get.return_value = json.dumps({"n": 777, "at": time.time()})
+        assert list_count(db_session, query) == ListCount(777)
+    r.set.assert_not_called()  # fresh entry → no background refresh
+
+
+def test_stale_cached_count_is_served_and_refresh_scheduled(db_session, vendors):
+    r = MagicMock()
+    r.get.return_value = json.dumps({"n": 10, "at": time.time() - COUNT_FRESH_SECONDS - 5})
+    with (
+        patch("app.cache.intel_cache._get_redis", return_value=r),
+        patch("app.services.list_paging._schedule_refresh") as schedule,
+    ):
+        assert list_count(db_session, db_session.query(VendorCard)) == ListCount(10)
+    schedule.assert_called_once()
+
+
+def test_filters_produce_distinct_cache_keys(db_session, vendors):
+    r = MagicMock()
+    r.get.return_value = None
+    with patch("app.cache.intel_cache._get_redis", return_value=r):
+        list_count(db_session, db_session.query(VendorCard).filter(VendorCard.sighting_count == 5))
+        list_count(db_session, db_session.query(VendorCard).filter(VendorCard.sighting_count == 9))
+    keys = {c.args[0] for c in r.setex.call_args_list}
+    assert len(keys) == 2
+
+
+def test_materials_workspace_sends_cursor_only_for_the_page_it_was_issued_for():
+    """Code that moves ``page`` on its own (URL sync, AI interpret) must not reuse a
+    cursor issued for another page — the list would start mid-way yet be labelled 1–50."""
+    from pathlib import Path
+
+    js = Path("app/static/htmx_app.js").read_text()
+    workspace = Path("app/templates/htmx/partials/materials/workspace.html").read_text()
+    assert '"activeCursor()"' in workspace
+    assert "this.cursorPage === this.page ? this.cursor : ''" in js
+    assert "this.cursorPage = cursor ? newPage : -1;" in js
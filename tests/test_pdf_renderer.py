@@ -0,0 +1,81 @@
+"""Tests for app.services.pdf_renderer — content-hash cache, stamp placeholder, pool
+bounds and timeout recycling.
+
+WeasyPrint is not installed on the test host, so layout is stubbed by patching
+``_render_html``; the pool path runs on a thread pool standing in for the process pool.
+
+Called by: pytest
+Depends on: app.services.pdf_renderer
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from app.config import settings
+from app.services import pdf_renderer
+
+STAMP = "2026-10-19 09:00 UTC"
+
+
+def _page(body: str) -> str:
+    return f"<p>{body}</p><footer>{pdf_renderer.STAMP_PLACEHOLDER}</footer>"
+
+
+class TestCache:
+    def test_unchanged_document_renders_once(self):
+        with patch.object(pdf_renderer, "_render_html", return_value=b"%PDF a") as layout:
+            first = pdf_renderer.render("quote_report.html", _page("Q-1"), STAMP)
+            second = pdf_renderer.render("quote_report.html", _page("Q-1"), "2026-10-19 09:05 UTC")
+        assert first == second == b"%PDF a"
+        assert layout.call_count == 1
+        assert layout.call_args.args[0] == f"<p>Q-1</p><footer>{STAMP}</footer>"
+
+    def test_content_or_template_change_misses(self):
+        with patch.object(pdf_renderer, "_render_html", return_value=b"%PDF") as layout:
+            pdf_renderer.render("quote_report.html", _page("Q-1"), STAMP)
+            pdf_renderer.render("quote_report.html", _page("Q-2"), STAMP)
+            pdf_renderer.render("bid_report.html", _page("Q-1"), STAMP)
+        assert layout.call_count == 3
+
+    def test_lru_bounded_by_bytes(self, monkeypatch):
+        monkeypatch.setattr(settings, "pdf_cache_max_mb", 1)
+        big = b"x" * (600 * 1024)
+        with patch.object(pdf_renderer, "_render_html", return_value=big) as layout:
+            pdf_renderer.render("a.html", _page("1"), STAMP)
+            pdf_renderer.render("a.html", _page("2"), STAMP)  # evicts "1"
+            pdf_renderer.render("a.html", _page("2"), STAMP)
+            pdf_renderer.render("a.html", _page("1"), STAMP)
+        assert layout.call_count == 3
+        assert pdf_renderer._cache_bytes <= 1024 * 1024
+
+
+class TestPool:
+    @pytest.fixture
+    def thread_pool(self, monkeypatch):
+        monkeypatch.setattr(pdf_renderer, "_inline", lambda: False)
+        pool = ThreadPoolExecutor(max_workers=1)
+        slots = threading.BoundedSemaphore(1)
+        monkeypatch.setattr(pdf_renderer, "_get_pool", lambda: (pool, slots))
+        yield pool
+        pool.shutdown(wait=True)
+
+    def test_renders_through_pool(self, thread_pool):
+        with patch.object(pdf_renderer, "_render_html", return_value=b"%PDF pool"):
+            assert pdf_renderer.render("rfq_summary.html", _page("R-1"), STAMP) == b"%PDF pool"
+        assert pdf_renderer._pending == 0
+
+    def test_timeout_raises_and_recycles(self, thread_pool, monkeypatch):
+        monkeypatch.setattr(settings, "pdf_render_timeout_s", 0.05)
+        with (
+            patch.object(pdf_renderer, "_render_html", side_effect=lambda html: time.sleep(0.3) or b"%PDF"),
+            patch.object(pdf_renderer, "_recycle_pool") as recycle,
+            pytest.raises(TimeoutError),
+        ):
+            pdf_renderer.render("rfq_summary.html", _page("R-2"), STAMP)
+        recycle.assert_called_once_with(thread_pool)
+        assert pdf_renderer._pending == 0
+        assert not pdf_renderer._cache
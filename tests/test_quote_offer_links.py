@@ -0,0 +1,102 @@
+"""Tests for the quote_offer_links projection of Quote.line_items.
+
+Covers the Quote listeners (create, line-item edit, flag_modified in-place edit, status
+change, unrelated update, delete cascade), offer-id extraction from messy JSON, the
+``quoted_offer_ids`` lookup, and the idempotent rebuild behind the backfill command.
+
+Called by: pytest
+Depends on: app.models.quotes, app.services.quote_offer_links, tests/conftest.py fixtures
+"""
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm.attributes import flag_modified
+
+from app.models import Quote, QuoteOfferLink
+from app.models.quotes import offer_ids_from_line_items
+from app.services.quote_offer_links import backfill_quote_offer_links, quoted_offer_ids
+
+
+def _quote(db, req, number, offer_ids, status="draft"):
+    q = Quote(
+        requisition_id=req.id,
+        quote_number=number,
+        line_items=[{"offer_id": oid, "mpn": "LM317T"} for oid in offer_ids],
+        status=status,
+    )
+    db.add(q)
+    db.commit()
+    return q
+
+
+def _links(db, quote_id):
+    rows = db.execute(select(QuoteOfferLink.offer_id, QuoteOfferLink.status).where(QuoteOfferLink.quote_id == quote_id))
+    return sorted((oid, status) for oid, status in rows)
+
+
+class TestOfferIdsFromLineItems:
+    def test_skips_missing_zero_and_garbage(self):
+        items = [{"offer_id": 3}, {"offer_id": "7"}, {"offer_id": None}, {"offer_id": 0}, {"offer_id": "x"}, "bad", {}]
+        assert offer_ids_from_line_items(items) == {3, 7}
+        assert offer_ids_from_line_items(None) == set()
+
+
+class TestListeners:
+    def test_insert_projects_distinct_offers(self, db_session, test_requisition):
+        q = _quote(db_session, test_requisition, "QOL-1", [5, 6, 5])
+        assert _links(db_session, q.id) == [(5, "draft"), (6, "draft")]
+
+    def test_status_change_and_line_edit_resync(self, db_session, test_requisition):
+        q = _quote(db_session, test_requisition, "QOL-2", [5])
+        q.status = "sent"
+        db_session.commit()
+        assert _links(db_session, q.id) == [(5, "sent")]
+
+        q.line_items = [{"offer_id": 9}]
+        db_session.commit()
+        assert _links(db_session, q.id) == [(9, "sent")]
+
+    def test_flagged_in_place_edit_resyncs(self, db_session, test_requisition):
+        q = _quote(db_session, test_requisition, "QOL-3", [5])
+        q.line_items.append({"offer_id": 11})
+        flag_modified(q, "line_items")
+        db_session.commit()
+        assert [oid for oid, _ in _links(db_session, q.id)] == [5, 11]
+
+    def test_unrelated_update_leaves_links(self, db_session, test_requisition):
+        q = _quote(db_session, test_requisition, "QOL-4", [5], status="sent")
+        before = db_session.scalars(select(QuoteOfferLink.id).where(QuoteOfferLink.quote_id == q.id)).all()
+        q.notes = "called the buyer"
+        db_session.commit()
+        after = db_session.scalars(select(QuoteOfferLink.id).where(QuoteOfferLink.quote_id == q.id)).all()
+        assert before == after
+
+    def test_delete_cascades(self, db_session, test_requisition):
+        q = _quote(db_session, test_requisition, "QOL-5", [5])
+        quote_id = q.id
+        db_session.delete(q)
+        db_session.commit()
+        assert _links(db_session, quote_id) == []
+
+
+class TestQuotedOfferIds:
+    def test_filters_by_status_and_offer_ids(self, db_session, test_requisition):
+        _quote(db_session, test_requisition, "QOL-6", [1, 2], status="sent")
+        _quote(db_session, test_requisition, "QOL-7", [3], status="won")
+        _quote(db_session, test_requisition, "QOL-8", [4], status="draft")
+        assert quoted_offer_ids(db_session) == {1, 2, 3}
+        assert quoted_offer_ids(db_session, ["won"]) == {3}
+        assert quoted_offer_ids(db_session, offer_ids={2, 4}) == {2}
+        assert quoted_offer_ids(db_session, offer_ids=set()) == set()
+
+
+class TestBackfill:
+    def test_rebuilds_and_is_idempotent(self, db_session, test_requisition):
+        q1 = _quote(db_session, test_requisition, "QOL-9", [1, 2], status="sent")
+        q2 = _quote(db_session, test_requisition, "QOL-10", [3], status="lost")
+        db_session.execute(delete(QuoteOfferLink))
+        db_session.commit()
+
+        assert backfill_quote_offer_links(db_session, batch_size=1) == 3
+        assert backfill_quote_offer_links(db_session) == 3
+        assert _links(db_session, q1.id) == [(1, "sent"), (2, "sent")]
+        assert _links(db_session, q2.id) == [(3, "lost")]
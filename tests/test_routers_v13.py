@@ -311,28 +311,28 @@ def test_graph_webhook_no_valid_notifications(client):
 def test_graph_webhook_processing_error(client):
     """POST /api/webhooks/graph processing failure returns 500 so Microsoft Graph
     retries."""
-    from unittest.mock import AsyncMock, patch
+    from unittest.mock import patch
 
     with (
         patch("app.services.webhook_service.validate_notifications", return_value=[{"id": 1}]),
-        patch(
-            "app.services.webhook_service.handle_notification", new_callable=AsyncMock, side_effect=RuntimeError("fail")
-        ),
+        patch("app.services.webhook_service.enqueue_notifications", side_effect=RuntimeError("fail")),
+        patch("app.services.webhook_service.release_replay_keys") as mock_release,
     ):
         resp = client.post("/api/webhooks/graph", json={"value": [{"resource": "test"}]})
     assert resp.status_code == 500
+    mock_release.assert_called_once_with([{"id": 1}])  # Graph's retry must not be a "replay"
 
 
 def test_graph_webhook_success(client):
     """POST /api/webhooks/graph success returns accepted."""
-    from unittest.mock import AsyncMock, patch
+    from unittest.mock import patch
 
     with (
         patch("app.services.webhook_service.validate_notifications", return_value=[{"id": 1}]),
-        patch("app.services.webhook_service.handle_notification", new_callable=AsyncMock, return_value=None),
+        patch("app.services.webhook_service.enqueue_notifications", return_value=1),
     ):
         resp = client.post("/api/webhooks/graph", json={"value": [{"resource": "test"}]})
-    assert resp.status_code == 200
+    assert resp.status_code == 202
     assert resp.json()["status"] == "accepted"
 
 
@@ -0,0 +1,213 @@
+"""Tests for progressive requirement search — per-connector persist, render and reconcile.
+
+Covers ``_fetch_fresh``'s ``on_batch`` hand-off (one batch per finished connector,
+first-seen rows only, failed connectors withheld) and ``search_requirement``'s
+progressive save: each batch is persisted with vendor-scoped summaries, the
+``on_partial`` hook fires after each, and the final pass re-scores every row against
+one median price exactly like a one-shot save.
+
+Called by: pytest
+Depends on: app.search_service, tests/conftest.py db_session fixture
+"""
+
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app import search_service
+from app.models import Requirement, Requisition
+from app.models.sourcing import Sighting
+from app.models.vendor_sighting_summary import VendorSightingSummary
+from app.search_service import search_requirement
+
+
+def _hit(vendor: str, source: str, price: float, sku: str = "") -> dict:
+    return {
+        "vendor_name": vendor,
+        "mpn_matched": "LM317T",
+        "vendor_sku": sku or f"{vendor}-1",
+        "source_type": source,
+        "qty_available": 500,
+        "unit_price": price,
+        "currency": "USD",
+        "confidence": 4,
+    }
+
+
+class _Conn:
+    def __init__(self, hits: list[dict], delay: float = 0.0, fail: bool = False):
+        self.hits = hits
+        self.delay = delay
+        self.fail = fail
+
+    async def search(self, pn: str) -> list[dict]:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return [dict(h) for h in self.hits]
+
+
+class _FastConn(_Conn):
+    pass
+
+
+class _SlowConn(_Conn):
+    pass
+
+
+class _BrokenConn(_Conn):
+    pass
+
+
+@pytest.fixture()
+def fake_fanout(monkeypatch):
+    for cls, name in (("_FastConn", "fast"), ("_SlowConn", "slow"), ("_BrokenConn", "broken")):
+        monkeypatch.setitem(search_service._CONNECTOR_SOURCE_MAP, cls, name)
+    monkeypatch.setattr(search_service, "_get_search_cache", lambda _k: None)
+    monkeypatch.setattr(search_service, "_set_search_cache", lambda *_a, **_kw: None)
+
+    def _use(*connectors):
+        monkeypatch.setattr(search_service, "_build_connectors", lambda _db: (list(connectors), {}, set()))
+
+    return _use
+
+
+class TestFetchFreshBatches:
+    @pytest.mark.asyncio
+    async def test_batches_in_completion_order_without_repeats(self, fake_fanout, db_session):
+        shared = _hit("Arrow", "x", 1.0, sku="A-1")
+        fake_fanout(
+            _SlowConn([shared, _hit("Future", "slow", 1.2)], delay=0.05),
+            _FastConn([shared, _hit("Avnet", "fast", 1.1)]),
+        )
+        batches: list[tuple[str, list[str]]] = []
+
+        async def on_batch(source, rows):
+            batches.append((source, sorted(r["vendor_name"] for r in rows)))
+
+        results, _stats = await search_service._fetch_fresh(["LM317T"], db_session, on_batch=on_batch)
+        assert batches == [("fast", ["Arrow", "Avnet"]), ("slow", ["Future"])]
+        assert sorted(r["vendor_name"] for r in results) == ["Arrow", "Avnet", "Future"]
+
+    @pytest.mark.asyncio
+    async def test_failed_connector_is_not_batched(self, fake_fanout, db_session):
+        fake_fanout(_FastConn([_hit("Avnet", "fast", 1.1)]), _BrokenConn([], fail=True))
+        seen: list[str] = []
+
+        async def on_batch(source, rows):
+            seen.append(source)
+
+        _results, stats = await search_service._fetch_fresh(["LM317T"], db_session, on_batch=on_batch)
+        assert seen == ["fast"]
+        assert next(s for s in stats if s["source"] == "broken")["status"] == "error"
+
+    @pytest.mark.asyncio
+    async def test_failing_handler_does_not_abort_fanout(self, fake_fanout, db_session):
+        fake_fanout(_FastConn([_hit("Avnet", "fast", 1.1)]))
+
+        async def on_batch(source, rows):
+            raise RuntimeError("db down")
+
+        results, _stats = await search_service._fetch_fresh(["LM317T"], db_session, on_batch=on_batch)
+        assert [r["vendor_name"] for r in results] == ["Avnet"]
+
+
+def _requirement(db_session, mpn: str = "LM317T") -> Requirement:
+    reqn = Requisition(name="PROG-1", customer_name="Acme", status="open", created_at=datetime.now(UTC))
+    db_session.add(reqn)
+    db_session.flush()
+    req = Requirement(requisition_id=reqn.id, primary_mpn=mpn, target_qty=100, created_at=datetime.now(UTC))
+    db_session.add(req)
+    db_session.commit()
+    return req
+
+
+_STATS = [
+    {"source": "nexar", "results": 1, "ms": 10, "error": None, "status": "ok"},
+    {"source": "brokerbin", "results": 1, "ms": 20, "error": None, "status": "ok"},
+    {"source": "ai_live_web", "results": 1, "ms": 30, "error": None, "status": "ok"},
+]
+
+
+def _rows() -> tuple[dict, dict, dict]:
+    # The AI web hit arrives after the fan-out, so only the final pass saves it.
+    return _hit("Arrow", "nexar", 1.0), _hit("Chip Broker", "brokerbin", 9.0), _hit("Web Seller", "ai_live_web", 2.0)
+
+
+@patch("app.search_service._schedule_background_enrichment", new_callable=AsyncMock)
+class TestProgressiveSearchRequirement:
+    @pytest.mark.asyncio
+    async def test_partials_persist_then_reconcile(self, _enrich, db_session):
+        req = _requirement(db_session)
+        db_session.add(
+            Sighting(requirement_id=req.id, vendor_name="Old Nexar", mpn_matched="LM317T", source_type="nexar")
+        )
+        db_session.add(
+            Sighting(requirement_id=req.id, vendor_name="Old DigiKey", mpn_matched="LM317T", source_type="digikey")
+        )
+        db_session.commit()
+        arrow, broker, web = _rows()
+        summaries_at_partial: list[set[str]] = []
+        partials: list[str] = []
+
+        async def fake_fetch(pns, db, on_batch=None):
+            await on_batch("nexar", [arrow])
+            await on_batch("brokerbin", [broker])
+            return [arrow, broker, web], _STATS
+
+        async def on_partial(source):
+            partials.append(source)
+            db_session.expire_all()
+            summaries_at_partial.append(
+                {s.vendor_name for s in db_session.query(VendorSightingSummary).filter_by(requirement_id=req.id).all()}
+            )
+
+        with patch("app.search_service._fetch_fresh", side_effect=fake_fetch):
+            await search_requirement(req, db_session, on_partial=on_partial)
+
+        assert partials == ["nexar", "brokerbin"]
+        # Vendor-scoped rebuild: each partial adds its own vendors, nothing is swept yet.
+        assert "arrow" in summaries_at_partial[0]
+        assert "chip broker" not in summaries_at_partial[0]
+        assert {"arrow", "chip broker"} <= summaries_at_partial[1]
+
+        db_session.expire_all()
+        vendors = {s.vendor_name for s in db_session.query(Sighting).filter_by(requirement_id=req.id).all()}
+        # Old nexar row replaced; the untouched digikey row kept; the AI hit saved last.
+        assert vendors == {"Arrow", "Chip Broker", "Web Seller", "Old DigiKey"}
+        summary_names = {
+            s.vendor_name for s in db_session.query(VendorSightingSummary).filter_by(requirement_id=req.id).all()
+        }
+        # The final full rebuild covers every vendor, including the last-saved AI hit.
+        assert summary_names == {"arrow", "chip broker", "web seller", "old digikey"}
+
+    @pytest.mark.asyncio
+    async def test_final_scores_match_one_shot_save(self, _enrich, db_session):
+        progressive_req = _requirement(db_session)
+        one_shot_req = _requirement(db_session)
+
+        async def progressive_fetch(pns, db, on_batch=None):
+            arrow, broker, web = _rows()
+            await on_batch("nexar", [arrow])
+            await on_batch("brokerbin", [broker])
+            return [arrow, broker, web], _STATS
+
+        async def one_shot_fetch(pns, db, on_batch=None):
+            return list(_rows()), _STATS
+
+        with patch("app.search_service._fetch_fresh", side_effect=progressive_fetch):
+            await search_requirement(progressive_req, db_session)
+        with (
+            patch("app.search_service._fetch_fresh", side_effect=one_shot_fetch),
+            patch("app.search_service._mpn_cooldown_partition", return_value=(["LM317T"], set())),
+        ):
+            await search_requirement(one_shot_req, db_session)
+
+        db_session.expire_all()
+
+        def _scores(rid):
+            return {s.vendor_name: s.score for s in db_session.query(Sighting).filter_by(requirement_id=rid).all()}
+
+        assert _scores(progressive_req.id) == _scores(one_shot_req.id)
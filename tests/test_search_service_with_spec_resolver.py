@@ -142,7 +142,7 @@ def _seed_pending_row(db_session) -> int:
 async def test_known_mpn_does_not_trigger_resolver(db_session, enable_flag, known_mpn_requirement, monkeypatch):
     """Sync fanout returns ≥1 sighting → resolver never runs."""
 
-    async def fake_fetch_fresh(mpns, db):
+    async def fake_fetch_fresh(mpns, db, on_batch=None):
         return ([_hit_sighting_row("ABC123")], [_ok_stat()])
 
     monkeypatch.setattr(search_service, "_fetch_fresh", fake_fetch_fresh)
@@ -161,7 +161,7 @@ async def test_zero_hit_triggers_resolver_and_re_fanout(db_session, enable_flag,
 
     fetch_calls: list[list[str]] = []
 
-    async def fake_fetch_fresh(mpns, db):
+    async def fake_fetch_fresh(mpns, db, on_batch=None):
         fetch_calls.append(list(mpns))
         if mpns == ["SPREJ"]:
             return ([], [_ok_stat("mouser")])
@@ -209,7 +209,7 @@ async def test_flag_off_skips_resolver_on_zero(db_session, spec_code_requirement
     """``spec_resolver_enabled=False`` → resolver never called even on zero hits."""
     monkeypatch.setattr(settings, "spec_resolver_enabled", False)
 
-    async def fake_fetch_fresh(mpns, db):
+    async def fake_fetch_fresh(mpns, db, on_batch=None):
         return ([], [_ok_stat()])
 
     monkeypatch.setattr(search_service, "_fetch_fresh", fake_fetch_fresh)
@@ -229,7 +229,7 @@ async def test_resolver_pending_records_requirement_id(db_session, enable_flag,
     req_id = spec_code_requirement.id
     pending_id = _seed_pending_row(db_session)
 
-    async def fake_fetch_fresh(mpns, db):
+    async def fake_fetch_fresh(mpns, db, on_batch=None):
         # Primary returns zero; AVL also returns zero (we only care about
         # the pending bookkeeping here).
         return ([], [_ok_stat("mouser")])
@@ -257,7 +257,7 @@ async def test_used_in_requirement_ids_is_idempotent_on_double_search(
     req_id = spec_code_requirement.id
     pending_id = _seed_pending_row(db_session)
 
-    async def fake_fetch_fresh(mpns, db):
+    async def fake_fetch_fresh(mpns, db, on_batch=None):
         return ([], [_ok_stat("mouser")])
 
     monkeypatch.setattr(search_service, "_fetch_fresh", fake_fetch_fresh)
@@ -280,7 +280,7 @@ async def test_avl_cooldown_skips_fetch_within_window(db_session, enable_flag, s
     burned."""
     fetch_calls: list[list[str]] = []
 
-    async def fake_fetch_fresh(mpns, db):
+    async def fake_fetch_fresh(mpns, db, on_batch=None):
         fetch_calls.append(list(mpns))
         return ([], [_ok_stat("mouser")])
 
@@ -318,7 +318,7 @@ async def test_avl_refanout_stamps_material_card_so_cooldown_engages(
     partition (no monkeypatch) and a zero-hit AVL fanout so the resolve_material_card
     fallback path is exercised."""
 
-    async def fake_fetch_fresh(mpns, db):
+    async def fake_fetch_fresh(mpns, db, on_batch=None):
         # Both the primary and the AVL fanout return zero hits.
         return ([], [_ok_stat("oemsecrets")])
 
@@ -345,7 +345,7 @@ async def test_avl_fetch_fresh_exception_logged_and_continues(
     and worker enqueues still happen — async workers are independent of the live
     connectors."""
 
-    async def fake_fetch_fresh(mpns, db):
+    async def fake_fetch_fresh(mpns, db, on_batch=None):
         if mpns == ["SPREJ"]:
             return ([], [_ok_stat("mouser")])
         raise RuntimeError("AVL fanout boom")
@@ -388,7 +388,7 @@ async def test_avl_connector_crash_keeps_workers_and_does_not_abort_session(
     blow-up in the resolver block can't poison the outer transaction.
     """
 
-    async def fake_fetch_fresh(mpns, db):
+    async def fake_fetch_fresh(mpns, db, on_batch=None):
         if mpns == ["SPREJ"]:
             return ([], [_ok_stat("mouser")])
         raise RuntimeError("AVL connectors down")
@@ -450,7 +450,7 @@ async def test_non_ibm_oem_hint_is_passed_to_resolver(db_session, enable_flag, t
     db_session.add(req)
     db_session.commit()
 
-    async def fake_fetch_fresh(mpns, db):
+    async def fake_fetch_fresh(mpns, db, on_batch=None):
         return ([], [_ok_stat("mouser")])
 
     monkeypatch.setattr(search_service, "_fetch_fresh", fake_fetch_fresh)
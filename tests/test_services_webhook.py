@@ -1161,3 +1161,206 @@ class TestHandleNotificationValidated:
 
         # No tokens should be fetched since validated list is empty
         mock_token.assert_not_called()
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  Durable ingestion queue — enqueue_notifications / drain_notification_queue
+# ══════════════════════════════════════════════════════════════════════
+
+
+class TestNotificationQueue:
+    """The endpoint enqueues; the drain fetches, logs and coalesces inbox polls."""
+
+    def setup_method(self):
+        _seen_notifications.clear()
+
+    def _validated(self, db_session, user, sub_id, resources, change_type="created"):
+        sub = _make_subscription(db_session, user, sub_id=sub_id, client_state="secret")
+        payload = {
+            "value": [
+                _make_notification(sub_id=sub_id, client_state="secret", resource=r, change_type=change_type)
+                for r in resources
+            ]
+        }
+        validated = validate_notifications(payload, db_session)
+        assert all(v["_subscription"].id == sub.id for v in validated)
+        return validated
+
+    def test_enqueue_persists_without_graph_calls(self, db_session, test_user):
+        from app.models import GraphNotificationQueue
+        from app.services.webhook_service import enqueue_notifications
+
+        validated = self._validated(db_session, test_user, "sub-q-1", ["Users('a')/Messages('q1')"])
+        with patch(_PATCH_GET_TOKEN, new_callable=AsyncMock) as mock_token:
+            assert enqueue_notifications(validated, db_session) == 1
+            mock_token.assert_not_called()
+
+        row = db_session.query(GraphNotificationQueue).one()
+        assert row.user_id == test_user.id
+        assert row.resource == "Users('a')/Messages('q1')"
+        assert row.processed_at is None
+        assert len(row.dedup_key) == 64
+
+    def test_enqueue_skips_non_created(self, db_session, test_user):
+        from app.models import GraphNotificationQueue
+        from app.services.webhook_service import enqueue_notifications
+
+        validated = self._validated(db_session, test_user, "sub-q-2", ["Users('a')/Messages('q2')"], "updated")
+        assert enqueue_notifications(validated, db_session) == 0
+        assert db_session.query(GraphNotificationQueue).count() == 0
+
+    def test_enqueue_dedups_across_workers(self, db_session, test_user):
+        """A replay that slipped past another worker's replay set hits the unique key."""
+        from app.models import GraphNotificationQueue
+        from app.services.webhook_service import enqueue_notifications
+
+        validated = self._validated(db_session, test_user, "sub-q-3", ["Users('a')/Messages('q3')"])
+        assert enqueue_notifications(validated, db_session) == 1
+        assert enqueue_notifications(validated, db_session) == 0
+        assert db_session.query(GraphNotificationQueue).count() == 1
+
+    def test_replay_uses_shared_redis_set(self, db_session, test_user):
+        """With Redis up, the replay claim is a SET NX — no process-local state."""
+        _make_subscription(db_session, test_user, sub_id="sub-q-4", client_state="secret")
+        notif = _make_notification(sub_id="sub-q-4", client_state="secret", resource="Users('a')/Messages('q4')")
+        fake_redis = MagicMock()
+        fake_redis.set.side_effect = [True, None]  # second SET NX loses: another worker saw it
+
+        with patch("app.cache.intel_cache._get_redis", return_value=fake_redis):
+            assert len(validate_notifications({"value": [notif.copy()]}, db_session)) == 1
+            assert validate_notifications({"value": [notif.copy()]}, db_session) == []
+
+        assert fake_redis.set.call_args.kwargs == {"nx": True, "ex": REPLAY_WINDOW_SECONDS}
+        assert _seen_notifications == {}
+
+    def test_drain_coalesces_one_poll_per_user(self, db_session, test_user):
+        from app.models import GraphNotificationQueue
+        from app.services.webhook_service import drain_notification_queue, enqueue_notifications
+
+        resources = [f"Users('a')/Messages('d{i}')" for i in range(3)]
+        enqueue_notifications(self._validated(db_session, test_user, "sub-q-5", resources), db_session)
+
+        mock_gc = MagicMock()
+        mock_gc.get_json = AsyncMock(side_effect=[_make_message(msg_id=f"d{i}") for i in range(3)])
+        with (
+            patch(_PATCH_GET_TOKEN, new_callable=AsyncMock, return_value="token") as mock_token,
+            patch(_PATCH_GRAPH_CLIENT, return_value=mock_gc),
+            patch(_PATCH_LOG_ACTIVITY) as mock_log,
+            patch(_PATCH_POLL_INBOX, new_callable=AsyncMock, return_value=[]) as mock_poll,
+        ):
+            assert _run(drain_notification_queue(db_session)) == 3
+
+        assert mock_log.call_count == 3
+        mock_token.assert_awaited_once()
+        mock_poll.assert_awaited_once()
+        rows = db_session.query(GraphNotificationQueue).all()
+        assert all(r.processed_at is not None for r in rows)
+
+        # A second pass finds nothing left to claim.
+        assert _run(drain_notification_queue(db_session)) == 0
+
+    def test_drain_failure_increments_fail_count(self, db_session, test_user):
+        from app.models import GraphNotificationQueue
+        from app.services.webhook_service import drain_notification_queue, enqueue_notifications
+
+        enqueue_notifications(
+            self._validated(db_session, test_user, "sub-q-6", ["Users('a')/Messages('f1')"]), db_session
+        )
+        with (
+            patch(_PATCH_GET_TOKEN, new_callable=AsyncMock, side_effect=RuntimeError("token store down")),
+            patch(_PATCH_POLL_INBOX, new_callable=AsyncMock) as mock_poll,
+        ):
+            assert _run(drain_notification_queue(db_session)) == 0
+
+        mock_poll.assert_not_awaited()
+        row = db_session.query(GraphNotificationQueue).one()
+        assert row.processed_at is None
+        assert row.claimed_at is None  # released for the next drain
+        assert row.fail_count == 1
+        assert "token store down" in row.last_error
+
+    def test_drain_keeps_transient_fetch_failures_pending(self, db_session, test_user):
+        """Throttled / no-token fetches stay queued; a 404 (message gone) is dropped."""
+        from app.models import GraphNotificationQueue
+        from app.services.webhook_service import drain_notification_queue, enqueue_notifications
+
+        resources = ["Users('a')/Messages('t1')", "Users('a')/Messages('t2')", "Users('a')/Messages('t3')"]
+        enqueue_notifications(self._validated(db_session, test_user, "sub-q-7", resources), db_session)
+
+        mock_gc = MagicMock()
+        mock_gc.get_json = AsyncMock(
+            side_effect=[
+                _make_message(msg_id="t1"),
+                {"error": "max_retries", "detail": "All retries exhausted"},
+                {"error": 404, "detail": "ErrorItemNotFound"},
+            ]
+        )
+        with (
+            patch(_PATCH_GET_TOKEN, new_callable=AsyncMock, return_value="token"),
+            patch(_PATCH_GRAPH_CLIENT, return_value=mock_gc),
+            patch(_PATCH_LOG_ACTIVITY) as mock_log,
+            patch(_PATCH_POLL_INBOX, new_callable=AsyncMock, return_value=[]),
+        ):
+            assert _run(drain_notification_queue(db_session)) == 2
+
+        assert mock_log.call_count == 1
+        rows = {r.resource: r for r in db_session.query(GraphNotificationQueue).all()}
+        throttled = rows["Users('a')/Messages('t2')"]
+        assert throttled.processed_at is None and throttled.claimed_at is None
+        assert throttled.fail_count == 1
+        assert "max_retries" in throttled.last_error
+        assert rows["Users('a')/Messages('t3')"].processed_at is not None
+
+    def test_drain_without_token_keeps_rows_pending(self, db_session, test_user):
+        from app.models import GraphNotificationQueue
+        from app.services.webhook_service import drain_notification_queue, enqueue_notifications
+
+        enqueue_notifications(
+            self._validated(db_session, test_user, "sub-q-8", ["Users('a')/Messages('n1')"]), db_session
+        )
+        with patch(_PATCH_GET_TOKEN, new_callable=AsyncMock, return_value=None):
+            assert _run(drain_notification_queue(db_session)) == 0
+
+        row = db_session.query(GraphNotificationQueue).one()
+        assert row.processed_at is None
+        assert row.fail_count == 1
+        assert row.last_error == "no valid Graph token"
+
+    def test_release_replay_keys_lets_graph_retry_through(self, db_session, test_user):
+        """A notification whose enqueue failed is accepted again on Graph's retry."""
+        from app.services.webhook_service import release_replay_keys
+
+        _make_subscription(db_session, test_user, sub_id="sub-q-9", client_state="secret")
+        notif = _make_notification(sub_id="sub-q-9", client_state="secret", resource="Users('a')/Messages('r1')")
+        fake_redis = MagicMock()
+        fake_redis.set.return_value = True
+
+        with patch("app.cache.intel_cache._get_redis", return_value=fake_redis):
+            validated = validate_notifications({"value": [notif.copy()]}, db_session)
+            release_replay_keys(validated)
+        fake_redis.delete.assert_called_once_with(fake_redis.set.call_args.args[0])
+
+        # Redis-down fallback: the process-local claim is dropped too.
+        validated = validate_notifications({"value": [notif.copy()]}, db_session)
+        assert validate_notifications({"value": [notif.copy()]}, db_session) == []
+        release_replay_keys(validated)
+        assert len(validate_notifications({"value": [notif.copy()]}, db_session)) == 1
+
+    def test_drain_purges_processed_rows_after_replay_window(self, db_session, test_user):
+        from app.models import GraphNotificationQueue
+        from app.services.webhook_service import drain_notification_queue
+
+        db_session.add(
+            GraphNotificationQueue(
+                user_id=test_user.id,
+                subscription_id="sub-old",
+                resource="Users('a')/Messages('old')",
+                change_type="created",
+                dedup_key="0" * 64,
+                processed_at=datetime.now(UTC) - timedelta(seconds=REPLAY_WINDOW_SECONDS + 60),
+            )
+        )
+        db_session.commit()
+
+        _run(drain_notification_queue(db_session))
+        assert db_session.query(GraphNotificationQueue).count() == 0
@@ -293,7 +293,7 @@ class TestBackgroundJob:
         inflight = 0
         peak = 0
 
-        async def slow_search(req, db):
+        async def slow_search(req, db, on_partial=None):
             nonlocal inflight, peak
             inflight += 1
             peak = max(peak, inflight)
@@ -366,7 +366,7 @@ class TestSightingsRefreshBranches:
 
         call_count = 0
 
-        async def _mock_search(req_obj, db):
+        async def _mock_search(req_obj, db, on_partial=None):
             nonlocal call_count
             call_count += 1
             if call_count == 2:
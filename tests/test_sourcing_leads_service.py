@@ -7,10 +7,11 @@ Depends on: conftest fixtures, sourcing lead models, vendor card models
 from datetime import UTC, datetime, timedelta
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from app.models.sourcing import Requirement, Requisition, Sighting
-from app.models.sourcing_lead import LeadFeedbackEvent, SourcingLead
+from app.models.sourcing_lead import LeadEvidence, LeadFeedbackEvent, SourcingLead
 from app.models.vendors import VendorCard
 from app.services.sourcing_leads import (
     BUYER_STATUSES,
@@ -28,6 +29,7 @@ from app.services.sourcing_leads import (
     append_lead_feedback,
     get_requisition_leads,
     get_vendor_feedback_adjustment,
+    get_vendor_feedback_adjustments,
     sync_leads_for_sightings,
     update_lead_status,
     upsert_lead_from_sighting,
@@ -318,6 +320,62 @@ class TestSyncLeads:
         requirement = _make_requirement(db_session, req.id)
         assert sync_leads_for_sightings(db_session, requirement, []) == 0
 
+    def test_sightings_of_one_lead_fold_with_evidence_each(self, db_session: Session):
+        req = _make_requisition(db_session)
+        requirement = _make_requirement(db_session, req.id)
+        _make_vendor_card(db_session)
+        api = _make_sighting(db_session, req.id, requirement.id, source_type="digikey")
+        market = _make_sighting(db_session, req.id, requirement.id, source_type="brokerbin", unit_price=0.40)
+
+        assert sync_leads_for_sightings(db_session, requirement, [api, market]) == 2
+
+        leads = db_session.query(SourcingLead).filter_by(requirement_id=requirement.id).all()
+        assert len(leads) == 1
+        assert leads[0].evidence_count == 2
+        assert leads[0].corroborated is True
+        states = {e.verification_state for e in db_session.query(LeadEvidence).filter_by(lead_id=leads[0].id)}
+        assert states == {"inferred"}
+
+    def test_resync_adds_no_duplicate_evidence(self, db_session: Session):
+        req = _make_requisition(db_session)
+        requirement = _make_requirement(db_session, req.id)
+        sighting = _make_sighting(db_session, req.id, requirement.id)
+
+        sync_leads_for_sightings(db_session, requirement, [sighting, sighting])
+        sync_leads_for_sightings(db_session, requirement, [sighting])
+
+        lead = db_session.query(SourcingLead).filter_by(requirement_id=requirement.id).one()
+        assert lead.evidence_count == 1
+        assert db_session.query(LeadEvidence).filter_by(lead_id=lead.id).count() == 1
+
+    def test_statements_do_not_grow_with_sightings(self, db_session: Session):
+        """Round trips track the distinct leads, not the number of sightings."""
+        req = _make_requisition(db_session)
+        sources = ["brokerbin", "netcomponents", "icsource", "oemsecrets"]
+        vendors = ["Arrow Electronics", "Chip One", "Parts Hub"]
+
+        def _statements(per_vendor: int) -> int:
+            requirement = _make_requirement(db_session, req.id)
+            sightings = [
+                _make_sighting(db_session, req.id, requirement.id, vendor_name=v, source_type=src)
+                for v in vendors
+                for src in sources[:per_vendor]
+            ]
+            statements: list[str] = []
+            engine = db_session.get_bind()
+
+            def _count(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+
+            event.listen(engine, "before_cursor_execute", _count)
+            try:
+                sync_leads_for_sightings(db_session, requirement, sightings)
+            finally:
+                event.remove(engine, "before_cursor_execute", _count)
+            return len(statements)
+
+        assert _statements(4) == _statements(1)
+
 
 class TestComputeVendorSafety:
     def test_with_good_vendor_card(self, db_session: Session):
@@ -659,6 +717,18 @@ class TestVendorFeedbackAdjustment:
         assert adj.safety_penalty == 0.0
         assert adj.do_not_contact is False
 
+    def test_bulk_matches_single_vendor_lookup(self, db_session: Session):
+        req = _make_requisition(db_session)
+        requirement = _make_requirement(db_session, req.id)
+        vc = _make_vendor_card(db_session)
+        quiet = _make_vendor_card(db_session, name="quiet vendor")
+        lead = upsert_lead_from_sighting(db_session, requirement, _make_sighting(db_session, req.id, requirement.id))
+        db_session.commit()
+        update_lead_status(db_session, lead.id, "no_stock")
+
+        bulk = get_vendor_feedback_adjustments(db_session, [vc.id, quiet.id, None])
+        assert bulk == {vc.id: get_vendor_feedback_adjustment(db_session, vc.id)}
+
     def test_no_feedback_history_returns_neutral(self, db_session: Session):
         vc = _make_vendor_card(db_session)
         adj = get_vendor_feedback_adjustment(db_session, vc.id)
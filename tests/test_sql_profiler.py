@@ -0,0 +1,154 @@
+"""Tests for the per-request / per-job SQL profiler (app/sql_profiler.py).
+
+Covers statement-shape normalisation, recording through the real engine listeners,
+N+1 detection, nested profile_block isolation, the Server-Timing header, the job
+wrapper, and query budgets for the hot list partials (flat in the number of rows —
+a per-row lazy load would trip the N+1 check).
+
+Depends on: app.sql_profiler, app.scheduler._traced_job, conftest fixtures
+            (query_budget, client).
+"""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models import Requisition, User, VendorCard
+from app.sql_profiler import (
+    N_PLUS_ONE_THRESHOLD,
+    QueryProfile,
+    capture_queries,
+    profile_block,
+    statement_shape,
+)
+
+
+def test_shape_collapses_in_lists_and_int_literals():
+    a = statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?) LIMIT 10")
+    b = statement_shape("SELECT *\n  FROM t WHERE id IN (%(id_1)s, %(id_2)s) LIMIT 50")
+    assert a == "SELECT * FROM t WHERE id IN (…) LIMIT N"
+    assert b == "SELECT * FROM t WHERE id IN (…) LIMIT N"
+    # Identifiers containing digits are left alone.
+    assert statement_shape("SELECT anon_1.x FROM t2") == "SELECT anon_1.x FROM t2"
+
+
+def test_profile_keeps_slowest_and_flags_repeats():
+    prof = QueryProfile()
+    for i in range(N_PLUS_ONE_THRESHOLD):
+        prof.record("SELECT * FROM offers WHERE requirement_id = ?", 0.001 * i)
+    prof.record("SELECT 1", 0.5)
+    assert prof.count == N_PLUS_ONE_THRESHOLD + 1
+    assert prof.slowest[0] == (0.5, "SELECT 1")
+    assert prof.n_plus_one() == [("SELECT * FROM offers WHERE requirement_id = ?", N_PLUS_ONE_THRESHOLD)]
+    assert prof.server_timing().startswith("db;dur=")
+
+
+def test_engine_listeners_record_into_active_block(db_session: Session):
+    with capture_queries() as outer, profile_block("test", "outer") as prof:
+        db_session.execute(text("SELECT 1"))
+        with profile_block("test", "inner") as inner:
+            db_session.execute(text("SELECT 2"))
+        db_session.execute(text("SELECT 3"))
+    assert inner.count == 1
+    assert prof.count == 2  # inner block's statement is not double-counted
+    assert outer.count == 3
+
+    db_session.execute(text("SELECT 4"))
+    assert outer.count == 3  # capture closed
+
+
+def test_n_plus_one_logged_and_counted(db_session: Session, test_user: User):
+    from app.prometheus_metrics import DB_N_PLUS_ONE
+
+    before = DB_N_PLUS_ONE.labels(kind="test", handler="loop")._value.get()
+    with profile_block("test", "loop") as prof:
+        for _ in range(N_PLUS_ONE_THRESHOLD):
+            db_session.execute(text("SELECT name FROM users WHERE id = :id"), {"id": test_user.id})
+    assert prof.n_plus_one()
+    assert DB_N_PLUS_ONE.labels(kind="test", handler="loop")._value.get() == before + 1
+
+
+async def test_traced_job_profiles_each_run(db_session: Session):
+    from app.prometheus_metrics import DB_QUERIES
+    from app.scheduler import _traced_job
+
+    @_traced_job
+    async def _job_probe():
+        db_session.execute(text("SELECT 1"))
+        db_session.execute(text("SELECT 2"))
+
+    hist = DB_QUERIES.labels(kind="job", handler="_job_probe")
+    before = hist._sum.get()
+    await _job_probe()
+    assert hist._sum.get() == before + 2
+
+
+def test_server_timing_header_on_responses(client):
+    resp = client.get("/v2/partials/requisitions")
+    assert resp.status_code == 200
+    assert resp.headers["server-timing"].startswith("db;dur=")
+    assert "queries" in resp.headers["server-timing"]
+
+
+def test_server_timing_off_for_https_app_url(monkeypatch):
+    from app.config import settings
+    from app.sql_profiler import _server_timing_enabled
+
+    monkeypatch.setattr(settings, "sql_server_timing", None)
+    monkeypatch.setattr(settings, "app_url", "https://avail.example.com")
+    assert _server_timing_enabled() is False
+    monkeypatch.setattr(settings, "sql_server_timing", True)
+    assert _server_timing_enabled() is True
+
+
+def test_query_budget_fixture_fails_over_budget(db_session: Session, query_budget):
+    with pytest.raises(AssertionError, match="query budget exceeded"):
+        with query_budget(1):
+            db_session.execute(text("SELECT 1"))
+            db_session.execute(text("SELECT 2"))
+
+
+# ── Hot-route budgets ────────────────────────────────────────────────
+# Each seeds several rows so a per-row query would show up as a repeated shape.
+
+
+@pytest.fixture
+def six_requisitions(db_session: Session, test_user: User) -> None:
+    for i in range(6):
+        db_session.add(
+            Requisition(name=f"REQ-BUDGET-{i}", customer_name="Acme", status="active", created_by=test_user.id)
+        )
+    db_session.commit()
+
+
+@pytest.fixture
+def six_vendors(db_session: Session) -> None:
+    for i in range(6):
+        db_session.add(VendorCard(normalized_name=f"budget vendor {i}", display_name=f"Budget Vendor {i}"))
+    db_session.commit()
+
+
+def test_requisitions_list_budget(client, six_requisitions, query_budget):
+    client.get("/v2/partials/requisitions")  # warm per-process caches
+    with query_budget(12):
+        assert client.get("/v2/partials/requisitions").status_code == 200
+
+
+def test_vendors_list_budget(client, six_vendors, query_budget):
+    client.get("/v2/partials/vendors")
+    with query_budget(6):
+        assert client.get("/v2/partials/vendors").status_code == 200
+
+
+def test_sightings_board_budget(client, six_requisitions, query_budget):
+    client.get("/v2/partials/sightings")
+    with query_budget(15):
+        assert client.get("/v2/partials/sightings").status_code == 200
+
+
+def test_materials_list_budget(client, query_budget):
+    client.get("/v2/partials/materials/faceted")
+    with query_budget(6):
+        assert client.get("/v2/partials/materials/faceted").status_code == 200
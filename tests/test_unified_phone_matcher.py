@@ -183,11 +183,11 @@ class TestUnifiedMatcherVendorCard:
         # e164 must live in the normalized_phones JSON list for the match.
         assert "+18003444539" in (card.normalized_phones or [])
 
-        # The helper itself resolves the card via the in-DB membership test.
-        # NOTE: on Postgres this compiles to a JSONB `@>` containment query;
-        # SQLite (this test DB) has no JSONB/@>, so the helper degrades to a
-        # Python membership test — the observable match result is identical.
-        assert activity_service._match_vendor_card_by_phone(db_session, "+18003444539") is card
+        # The helper resolves the card from entity_resolver's E.164 → vendor index.
+        assert activity_service._match_vendor_card_by_phone(db_session, "+18003444539") == (
+            card.id,
+            "Containment Vendor",
+        )
 
         result = match_phone_to_entity("8003444539", db_session)
         assert result is not None
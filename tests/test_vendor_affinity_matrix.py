@@ -0,0 +1,154 @@
+"""Tests for the precomputed vendor affinity matrix (vendor_affinity_cells).
+
+Covers matrix parity with the live L1 / L3 aggregation (including the target-MPN
+exclusion and mirror-sighting filter), the hourly refresh recomputing only touched keys
+(and doing the first full build), and the per-prefix L3 classification cache.
+
+Called by: pytest
+Depends on: app.services.vendor_affinity_service, tests/conftest.py db_session fixture
+"""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import MaterialCard, MaterialVendorHistory, Sighting, VendorAffinityCell, VendorCard
+from app.services import vendor_affinity_service as svc
+
+
+def _card(db: Session, mpn: str, manufacturer: str | None = "Texas Instruments", category: str | None = None):
+    card = MaterialCard(normalized_mpn=mpn.lower(), display_mpn=mpn, manufacturer=manufacturer, category=category)
+    db.add(card)
+    db.flush()
+    return card
+
+
+def _history(db: Session, card: MaterialCard, vendor: str, seen: datetime | None = None):
+    seen = seen or datetime.now(UTC)
+    db.add(
+        MaterialVendorHistory(
+            material_card_id=card.id,
+            vendor_name=vendor,
+            vendor_name_normalized=vendor.lower(),
+            first_seen=seen,
+            last_seen=seen,
+        )
+    )
+    db.flush()
+
+
+def _sighting(db: Session, card: MaterialCard, vendor: str, source_type: str = "api"):
+    db.add(
+        Sighting(
+            material_card_id=card.id,
+            vendor_name=vendor,
+            vendor_name_normalized=vendor.lower(),
+            mpn_matched=card.display_mpn,
+            normalized_mpn=card.normalized_mpn,
+            source_type=source_type,
+        )
+    )
+    db.flush()
+
+
+def _seed_l1(db: Session) -> None:
+    target = _card(db, "LM317T")
+    others = [_card(db, f"TPS{i}000") for i in range(3)]
+    _card(db, "STM32F4", manufacturer="ST")
+    for card in others:
+        _history(db, card, "Arrow")
+    _history(db, others[0], "Mouser")
+    _history(db, target, "Mouser")  # target-only history must not count
+    _history(db, target, "Digi-Key")
+    db.add(VendorCard(normalized_name="arrow", display_name="Arrow"))
+    db.commit()
+
+
+def _strip(matches: list[dict]) -> list[tuple]:
+    return sorted((m["vendor_name"], m["vendor_id"], m["mpn_count"]) for m in matches)
+
+
+class TestMatrixParity:
+    def test_l1_matches_live_aggregation(self, db_session: Session):
+        _seed_l1(db_session)
+        live = svc.find_affinity_vendors_l1("LM317T", db_session)
+        svc.rebuild_vendor_affinity(db_session)
+        from_matrix = svc.find_affinity_vendors_l1("LM317T", db_session)
+
+        assert _strip(from_matrix) == _strip(live)
+        assert {m["vendor_name"]: m["mpn_count"] for m in from_matrix} == {"Arrow": 3, "Mouser": 1}
+        assert next(m for m in from_matrix if m["vendor_name"] == "Arrow")["vendor_id"] is not None
+
+    def test_l3_matches_live_aggregation(self, db_session: Session):
+        # "Power" spans two category keys; the vendor's MPNs are summed across both.
+        ics = [_card(db_session, f"TPS54{i}", category="power_ic") for i in range(2)]
+        psu = _card(db_session, "RSP-100", category="power_supplies")
+        cap = _card(db_session, "GRM188", category="capacitors")
+        for card in (*ics, psu):
+            _sighting(db_session, card, "Arrow")
+        _sighting(db_session, cap, "Murata Direct")
+        _sighting(db_session, ics[0], "Customer Excess", source_type="customer_excess")
+        db_session.commit()
+
+        with (
+            patch("app.services.credential_service.get_credential_cached", return_value="sk-fake"),
+            patch.object(svc, "_classify_mpn_cached", return_value="Power"),
+        ):
+            live = svc.find_affinity_vendors_l3("TPS5430", None, db_session)
+            svc.rebuild_vendor_affinity(db_session)
+            from_matrix = svc.find_affinity_vendors_l3("TPS5430", None, db_session)
+
+        assert _strip(from_matrix) == _strip(live) == [("Arrow", None, 3)]
+
+
+class TestRefresh:
+    def test_first_refresh_builds_everything(self, db_session: Session):
+        _seed_l1(db_session)
+        assert svc.refresh_vendor_affinity(db_session)["mode"] == "full"
+        assert db_session.scalar(select(func.count(VendorAffinityCell.id))) > 0
+
+    def test_refresh_recomputes_only_touched_keys(self, db_session: Session):
+        _seed_l1(db_session)
+        svc.rebuild_vendor_affinity(db_session)
+        st_cells_before = db_session.scalars(
+            select(VendorAffinityCell.id).where(VendorAffinityCell.dim_key == "ST")
+        ).all()
+
+        new_card = _card(db_session, "TPS9000")
+        _history(db_session, new_card, "Arrow", seen=datetime.now(UTC) + timedelta(minutes=1))
+        db_session.commit()
+        stats = svc.refresh_vendor_affinity(db_session)
+
+        assert stats["mode"] == "incremental"
+        assert stats["manufacturers"] == 1
+        counts = {m["vendor_name"]: m["mpn_count"] for m in svc.find_affinity_vendors_l1("LM317T", db_session)}
+        assert counts["Arrow"] == 4
+        st_cells_after = db_session.scalars(
+            select(VendorAffinityCell.id).where(VendorAffinityCell.dim_key == "ST")
+        ).all()
+        assert st_cells_after == st_cells_before
+
+
+class TestClassificationCache:
+    def test_prefix_shares_one_classification(self):
+        store: dict[str, dict] = {}
+        with (
+            patch("app.cache.intel_cache.get_cached", side_effect=store.get),
+            patch("app.cache.intel_cache.set_cached", side_effect=lambda k, v, ttl_days: store.__setitem__(k, v)),
+            patch.object(svc, "_classify_mpn", return_value="Microcontroller") as classify,
+        ):
+            assert svc._classify_mpn_cached("STM32F407VGT6", None, "sk") == "Microcontroller"
+            assert svc._classify_mpn_cached("stm32-f401re", None, "sk") == "Microcontroller"
+        assert classify.call_count == 1
+        assert list(store) == ["affinity_l3_category:STM32F"]
+
+    def test_failed_classification_not_cached(self):
+        with (
+            patch("app.cache.intel_cache.get_cached", return_value=None),
+            patch("app.cache.intel_cache.set_cached") as set_cached,
+            patch.object(svc, "_classify_mpn", return_value=None),
+        ):
+            assert svc._classify_mpn_cached("XYZ123", None, "sk") is None
+        set_cached.assert_not_called()
@@ -164,13 +164,13 @@ def test_valid_client_state_passes(admin_client, sub1, client_state_1):
         admin_client,
         {"value": [notif("sub-sec-001", client_state_1, "Users('a')/Messages('m-valid')")]},
     )
-    assert r.status_code in (200, 502)
+    assert r.status_code == 202
 
 
 def test_replay_duplicate_rejected(admin_client, sub2, client_state_2):
     resource = "Users('b')/Messages('m-replay')"
     r1 = webhook_post(admin_client, {"value": [notif("sub-sec-002", client_state_2, resource)]})
-    assert r1.status_code in (200, 502)
+    assert r1.status_code == 202
 
     r2 = webhook_post(admin_client, {"value": [notif("sub-sec-002", client_state_2, resource)]})
     assert r2.status_code == 403
@@ -181,13 +181,13 @@ def test_different_resource_accepted(admin_client, sub2, client_state_2):
         admin_client,
         {"value": [notif("sub-sec-002", client_state_2, "Users('b')/Messages('m-A')")]},
     )
-    assert r1.status_code in (200, 502)
+    assert r1.status_code == 202
 
     r2 = webhook_post(
         admin_client,
         {"value": [notif("sub-sec-002", client_state_2, "Users('b')/Messages('m-B')")]},
     )
-    assert r2.status_code in (200, 502)
+    assert r2.status_code == 202
 
 
 def test_expired_replay_entry_re_accepted(admin_client, sub3, client_state_3):
@@ -195,14 +195,14 @@ def test_expired_replay_entry_re_accepted(admin_client, sub3, client_state_3):
 
     resource = "Users('c')/Messages('m-expire')"
     r1 = webhook_post(admin_client, {"value": [notif("sub-sec-003", client_state_3, resource)]})
-    assert r1.status_code in (200, 502)
+    assert r1.status_code == 202
 
     # Manually expire the cache entry
     replay_key = f"sub-sec-003:{resource}"
     _seen_notifications[replay_key] = time.monotonic() - REPLAY_WINDOW_SECONDS - 1
 
     r2 = webhook_post(admin_client, {"value": [notif("sub-sec-003", client_state_3, resource)]})
-    assert r2.status_code in (200, 502)
+    assert r2.status_code == 202
 
 
 def test_null_client_state_accepts_any(admin_client, sub_no_state):
@@ -210,7 +210,7 @@ def test_null_client_state_accepts_any(admin_client, sub_no_state):
         admin_client,
         {"value": [notif("sub-sec-004", "literally-anything", "Users('d')/Messages('m-null')")]},
     )
-    assert r.status_code in (200, 502)
+    assert r.status_code == 202
 
 
 def test_timing_safe_comparison(admin_client, sub1, client_state_1):
@@ -234,7 +234,7 @@ def test_mixed_batch_valid_and_invalid(admin_client, sub1, sub5, client_state_5)
         ]
     }
     r = webhook_post(admin_client, payload)
-    assert r.status_code in (200, 502)
+    assert r.status_code == 202
 
 
 def test_all_invalid_batch_returns_403(admin_client, sub1):
@@ -369,7 +369,7 @@ def test_missing_stored_client_state_fails_open_with_error_log(admin_client, sub
     finally:
         logger.remove(sink_id)
 
-    assert r.status_code in (200, 502)  # accepted (fail-open), not dropped
+    assert r.status_code == 202  # accepted (fail-open), not dropped
     joined = "\n".join(captured)
     assert "sub-sec-004" in joined
     assert "WITHOUT clientState authentication" in joined